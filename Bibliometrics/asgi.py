@@ -14,3 +14,9 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Bibliometrics.settings')
 
 application = get_asgi_application()
+
+# Construir los índices en memoria del dashboard (facetas y autores) al arrancar
+from core import autocomplete, facets  # noqa: E402
+
+facets.warm_up()
+autocomplete.warm_up()
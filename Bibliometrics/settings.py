@@ -53,6 +53,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'django.middleware.gzip.GZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -87,13 +88,119 @@ WSGI_APPLICATION = 'Bibliometrics.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE: 'sqlite' (por defecto, fichero db.sqlite3) o 'postgresql' (requiere psycopg; DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT)
+# DB_CONN_MAX_AGE: segundos que se reutiliza cada conexión de PostgreSQL entre peticiones (0 = una por petición)
+# DB_POOL=true: pool de conexiones de psycopg 3 (requiere psycopg[pool]); sustituye a las conexiones persistentes
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DB_POOL = os.getenv('DB_POOL', 'false').lower() == 'true'
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'bibliometrics'),
+            'USER': os.getenv('DB_USER', ''),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', ''),
+            'PORT': os.getenv('DB_PORT', ''),
+            # Django no admite CONN_MAX_AGE junto con el pool: las conexiones se devuelven al pool
+            'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+                    'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+                },
+            } if DB_POOL else {},
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
     }
+
+    # SQLITE_PRODUCTION=true: journal WAL y pragmas de rendimiento en cada conexión, y un alias 'readonly'
+    # (mismo fichero, PRAGMA query_only) para las lecturas de core.views (core.routers), de modo que el
+    # dashboard sigue respondiendo mientras un comando load_* mantiene abierta una transacción larga
+    SQLITE_PRODUCTION = os.getenv('SQLITE_PRODUCTION', 'false').lower() == 'true'
+    if SQLITE_PRODUCTION:
+        SQLITE_PRAGMAS = (
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'
+            f"PRAGMA mmap_size={int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))};"
+            # Valor negativo: tamaño en KiB
+            f"PRAGMA cache_size={int(os.getenv('SQLITE_CACHE_SIZE', -64 * 1024))};"
+            'PRAGMA temp_store=MEMORY;'
+        )
+        DATABASES['default']['OPTIONS'] = {
+            'init_command': SQLITE_PRAGMAS,
+            # Las transacciones de escritura toman el bloqueo al empezar (sin "database is locked" a mitad)
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 30,
+        }
+        DATABASES['readonly'] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': DATABASES['default']['NAME'],
+            'OPTIONS': {
+                'init_command': SQLITE_PRAGMAS + 'PRAGMA query_only=ON;',
+                'timeout': 30,
+            },
+            'TEST': {'MIRROR': 'default'},
+        }
+        DATABASE_ROUTERS = ['core.routers.ReadOnlyRouter']
+        MIDDLEWARE.append('core.routers.ReadOnlyViewsMiddleware')
+
+
+# Caché de respuestas del dashboard
+# Las claves incluyen la versión de los datos (bibliodata.DataVersion), que cada comando load_* incrementa,
+# por lo que las entradas antiguas nunca se sirven y se eliminan al superar DASHBOARD_CACHE_MAX_ENTRIES.
+# DASHBOARD_CACHE_BACKEND: 'locmem' (por proceso) o 'file' (compartida entre procesos en DASHBOARD_CACHE_LOCATION)
+
+DASHBOARD_CACHE_BACKEND = os.getenv('DASHBOARD_CACHE_BACKEND', 'locmem')
+DASHBOARD_CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'dashboard': {
+        'BACKEND': DASHBOARD_CACHE_BACKENDS[DASHBOARD_CACHE_BACKEND],
+        'LOCATION': os.getenv('DASHBOARD_CACHE_LOCATION', str(BASE_DIR / 'cache' / 'dashboard') if DASHBOARD_CACHE_BACKEND == 'file' else 'dashboard'),
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('DASHBOARD_CACHE_MAX_ENTRIES', 2000)),
+            'CULL_FREQUENCY': 4,
+        },
+    },
+}
+
+# Instantáneas de las redes de colaboración (bibliodata.graphs), escritas por los comandos load_*
+GRAPH_SNAPSHOT_DIR = os.getenv('GRAPH_SNAPSHOT_DIR', str(BASE_DIR / 'cache' / 'graphs'))
+
+# Informes PDF generados en segundo plano (python manage.py run_report_worker)
+REPORT_CACHE_DIR = os.getenv('REPORT_CACHE_DIR', str(BASE_DIR / 'cache' / 'reports'))
+# Segundos tras los que un informe en curso se considera abandonado y se reintenta
+REPORT_JOB_TIMEOUT = int(os.getenv('REPORT_JOB_TIMEOUT', 600))
+
+# Instrumentación por petición (core.profiling): cabeceras Server-Timing y registro en memoria de las
+# últimas peticiones (consultas SQL, sentencias más lentas y repetidas), visible por superusuarios
+REQUEST_PROFILING = os.getenv('REQUEST_PROFILING', str(DEBUG)).lower() == 'true'
+REQUEST_PROFILE_LOG_SIZE = int(os.getenv('REQUEST_PROFILE_LOG_SIZE', 200))
+REQUEST_PROFILE_SLOWEST = int(os.getenv('REQUEST_PROFILE_SLOWEST', 5))
+# Veces que se tiene que repetir una sentencia en una petición para señalarla (patrón N+1)
+REQUEST_PROFILE_REPEATED = int(os.getenv('REQUEST_PROFILE_REPEATED', 5))
+# Milisegundos a partir de los que se captura el plan (EXPLAIN) de una consulta; 0 = desactivado
+REQUEST_PROFILE_EXPLAIN_MS = float(os.getenv('REQUEST_PROFILE_EXPLAIN_MS', 0))
+if REQUEST_PROFILING:
+    # Debe ser el último middleware para medir solo la vista
+    MIDDLEWARE.append('core.profiling.RequestProfilingMiddleware')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
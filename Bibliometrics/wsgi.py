@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Bibliometrics.settings')
 
 application = get_wsgi_application()
+
+# Construir los índices en memoria del dashboard (facetas y autores) al arrancar
+from core import autocomplete, facets  # noqa: E402
+
+facets.warm_up()
+autocomplete.warm_up()
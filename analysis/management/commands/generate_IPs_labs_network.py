@@ -1,13 +1,10 @@
 import csv
 import networkx as nx
-from unidecode import unidecode
 from collections import defaultdict
 from django.core.management.base import BaseCommand
 from bibliodata.models import Author, Publication
-
-
-def normalize_name(name):
-    return unidecode(name.lower().replace(",", "").strip())
+from bibliodata.graphs import write_snapshot
+from bibliodata.resolver import AuthorResolver
 
 
 class Command(BaseCommand):
@@ -30,18 +27,17 @@ class Command(BaseCommand):
                 for ip in ips:
                     lab_ip_dict[ip] = lab
 
-        # === Mapeo nombre normalizado -> Author ===
-        author_map = {a.name: a for a in Author.objects.all()}
+        # === Mapeo nombre normalizado -> Author (mayúsculas, tildes, comas y alias) ===
+        resolved, unresolved = AuthorResolver.build().resolve_many(lab_ip_dict)
+        authors = Author.objects.in_bulk(set(resolved.values()))
 
         # === Filtrar IPs válidos que están en la base de datos ===
         valid_ips = {}
         for raw_name, lab in lab_ip_dict.items():
-            normalized = raw_name
-            author = author_map.get(normalized)
-            if author:
-                valid_ips[author] = lab
-            else:
-                self.stdout.write(self.style.WARNING(f"❌ IP no encontrado en BD: {raw_name}"))
+            if raw_name in resolved:
+                valid_ips[authors[resolved[raw_name]]] = lab
+        for raw_name in unresolved:
+            self.stdout.write(self.style.WARNING(f"❌ IP no encontrado en BD: {raw_name}"))
 
         # === Crear grafo ===
         G = nx.Graph()
@@ -84,4 +80,8 @@ class Command(BaseCommand):
             for u, v, data in G.edges(data=True):
                 writer.writerow([u, v, "Undirected", data["weight"]])
 
-        self.stdout.write(self.style.SUCCESS("✅ Red de coautorías IPBLN exportada para Gephi."))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS("✅ Red de coautorías IPBLN exportada para Gephi."))
+
+        # === Instantánea de la red de IPs para el dashboard ===
+        write_snapshot('ips')
+        self.stdout.write(self.style.SUCCESS("🕸️ Instantánea de la red de IPs actualizada."))
\ No newline at end of file
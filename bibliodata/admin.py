@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Publication, Author, Collaboration, Institution, InstitutionMetric, ThematicArea, PublicationMetric
+from .models import Publication, Author, Collaboration, Institution, InstitutionMetric, ThematicArea, PublicationMetric, PublicationType
 
 @admin.register(Publication)
 class PublicationAdmin(admin.ModelAdmin):
@@ -13,7 +13,7 @@ class PublicationAdmin(admin.ModelAdmin):
     """
     list_display = ("title", "year", "publication_type", "source")
     search_fields = ("title", "doi")
-    list_filter = ("year", "publication_type")
+    list_filter = ("year", "publication_types")
 
 
 @admin.register(PublicationMetric)
@@ -93,3 +93,16 @@ class ThematicAreaAdmin(admin.ModelAdmin):
     """
     list_display = ("name",)
     search_fields = ("name",)
+
+
+@admin.register(PublicationType)
+class PublicationTypeAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for Publication Types.
+
+    Features:
+        - Displays the name of the type.
+        - Enables search by name.
+    """
+    list_display = ("name",)
+    search_fields = ("name",)
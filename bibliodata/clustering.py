@@ -0,0 +1,86 @@
+"""
+Selection of the best clustering of each author (AuthorBestClustering).
+
+The keywords view of the collaboration network colours every author with one of
+their AuthorClustering rows:
+
+- global mode: the row with the highest combined score
+  ``0.8 * silhouette + 0.1 * calinski_harabasz + 0.1 * davies_bouldin``, where
+  each metric is min-max normalized over the rows of the same author;
+- auto mode: for each model_name, the row with the highest silhouette.
+
+Both selections are computed here with pandas in one pass over all the rows and
+stored in AuthorBestClustering, so the endpoint reads them with a single join.
+"""
+
+import pandas as pd
+from django.db import router, transaction
+
+METRICS = ('silhouette', 'calinski_harabasz', 'davies_bouldin')
+WEIGHTS = {'silhouette': 0.8, 'calinski_harabasz': 0.1, 'davies_bouldin': 0.1}
+
+
+def select_best(rows):
+    """
+    Computes the best clusterings from AuthorClustering rows.
+
+    Args:
+        rows (list[dict]): ``id``, ``author_id``, ``model_name`` and the METRICS.
+
+    Returns:
+        list[tuple]: ``(author_id, selection, clustering_id, score)`` tuples.
+    """
+    if not rows:
+        return []
+    df = pd.DataFrame(rows, columns=['id', 'author_id', 'model_name', *METRICS]).sort_values('id', kind='stable')
+    for metric in METRICS:
+        df[metric] = pd.to_numeric(df[metric], errors='coerce')
+
+    # === Modo global: score combinado con métricas normalizadas por autor ===
+    by_author = df.groupby('author_id')
+    score = 0.0
+    for metric in METRICS:
+        low = by_author[metric].transform('min')
+        high = by_author[metric].transform('max')
+        span = high - low
+        normalized = ((df[metric] - low) / span.where(span != 0)).where(span != 0, 0.0)
+        score = score + WEIGHTS[metric] * normalized
+    df['score'] = score
+
+    complete = df.dropna(subset=list(METRICS))
+    # idxmax devuelve la primera fila con el máximo (la de menor id, como el bucle original)
+    best_global = complete.loc[complete.groupby('author_id')['score'].idxmax()]
+    selected = [
+        (row.author_id, 'global', row.id, float(row.score))
+        for row in best_global.itertuples(index=False)
+    ]
+
+    # === Modo automático: mejor silhouette de cada modelo (nulos al final, desempate por id) ===
+    ranked = df.sort_values(['silhouette', 'id'], ascending=[False, True], na_position='last', kind='stable')
+    best_per_model = ranked.groupby(['author_id', 'model_name'], sort=False).head(1)
+    selected += [
+        (row.author_id, row.model_name, row.id, None if pd.isna(row.silhouette) else float(row.silhouette))
+        for row in best_per_model.itertuples(index=False)
+    ]
+    return selected
+
+
+def rebuild_best_clusterings():
+    """
+    Recomputes the AuthorBestClustering table from every AuthorClustering row.
+
+    Returns:
+        int: Number of stored selections.
+    """
+    from .models import AuthorClustering, AuthorBestClustering
+
+    rows = list(AuthorClustering.objects.values('id', 'author_id', 'model_name', *METRICS))
+    selected = select_best(rows)
+    # Borrado y recarga en una transacción: los lectores nunca ven la tabla vacía o a medias
+    with transaction.atomic(using=router.db_for_write(AuthorBestClustering)):
+        AuthorBestClustering.objects.all().delete()
+        AuthorBestClustering.objects.bulk_create([
+            AuthorBestClustering(author_id=author_id, selection=selection, clustering_id=clustering_id, score=score)
+            for author_id, selection, clustering_id, score in selected
+        ], batch_size=1000)
+    return len(selected)
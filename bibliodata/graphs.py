@@ -0,0 +1,394 @@
+"""
+Precomputed snapshots of the collaboration graphs shown in the dashboard.
+
+There are two graphs: ``ips`` (the network of the IP labs, from the CSV files of
+analysis/data/networks) and ``full`` (every Collaboration, with the global
+departments and communities). Both carry the three partitions the dashboard can
+colour by (department, Lovaina and Leiden), so one snapshot serves all of them.
+
+A snapshot is a JSON document with the nodes and edges stored as parallel arrays::
+
+    {"format": "columnar", "revision": 2, "graph": "ips", "version": 12,
+     "nodes": {"id": [...], "label": [...], "department": [code, ...],
+               "lovaina_community": [...], "leiden_community": [...]},
+     "departments": ["Biología Celular", ...],
+     "edges": {"source": [node index, ...], "target": [...], "weight": [...]},
+     "layouts": {"department": {"x": [...], "y": [...]}, "lovaina": {...}, "leiden": {...}}}
+
+Departments are dictionary-encoded (``department`` holds indexes into
+``departments``, -1 for none). ``layouts`` holds precomputed node positions for
+each community mode: the communities are placed around a circle and the nodes of
+each one are laid out with a seeded spring layout, so the same data always gets
+the same drawing and the browser does not have to compute it.
+
+Snapshots are tagged with ``DataVersion.graph_version`` and written to
+GRAPH_SNAPSHOT_DIR by the load commands that change the graph data (collaborations,
+author names, departments and communities), or by ``write_graph_snapshots``. The
+layouts are never computed in a web request: a snapshot written for an older graph
+version is served as it is, and a missing one is replaced by a snapshot without
+layouts, kept in memory until the file is written (the browser lays out the graph
+itself). A gzip copy (``<name>.json.gz``) is written next to every snapshot so the
+compressed body is reused instead of being recompressed per request.
+"""
+
+import csv
+import gzip
+import hashlib
+import json
+import math
+import os
+import tempfile
+import threading
+
+import networkx as nx
+from django.conf import settings
+
+from .models import Author, Collaboration, DataVersion
+from .resolver import AuthorResolver
+
+GRAPHS = ('ips', 'full')
+# Se incrementa al cambiar el contenido de las instantáneas para regenerar las antiguas
+SNAPSHOT_REVISION = 2
+# Permisos de los ficheros escritos (legibles por el usuario del servidor web)
+SNAPSHOT_FILE_MODE = 0o644
+
+LAB_NODES_PATH = "analysis/data/networks/lab_nodes.csv"
+LAB_EDGES_PATH = "analysis/data/networks/lab_edges.csv"
+
+# Modo de comunidad -> atributo del nodo por el que se agrupa el layout
+LAYOUTS = {
+    'department': 'department',
+    'lovaina': 'lovaina_community',
+    'leiden': 'leiden_community',
+}
+LAYOUT_SEED = 42
+LAYOUT_SIZE = 1000
+# Coste máximo del spring layout (nodos x iteraciones) en redes grandes
+LAYOUT_NODE_ITERATIONS = 100_000
+
+
+class GraphSnapshot:
+    """
+    A snapshot read from disk: its raw JSON bytes, data version and ETag.
+    """
+
+    def __init__(self, name, content, gzip_content=None):
+        self.name = name
+        self.content = content
+        self._gzip_content = gzip_content
+        self.data = json.loads(content)
+        self.version = self.data.get('version')
+        self.revision = self.data.get('revision')
+        self.etag = f'"{name}-v{self.version}-{hashlib.sha1(content).hexdigest()[:12]}"'
+
+    @property
+    def gzip_content(self):
+        """
+        Gzip-compressed content, computed at most once per snapshot.
+        """
+        if self._gzip_content is None:
+            self._gzip_content = gzip.compress(self.content, mtime=0)
+        return self._gzip_content
+
+    def to_networkx(self):
+        """
+        Rebuilds the graph with the node attributes used by the dashboard views.
+        """
+        nodes, edges = self.data['nodes'], self.data['edges']
+        departments = self.data['departments']
+        G = nx.Graph()
+        for i, node_id in enumerate(nodes['id']):
+            code = nodes['department'][i]
+            G.add_node(
+                node_id,
+                label=nodes['label'][i],
+                department=departments[code] if code >= 0 else None,
+                lovaina_community=nodes['lovaina_community'][i],
+                leiden_community=nodes['leiden_community'][i],
+            )
+        for s, t, w in zip(edges['source'], edges['target'], edges['weight']):
+            G.add_edge(nodes['id'][s], nodes['id'][t], weight=w)
+        return G
+
+
+def snapshot_path(name):
+    return os.path.join(settings.GRAPH_SNAPSHOT_DIR, f'{name}.json')
+
+
+def _encode(document):
+    return json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _write_atomic(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(content)
+    # mkstemp crea el fichero con permisos 0600: el servidor web puede ejecutarse con otro usuario
+    os.chmod(tmp_path, SNAPSHOT_FILE_MODE)
+    os.replace(tmp_path, path)
+
+
+def _lab_graph():
+    """Red de los IPs a partir de los CSV de analysis/data/networks."""
+    with open(LAB_NODES_PATH, encoding="utf-8") as f:
+        node_rows = list(csv.DictReader(f))
+    with open(LAB_EDGES_PATH, encoding="utf-8") as f:
+        edge_rows = list(csv.DictReader(f))
+
+    # Resolver todos los nombres del CSV de una vez (mayúsculas, tildes, comas y alias)
+    names = [row["Id"].strip() for row in node_rows]
+    names += [row[key] for row in edge_rows for key in ("Source", "Target")]
+    resolved, _ = AuthorResolver.build().resolve_many(names)
+    authors = Author.objects.only('gesbib_id', 'department', 'lovaina_community', 'leiden_community').in_bulk(set(resolved.values()))
+
+    G = nx.Graph()
+    for row in node_rows:
+        name = row["Id"].strip()
+        author = authors.get(resolved.get(name))
+        if author is None:
+            continue
+        G.add_node(
+            str(author.gesbib_id),
+            label=name,
+            department=author.department,
+            lovaina_community=author.lovaina_community,
+            leiden_community=author.leiden_community,
+        )
+
+    for row in edge_rows:
+        source, target = resolved.get(row["Source"]), resolved.get(row["Target"])
+        if source is None or target is None:
+            continue
+        source, target = str(source), str(target)
+        if G.has_node(source) and G.has_node(target):
+            G.add_edge(source, target, weight=int(row["Weight"]))
+    return G
+
+
+def _full_graph():
+    """Red completa a partir de todas las colaboraciones (comunidades globales)."""
+    author_fields = ('gesbib_id', 'name', 'department_global', 'lovaina_community_global', 'leiden_community_global')
+    rows = Collaboration.objects.order_by('id').values_list(
+        *(f'author__{f}' for f in author_fields),
+        *(f'collaborator__{f}' for f in author_fields),
+        'publication_count',
+    )
+    size = len(author_fields)
+    G = nx.Graph()
+    for row in rows:
+        ends = []
+        for gesbib_id, name, department, lovaina, leiden in (row[:size], row[size:2 * size]):
+            node_id = str(gesbib_id)
+            if not G.has_node(node_id):
+                G.add_node(node_id, label=name, department=department, lovaina_community=lovaina, leiden_community=leiden)
+            ends.append(node_id)
+        G.add_edge(ends[0], ends[1], weight=row[-1])
+    return G
+
+
+def community_layout(G, attribute, seed=LAYOUT_SEED):
+    """
+    Deterministic positions of the nodes of a graph grouped by a community attribute.
+
+    Communities are placed around a circle (unknown ones last) and the nodes of
+    each community are laid out with a seeded spring layout around its center.
+    Large graphs get fewer spring iterations (at least 10) to bound the cost.
+
+    Returns:
+        dict: ``{node_id: (x, y)}`` in a ``LAYOUT_SIZE`` x ``LAYOUT_SIZE`` box.
+    """
+    groups = {}
+    for node_id, attrs in G.nodes(data=True):
+        groups.setdefault(attrs.get(attribute), []).append(node_id)
+    # Las comunidades desconocidas (None / -1) se colocan al final, como en el dashboard
+    order = [g for g in groups if g not in (None, -1)] + [g for g in (None, -1) if g in groups]
+    if not order:
+        return {}
+
+    center = LAYOUT_SIZE / 2
+    radius = center * 0.8
+    group_radius = radius / math.sqrt(len(order)) * 0.5
+    iterations = max(10, min(50, LAYOUT_NODE_ITERATIONS // G.number_of_nodes()))
+    positions = {}
+    for i, group in enumerate(order):
+        angle = 2 * math.pi * i / len(order)
+        cx = center + radius * math.cos(angle)
+        cy = center + radius * math.sin(angle)
+        members = groups[group]
+        if len(members) == 1:
+            positions[members[0]] = (cx, cy)
+            continue
+        # Subgrafo con los nodos en orden fijo (G.subgraph los recorre en el orden de un set,
+        # que cambia entre procesos, y el layout dejaría de ser reproducible)
+        member_set = set(members)
+        H = nx.Graph()
+        H.add_nodes_from(members)
+        H.add_edges_from((u, v, d) for u, v, d in G.edges(members, data=True) if v in member_set)
+        layout = nx.spring_layout(
+            H, iterations=iterations, weight='weight',
+            scale=group_radius, center=(cx, cy), seed=seed,
+        )
+        positions.update({node_id: (float(x), float(y)) for node_id, (x, y) in layout.items()})
+    return positions
+
+
+def build_snapshot(name, version, layouts=True):
+    """
+    Computes the columnar document of a graph.
+
+    Args:
+        name (str): One of GRAPHS.
+        version (int): Graph version the snapshot is tagged with.
+        layouts (bool): Whether to compute the node positions (the slow part).
+
+    Returns:
+        dict: Snapshot document (see the module docstring).
+    """
+    G = _lab_graph() if name == 'ips' else _full_graph()
+
+    ids = list(G.nodes())
+    index = {node_id: i for i, node_id in enumerate(ids)}
+    departments = []
+    department_codes = {}
+    nodes = {'id': ids, 'label': [], 'department': [], 'lovaina_community': [], 'leiden_community': []}
+    for node_id in ids:
+        attrs = G.nodes[node_id]
+        department = attrs.get('department')
+        if department is None:
+            code = -1
+        else:
+            code = department_codes.get(department)
+            if code is None:
+                code = department_codes[department] = len(departments)
+                departments.append(department)
+        nodes['label'].append(attrs.get('label', node_id))
+        nodes['department'].append(code)
+        nodes['lovaina_community'].append(attrs.get('lovaina_community'))
+        nodes['leiden_community'].append(attrs.get('leiden_community'))
+
+    edges = {'source': [], 'target': [], 'weight': []}
+    for u, v, d in G.edges(data=True):
+        edges['source'].append(index[u])
+        edges['target'].append(index[v])
+        edges['weight'].append(d.get('weight', 1))
+
+    positions_by_mode = {}
+    for mode, attribute in (LAYOUTS.items() if layouts else ()):
+        positions = community_layout(G, attribute)
+        positions_by_mode[mode] = {
+            'x': [round(positions[node_id][0], 1) for node_id in ids],
+            'y': [round(positions[node_id][1], 1) for node_id in ids],
+        }
+
+    return {
+        'format': 'columnar',
+        'revision': SNAPSHOT_REVISION,
+        'graph': name,
+        'version': version,
+        'nodes': nodes,
+        'departments': departments,
+        'edges': edges,
+        'layouts': positions_by_mode,
+    }
+
+
+def write_snapshot(name, version=None):
+    """
+    Builds a graph snapshot and writes it atomically to GRAPH_SNAPSHOT_DIR.
+
+    Returns:
+        GraphSnapshot: The written snapshot.
+    """
+    if version is None:
+        version = DataVersion.current_graph()
+    snapshot = GraphSnapshot(name, _encode(build_snapshot(name, version)))
+    path = snapshot_path(name)
+    _write_atomic(path, snapshot.content)
+    # La copia comprimida se escribe después: solo vale si no es más antigua que el JSON
+    _write_atomic(path + '.gz', snapshot.gzip_content)
+    return snapshot
+
+
+def write_snapshots(stdout=None, style=None, stale_only=False):
+    """
+    Rewrites the snapshots of every graph. Called by the load commands that
+    bump the graph version.
+
+    A graph that cannot be built (e.g. the lab CSV files are missing) is skipped
+    with a warning so the load itself does not fail. With ``stale_only``, the
+    snapshots already written for the current graph version are kept.
+    """
+    version = DataVersion.current_graph()
+    for name in GRAPHS:
+        if stale_only and is_current(_read_snapshot(name), version):
+            if stdout:
+                stdout.write(f"🕸️ Red '{name}' al día (versión {version})")
+            continue
+        try:
+            snapshot = write_snapshot(name, version)
+        except Exception as e:
+            if stdout:
+                stdout.write(style.WARNING(f"⚠️ No se pudo generar la red '{name}': {e}"))
+            continue
+        if stdout:
+            stdout.write(f"🕸️ Red '{name}' guardada: {len(snapshot.data['nodes']['id'])} nodos, {len(snapshot.data['edges']['source'])} aristas")
+
+
+_loaded = {}
+_fallback = {}
+_lock = threading.Lock()
+
+
+def _read_snapshot(name):
+    path = snapshot_path(name)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached = _loaded.get(name)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'rb') as f:
+        content = f.read()
+    gzip_content = None
+    try:
+        if os.stat(path + '.gz').st_mtime_ns >= mtime:
+            with open(path + '.gz', 'rb') as f:
+                gzip_content = f.read()
+    except FileNotFoundError:
+        pass
+    snapshot = GraphSnapshot(name, content, gzip_content)
+    _loaded[name] = (mtime, snapshot)
+    return snapshot
+
+
+def is_current(snapshot, version):
+    """
+    Whether a snapshot was written for the given graph version with the current format.
+    """
+    return snapshot is not None and snapshot.version == version and snapshot.revision == SNAPSHOT_REVISION
+
+
+def get_snapshot(name):
+    """
+    Returns the snapshot of a graph.
+
+    The snapshot on disk is returned even if it is older than the current graph
+    version (the load commands and ``write_graph_snapshots`` rewrite it). If there
+    is none, a snapshot without layouts is built and kept in memory.
+
+    Returns:
+        GraphSnapshot: Snapshot shared by the requests of this process.
+    """
+    snapshot = _read_snapshot(name)
+    if snapshot is not None:
+        return snapshot
+    version = DataVersion.current_graph()
+    with _lock:
+        snapshot = _fallback.get(name)
+        if snapshot is None or snapshot.version != version:
+            # Sin layouts (el cálculo lento se hace al escribir la instantánea, fuera de la petición)
+            snapshot = GraphSnapshot(name, _encode(build_snapshot(name, version, layouts=False)))
+            _fallback[name] = snapshot
+    return snapshot
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from bibliodata.models import DataVersion
+from bibliodata.graphs import write_snapshots
+from bibliodata.search import index_publications
+from bibliodata.synthetic import SyntheticCorpus
+
+
+class Command(BaseCommand):
+    help = "Genera un corpus sintético determinista (publicaciones, autores, métricas, colaboraciones y clusterings) para pruebas de rendimiento"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--publications', type=int, default=10000, help='Número de publicaciones (hasta ~1M)')
+        parser.add_argument('--authors', type=int, help='Número de autores (por defecto, uno por cada 10 publicaciones)')
+        parser.add_argument('--areas', type=int, default=24, help='Número de áreas temáticas')
+        parser.add_argument('--institutions', type=int, default=60, help='Número de instituciones')
+        parser.add_argument('--metric-years', type=int, default=2, help='Años de cada serie de métricas de una publicación')
+        parser.add_argument('--seed', type=int, default=42, help='Semilla del generador (mismo valor, mismo corpus)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Publicaciones escritas por transacción')
+        parser.add_argument('--replace', action='store_true', help='Borra antes todos los datos bibliográficos existentes')
+
+    def handle(self, *args, **options):
+        if SyntheticCorpus.has_data():
+            if not options['replace']:
+                self.stdout.write(self.style.WARNING("⚠️ La base de datos ya contiene datos bibliográficos; usa --replace para sustituirlos"))
+                return
+            self.stdout.write("🗑️ Borrando los datos bibliográficos existentes...")
+            SyntheticCorpus.clear()
+
+        corpus = SyntheticCorpus(
+            publications=options['publications'],
+            authors=options['authors'],
+            areas=options['areas'],
+            institutions=options['institutions'],
+            metric_years=options['metric_years'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            log=lambda message: self.stdout.write(f"🧪 {message}"),
+        )
+        counts = corpus.generate()
+
+        # Mismos pasos finales que los comandos load_*: índice de búsqueda, versión de datos y redes
+        indexed = index_publications()
+        DataVersion.bump(graphs=True)
+        write_snapshots(self.stdout, self.style)
+
+        for name, count in counts.items():
+            self.stdout.write(self.style.SUCCESS(f"✅ {name}: {count}"))
+        self.stdout.write(self.style.SUCCESS(f"🔎 Publicaciones indexadas para búsqueda: {indexed}"))
@@ -3,7 +3,9 @@
 import csv
 from collections import defaultdict
 from django.core.management.base import BaseCommand
-from bibliodata.models import Author, AuthorClustering
+from bibliodata.models import AuthorClustering, DataVersion
+from bibliodata.clustering import rebuild_best_clusterings
+from bibliodata.resolver import AuthorResolver
 
 class Command(BaseCommand):
     help = 'Carga resultados de clustering de autores desde CSVs exportados'
@@ -29,43 +31,49 @@ class Command(BaseCommand):
                     if cluster != -1:  # Ignorar ruido
                         clusters_by_group[key].add(cluster)
 
+        resolver = AuthorResolver.build()
+
         with open(filepath, encoding='utf-8') as f:
             reader = csv.DictReader(f)
             for row in reader:
-                try:
-                    author = Author.objects.get(name=row['author'])
+                author_id = resolver.resolve(row['author'])
+                if author_id is None:
+                    self.stdout.write(self.style.WARNING(f"❌ Autor no encontrado: {row['author']}"))
+                    continue
 
-                    cluster = int(row['cluster'])
-                    pca_dims = int(row.get('pca_dims') or 0)
+                cluster = int(row['cluster'])
+                pca_dims = int(row.get('pca_dims') or 0)
 
-                    # Obtener k dinámicamente según el modelo
-                    if model_name == "dbscan":
-                        key = (row['eps'], row['pca_dims'])
-                        k = len(clusters_by_group[key])
-                    elif model_name == "hdbscan":
-                        k = int(row.get('n_clusters') or 0)
-                    else:
-                        k = int(row.get('k') or 0)
+                # Obtener k dinámicamente según el modelo
+                if model_name == "dbscan":
+                    key = (row['eps'], row['pca_dims'])
+                    k = len(clusters_by_group[key])
+                elif model_name == "hdbscan":
+                    k = int(row.get('n_clusters') or 0)
+                else:
+                    k = int(row.get('k') or 0)
 
-                    # Crear o actualizar clustering
-                    obj, created_flag = AuthorClustering.objects.update_or_create(
-                        author=author,
-                        model_name=model_name,
-                        k=k,
-                        pca_dims=pca_dims,
-                        defaults={
-                            'cluster': cluster,
-                            'silhouette': float(row.get('silhouette') or 0),
-                            'calinski_harabasz': float(row.get('calinski_harabasz') or 0),
-                            'davies_bouldin': float(row.get('davies_bouldin') or 0),
-                        }
-                    )
-                    if created_flag:
-                        created += 1
-                    else:
-                        skipped += 1
+                # Crear o actualizar clustering
+                obj, created_flag = AuthorClustering.objects.update_or_create(
+                    author_id=author_id,
+                    model_name=model_name,
+                    k=k,
+                    pca_dims=pca_dims,
+                    defaults={
+                        'cluster': cluster,
+                        'silhouette': float(row.get('silhouette') or 0),
+                        'calinski_harabasz': float(row.get('calinski_harabasz') or 0),
+                        'davies_bouldin': float(row.get('davies_bouldin') or 0),
+                    }
+                )
+                if created_flag:
+                    created += 1
+                else:
+                    skipped += 1
 
-                except Author.DoesNotExist:
-                    self.stdout.write(self.style.WARNING(f"❌ Autor no encontrado: {row['author']}"))
+        # Mejor agrupamiento de cada autor (modo global y por modelo), en una sola pasada
+        selected = rebuild_best_clusterings()
+        DataVersion.bump()
 
-        self.stdout.write(self.style.SUCCESS(f"✅ {created} agrupamientos creados, {skipped} actualizados o existentes."))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS(f"✅ {created} agrupamientos creados, {skipped} actualizados o existentes."))
+        self.stdout.write(self.style.SUCCESS(f"🏆 Mejores agrupamientos por autor recalculados: {selected}"))
\ No newline at end of file
@@ -3,7 +3,8 @@ import json
 import re
 
 from django.core.management.base import BaseCommand
-from bibliodata.models import Author, Institution
+from bibliodata.models import Author, Institution, DataVersion
+from bibliodata.graphs import write_snapshots
 
 class Command(BaseCommand):
     help = "Carga los autores del IPBLN desde CSV y JSON enriquecido."
@@ -94,6 +95,10 @@ class Command(BaseCommand):
                 created += 1
             else:
                 updated += 1
-        
+
+        # Los nombres de los autores son las etiquetas de los nodos de las redes
+        DataVersion.bump(graphs=True)
+        write_snapshots(self.stdout, self.style)
+
         self.stdout.write(self.style.SUCCESS(f"✅ Autores creados: {created}"))
         self.stdout.write(self.style.SUCCESS(f"🔄 Autores actualizados: {updated}"))
\ No newline at end of file
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
-from bibliodata.models import Author, Publication, Collaboration
+from bibliodata.models import Author, Publication, Collaboration, DataVersion
+from bibliodata.graphs import write_snapshots
 from django.db import transaction
 
 class Command(BaseCommand):
@@ -34,4 +35,7 @@ class Command(BaseCommand):
 
                 self.stdout.write(f"🔗 {author.name}: {len(counter)} colaboraciones")
 
+        DataVersion.bump(graphs=True)
+        write_snapshots(self.stdout, self.style)
+
         self.stdout.write(self.style.SUCCESS(f"\n✅ Total de colaboraciones creadas: {total}"))
@@ -1,7 +1,8 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
-from bibliodata.models import Author  # Cambia esto según tu modelo
-import json
+from bibliodata.models import Author, DataVersion  # Cambia esto según tu modelo
+from bibliodata.graphs import write_snapshots
+from bibliodata.resolver import AuthorResolver
 
 class Command(BaseCommand):
     help = "Asigna departamentos a autores en función de su alias"
@@ -27,49 +28,37 @@ class Command(BaseCommand):
             ]
         }
 
-        def normalize(s):
-            return s.lower().strip()
-
+        resolver = AuthorResolver.build()
         updated = 0
-        assigned_names = set()
+        not_assigned = []
+        ambiguous = []
 
         with transaction.atomic():
             for department, names in departments.items():
-                normalized_names = set(map(normalize, names))
+                # Nombres de la lista -> autores (por nombre o alias, sin tildes ni mayúsculas)
+                resolved, unresolved = resolver.resolve_many(names)
+                not_assigned.extend((name, department) for name in unresolved)
+                ambiguous.extend((name, department) for name in resolver.ambiguous_names(resolved))
 
-                for author in Author.objects.all():
-                    try:
-                        aliases = author.aliases
-                        if isinstance(aliases, str):
-                            aliases = json.loads(aliases)
-                        if not isinstance(aliases, list):
-                            continue
-                    except Exception:
-                        continue
+                authors = Author.objects.filter(gesbib_id__in=set(resolved.values())).order_by('name')
+                for name in authors.values_list('name', flat=True):
+                    self.stdout.write(self.style.SUCCESS(f"{name} asignado a {department}"))
+                updated += authors.update(department=department)
 
-                    for alias in aliases:
-                        if normalize(alias) in normalized_names:
-                            author.department = department
-                            author.save()
-                            assigned_names.add(normalize(alias))
-                            updated += 1
-                            self.stdout.write(self.style.SUCCESS(
-                                f"{author.name} asignado a {department}"))
-                            break  # ya asignado, salimos
+        DataVersion.bump(graphs=True)
+        write_snapshots(self.stdout, self.style)
 
         # Mostrar los que no se pudieron asignar
         self.stdout.write(self.style.NOTICE(f"\nTotal autores actualizados: {updated}"))
 
-        # Comparar contra todos los nombres declarados
-        not_assigned = []
-        for department, names in departments.items():
-            for name in names:
-                if normalize(name) not in assigned_names:
-                    not_assigned.append((name, department))
-
         if not_assigned:
             self.stdout.write(self.style.WARNING("\nAutores NO asignados:"))
             for name, dept in not_assigned:
                 self.stdout.write(f" - {name} ({dept})")
         else:
             self.stdout.write(self.style.SUCCESS("\n✅ Todos los autores de la lista fueron asignados correctamente."))
+
+        if ambiguous:
+            self.stdout.write(self.style.WARNING("\n⚠️ Nombres compartidos por varios autores (revisar la asignación):"))
+            for name, dept in ambiguous:
+                self.stdout.write(f" - {name} ({dept})")
@@ -1,6 +1,6 @@
 import csv
 from django.core.management.base import BaseCommand
-from bibliodata.models import Institution, InstitutionMetric
+from bibliodata.models import Institution, InstitutionMetric, DataVersion
 
 class Command(BaseCommand):
     help = "Carga los institutos y métricas desde un CSV de GesBIB"
@@ -43,5 +43,6 @@ class Command(BaseCommand):
                     }
                 )
 
+        DataVersion.bump()
 
         self.stdout.write(self.style.SUCCESS("✅ Instituciones y métricas cargadas con éxito."))
\ No newline at end of file
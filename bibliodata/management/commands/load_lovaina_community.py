@@ -1,5 +1,8 @@
 from django.core.management.base import BaseCommand
-from bibliodata.models import Author
+from django.db import transaction
+from bibliodata.models import Author, DataVersion
+from bibliodata.graphs import write_snapshots
+from bibliodata.resolver import AuthorResolver
 import pandas as pd
 
 class Command(BaseCommand):
@@ -22,27 +25,37 @@ class Command(BaseCommand):
 
         comunidad_forzada = 10
 
-        count = 0
-        not_found = []
-
-        for _, row in df.iterrows():
-            name = row['author_name']
-            community = row['lovaina_community']
-
+        # Nombre -> comunidad (si un nombre se repite, cuenta la última fila, como antes)
+        communities = {}
+        for name, community in zip(df['author_name'].tolist(), df['lovaina_community'].tolist()):
             if name in grupo_forzado:
                 community = comunidad_forzada
+            communities[name] = community
+
+        resolver = AuthorResolver.build()
+        resolved, not_found = resolver.resolve_many(communities)
+        ambiguous = resolver.ambiguous_names(resolved)
+
+        # Una consulta para leer los autores y un UPDATE por lote para guardarlos
+        authors = Author.objects.in_bulk(set(resolved.values()))
+        for name, author_id in resolved.items():
+            author = authors[author_id]
+            author.lovaina_community = communities[name]
+            self.stdout.write(self.style.SUCCESS(f"{author.name} → comunidad {communities[name]}"))
+
+        with transaction.atomic():
+            Author.objects.bulk_update(authors.values(), ['lovaina_community'], batch_size=500)
+        count = len(authors)
 
-            author = Author.objects.filter(name__iexact=name).first()
-            if author:
-                author.lovaina_community = community
-                author.save()
-                count += 1
-                self.stdout.write(self.style.SUCCESS(f"{author.name} → comunidad {community}"))
-            else:
-                not_found.append(name)
+        DataVersion.bump(graphs=True)
+        write_snapshots(self.stdout, self.style)
 
         self.stdout.write(self.style.NOTICE(f"\n✅ Autores actualizados: {count}"))
         if not_found:
             self.stdout.write(self.style.WARNING("\n⚠️ Nombres no encontrados:"))
             for name in not_found:
                 self.stdout.write(f" - {name}")
+        if ambiguous:
+            self.stdout.write(self.style.WARNING("\n⚠️ Nombres compartidos por varios autores (revisar la asignación):"))
+            for name in ambiguous:
+                self.stdout.write(f" - {name} → {resolved[name]}")
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
-from bibliodata.models import Author
+from bibliodata.models import Author, DataVersion
+from bibliodata.graphs import write_snapshots
 import pandas as pd
 
 class Command(BaseCommand):
@@ -28,6 +29,9 @@ class Command(BaseCommand):
             else:
                 not_found.append(id)
 
+        DataVersion.bump(graphs=True)
+        write_snapshots(self.stdout, self.style)
+
         self.stdout.write(self.style.NOTICE(f"\n✅ Autores actualizados: {count}"))
         if not_found:
             self.stdout.write(self.style.WARNING("\n⚠️ Nombres no encontrados:"))
@@ -1,6 +1,6 @@
 import csv
 from django.core.management.base import BaseCommand
-from bibliodata.models import Publication, ThematicArea
+from bibliodata.models import Publication, ThematicArea, DataVersion
 from django.db import transaction
 
 class Command(BaseCommand):
@@ -40,6 +40,8 @@ class Command(BaseCommand):
                     pub.predicted_thematic_areas.add(area_obj)
                 pub.save()
                 count_updated += 1
+        DataVersion.bump()
+
         self.stdout.write(self.style.SUCCESS(f'Publicaciones actualizadas: {count_updated}'))
         if count_not_found:
             self.stdout.write(self.style.WARNING(f'Publicaciones no encontradas: {count_not_found}')) 
\ No newline at end of file
@@ -1,9 +1,10 @@
 import csv
 import json
-import re
-import unidecode
 from django.core.management.base import BaseCommand
-from bibliodata.models import Publication, PublicationMetric, Author, Institution, ThematicArea
+from bibliodata.models import Publication, PublicationMetric, PublicationType, Author, Institution, ThematicArea, DataVersion
+from bibliodata.dates import parse_publication_date
+from bibliodata.search import index_publications
+from bibliodata.resolver import AuthorResolver
 
 
 def clean_list(json_list):
@@ -40,6 +41,9 @@ class Command(BaseCommand):
 
         created, updated = 0, 0
 
+        # Nombres y firmas (alias) de los autores del IPBLN, normalizados una sola vez
+        firmas_autores_ipbln = AuthorResolver.build()
+
         for pub_id, item in items.items():
             j = json_data.get(pub_id, {}).get("sd", {})
             print(f"Procesando publicación {pub_id}...")
@@ -51,6 +55,10 @@ class Command(BaseCommand):
                     return val  # puede ser lista, string, número, etc.
             imp = impact.get(pub_id, {})
 
+            # === Fecha de publicación normalizada (fecha, mes y precisión) ===
+            year = int(item.get("Año") or 0)
+            parsed_date, month, date_precision = parse_publication_date(jv("fecha_publicacion"), year or None)
+
             # === Datos básicos ===
             obj, created_flag = Publication.objects.update_or_create(
                 gb_id=pub_id,
@@ -58,8 +66,11 @@ class Command(BaseCommand):
                     "title": item.get("Título"),
                     "title_link": item.get("Título link"),
                     "doi": jv("doi"),
-                    "year": int(item.get("Año") or 0),
+                    "year": year,
                     "publication_date": jv("fecha_publicacion"),
+                    "parsed_date": parsed_date,
+                    "month": month,
+                    "date_precision": date_precision,
                     "publication_type": jv("doctype"), # Lista
                     "source": item.get("Fuente"),
                     "source_link": item.get("Fuente link"),
@@ -94,12 +105,6 @@ class Command(BaseCommand):
             ids_autores_csv = item.get("id_autores", "").split(" | ")
             ids_autores_csv = [aid.strip() for aid in ids_autores_csv if aid.strip()]
 
-            firmas_autores_ipbln = set()
-            for autor in Author.objects.all():
-                firmas_autores_ipbln.add(autor.name.strip())
-                if autor.aliases:
-                    firmas_autores_ipbln.update([a.strip() for a in autor.aliases])
-
             autores_obj = []
             for aid in ids_autores_csv:
                 autor = Author.objects.filter(gesbib_id=aid).first()
@@ -130,6 +135,13 @@ class Command(BaseCommand):
 
             obj.institutions.set(institutions_objs)
 
+            # === Tipos de publicación ===
+            types_objs = []
+            for type_name in PublicationType.split(obj.publication_type):
+                type_obj, _ = PublicationType.objects.get_or_create(name=type_name)
+                types_objs.append(type_obj)
+            obj.publication_types.set(types_objs)
+
             # === Temáticas ===
             areas = jv("area_all") or []
             if not areas:
@@ -207,5 +219,10 @@ class Command(BaseCommand):
             created += 1 if created_flag else 0
             updated += 0 if created_flag else 1
 
+        # Índice de búsqueda de texto completo (título, resumen, keywords y áreas)
+        indexed = index_publications()
+        DataVersion.bump()
+
         self.stdout.write(self.style.SUCCESS(f"✅ Publicaciones creadas: {created}"))
         self.stdout.write(self.style.SUCCESS(f"🔄 Publicaciones actualizadas: {updated}"))
+        self.stdout.write(self.style.SUCCESS(f"🔎 Publicaciones indexadas para búsqueda: {indexed}"))
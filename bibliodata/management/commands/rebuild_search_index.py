@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from bibliodata.search import fts_available, index_publications
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda de texto completo (FTS5) de las publicaciones"
+
+    def handle(self, *args, **kwargs):
+        if not fts_available():
+            self.stdout.write(self.style.WARNING("⚠️ El índice FTS5 no está disponible en esta base de datos"))
+            return
+
+        total = index_publications()
+        self.stdout.write(self.style.SUCCESS(f"✅ Publicaciones indexadas: {total}"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from bibliodata.graphs import write_snapshots
+
+
+class Command(BaseCommand):
+    help = "Regenera las instantáneas de las redes de colaboración (nodos, aristas y layouts)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stale-only', action='store_true',
+            help="Regenerar solo las instantáneas que faltan o son de una versión de red anterior",
+        )
+
+    def handle(self, *args, **options):
+        write_snapshots(self.stdout, self.style, stale_only=options['stale_only'])
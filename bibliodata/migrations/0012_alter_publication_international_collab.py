@@ -3,6 +3,16 @@
 from django.db import migrations, models
 
 
+def boolean_to_float(apps, schema_editor):
+    # PostgreSQL no convierte boolean a double precision directamente: se pasa por integer.
+    # En SQLite el cambio de tipo no necesita conversión
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'ALTER TABLE bibliodata_publication ALTER COLUMN international_collab '
+            'TYPE double precision USING international_collab::integer::double precision'
+        )
+
+
 class Migration(migrations.Migration):
 
     dependencies = [
@@ -10,6 +20,7 @@ class Migration(migrations.Migration):
     ]
 
     operations = [
+        migrations.RunPython(boolean_to_float, migrations.RunPython.noop),
         migrations.AlterField(
             model_name='publication',
             name='international_collab',
@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-18 11:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bibliodata', '0022_delete_reporttemplate_delete_thematiccluster'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField(default=0, verbose_name='Data version')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last update')),
+            ],
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2 on 2026-10-18 11:07
+
+from django.db import migrations, models
+
+
+def backfill_publication_types(apps, schema_editor):
+    Publication = apps.get_model('bibliodata', 'Publication')
+    PublicationType = apps.get_model('bibliodata', 'PublicationType')
+    Through = Publication.publication_types.through
+
+    # Tipos individuales de cada publicación a partir del JSON existente
+    pub_types = {}
+    for pub_id, value in Publication.objects.values_list('id', 'publication_type').iterator():
+        if isinstance(value, list):
+            names = [t.strip() for t in value if t and t.strip()]
+        elif value and str(value).strip():
+            names = [str(value).strip()]
+        else:
+            names = []
+        if names:
+            pub_types[pub_id] = list(dict.fromkeys(names))
+
+    all_names = {name for names in pub_types.values() for name in names}
+    PublicationType.objects.bulk_create([PublicationType(name=name) for name in sorted(all_names)], ignore_conflicts=True)
+    type_ids = dict(PublicationType.objects.values_list('name', 'id'))
+
+    Through.objects.bulk_create([
+        Through(publication_id=pub_id, publicationtype_id=type_ids[name])
+        for pub_id, names in pub_types.items()
+        for name in names
+    ], batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bibliodata', '0023_dataversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublicationType',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Publication type')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='publication',
+            name='publication_types',
+            field=models.ManyToManyField(blank=True, related_name='publications', to='bibliodata.publicationtype'),
+        ),
+        migrations.RunPython(backfill_publication_types, migrations.RunPython.noop),
+    ]
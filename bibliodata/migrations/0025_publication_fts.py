@@ -0,0 +1,62 @@
+# Generated by Django 5.2 on 2026-10-18 12:02
+
+from django.db import OperationalError, migrations
+
+# Copia congelada de la creación y el llenado del índice de bibliodata.search tal como
+# eran en esta migración: los cambios posteriores de ese módulo no deben alterarla
+FTS_TABLE = 'bibliodata_publication_fts'
+BATCH_SIZE = 1000
+
+
+def _document_rows(Publication):
+    areas = {}
+    for pub_id, name in Publication.thematic_areas.through.objects.values_list('publication_id', 'thematicarea__name'):
+        areas.setdefault(pub_id, []).append(name)
+
+    for pub_id, title, abstract, keywords in Publication.objects.values_list('id', 'title', 'abstract', 'keywords_all').iterator():
+        if isinstance(keywords, list):
+            keywords = ' ; '.join(str(k) for k in keywords if k)
+        yield (pub_id, title or '', abstract or '', keywords or '', ' ; '.join(areas.get(pub_id, [])))
+
+
+def create_search_index(apps, schema_editor):
+    # Solo en SQLite con FTS5; en otros motores la búsqueda no necesita tabla propia
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "title, abstract, keywords, areas, tokenize='unicode61 remove_diacritics 2')"
+        )
+    except OperationalError:
+        # SQLite compilado sin FTS5: la búsqueda usará el modo antiguo (icontains)
+        return
+
+    Publication = apps.get_model('bibliodata', 'Publication')
+    sql = f'INSERT INTO {FTS_TABLE} (rowid, title, abstract, keywords, areas) VALUES (%s, %s, %s, %s, %s)'
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        batch = []
+        for row in _document_rows(Publication):
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                cursor.executemany(sql, batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bibliodata', '0024_publicationtype'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
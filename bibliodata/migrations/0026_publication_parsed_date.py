@@ -0,0 +1,165 @@
+# Generated by Django 5.2 on 2026-10-18 11:16
+
+import re
+from datetime import date
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+# === Copia congelada de bibliodata.dates tal como era en esta migración ===
+# (los cambios posteriores del parser no deben alterar el relleno histórico)
+
+# Diccionario para convertir nombres de meses a números
+MONTHS = {
+    'jan': 1, 'january': 1,
+    'feb': 2, 'february': 2,
+    'mar': 3, 'march': 3,
+    'apr': 4, 'april': 4,
+    'may': 5,
+    'jun': 6, 'june': 6,
+    'jul': 7, 'july': 7,
+    'aug': 8, 'august': 8,
+    'sep': 9, 'september': 9,
+    'oct': 10, 'october': 10,
+    'nov': 11, 'november': 11,
+    'dec': 12, 'december': 12
+}
+
+PRECISION_DAY = 'day'
+PRECISION_MONTH = 'month'
+PRECISION_YEAR = 'year'
+
+_YEAR_RE = re.compile(r'\b(1[89]\d{2}|2\d{3})\b')
+_NUMERIC_RE = re.compile(r'^(\d{4})[-/](\d{1,2})(?:[-/](\d{1,2}))?')
+
+
+def extract_month(date_str, default=1):
+    """
+    Month of a publication date string, using the heuristics of the dashboard.
+
+    Args:
+        date_str (str): Raw publication date.
+        default: Value returned when no month can be determined.
+
+    Returns:
+        int: Month number (1-12), or ``default``.
+    """
+    if not date_str:
+        return default  # Fallback a enero si no hay fecha
+
+    date_str = date_str.strip().lower()
+
+    # Formato yyyy-mm-dd o yyyy/mm/dd
+    if '-' in date_str or '/' in date_str:
+        separator = '-' if '-' in date_str else '/'
+        parts = date_str.split(separator)
+        if len(parts) >= 2:
+            try:
+                month = int(parts[1])
+                if 1 <= month <= 12:
+                    return month
+            except ValueError:
+                pass
+
+    # Formato Month-Month Year o Month/Month Year
+    for separator in ['-', '/']:
+        if separator in date_str:
+            parts = date_str.split(separator)
+            if len(parts) >= 2:
+                # Intentar obtener el segundo mes del rango
+                words = parts[1].strip().split()
+                second_month = words[0] if words else ''  # Tomar solo la primera palabra
+                if second_month in MONTHS:
+                    return MONTHS[second_month]
+
+    # Formato Month Year
+    for month_name, month_num in MONTHS.items():
+        if month_name in date_str:
+            return month_num
+
+    return default  # Fallback a enero si no se puede determinar el mes
+
+
+def parse_publication_date(value, year=None):
+    """
+    Parses a raw publication date into a real date.
+
+    Args:
+        value (str): Raw publication date.
+        year (int | None): Publication year, used when the string has no year.
+
+    Returns:
+        tuple: ``(date | None, month | None, precision | None)``. The date is the
+        first day of the month (or of the year) when the string is less precise.
+    """
+    if not value or not str(value).strip():
+        return None, None, None
+    value = str(value).strip()
+
+    match = _NUMERIC_RE.match(value)
+    if match:
+        y, m, d = int(match.group(1)), int(match.group(2)), match.group(3)
+        if 1 <= m <= 12:
+            if d:
+                try:
+                    return date(y, m, int(d)), m, PRECISION_DAY
+                except ValueError:
+                    pass
+            try:
+                return date(y, m, 1), m, PRECISION_MONTH
+            except ValueError:
+                # Año fuera de rango (p. ej. 0000-05): se sigue con las heurísticas de año y mes
+                pass
+
+    found = _YEAR_RE.search(value)
+    y = int(found.group(1)) if found else (year or None)
+    month = extract_month(value, default=None)
+    if y is None:
+        return None, month, PRECISION_MONTH if month else None
+    if month:
+        return date(y, month, 1), month, PRECISION_MONTH
+    return date(y, 1, 1), None, PRECISION_YEAR
+
+
+def backfill_parsed_dates(apps, schema_editor):
+    Publication = apps.get_model('bibliodata', 'Publication')
+    # Lotes por id: no se lee con un cursor abierto mientras se escribe en la misma tabla
+    last_id = 0
+    while True:
+        batch = list(Publication.objects.filter(id__gt=last_id).order_by('id').only('id', 'year', 'publication_date')[:BATCH_SIZE])
+        if not batch:
+            break
+        for pub in batch:
+            pub.parsed_date, pub.month, pub.date_precision = parse_publication_date(pub.publication_date, pub.year)
+        Publication.objects.bulk_update(batch, ['parsed_date', 'month', 'date_precision'])
+        last_id = batch[-1].id
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bibliodata', '0025_publication_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publication',
+            name='date_precision',
+            field=models.CharField(blank=True, choices=[('day', 'Day'), ('month', 'Month'), ('year', 'Year')], max_length=5, null=True, verbose_name='Publication date precision'),
+        ),
+        migrations.AddField(
+            model_name='publication',
+            name='month',
+            field=models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Publication month'),
+        ),
+        migrations.AddField(
+            model_name='publication',
+            name='parsed_date',
+            field=models.DateField(blank=True, null=True, verbose_name='Parsed publication date'),
+        ),
+        migrations.AddIndex(
+            model_name='publication',
+            index=models.Index(fields=['year', 'month'], name='bibliodata__year_147f16_idx'),
+        ),
+        migrations.RunPython(backfill_parsed_dates, migrations.RunPython.noop),
+    ]
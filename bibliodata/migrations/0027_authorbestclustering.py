@@ -0,0 +1,90 @@
+# Generated by Django 5.2 on 2026-10-18 11:22
+
+import django.db.models.deletion
+import pandas as pd
+from django.db import migrations, models
+
+# === Copia congelada de bibliodata.clustering tal como era en esta migración ===
+# (los cambios posteriores de la selección no deben alterar el relleno histórico)
+
+METRICS = ('silhouette', 'calinski_harabasz', 'davies_bouldin')
+WEIGHTS = {'silhouette': 0.8, 'calinski_harabasz': 0.1, 'davies_bouldin': 0.1}
+
+
+def select_best(rows):
+    """
+    Computes the best clusterings from AuthorClustering rows.
+
+    Args:
+        rows (list[dict]): ``id``, ``author_id``, ``model_name`` and the METRICS.
+
+    Returns:
+        list[tuple]: ``(author_id, selection, clustering_id, score)`` tuples.
+    """
+    if not rows:
+        return []
+    df = pd.DataFrame(rows, columns=['id', 'author_id', 'model_name', *METRICS]).sort_values('id', kind='stable')
+    for metric in METRICS:
+        df[metric] = pd.to_numeric(df[metric], errors='coerce')
+
+    # === Modo global: score combinado con métricas normalizadas por autor ===
+    by_author = df.groupby('author_id')
+    score = 0.0
+    for metric in METRICS:
+        low = by_author[metric].transform('min')
+        high = by_author[metric].transform('max')
+        span = high - low
+        normalized = ((df[metric] - low) / span.where(span != 0)).where(span != 0, 0.0)
+        score = score + WEIGHTS[metric] * normalized
+    df['score'] = score
+
+    complete = df.dropna(subset=list(METRICS))
+    # idxmax devuelve la primera fila con el máximo (la de menor id, como el bucle original)
+    best_global = complete.loc[complete.groupby('author_id')['score'].idxmax()]
+    selected = [
+        (row.author_id, 'global', row.id, float(row.score))
+        for row in best_global.itertuples(index=False)
+    ]
+
+    # === Modo automático: mejor silhouette de cada modelo (nulos al final, desempate por id) ===
+    ranked = df.sort_values(['silhouette', 'id'], ascending=[False, True], na_position='last', kind='stable')
+    best_per_model = ranked.groupby(['author_id', 'model_name'], sort=False).head(1)
+    selected += [
+        (row.author_id, row.model_name, row.id, None if pd.isna(row.silhouette) else float(row.silhouette))
+        for row in best_per_model.itertuples(index=False)
+    ]
+    return selected
+
+
+def backfill_best_clusterings(apps, schema_editor):
+    AuthorClustering = apps.get_model('bibliodata', 'AuthorClustering')
+    AuthorBestClustering = apps.get_model('bibliodata', 'AuthorBestClustering')
+    rows = list(AuthorClustering.objects.values('id', 'author_id', 'model_name', *METRICS))
+    AuthorBestClustering.objects.bulk_create([
+        AuthorBestClustering(author_id=author_id, selection=selection, clustering_id=clustering_id, score=score)
+        for author_id, selection, clustering_id, score in select_best(rows)
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bibliodata', '0026_publication_parsed_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorBestClustering',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('selection', models.CharField(max_length=50, verbose_name='Selection')),
+                ('score', models.FloatField(blank=True, null=True, verbose_name='Selection score')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='best_clusterings', to='bibliodata.author')),
+                ('clustering', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='bibliodata.authorclustering')),
+            ],
+            options={
+                'unique_together': {('selection', 'author')},
+            },
+        ),
+        migrations.RunPython(backfill_best_clusterings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2 on 2026-10-18 14:10
+
+from django.db import migrations
+
+# Índice de texto completo en PostgreSQL: un tsvector ponderado por publicación con índice GIN
+# (en SQLite es la tabla FTS5 de la migración 0025). Copia congelada de bibliodata.search
+FTS_TABLE = 'bibliodata_publication_fts'
+FTS_GIN_INDEX = 'bibliodata_publication_fts_document_gin'
+BATCH_SIZE = 1000
+INSERT_SQL = (
+    f"INSERT INTO {FTS_TABLE} (publication_id, document) VALUES (%s, "
+    "setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'C') || "
+    "setweight(to_tsvector('simple', %s), 'B') || setweight(to_tsvector('simple', %s), 'B'))"
+)
+
+
+def _document_rows(Publication):
+    areas = {}
+    through = Publication.thematic_areas.through.objects.order_by('id')
+    for pub_id, name in through.values_list('publication_id', 'thematicarea__name'):
+        areas.setdefault(pub_id, []).append(name)
+
+    for pub_id, title, abstract, keywords in Publication.objects.values_list('id', 'title', 'abstract', 'keywords_all').iterator():
+        if isinstance(keywords, list):
+            keywords = ' ; '.join(str(k) for k in keywords if k)
+        yield (pub_id, title or '', abstract or '', keywords or '', ' ; '.join(areas.get(pub_id, [])))
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f'CREATE TABLE IF NOT EXISTS {FTS_TABLE} ('
+        'publication_id bigint PRIMARY KEY REFERENCES bibliodata_publication (id) ON DELETE CASCADE, '
+        'document tsvector NOT NULL)'
+    )
+    schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {FTS_GIN_INDEX} ON {FTS_TABLE} USING gin (document)')
+
+    Publication = apps.get_model('bibliodata', 'Publication')
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        batch = []
+        for row in _document_rows(Publication):
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                cursor.executemany(INSERT_SQL, batch)
+                batch = []
+        if batch:
+            cursor.executemany(INSERT_SQL, batch)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bibliodata', '0027_authorbestclustering'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2 on 2026-10-18 15:02
+
+from django.db import migrations, models
+
+# Tablas intermedias filtradas por nombre de área / institución / tipo: (tabla, columna del objeto relacionado).
+# El índice (objeto, publicación) resuelve el filtro y la semi-join sin leer la tabla
+THROUGH_INDEXES = (
+    ('bibliodata_publication_thematic_areas', 'thematicarea_id'),
+    ('bibliodata_publication_predicted_thematic_areas', 'thematicarea_id'),
+    ('bibliodata_publication_institutions', 'institution_id'),
+    ('bibliodata_publication_publication_types', 'publicationtype_id'),
+)
+AUTHOR_NAME_CI_INDEX = 'bibliodata_author_name_ci'
+
+
+def _through_index_name(table):
+    return f'{table}_rev'
+
+
+def create_indexes(apps, schema_editor):
+    for table, column in THROUGH_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {_through_index_name(table)} ON {table} ({column}, publication_id)'
+        )
+    # name__iexact: UPPER(name) = UPPER(%s) en PostgreSQL, name LIKE %s en SQLite (sin distinguir mayúsculas ASCII)
+    if schema_editor.connection.vendor == 'postgresql':
+        expression = 'UPPER(name)'
+    elif schema_editor.connection.vendor == 'sqlite':
+        expression = 'name COLLATE NOCASE'
+    else:
+        return
+    schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {AUTHOR_NAME_CI_INDEX} ON bibliodata_author ({expression})')
+
+
+def drop_indexes(apps, schema_editor):
+    for table, _ in THROUGH_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {_through_index_name(table)}')
+    schema_editor.execute(f'DROP INDEX IF EXISTS {AUTHOR_NAME_CI_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bibliodata', '0028_publication_fts_postgresql'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['name'], name='bibliodata__name_5a60b1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='publicationmetric',
+            index=models.Index(fields=['publication', 'source', 'metric_type', '-year', 'impact_factor'], name='bibliodata__publica_d47af3_idx'),
+        ),
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
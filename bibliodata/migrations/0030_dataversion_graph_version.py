@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-18 12:25
+
+from django.db import migrations, models
+
+
+def copy_version(apps, schema_editor):
+    # Las instantáneas ya escritas llevan la versión de datos: se parte de ella para no darlas por antiguas
+    DataVersion = apps.get_model('bibliodata', 'DataVersion')
+    DataVersion.objects.update(graph_version=models.F('version'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bibliodata', '0029_index_audit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataversion',
+            name='graph_version',
+            field=models.PositiveIntegerField(default=0, verbose_name='Graph version'),
+        ),
+        migrations.RunPython(copy_version, migrations.RunPython.noop),
+    ]
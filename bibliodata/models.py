@@ -1,12 +1,22 @@
 from django.db import models
+from django.utils import timezone
 
 class Publication(models.Model):
+    DATE_PRECISIONS = [
+        ('day', 'Day'),
+        ('month', 'Month'),
+        ('year', 'Year'),
+    ]
+
     gb_id = models.CharField("GESBIB ID", max_length=50, unique=True)
     title = models.TextField("Title")
     title_link = models.URLField("Link to title", blank=True, null=True)
     doi = models.JSONField("DOI(s)", blank=True, null=True)
     year = models.IntegerField("Year")
     publication_date = models.CharField("Publication date (yyyy-mm-dd)", max_length=20, blank=True, null=True)
+    parsed_date = models.DateField("Parsed publication date", blank=True, null=True)  # Calculada al cargar
+    month = models.PositiveSmallIntegerField("Publication month", blank=True, null=True)
+    date_precision = models.CharField("Publication date precision", max_length=5, choices=DATE_PRECISIONS, blank=True, null=True)
     publication_type = models.JSONField("Normalized type(s)", blank=True,  null=True)
     source = models.CharField("Source", max_length=255, blank=True, null=True)
     source_link = models.URLField("Source link", blank=True, null=True)
@@ -47,6 +57,12 @@ class Publication(models.Model):
     other_authors = models.JSONField("Non-IPBLN authors (raw names)", blank=True, null=True)
     affiliations = models.JSONField("Full affiliation strings", blank=True, null=True)
     institutions = models.ManyToManyField("Institution", related_name="publications", blank=True)
+    publication_types = models.ManyToManyField("PublicationType", related_name="publications", blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["year", "month"]),
+        ]
 
     def __str__(self):
         return f"{self.title[:80]}..."
@@ -134,6 +150,10 @@ class PublicationMetric(models.Model):
     class Meta:
         unique_together = ("publication", "source", "metric_type", "year")
         ordering = ["publication", "source", "year"]
+        indexes = [
+            # Métrica más reciente de cada publicación (ORDER BY year DESC LIMIT 1) sin leer la tabla
+            models.Index(fields=["publication", "source", "metric_type", "-year", "impact_factor"]),
+        ]
 
     def __str__(self):
         return f"{self.publication.title[:60]} - {self.source.upper()} {self.metric_type.upper()} {self.year or ''}"
@@ -210,6 +230,11 @@ class Author(models.Model):
     lovaina_community_global = models.IntegerField("Lovaina Community for global network", blank=True, null=True)
     leiden_community_global = models.IntegerField("Leiden Community for global network", blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["name"]),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -258,6 +283,31 @@ class AuthorClustering(models.Model):
         return f"{self.author.name} | {self.model_name} | k={self.k} | cluster={self.cluster}"
 
 
+class AuthorBestClustering(models.Model):
+    """
+    Best clustering of each author, precomputed by load_IPs_clustering.
+
+    Fields:
+        - selection: 'global' for the best model by combined score (0.8 silhouette +
+          0.1 Calinski-Harabasz + 0.1 Davies-Bouldin, normalized per author), or a
+          model_name for the best run of that model by silhouette (auto mode).
+        - clustering: The selected AuthorClustering row.
+        - score: Combined score (global) or silhouette (per model).
+    """
+    GLOBAL = 'global'
+
+    author = models.ForeignKey("Author", on_delete=models.CASCADE, related_name="best_clusterings")
+    selection = models.CharField("Selection", max_length=50)
+    clustering = models.ForeignKey("AuthorClustering", on_delete=models.CASCADE, related_name="+")
+    score = models.FloatField("Selection score", blank=True, null=True)
+
+    class Meta:
+        unique_together = ("selection", "author")
+
+    def __str__(self):
+        return f"{self.author_id} | {self.selection} | {self.clustering_id}"
+
+
 class Institution(models.Model):
     """
     Represents a CSIC research center or institute.
@@ -339,3 +389,76 @@ class ThematicArea(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class PublicationType(models.Model):
+    """
+    Represents a normalized publication type (e.g., Artículo de revista, Libro...).
+
+    Fields:
+        - name: Unique name of the type, as found in Publication.publication_type.
+
+    Usage:
+        - Indexed lookup for type filters and type counts, instead of matching the
+          serialized JSON of Publication.publication_type.
+    """
+    name = models.CharField("Publication type", max_length=255, unique=True)
+
+    @staticmethod
+    def split(value):
+        """
+        Returns the cleaned individual types of a raw Publication.publication_type value.
+        """
+        if isinstance(value, list):
+            return list(dict.fromkeys(t.strip() for t in value if t and t.strip()))
+        if value and str(value).strip():
+            return [str(value).strip()]
+        return []
+
+    def __str__(self):
+        return self.name
+
+
+class DataVersion(models.Model):
+    """
+    Global version counter of the bibliographic data.
+
+    Every load command bumps it once it has finished writing, so that in-memory
+    indexes and cached responses built from a previous load can detect they are stale.
+
+    Fields:
+        - version: Monotonic counter, increased by each load.
+        - graph_version: Counter of the collaboration graph data (collaborations, author
+          names, departments and communities), increased only by the loads that change it.
+          The graph snapshots (bibliodata.graphs) are tagged with it.
+        - updated_at: Timestamp of the last bump.
+
+    Usage:
+        - DataVersion.current() returns the current counter (0 if nothing was loaded yet).
+        - DataVersion.current_graph() returns the current graph counter.
+        - DataVersion.bump() must be called at the end of every load command, with
+          graphs=True (followed by write_snapshots) if the load changed the graph data.
+    """
+    version = models.PositiveIntegerField("Data version", default=0)
+    graph_version = models.PositiveIntegerField("Graph version", default=0)
+    updated_at = models.DateTimeField("Last update", auto_now=True)
+
+    @classmethod
+    def current(cls):
+        return cls.objects.filter(pk=1).values_list("version", flat=True).first() or 0
+
+    @classmethod
+    def current_graph(cls):
+        return cls.objects.filter(pk=1).values_list("graph_version", flat=True).first() or 0
+
+    @classmethod
+    def bump(cls, graphs=False):
+        obj, _ = cls.objects.get_or_create(pk=1)
+        changes = {"version": models.F("version") + 1, "updated_at": timezone.now()}
+        if graphs:
+            changes["graph_version"] = models.F("graph_version") + 1
+        cls.objects.filter(pk=obj.pk).update(**changes)
+        return cls.current()
+
+    def __str__(self):
+        return f"v{self.version}"
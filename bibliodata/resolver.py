@@ -0,0 +1,102 @@
+"""
+Resolution of author names (as written in CSV files and GesBIB signatures) to Author ids.
+
+Names and aliases (``Author.aliases``) are normalized the same way everywhere:
+lowercase, without accents (unidecode), without commas and with the spacing
+collapsed, so "Suñé, Carlos", "SUÑE CARLOS" and "sune, carlos" are the same key.
+The map is built with one query and then resolves any number of names in memory.
+When a key is shared, the author's own name wins over an alias and, among equals,
+the author with the lowest gesbib_id; shared keys are listed in ``ambiguous``.
+"""
+
+from unidecode import unidecode
+
+from .models import Author
+
+
+def normalize_name(name):
+    """
+    Normalized form of an author name used as lookup key.
+    """
+    return ' '.join(unidecode(name or '').lower().replace(',', ' ').split())
+
+
+class AuthorResolver:
+    """
+    Normalized name -> gesbib_id map of every author.
+    """
+
+    def __init__(self, keys, ambiguous=()):
+        self.keys = keys
+        self.ambiguous = set(ambiguous)
+
+    @classmethod
+    def build(cls, queryset=None):
+        """
+        Builds the map from the names and aliases of the authors.
+
+        Args:
+            queryset (QuerySet | None): Authors to index (all by default).
+        """
+        if queryset is None:
+            queryset = Author.objects.all()
+        authors = list(queryset.order_by('gesbib_id').values_list('gesbib_id', 'name', 'aliases'))
+
+        keys = {}
+        ambiguous = set()
+
+        def add(key, gesbib_id):
+            if not key:
+                return
+            current = keys.setdefault(key, gesbib_id)
+            if current != gesbib_id:
+                ambiguous.add(key)
+
+        # Primero los nombres y después los alias, para que un nombre nunca lo tape un alias
+        for gesbib_id, name, _ in authors:
+            add(normalize_name(name), gesbib_id)
+        for gesbib_id, _, aliases in authors:
+            if isinstance(aliases, list):
+                for alias in aliases:
+                    if isinstance(alias, str):
+                        add(normalize_name(alias), gesbib_id)
+        return cls(keys, ambiguous)
+
+    def resolve(self, name):
+        """
+        Returns the gesbib_id of a name, or None if no author matches it.
+        """
+        return self.keys.get(normalize_name(name))
+
+    def resolve_many(self, names):
+        """
+        Resolves several names at once.
+
+        Returns:
+            tuple: ``(resolved, unresolved)``, where ``resolved`` maps every matched
+            name to its gesbib_id and ``unresolved`` lists the other names in input
+            order (without duplicates).
+        """
+        resolved = {}
+        unresolved = []
+        seen = set()
+        for name in names:
+            if name in seen:
+                continue
+            seen.add(name)
+            gesbib_id = self.resolve(name)
+            if gesbib_id is None:
+                unresolved.append(name)
+            else:
+                resolved[name] = gesbib_id
+        return resolved, unresolved
+
+    def ambiguous_names(self, names):
+        """
+        Returns the given names whose key is shared by several authors, in input
+        order (without duplicates): they resolve, but maybe to the wrong author.
+        """
+        return [name for name in dict.fromkeys(names) if normalize_name(name) in self.ambiguous]
+
+    def __contains__(self, name):
+        return self.resolve(name) is not None
@@ -0,0 +1,216 @@
+"""
+Full-text search over the publications.
+
+Both backends index the title, the abstract, the keywords and the names of the
+thematic areas of every publication in a ``bibliodata_publication_fts`` table,
+kept in sync by ``load_publications`` through index_publications():
+
+- on SQLite it is an FTS5 virtual table whose rowid is the Publication id,
+  created by migration 0025;
+- on PostgreSQL it holds one weighted tsvector per publication (title A,
+  keywords and areas B, abstract C) with a GIN index, created by migration 0028,
+  so a search is an index lookup instead of computing the vector of every row.
+"""
+
+import re
+from html import escape
+
+from django.db import OperationalError, ProgrammingError, connections, router, transaction
+
+FTS_TABLE = 'bibliodata_publication_fts'
+FTS_VENDORS = ('sqlite', 'postgresql')
+# Publicaciones leídas e insertadas por lote al reindexar (también limita los parámetros de DELETE ... IN)
+BATCH_SIZE = 500
+
+# Marcadores internos del resaltado: se sustituyen por <mark> tras escapar el HTML
+_HL_START, _HL_END = '\x02', '\x03'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+_fts_tables = {}
+
+
+def _connection(write=False):
+    """Conexión elegida por los routers para leer (o escribir) publicaciones."""
+    from .models import Publication
+
+    alias = router.db_for_write(Publication) if write else router.db_for_read(Publication)
+    return connections[alias]
+
+
+def fts_available(db_connection=None):
+    """
+    Returns True if the full-text index can be used with the given connection
+    (by default, the one the routers use to read publications).
+
+    The answer is cached per process and connection: the table is created by a
+    migration, never while the site is running.
+    """
+    if db_connection is None:
+        db_connection = _connection()
+    if db_connection.vendor not in FTS_VENDORS:
+        return False
+    if db_connection.alias not in _fts_tables:
+        _fts_tables[db_connection.alias] = FTS_TABLE in db_connection.introspection.table_names()
+    return _fts_tables[db_connection.alias]
+
+
+def _id_batches(Publication, publication_ids=None):
+    """Lotes de BATCH_SIZE ids de publicaciones (todas, por orden de id, cuando es None)."""
+    if publication_ids is not None:
+        for start in range(0, len(publication_ids), BATCH_SIZE):
+            yield publication_ids[start:start + BATCH_SIZE]
+        return
+    last_id = 0
+    while True:
+        ids = list(Publication.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:BATCH_SIZE])
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def _document_rows(Publication, ids):
+    areas = {}
+    through = Publication.thematic_areas.through.objects.filter(publication_id__in=ids).order_by('id')
+    for pub_id, name in through.values_list('publication_id', 'thematicarea__name'):
+        areas.setdefault(pub_id, []).append(name)
+
+    pubs = Publication.objects.filter(id__in=ids).order_by('id')
+    for pub_id, title, abstract, keywords in pubs.values_list('id', 'title', 'abstract', 'keywords_all'):
+        if isinstance(keywords, list):
+            keywords = ' ; '.join(str(k) for k in keywords if k)
+        yield (pub_id, title or '', abstract or '', keywords or '', ' ; '.join(areas.get(pub_id, [])))
+
+
+# Sentencias del índice en cada motor: (clave de la fila, INSERT de una fila de _document_rows)
+_INDEX_SQL = {
+    'sqlite': (
+        'rowid',
+        f'INSERT INTO {FTS_TABLE} (rowid, title, abstract, keywords, areas) VALUES (%s, %s, %s, %s, %s)',
+    ),
+    'postgresql': (
+        'publication_id',
+        f"INSERT INTO {FTS_TABLE} (publication_id, document) VALUES (%s, "
+        "setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'C') || "
+        "setweight(to_tsvector('simple', %s), 'B') || setweight(to_tsvector('simple', %s), 'B'))",
+    ),
+}
+
+
+def reindex(db_connection, publication_ids=None):
+    """
+    Writes the index rows of the given publications (all of them when None).
+
+    The publications are read and inserted in batches of BATCH_SIZE, so the text
+    of the whole corpus is never held in memory. Everything runs in one
+    transaction, so searches never see a half-built index.
+    """
+    from .models import Publication
+
+    key_column, insert_sql = _INDEX_SQL[db_connection.vendor]
+    if publication_ids is not None:
+        publication_ids = list(publication_ids)
+    total = 0
+    with transaction.atomic(using=db_connection.alias), db_connection.cursor() as cursor:
+        if publication_ids is None:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        for ids in _id_batches(Publication, publication_ids):
+            if publication_ids is not None:
+                cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE {key_column} IN ({','.join(['%s'] * len(ids))})", ids)
+            rows = list(_document_rows(Publication, ids))
+            cursor.executemany(insert_sql, rows)
+            total += len(rows)
+    return total
+
+
+def index_publications(publication_ids=None):
+    """
+    (Re)indexes the given publications, or all of them.
+
+    Args:
+        publication_ids (iterable[int] | None): Publications to refresh. None rebuilds the whole index.
+
+    Returns:
+        int: Number of indexed publications (0 if there is no full-text index).
+    """
+    db_connection = _connection(write=True)
+    if not fts_available(db_connection):
+        return 0
+    return reindex(db_connection, publication_ids)
+
+
+def match_expression(query):
+    """
+    Converts free text typed by the user into a safe FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term and all of them are required,
+    so FTS5 operators typed by the user are never interpreted.
+    """
+    tokens = _TOKEN_RE.findall(query)
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def _highlight(text):
+    return escape(text or '').replace(_HL_START, '<mark>').replace(_HL_END, '</mark>')
+
+
+def search(query, limit=50):
+    """
+    Ranked full-text search.
+
+    Args:
+        query (str): Text typed by the user.
+        limit (int): Maximum number of hits.
+
+    Returns:
+        list[dict] | None: Hits ordered by relevance as ``{'id', 'score', 'snippet'}``,
+        where ``snippet`` is HTML-escaped text with the matches wrapped in ``<mark>``.
+        None when no full-text backend is available.
+    """
+    # Lecturas por los routers: el alias de solo lectura en las peticiones del dashboard (core.routers)
+    db_connection = _connection()
+    if not fts_available(db_connection):
+        return None
+    if db_connection.vendor == 'postgresql':
+        return _search_postgres(db_connection, query, limit)
+
+    expression = match_expression(query)
+    if not expression:
+        return []
+    sql = (
+        f"SELECT rowid, bm25({FTS_TABLE}, 10.0, 1.0, 3.0, 3.0) AS score, "
+        f"snippet({FTS_TABLE}, -1, %s, %s, '…', 16) "
+        f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY score LIMIT %s"
+    )
+    try:
+        with db_connection.cursor() as cursor:
+            cursor.execute(sql, [_HL_START, _HL_END, expression, limit])
+            rows = cursor.fetchall()
+    except (OperationalError, ProgrammingError):
+        return None
+    # bm25() devuelve valores negativos: cuanto menor, más relevante
+    return [{'id': pub_id, 'score': -score, 'snippet': _highlight(snippet)} for pub_id, score, snippet in rows]
+
+
+def _search_postgres(db_connection, query, limit):
+    # Se ordenan los documentos con el índice GIN y solo se resaltan los resúmenes de los elegidos
+    sql = (
+        "SELECT hits.publication_id, hits.score, "
+        "ts_headline('simple', COALESCE(p.abstract, ''), hits.query, %s) "
+        "FROM ("
+        "  SELECT publication_id, ts_rank(document, query) AS score, query"
+        f"  FROM {FTS_TABLE}, websearch_to_tsquery('simple', %s) AS query"
+        "  WHERE document @@ query ORDER BY score DESC, publication_id LIMIT %s"
+        ") AS hits JOIN bibliodata_publication p ON p.id = hits.publication_id "
+        "ORDER BY hits.score DESC, hits.publication_id"
+    )
+    options = f'StartSel={_HL_START}, StopSel={_HL_END}, MaxWords=30, MinWords=10'
+    try:
+        with db_connection.cursor() as cursor:
+            cursor.execute(sql, [options, query, limit])
+            rows = cursor.fetchall()
+    except (OperationalError, ProgrammingError):
+        return None
+    return [{'id': pub_id, 'score': score, 'snippet': _highlight(snippet)} for pub_id, score, snippet in rows]
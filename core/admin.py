@@ -1,3 +1,15 @@
 from django.contrib import admin
+from .models import ReportJob
 
-# Register your models here.
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the ReportJob model.
+
+    Features:
+        - Displays token, status, progress, language and requesting user in the list view.
+        - Adds filters by status and language.
+    """
+    list_display = ("token", "status", "progress", "language", "requested_by", "created_at", "finished_at")
+    list_filter = ("status", "language")
+    readonly_fields = ("token", "key", "created_at", "started_at", "finished_at")
@@ -0,0 +1,174 @@
+"""
+Aggregates behind the dashboard charts (timeline and thematic areas).
+
+They are shared by the filtered-data endpoint, which sends them to the browser,
+and by the PDF report, which draws the same charts on the server (see core.charts).
+"""
+
+from django.db.models import Count, Min, Max, Q, F, Value, IntegerField, ExpressionWrapper, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from bibliodata.models import Publication, PublicationType, ThematicArea
+
+
+def _area_count(through, publication_ids):
+    """Número de publicaciones del conjunto con el área de la fila externa en la tabla intermedia dada."""
+    return Coalesce(Subquery(
+        through.objects
+        .filter(thematicarea_id=OuterRef('pk'), publication_id__in=publication_ids)
+        .order_by()
+        .values('thematicarea_id')
+        .annotate(count=Count('publication_id'))
+        .values('count'),
+        output_field=IntegerField(),
+    ), Value(0))
+
+
+def combined_area_counts(query):
+    """
+    Cuenta las áreas temáticas normales y predichas de las publicaciones filtradas.
+
+    Cada publicación suma 1 por área en cada una de las dos relaciones (unión sin
+    eliminar duplicados), todo en una única consulta sobre ThematicArea.
+
+    Returns:
+        list[tuple[str, int]]: (nombre, count) ordenados por count descendente.
+    """
+    publication_ids = query.order_by().values('id')
+    counts = ThematicArea.objects.exclude(name='').annotate(
+        normal=_area_count(Publication.thematic_areas.through, publication_ids),
+        predicted=_area_count(Publication.predicted_thematic_areas.through, publication_ids),
+    ).annotate(
+        total=F('normal') + F('predicted')
+    ).filter(total__gt=0).order_by('-total', 'name')
+    return list(counts.values_list('name', 'total'))
+
+
+def filter_by_types(query, types):
+    """
+    Restringe las publicaciones a las que tienen alguno de los tipos dados.
+
+    Usa una semi-join sobre la tabla intermedia de PublicationType (indexada),
+    de modo que no se duplican filas aunque una publicación tenga varios tipos.
+    """
+    return query.filter(id__in=PublicationType.publications.through.objects
+                        .filter(publicationtype__name__in=types)
+                        .values('publication_id'))
+
+
+def filter_publications(year_from=None, year_to=None, areas=(), institutions=(), types=(), author=None):
+    """
+    Publications matching the dashboard filters.
+
+    Returns:
+        QuerySet: Publications (may contain duplicates; aggregate with distinct counts).
+    """
+    query = Publication.objects.all()
+    if year_from:
+        query = query.filter(year__gte=year_from)
+    if year_to:
+        query = query.filter(year__lte=year_to)
+    if areas:
+        query = query.filter(thematic_areas__name__in=areas)
+    if institutions:
+        query = query.filter(institutions__name__in=institutions)
+    if types:
+        query = filter_by_types(query, types)
+    if author:
+        query = query.filter(authors__name=author)
+    return query
+
+
+def timeline_counts(query, year_from=None, year_to=None, view_type='yearly'):
+    """
+    Publications per year (or per month / quarter of each year) of the timeline.
+
+    Returns:
+        tuple: ``(timeline, timeline_info)``; every period of the year range is
+        present, with count 0 if it has no publications. ``timeline_info`` counts
+        the publications without month in the monthly and quarterly views.
+    """
+    # Rango de años de la línea temporal
+    min_year = int(year_from) if year_from else Publication.objects.aggregate(Min('year'))['year__min']
+    max_year = int(year_to) if year_to else Publication.objects.aggregate(Max('year'))['year__max']
+
+    if view_type in ('monthly', 'quarterly'):
+        # Vista mensual o trimestral para cualquier rango de años, agrupada en la base de datos.
+        # El mes se calcula al cargar las publicaciones; las que no tienen mes cuentan en enero
+        month = Coalesce('month', Value(1), output_field=IntegerField())
+        if view_type == 'monthly':
+            period_key, periods = 'month', 12
+            period = month
+        else:
+            period_key, periods = 'quarter', 4
+            period = ExpressionWrapper((month - 1) / 3 + 1, output_field=IntegerField())
+
+        # Crear un diccionario con todos los periodos del rango
+        periods_data = {(year, p): 0 for year in range(min_year, max_year + 1) for p in range(1, periods + 1)}
+        no_month_count = 0
+
+        period_counts = query.annotate(period=period).values('year', 'period').annotate(
+            count=Count('id', distinct=True),
+            no_month=Count('id', distinct=True, filter=Q(month__isnull=True)),
+        ).order_by('year', 'period')
+        for item in period_counts:
+            periods_data[(item['year'], item['period'])] = item['count']
+            no_month_count += item['no_month']
+
+        # Convertir a lista de objetos para el JSON
+        timeline_data = [{'year': year, period_key: p, 'count': count}
+                         for (year, p), count in periods_data.items()]
+
+        # Añadir información sobre publicaciones sin mes
+        timeline_info = {
+            'no_month_count': no_month_count,
+            'total_count': sum(periods_data.values())
+        }
+    else:
+        # Vista anual (comportamiento original)
+        # Crear un diccionario con todos los años en el rango
+        timeline_data = {year: 0 for year in range(min_year, max_year + 1)}
+
+        # Obtener los conteos reales
+        year_counts = query.values('year').annotate(count=Count('id', distinct=True)).order_by('year')
+
+        # Actualizar el diccionario con los conteos reales
+        for item in year_counts:
+            timeline_data[item['year']] = item['count']
+
+        # Convertir a lista de objetos para el JSON
+        timeline_data = [{'year': year, 'count': count} for year, count in timeline_data.items()]
+        timeline_info = None
+
+    return timeline_data, timeline_info
+
+
+def area_counts(query, include_predicted_areas=False):
+    """
+    Publications per thematic area, the biggest ones plus an "Otras" slice.
+
+    Returns:
+        list[dict]: ``{'thematic_areas__name': name, 'count': count}`` by count descending.
+    """
+    if not include_predicted_areas:
+        areas_data = list(query.values('thematic_areas__name').annotate(count=Count('id', distinct=True)).order_by('-count'))
+        # Procesar para mostrar top 13 + Otros
+        if len(areas_data) > 14:
+            top_15_areas = areas_data[:14]
+            other_areas = areas_data[14:]
+            other_count = sum(area['count'] for area in other_areas)
+            areas_data = top_15_areas + [{'thematic_areas__name': 'Otras', 'count': other_count}]
+    else:
+        # Sumar normales y predichas en una sola consulta agregada
+        areas_data = [
+            {'thematic_areas__name': name, 'count': count}
+            for name, count in combined_area_counts(query)
+        ]
+
+        # Procesar para mostrar top 13 + Otros
+        if len(areas_data) > 13:
+            top_15_areas = areas_data[:13]
+            other_areas = areas_data[13:]
+            other_count = sum(area['count'] for area in other_areas)
+            areas_data = top_15_areas + [{'thematic_areas__name': 'Otras', 'count': other_count}]
+    return areas_data
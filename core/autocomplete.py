@@ -0,0 +1,138 @@
+"""
+In-memory prefix index for the author autocomplete of the dashboard.
+
+Author names and their aliases (``Author.aliases``) are normalized (unidecode +
+lowercase) and every suffix that starts at a word boundary is stored in a sorted
+list, so "este" finds "Estévez Pérez, Ana" and "ana" finds it too. Lookups are a
+``bisect`` into that list; the publication counts are precomputed, so a
+suggestion request does not touch the database.
+
+Like the facet index, the index is tagged with the current DataVersion and rebuilt
+when a load command bumps it. The version itself is checked at most once every
+VERSION_CHECK_SECONDS so that fast typing does not query the database either.
+"""
+
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from unidecode import unidecode
+
+from bibliodata.models import Author, DataVersion
+
+VERSION_CHECK_SECONDS = 5
+
+_WORD_START_RE = re.compile(r'(?<![a-z0-9])[a-z0-9]')
+
+
+def normalize(text):
+    """
+    Lowercase ASCII form of a name, with the spacing collapsed.
+    """
+    return ' '.join(unidecode(text or '').lower().split())
+
+
+def _word_suffixes(text):
+    for match in _WORD_START_RE.finditer(text):
+        yield text[match.start():]
+
+
+class AuthorPrefixIndex:
+    """
+    Sorted list of ``(normalized suffix, author position)`` pairs.
+
+    Authors are grouped by name, as the dashboard filters publications by name;
+    the count of a name is the number of distinct publications of those authors.
+    """
+
+    def __init__(self, version, names, counts, keys, owners):
+        self.version = version
+        self.names = names
+        self.counts = counts
+        self.keys = keys
+        self.owners = owners
+
+    @classmethod
+    def build(cls, version):
+        publications = defaultdict(set)
+        for name, pub_id in Author.publications.through.objects.values_list('author__name', 'publication_id'):
+            publications[name].add(pub_id)
+
+        spellings = defaultdict(set)
+        for name, aliases in Author.objects.values_list('name', 'aliases'):
+            if not name:
+                continue
+            spellings[name].add(normalize(name))
+            if isinstance(aliases, list):
+                spellings[name].update(normalize(alias) for alias in aliases if isinstance(alias, str))
+
+        names = sorted(spellings)
+        entries = set()
+        for pos, name in enumerate(names):
+            for spelling in spellings[name]:
+                for suffix in _word_suffixes(spelling):
+                    entries.add((suffix, pos))
+        entries = sorted(entries)
+
+        return cls(
+            version=version,
+            names=names,
+            counts=[len(publications.get(name, ())) for name in names],
+            keys=[key for key, _ in entries],
+            owners=[pos for _, pos in entries],
+        )
+
+    def suggest(self, query, limit=10):
+        """
+        Authors whose name or alias has a word starting with the query.
+
+        Returns:
+            list[dict]: Up to ``limit`` ``{'name', 'count'}`` dicts ordered by
+            publication count (desc) and name, as the dashboard expects.
+        """
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        matches = set()
+        i = bisect_left(self.keys, prefix)
+        while i < len(self.keys) and self.keys[i].startswith(prefix):
+            matches.add(self.owners[i])
+            i += 1
+        best = sorted(matches, key=lambda pos: (-self.counts[pos], self.names[pos]))[:limit]
+        return [{'name': self.names[pos], 'count': self.counts[pos]} for pos in best]
+
+
+_index = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_author_index():
+    """
+    Returns the author index, rebuilding it if a load command changed the data.
+
+    Returns:
+        AuthorPrefixIndex: Index shared by all the requests of this process.
+    """
+    global _index, _checked_at
+    now = time.monotonic()
+    if _index is not None and now - _checked_at < VERSION_CHECK_SECONDS:
+        return _index
+    with _lock:
+        version = DataVersion.current()
+        if _index is None or _index.version != version:
+            _index = AuthorPrefixIndex.build(version)
+        _checked_at = now
+        return _index
+
+
+def warm_up():
+    """
+    Builds the author index at startup. Errors are ignored (e.g. unmigrated database).
+    """
+    try:
+        get_author_index()
+    except Exception:
+        pass
@@ -0,0 +1,268 @@
+"""
+Benchmark of the dashboard API endpoints.
+
+Every scenario is a request to one endpoint of core.views with a representative
+mix of filters (no filters, a year range, an area, an institution and a type,
+an author...), built from the data in the database so that it also works on a
+synthetic corpus (see bibliodata.synthetic). Requests go through the whole
+Django stack with the test client, streamed bodies included, and are measured
+in two modes:
+
+- ``cold``: the dashboard response cache is cleared before every request (the
+  in-process indexes, like the author autocomplete or the graph snapshots, are
+  built once by the warm-up request and stay warm);
+- ``warm``: the response cache is kept, as for repeated requests in production.
+
+For every scenario and mode the report has the p50 / p95 / mean latency of the
+timed runs, and the number of queries (on every database alias), the peak of
+Python memory (tracemalloc) and the response size of one extra run. The report
+is a JSON document with sorted keys, meant to be stored and diffed between
+commits (see ``compare``).
+"""
+
+import json
+import math
+import platform
+import subprocess
+import time
+import tracemalloc
+from contextlib import ExitStack
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.db import connection, connections
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from bibliodata.models import (
+    Author, Collaboration, Institution, Publication, PublicationMetric, PublicationType, ThematicArea,
+)
+from .cache import dashboard_cache
+
+MODES = ('cold', 'warm')
+
+
+class Scenario:
+    """
+    One request of the benchmark.
+
+    Args:
+        name (str): Unique name, ``<endpoint>:<filters>``.
+        url_name (str): Name of the URL pattern in core.urls.
+        params (dict | None): Query parameters (lists for repeated parameters).
+    """
+
+    def __init__(self, name, url_name, params=None):
+        self.name = name
+        self.url = reverse(url_name)
+        if params:
+            self.url += '?' + urlencode(params, doseq=True)
+
+
+def _most_common(model, relation, **filters):
+    """Nombre del objeto con más publicaciones (None si no hay ninguno)."""
+    return (model.objects.filter(**filters).annotate(n=Count(relation)).order_by('-n', 'name')
+            .values_list('name', flat=True).first())
+
+
+def build_scenarios():
+    """
+    Scenarios of every API endpoint with filter values taken from the database.
+    """
+    last_year = Publication.objects.order_by('-year').values_list('year', flat=True).first()
+    if last_year is None:
+        return []
+    area = _most_common(ThematicArea, 'publications')
+    institution = _most_common(Institution, 'publications')
+    pub_type = _most_common(PublicationType, 'publications')
+    author = _most_common(Author, 'publications')
+
+    years = {'year_from': last_year - 4, 'year_to': last_year}
+    area_filters = {**years, 'areas': [area]}
+    mixed = {'year_from': last_year - 9, 'year_to': last_year, 'institutions': [institution], 'types': [pub_type]}
+    by_author = {'author': author}
+
+    scenarios = [
+        Scenario('filters:none', 'get_filter_data'),
+        Scenario('filters:years', 'get_filter_data', years),
+        Scenario('filters:area', 'get_filter_data', area_filters),
+
+        Scenario('data:none', 'get_filtered_data'),
+        Scenario('data:years_monthly', 'get_filtered_data', {**years, 'view_type': 'monthly'}),
+        Scenario('data:area', 'get_filtered_data', area_filters),
+        Scenario('data:institution_type_predicted', 'get_filtered_data', {**mixed, 'include_predicted_areas': 'true'}),
+
+        Scenario('publications:none', 'get_publications_data'),
+        Scenario('publications:page_50', 'get_publications_data', {'page': 50}),
+        Scenario('publications:sort_wos_citations', 'get_publications_data', {'sort_by': 'WoS Citations'}),
+        Scenario('publications:area_sort_rcr', 'get_publications_data', {**area_filters, 'sort_by': 'RCR', 'sort_order': 'asc'}),
+        Scenario('publications:institution_type', 'get_publications_data', mixed),
+
+        Scenario('network:ips', 'get_collaboration_network'),
+        Scenario('network:full', 'get_collaboration_network', {'fullNetwork': 'true'}),
+        Scenario('network:full_reduced', 'get_collaboration_network', {'fullNetwork': 'true', 'minWeight': 2, 'topN': 300}),
+        Scenario('network:full_aggregated', 'get_collaboration_network', {'fullNetwork': 'true', 'aggregate': 'lovaina'}),
+        Scenario('network:keywords_global', 'get_collaboration_network', {'fullNetwork': 'true', 'communityView': 'keywords', 'globalMode': 'true', 'topK': 10}),
+
+        Scenario('search:text', 'search_publications', {'q': 'proteína respuesta inmune'}),
+
+        Scenario('export:csv_years', 'export_report', {**years, 'format': 'csv'}),
+    ]
+    # Sin autores con publicaciones (p. ej. un corpus recién cargado) no hay escenarios de autor
+    if author is not None:
+        scenarios += [
+            Scenario('filters:author', 'get_filter_data', by_author),
+            Scenario('data:author', 'get_filtered_data', by_author),
+            Scenario('publications:author', 'get_publications_data', by_author),
+            Scenario('network:author', 'get_collaboration_network', by_author),
+            Scenario('search:author', 'search_publications', by_author),
+            Scenario('search_authors:prefix', 'get_author_suggestions', {'q': author[:3]}),
+            Scenario('author_metrics:author', 'get_author_metrics', {'author_id': author}),
+            Scenario('export:bibtex_author', 'export_report', {**by_author, 'format': 'bibtex'}),
+        ]
+    return scenarios
+
+
+def percentile(values, p):
+    """Percentil ``p`` (0-100) por rango más cercano."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def _host():
+    """Host aceptado por ALLOWED_HOSTS para las peticiones del cliente de pruebas."""
+    for host in settings.ALLOWED_HOSTS:
+        if host != '*':
+            return host.lstrip('.')
+    return 'localhost'
+
+
+class Benchmark:
+    """
+    Runs the scenarios with a logged-in test client.
+
+    Args:
+        user: User the requests are made as.
+        repeat (int): Timed requests per scenario and mode.
+        warmup (int): Untimed requests before the timed ones.
+        modes (tuple[str]): Subset of MODES.
+        log (callable | None): Called with the name and the result of every scenario.
+    """
+
+    def __init__(self, user, repeat=10, warmup=1, modes=MODES, log=None):
+        # Como un navegador: las respuestas comprimidas por GZipMiddleware cuentan en el tiempo y el tamaño
+        # Los errores de una vista se registran como respuestas 500 en lugar de interrumpir la medición
+        self.client = Client(raise_request_exception=False, HTTP_HOST=_host(), HTTP_ACCEPT_ENCODING='gzip')
+        self.client.force_login(user)
+        self.repeat = repeat
+        self.warmup = warmup
+        self.modes = modes
+        self.log = log or (lambda name, result: None)
+
+    def _request(self, url, cold):
+        """Una petición completa (cuerpo en streaming incluido): (respuesta, cuerpo)."""
+        if cold:
+            dashboard_cache().clear()
+        response = self.client.get(url, secure=True)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def measure(self, scenario, mode):
+        cold = mode == 'cold'
+        for _ in range(self.warmup):
+            self._request(scenario.url, cold)
+
+        timings = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            self._request(scenario.url, cold)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        # Consultas, memoria y tamaño en una petición aparte (tracemalloc ralentiza la ejecución)
+        # Las consultas se cuentan en todos los alias (p. ej. el de solo lectura de core.routers)
+        tracemalloc.start()
+        try:
+            with ExitStack() as stack:
+                captures = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+                response, body = self._request(scenario.url, cold)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'status': response.status_code,
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'mean_ms': round(sum(timings) / len(timings), 2),
+            'queries': sum(len(queries) for queries in captures),
+            'peak_memory_kb': round(peak / 1024),
+            'bytes': len(body),
+        }
+
+    def run(self, scenarios):
+        """
+        Returns:
+            dict: Report with the ``meta`` data of the run and the ``endpoints`` results.
+        """
+        endpoints = {}
+        for scenario in scenarios:
+            result = {'url': scenario.url}
+            for mode in self.modes:
+                result[mode] = self.measure(scenario, mode)
+            endpoints[scenario.name] = result
+            self.log(scenario.name, result)
+        return {'meta': self.meta(), 'endpoints': endpoints}
+
+    def meta(self):
+        try:
+            commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                    cwd=settings.BASE_DIR, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'commit': commit,
+            'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'database': connection.vendor,
+            'debug': settings.DEBUG,
+            'request_profiling': settings.REQUEST_PROFILING,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'repeat': self.repeat,
+            'warmup': self.warmup,
+            'corpus': {
+                'publications': Publication.objects.count(),
+                'authors': Author.objects.count(),
+                'publication_metrics': PublicationMetric.objects.count(),
+                'collaborations': Collaboration.objects.count(),
+            },
+        }
+
+
+def write_report(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write('\n')
+
+
+def compare(report, baseline):
+    """
+    Relative change of the p50 latency and of the queries of every scenario present in both reports.
+
+    Returns:
+        list[tuple]: ``(name, mode, p50 before, p50 after, ratio, queries before, queries after)``.
+    """
+    rows = []
+    for name, result in report['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(name)
+        if previous is None:
+            continue
+        for mode in MODES:
+            if mode in result and mode in previous:
+                before, after = previous[mode], result[mode]
+                ratio = after['p50_ms'] / before['p50_ms'] if before['p50_ms'] else None
+                rows.append((name, mode, before['p50_ms'], after['p50_ms'], ratio, before['queries'], after['queries']))
+    return rows
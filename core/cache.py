@@ -0,0 +1,68 @@
+"""
+Versioned response cache for the dashboard JSON endpoints.
+
+The data behind the dashboard only changes when a ``load_*`` command runs, and
+every one of them bumps bibliodata.DataVersion. Responses are therefore cached
+under a key made of the view name, the data version and the normalized request
+parameters, with no expiry: a new load simply makes the old keys unreachable and
+the size-bounded backend (see CACHES['dashboard'] in settings) evicts them.
+"""
+
+from functools import wraps
+
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from bibliodata.models import DataVersion
+from .pagination import filters_fingerprint
+
+
+def dashboard_cache():
+    """
+    Returns the cache backend used for the dashboard responses.
+    """
+    return caches['dashboard']
+
+
+def versioned_key(prefix, params, version=None, exclude=()):
+    """
+    Cache key for a set of request parameters under the current data version.
+
+    Args:
+        prefix (str): Namespace of the cached value (usually the view name).
+        params (QueryDict): Request parameters; order and empty values are ignored.
+        version (int | None): Data version (read from the database if omitted).
+        exclude (tuple[str]): Parameters that do not change the cached value.
+
+    Returns:
+        str: Cache key.
+    """
+    if version is None:
+        version = DataVersion.current()
+    return f'{prefix}:v{version}:{filters_fingerprint(params, exclude=exclude)}'
+
+
+def cached_json_response(view_func):
+    """
+    Decorator that caches the successful responses of a GET JSON view.
+
+    Only 200 responses are stored; errors are always recomputed. Responses that
+    carry their own ETag (served from a precomputed snapshot) and streaming
+    responses (whose body is never held in memory) are not stored either.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        store = dashboard_cache()
+        key = versioned_key(view_func.__name__, request.GET)
+        cached = store.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = view_func(request, *args, **kwargs)
+        if response.status_code != 200 or response.has_header('ETag') or response.streaming:
+            return response
+        store.set(key, (response.content, response['Content-Type']))
+        return response
+    return wrapper
+
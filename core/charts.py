@@ -0,0 +1,203 @@
+"""
+Charts of the PDF report, drawn on the server with ReportLab graphics.
+
+The report used to embed PNG captures of the dashboard charts rasterized and
+uploaded by the browser. The same charts are now drawn here as vector graphics
+from the aggregates of the dashboard (see core.aggregates):
+
+- ``chart_series`` computes the timeline and thematic-area series of a filter
+  set, cached under the data version like the dashboard responses;
+- ``timeline_drawing``, ``pie_drawing`` and ``bar_drawing`` turn them into
+  Drawings (flowables) with the dashboard colours.
+"""
+
+from django.utils.datastructures import MultiValueDict
+from django.utils.translation import gettext as _, gettext_lazy
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.legends import Legend
+from reportlab.graphics.charts.lineplots import LinePlot
+from reportlab.graphics.charts.piecharts import Pie
+from reportlab.graphics.shapes import Drawing
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+
+from .aggregates import filter_publications, timeline_counts, area_counts
+from .cache import dashboard_cache, versioned_key
+
+CHART_WIDTH = 18*cm
+CHART_HEIGHT = 9*cm
+
+# Paleta d3.schemeCategory10, la de los gráficos del dashboard
+CATEGORY10 = [colors.HexColor(c) for c in (
+    '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+    '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf',
+)]
+TIMELINE_LINE = colors.HexColor('#2196f3')
+TIMELINE_FILL = colors.HexColor('#e3f2fd')
+
+# Perezosas: se traducen al dibujar, en el idioma del informe (translation.override del worker)
+SHORT_MONTHS = [gettext_lazy(month) for month in (
+    'Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun', 'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic',
+)]
+MAX_TICKS = 12
+LEGEND_LABEL_LENGTH = 45
+
+CHART_FILTERS = ('year_from', 'year_to', 'areas', 'institutions', 'types', 'author')
+
+
+def chart_series(params, view_type='yearly', include_predicted_areas=False):
+    """
+    Timeline and thematic-area series of the report filters.
+
+    Args:
+        params (dict): Report parameters (see core.reports.report_params).
+        view_type (str): yearly | monthly | quarterly.
+        include_predicted_areas (bool): Add the AI-predicted areas to the counts.
+
+    Returns:
+        dict: ``timeline``, ``timeline_info`` and ``areas``, as returned to the dashboard.
+    """
+    filters = MultiValueDict({
+        name: params[name] if isinstance(params[name], list) else [params[name]]
+        for name in CHART_FILTERS
+    })
+    filters.setlist('view_type', [view_type])
+    filters.setlist('include_predicted_areas', ['true' if include_predicted_areas else ''])
+
+    store = dashboard_cache()
+    key = versioned_key('report_charts', filters)
+    series = store.get(key)
+    if series is None:
+        query = filter_publications(*(params[name] for name in CHART_FILTERS))
+        timeline, timeline_info = timeline_counts(query, params['year_from'], params['year_to'], view_type)
+        series = {
+            'timeline': timeline,
+            'timeline_info': timeline_info,
+            'areas': area_counts(query, include_predicted_areas),
+        }
+        store.set(key, series)
+    return series
+
+
+def _period_label(item, view_type, single_year):
+    """Etiqueta de un periodo del eje X, como en el dashboard."""
+    if view_type == 'yearly':
+        return str(item['year'])
+    if view_type == 'monthly':
+        period = str(SHORT_MONTHS[item['month'] - 1])
+    else:
+        period = _('T%(quarter)s') % {'quarter': item['quarter']}
+    return period if single_year else f"{period} {item['year']}"
+
+
+def timeline_drawing(timeline, view_type='yearly'):
+    """
+    Area chart of the publications per period (None if the timeline is empty).
+    """
+    if not timeline:
+        return None
+    single_year = timeline[0]['year'] == timeline[-1]['year']
+    labels = [_period_label(item, view_type, single_year) for item in timeline]
+
+    drawing = Drawing(CHART_WIDTH, CHART_HEIGHT)
+    plot = LinePlot()
+    plot.x, plot.y = 1.5*cm, 1.5*cm
+    plot.width, plot.height = CHART_WIDTH - 2*cm, CHART_HEIGHT - 2*cm
+    plot.data = [[(i, item['count']) for i, item in enumerate(timeline)]]
+    plot.lines[0].strokeColor = TIMELINE_LINE
+    plot.lines[0].strokeWidth = 2
+    plot.lines[0].fillColor = TIMELINE_FILL
+    plot.lines[0].inFill = True
+
+    # Como mucho unas 12 marcas, siempre sobre periodos enteros
+    step = max(1, -(-len(timeline) // MAX_TICKS))
+    plot.xValueAxis.valueMin = 0
+    plot.xValueAxis.valueMax = max(len(timeline) - 1, 1)
+    plot.xValueAxis.valueSteps = list(range(0, len(timeline), step))
+    plot.xValueAxis.labelTextFormat = lambda value: labels[int(value)] if int(value) < len(labels) else ''
+    plot.xValueAxis.labels.fontName = 'Helvetica'
+    plot.xValueAxis.labels.fontSize = 8
+    plot.yValueAxis.valueMin = 0
+    plot.yValueAxis.labels.fontName = 'Helvetica'
+    plot.yValueAxis.labels.fontSize = 8
+    plot.yValueAxis.visibleGrid = True
+    plot.yValueAxis.gridStrokeColor = colors.lightgrey
+    drawing.add(plot)
+    return drawing
+
+
+def _areas(areas):
+    """Áreas con nombre (el dashboard descarta la fila sin área) y su color."""
+    areas = [area for area in areas if area['thematic_areas__name'] is not None]
+    return areas, [CATEGORY10[i % len(CATEGORY10)] for i in range(len(areas))]
+
+
+def _legend(areas, palette, x, y):
+    legend = Legend()
+    legend.x, legend.y = x, y
+    legend.boxAnchor = 'w'
+    legend.alignment = 'right'
+    legend.fontName = 'Helvetica'
+    legend.fontSize = 7
+    legend.deltay = 10
+    legend.columnMaximum = 16
+    legend.colorNamePairs = [
+        (color, f"{_short(area['thematic_areas__name'])} ({area['count']})")
+        for area, color in zip(areas, palette)
+    ]
+    return legend
+
+
+def _short(name):
+    return name if len(name) <= LEGEND_LABEL_LENGTH else name[:LEGEND_LABEL_LENGTH - 1] + '…'
+
+
+def pie_drawing(areas):
+    """
+    Pie chart of the thematic areas with a legend (None if there are no areas).
+    """
+    areas, palette = _areas(areas)
+    if not areas:
+        return None
+    drawing = Drawing(CHART_WIDTH, CHART_HEIGHT)
+    pie = Pie()
+    size = CHART_HEIGHT - 1*cm
+    pie.x, pie.y = 0.5*cm, 0.5*cm
+    pie.width = pie.height = size
+    pie.data = [area['count'] for area in areas]
+    pie.sideLabels = False
+    pie.slices.strokeColor = colors.white
+    pie.slices.strokeWidth = 0.5
+    for i, color in enumerate(palette):
+        pie.slices[i].fillColor = color
+    drawing.add(pie)
+    drawing.add(_legend(areas, palette, size + 1.5*cm, CHART_HEIGHT / 2))
+    return drawing
+
+
+def bar_drawing(areas):
+    """
+    Bar chart of the thematic areas with a legend (None if there are no areas).
+    """
+    areas, palette = _areas(areas)
+    if not areas:
+        return None
+    drawing = Drawing(CHART_WIDTH, CHART_HEIGHT)
+    chart = VerticalBarChart()
+    chart.x, chart.y = 1.5*cm, 0.7*cm
+    chart.width, chart.height = CHART_WIDTH / 2 - 1.5*cm, CHART_HEIGHT - 1.2*cm
+    chart.data = [[area['count'] for area in areas]]
+    chart.categoryAxis.categoryNames = [''] * len(areas)
+    chart.barSpacing = 0
+    chart.groupSpacing = 2
+    chart.bars.strokeColor = None
+    for i, color in enumerate(palette):
+        chart.bars[(0, i)].fillColor = color
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.labels.fontName = 'Helvetica'
+    chart.valueAxis.labels.fontSize = 8
+    chart.valueAxis.visibleGrid = True
+    chart.valueAxis.gridStrokeColor = colors.lightgrey
+    drawing.add(chart)
+    drawing.add(_legend(areas, palette, CHART_WIDTH / 2 + 0.5*cm, CHART_HEIGHT / 2))
+    return drawing
@@ -0,0 +1,308 @@
+"""
+Tabular and bibliographic exports of the filtered publications.
+
+The publication ids are read with a chunked ``iterator()`` and every chunk is
+serialized with its relations and latest metrics (see core.serializers), so an
+export costs a constant amount of memory whatever the number of publications:
+
+- CSV, BibTeX and RIS are text formats written row by row straight into a
+  StreamingHttpResponse, so the download starts with the first chunk;
+- XLSX (openpyxl) and Parquet (pyarrow) need their writer to finish the file
+  (zip directory, parquet footer) before it can be sent: rows are written by
+  chunks to a temporary file on disk, which is then streamed. Both packages are
+  optional; without them the format is reported as unavailable.
+"""
+
+import csv
+import tempfile
+import unicodedata
+from itertools import islice
+
+from django.http import FileResponse, StreamingHttpResponse
+
+from .metrics import LATEST_METRICS
+from .serializers import serialize_publications
+
+try:
+    import openpyxl
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+except ImportError:  # openpyxl es opcional: sin él no se ofrece XLSX
+    openpyxl = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow es opcional: sin él no se ofrece Parquet
+    pa = pq = None
+
+EXPORT_CHUNK = 1000
+EXPORT_FILENAME = 'Bibliometria_IPBLN_Publicaciones'
+
+# Formato -> (extensión, content type)
+EXPORT_FORMATS = {
+    'csv': ('csv', 'text/csv; charset=utf-8'),
+    'xlsx': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'bibtex': ('bib', 'application/x-bibtex; charset=utf-8'),
+    'ris': ('ris', 'application/x-research-info-systems; charset=utf-8'),
+}
+
+PUBLICATION_FIELDS = (
+    'title', 'year', 'publication_date', 'publication_type', 'doi', 'source', 'editorial',
+    'language', 'citations', 'international_collab', 'title_link', 'keywords_all',
+    'isbn', 'issns', 'other_authors', 'abstract',
+)
+PUBLICATION_RELATIONS = ('authors', 'institutions', 'areas')
+
+# Columnas de las exportaciones tabulares: (cabecera, clave de la publicación, tipo)
+COLUMNS = [
+    ('id', 'id', 'int'),
+    ('title', 'title', 'text'),
+    ('year', 'year', 'int'),
+    ('publication_date', 'publication_date', 'text'),
+    ('publication_type', 'publication_type', 'list'),
+    ('doi', 'doi', 'list'),
+    ('source', 'source', 'text'),
+    ('editorial', 'editorial', 'text'),
+    ('language', 'language', 'text'),
+    ('authors', 'authors', 'list'),
+    ('other_authors', 'other_authors', 'list'),
+    ('institutions', 'institutions', 'list'),
+    ('thematic_areas', 'areas', 'list'),
+    ('keywords', 'keywords_all', 'list'),
+    ('isbn', 'isbn', 'list'),
+    ('issn', 'issns', 'list'),
+    ('citations', 'citations', 'int'),
+    ('international_collab', 'international_collab', 'float'),
+    ('link', 'title_link', 'text'),
+]
+METRIC_COLUMNS = [(key, f'{key} year') for key in LATEST_METRICS]
+
+
+def iter_publications(query, chunk_size=EXPORT_CHUNK):
+    """
+    Yields the serialized publications of a queryset, one chunk at a time.
+
+    Args:
+        query (QuerySet): Filtered and ordered publications.
+        chunk_size (int): Publications read and serialized together.
+    """
+    ids = query.values_list('id', flat=True).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(ids, chunk_size))
+        if not chunk:
+            break
+        yield from serialize_publications(chunk, fields=PUBLICATION_FIELDS, relations=PUBLICATION_RELATIONS, metrics=True)
+
+
+def _as_list(value):
+    """Valores de un campo JSON que puede ser una lista, un valor suelto o nulo."""
+    if value is None or value == '':
+        return []
+    if isinstance(value, list):
+        return [str(v) for v in value if v not in (None, '')]
+    return [str(value)]
+
+
+def _cell(pub, key, kind):
+    value = pub.get(key)
+    if kind == 'list':
+        return '; '.join(_as_list(value))
+    return value
+
+
+def header():
+    return [name for name, _, _ in COLUMNS] + [name for pair in METRIC_COLUMNS for name in pair]
+
+
+def row(pub):
+    """Fila tabular de una publicación: columnas de COLUMNS y valor / año de cada métrica."""
+    values = [_cell(pub, key, kind) for _, key, kind in COLUMNS]
+    for key in LATEST_METRICS:
+        metric = pub['metrics'].get(key)
+        values += [metric['value'], metric['year']] if metric else [None, None]
+    return values
+
+
+# === Formatos de texto (streaming) ===
+
+class _Echo:
+    """Pseudo-fichero para csv.writer: devuelve la línea en lugar de escribirla."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(publications):
+    writer = csv.writer(_Echo())
+    # BOM para que Excel detecte UTF-8
+    yield '\ufeff' + writer.writerow(header())
+    for pub in publications:
+        yield writer.writerow(['' if value is None else value for value in row(pub)])
+
+
+def _entry_kind(pub):
+    """Tipo bibliográfico (article, book, chapter, conference, misc) según los tipos de la publicación."""
+    types = ' '.join(_as_list(pub.get('publication_type')))
+    types = unicodedata.normalize('NFKD', types).encode('ascii', 'ignore').decode('ascii').lower()
+    if 'capitulo' in types or 'chapter' in types:
+        return 'chapter'
+    if 'congreso' in types or 'conferen' in types or 'proceedings' in types:
+        return 'conference'
+    if 'libro' in types or 'book' in types:
+        return 'book'
+    if 'articulo' in types or 'article' in types or 'revis' in types or 'review' in types:
+        return 'article'
+    return 'misc'
+
+
+def _all_authors(pub):
+    return list(dict.fromkeys(pub['authors'] + _as_list(pub.get('other_authors'))))
+
+
+BIBTEX_TYPES = {
+    'article': ('article', 'journal'),
+    'book': ('book', None),
+    'chapter': ('incollection', 'booktitle'),
+    'conference': ('inproceedings', 'booktitle'),
+    'misc': ('misc', 'howpublished'),
+}
+_BIBTEX_SPECIAL = {'\\': r'\textbackslash{}', '{': r'\{', '}': r'\}', '%': r'\%', '&': r'\&',
+                   '#': r'\#', '_': r'\_', '$': r'\$'}
+
+
+def _bibtex_escape(value):
+    return ''.join(_BIBTEX_SPECIAL.get(char, char) for char in str(value))
+
+
+def bibtex_entry(pub):
+    entry_type, source_field = BIBTEX_TYPES[_entry_kind(pub)]
+    fields = [
+        ('title', pub['title']),
+        ('author', ' and '.join(_all_authors(pub))),
+        ('year', pub['year']),
+        (source_field, pub['source'] if source_field else None),
+        ('publisher', pub['editorial']),
+        ('doi', next(iter(_as_list(pub['doi'])), None)),
+        ('isbn', ', '.join(_as_list(pub['isbn']))),
+        ('issn', ', '.join(_as_list(pub['issns']))),
+        ('url', pub['title_link']),
+        ('keywords', ', '.join(_as_list(pub['keywords_all']))),
+        ('language', pub['language']),
+        ('abstract', pub['abstract']),
+    ]
+    lines = [f'@{entry_type}{{ipbln{pub["id"]},']
+    lines += [f'  {name} = {{{_bibtex_escape(value)}}},' for name, value in fields if value not in (None, '')]
+    lines.append('}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def iter_bibtex(publications):
+    for pub in publications:
+        yield bibtex_entry(pub)
+
+
+RIS_TYPES = {'article': 'JOUR', 'book': 'BOOK', 'chapter': 'CHAP', 'conference': 'CONF', 'misc': 'GEN'}
+
+
+def ris_record(pub):
+    def tag(name, value):
+        # Los valores RIS son de una sola línea
+        return f'{name}  - {" ".join(str(value).split())}\r\n'
+
+    kind = _entry_kind(pub)
+    lines = [tag('TY', RIS_TYPES[kind]), tag('TI', pub['title'])]
+    lines += [tag('AU', author) for author in _all_authors(pub)]
+    if pub['year']:
+        lines.append(tag('PY', pub['year']))
+    if pub['publication_date']:
+        lines.append(tag('DA', pub['publication_date']))
+    if pub['source']:
+        lines.append(tag('JO' if kind == 'article' else 'T2', pub['source']))
+    if pub['editorial']:
+        lines.append(tag('PB', pub['editorial']))
+    lines += [tag('DO', doi) for doi in _as_list(pub['doi'])]
+    lines += [tag('SN', number) for number in _as_list(pub['isbn']) + _as_list(pub['issns'])]
+    if pub['title_link']:
+        lines.append(tag('UR', pub['title_link']))
+    lines += [tag('KW', keyword) for keyword in _as_list(pub['keywords_all'])]
+    if pub['language']:
+        lines.append(tag('LA', pub['language']))
+    if pub['abstract']:
+        lines.append(tag('AB', pub['abstract']))
+    lines.append('ER  - \r\n')
+    return ''.join(lines)
+
+
+def iter_ris(publications):
+    for pub in publications:
+        yield ris_record(pub)
+
+
+# === Formatos binarios (fichero temporal) ===
+
+def write_xlsx(publications, file):
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Publicaciones')
+    sheet.append(header())
+    for pub in publications:
+        # openpyxl rechaza los caracteres de control
+        sheet.append([ILLEGAL_CHARACTERS_RE.sub('', value) if isinstance(value, str) else value for value in row(pub)])
+    workbook.save(file)
+
+
+def _parquet_schema():
+    types = {'int': pa.int64(), 'float': pa.float64(), 'text': pa.string(), 'list': pa.list_(pa.string())}
+    fields = [pa.field(name, types[kind]) for name, _, kind in COLUMNS]
+    for value_name, year_name in METRIC_COLUMNS:
+        fields += [pa.field(value_name, pa.float64()), pa.field(year_name, pa.int64())]
+    return pa.schema(fields)
+
+
+def write_parquet(publications, file, chunk_size=EXPORT_CHUNK):
+    schema = _parquet_schema()
+    names = schema.names
+    with pq.ParquetWriter(file, schema) as writer:
+        while True:
+            chunk = list(islice(publications, chunk_size))
+            if not chunk:
+                break
+            records = []
+            for pub in chunk:
+                values = [_as_list(pub.get(key)) if kind == 'list' else pub.get(key) for _, key, kind in COLUMNS]
+                for key in LATEST_METRICS:
+                    metric = pub['metrics'].get(key)
+                    values += [metric['value'], metric['year']] if metric else [None, None]
+                records.append(dict(zip(names, values)))
+            # Un row group por bloque de publicaciones
+            writer.write_table(pa.Table.from_pylist(records, schema=schema))
+
+
+def export_response(format_, query):
+    """
+    Download response with the publications of ``query`` in the given format.
+
+    Raises:
+        ValueError: With a message for the client if the format is unknown or
+        its optional dependency is not installed.
+    """
+    if format_ not in EXPORT_FORMATS:
+        raise ValueError(f"Formato no soportado: {format_}")
+    extension, content_type = EXPORT_FORMATS[format_]
+    filename = f'{EXPORT_FILENAME}.{extension}'
+    publications = iter_publications(query)
+
+    if format_ in ('xlsx', 'parquet'):
+        if format_ == 'xlsx' and openpyxl is None:
+            raise ValueError('La exportación XLSX requiere el paquete openpyxl')
+        if format_ == 'parquet' and pa is None:
+            raise ValueError('La exportación Parquet requiere el paquete pyarrow')
+        file = tempfile.TemporaryFile()
+        (write_xlsx if format_ == 'xlsx' else write_parquet)(publications, file)
+        file.seek(0)
+        return FileResponse(file, as_attachment=True, filename=filename, content_type=content_type)
+
+    writers = {'csv': iter_csv, 'bibtex': iter_bibtex, 'ris': iter_ris}
+    response = StreamingHttpResponse(writers[format_](publications), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
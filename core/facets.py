@@ -0,0 +1,177 @@
+"""
+In-memory facet index for the dashboard filter endpoint.
+
+Every facet value (year, thematic area, institution, publication type and author)
+is stored as a bitset of publications, encoded as a Python int where bit ``i`` is
+set when the i-th publication (ordered by id) has that value. Cross-filter counts
+are then computed with bitwise AND and ``int.bit_count()`` instead of SQL queries.
+
+The index is tagged with the current DataVersion and rebuilt lazily the first time
+it is requested after a load command bumps the version.
+"""
+
+import threading
+from collections import defaultdict
+
+from bibliodata.models import Publication, Author, DataVersion
+
+
+def _to_bitset(positions):
+    """
+    Builds an int bitset with the given bit positions set.
+
+    Args:
+        positions (iterable[int]): Positions of the publications in the index.
+
+    Returns:
+        int: Bitset with one bit per position.
+    """
+    positions = list(positions)
+    if not positions:
+        return 0
+    buffer = bytearray(max(positions) // 8 + 1)
+    for pos in positions:
+        buffer[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def _union(bitsets):
+    mask = 0
+    for bits in bitsets:
+        mask |= bits
+    return mask
+
+
+class FacetIndex:
+    """
+    Bitset index of the publications by year, area, institution, type and author.
+
+    Author bitsets are not materialized (there are too many authors for that);
+    the positions are kept and turned into a bitset only when filtering by author.
+    """
+
+    def __init__(self, version, size, years, areas, institutions, types, authors):
+        self.version = version
+        self.size = size
+        self.all = (1 << size) - 1
+        self.years = years
+        self.areas = areas
+        self.institutions = institutions
+        self.types = types
+        self.authors = authors
+
+    @classmethod
+    def build(cls, version):
+        rows = Publication.objects.order_by('id').values_list('id', 'year')
+        position = {}
+        years = defaultdict(list)
+        for pos, (pub_id, year) in enumerate(rows):
+            position[pub_id] = pos
+            years[year].append(pos)
+
+        def group(through_rows):
+            groups = defaultdict(list)
+            for pub_id, name in through_rows:
+                if name and pub_id in position:
+                    groups[name].append(position[pub_id])
+            return groups
+
+        areas = group(Publication.thematic_areas.through.objects.values_list('publication_id', 'thematicarea__name'))
+        institutions = group(Publication.institutions.through.objects.values_list('publication_id', 'institution__name'))
+        types = group(Publication.publication_types.through.objects.values_list('publication_id', 'publicationtype__name'))
+        authors = group(Author.publications.through.objects.values_list('publication_id', 'author__name'))
+
+        return cls(
+            version=version,
+            size=len(position),
+            years={year: _to_bitset(p) for year, p in years.items()},
+            areas={name: _to_bitset(p) for name, p in areas.items()},
+            institutions={name: _to_bitset(p) for name, p in institutions.items()},
+            types={name: _to_bitset(p) for name, p in types.items()},
+            authors={name: tuple(p) for name, p in authors.items()},
+        )
+
+    def counts(self, year_from=None, year_to=None, areas=None, institutions=None, types=None, author=None):
+        """
+        Computes the counts of every facet under the given filters.
+
+        Each facet is counted with all the filters applied except its own one,
+        so the user can still see the alternatives of the facet being filtered.
+
+        Returns:
+            dict: ``years``, ``areas``, ``institutions`` and ``publication_types``
+            lists in the format expected by the dashboard.
+        """
+        base = self.all
+        if year_from is not None or year_to is not None:
+            low = year_from if year_from is not None else float('-inf')
+            high = year_to if year_to is not None else float('inf')
+            base &= _union(bits for year, bits in self.years.items() if low <= year <= high)
+        if author:
+            base &= _to_bitset(self.authors.get(author, ()))
+
+        area_mask = _union(self.areas.get(a, 0) for a in areas) if areas else None
+        institution_mask = _union(self.institutions.get(i, 0) for i in institutions) if institutions else None
+        type_mask = _union(self.types.get(t, 0) for t in types) if types else None
+
+        def combine(*masks):
+            mask = base
+            for m in masks:
+                if m is not None:
+                    mask &= m
+            return mask
+
+        def count(mask, bitsets):
+            result = []
+            for key, bits in bitsets.items():
+                c = (mask & bits).bit_count()
+                if c:
+                    result.append((key, c))
+            return result
+
+        years_mask = combine(area_mask, institution_mask, type_mask)
+        years = [{'year': y, 'count': c} for y, c in sorted(count(years_mask, self.years))]
+
+        areas_counts = sorted(count(combine(institution_mask, type_mask), self.areas), key=lambda x: (-x[1], x[0]))
+        institutions_counts = sorted(count(combine(area_mask, type_mask), self.institutions), key=lambda x: (-x[1], x[0]))
+        types_counts = sorted(count(combine(area_mask, institution_mask), self.types), key=lambda x: (-x[1], x[0]))
+
+        return {
+            'years': years,
+            'areas': [{'thematic_areas__name': n, 'name': n, 'count': c} for n, c in areas_counts],
+            'institutions': [{'institutions__name': n, 'name': n, 'count': c} for n, c in institutions_counts],
+            'publication_types': [{'publication_type': n, 'count': c} for n, c in types_counts],
+        }
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_facet_index():
+    """
+    Returns the facet index for the current data version, rebuilding it if stale.
+
+    Returns:
+        FacetIndex: Index shared by all the requests of this process.
+    """
+    global _index
+    version = DataVersion.current()
+    index = _index
+    if index is None or index.version != version:
+        with _lock:
+            if _index is None or _index.version != version:
+                _index = FacetIndex.build(version)
+            index = _index
+    return index
+
+
+def warm_up():
+    """
+    Builds the facet index at startup so that the first request does not pay for it.
+    Errors are ignored (e.g. the database has not been migrated yet).
+    """
+    try:
+        get_facet_index()
+    except Exception:
+        pass
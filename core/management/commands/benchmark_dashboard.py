@@ -0,0 +1,61 @@
+import json
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from core.benchmark import MODES, Benchmark, build_scenarios, compare, write_report
+
+
+class Command(BaseCommand):
+    help = "Mide la latencia (p50/p95), las consultas y la memoria de cada endpoint del dashboard y guarda un informe JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='benchmark.json', help='Fichero JSON del informe')
+        parser.add_argument('--repeat', type=int, default=10, help='Peticiones medidas por escenario y modo')
+        parser.add_argument('--warmup', type=int, default=1, help='Peticiones previas sin medir')
+        parser.add_argument('--mode', choices=(*MODES, 'both'), default='both', help='Caché de respuestas vacía (cold), conservada (warm) o ambas')
+        parser.add_argument('--only', help='Solo los escenarios cuyo nombre contiene este texto (ej: publications)')
+        parser.add_argument('--compare', help='Informe JSON anterior con el que comparar los resultados')
+
+    def handle(self, *args, **options):
+        scenarios = [s for s in build_scenarios() if not options['only'] or options['only'] in s.name]
+        if not scenarios:
+            self.stdout.write(self.style.WARNING("⚠️ No hay publicaciones (o escenarios) que medir; genera antes un corpus con generate_synthetic_corpus"))
+            return
+
+        # Usuario temporal para las peticiones autenticadas
+        User = get_user_model()
+        user = User.objects.create_user(email=f'benchmark-{uuid.uuid4().hex[:12]}@example.org', is_active=True)
+        try:
+            def log(name, result):
+                times = ', '.join(f"{mode} p50 {result[mode]['p50_ms']} ms / p95 {result[mode]['p95_ms']} ms" for mode in MODES if mode in result)
+                first = result[next(mode for mode in MODES if mode in result)]
+                self.stdout.write(f"⏱️ {name}: {times} · {first['queries']} consultas · HTTP {first['status']}")
+
+            benchmark = Benchmark(
+                user,
+                repeat=options['repeat'],
+                warmup=options['warmup'],
+                modes=MODES if options['mode'] == 'both' else (options['mode'],),
+                log=log,
+            )
+            report = benchmark.run(scenarios)
+        finally:
+            user.delete()
+
+        write_report(report, options['output'])
+        failed = [name for name, result in report['endpoints'].items()
+                  if any(result[mode]['status'] != 200 for mode in MODES if mode in result)]
+        if failed:
+            self.stdout.write(self.style.WARNING(f"⚠️ Respuestas distintas de 200: {', '.join(failed)}"))
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as f:
+                baseline = json.load(f)
+            self.stdout.write(f"\n📊 Comparación con {options['compare']} ({baseline['meta'].get('commit')}):")
+            for name, mode, before, after, ratio, queries_before, queries_after in compare(report, baseline):
+                change = f"{(ratio - 1) * 100:+.0f}%" if ratio is not None else "-"
+                self.stdout.write(f"  {name} [{mode}]: {before} → {after} ms ({change}), consultas {queries_before} → {queries_after}")
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Informe guardado en {options['output']} ({len(scenarios)} escenarios)"))
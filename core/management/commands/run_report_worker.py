@@ -0,0 +1,52 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.reports import claim_next_job, purge_reports, run_job
+
+# Segundos entre purgas mientras el worker está en marcha
+PURGE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = "Genera en segundo plano los informes PDF solicitados desde el dashboard"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Procesa los informes pendientes y termina')
+        parser.add_argument('--interval', type=float, default=2.0, help='Segundos entre consultas de la cola cuando está vacía')
+        parser.add_argument(
+            '--purge-older-than', type=float, metavar='DAYS',
+            help='Borra los informes (trabajos, PDF y capturas) con más de DAYS días; al iniciar y cada hora',
+        )
+
+    def purge(self, days):
+        jobs, files = purge_reports(timedelta(days=days))
+        if jobs or files:
+            self.stdout.write(f"🧹 Informes purgados: {jobs} trabajos, {files} ficheros")
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS("🖨️ Worker de informes iniciado"))
+        purge_days = options['purge_older_than']
+        last_purge = None
+        processed = 0
+        while True:
+            if purge_days is not None and (last_purge is None or time.monotonic() - last_purge >= PURGE_INTERVAL):
+                self.purge(purge_days)
+                last_purge = time.monotonic()
+
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+                continue
+
+            self.stdout.write(f"📄 Generando informe {job.token}...")
+            if run_job(job):
+                self.stdout.write(self.style.SUCCESS(f"✅ Informe {job.token} generado"))
+            else:
+                self.stdout.write(self.style.WARNING(f"⚠️ Falló el informe {job.token}"))
+            processed += 1
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Informes procesados: {processed}"))
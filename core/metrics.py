@@ -0,0 +1,77 @@
+"""
+Latest bibliometric indicators of the publications, computed in the database.
+
+A publication can have one PublicationMetric row per (source, metric_type, year);
+the dashboard always shows the most recent one. This module exposes that
+"latest metric" projection both as a Subquery annotation (to ORDER BY it) and as
+a grouped bulk fetch (to return the metric columns of a page of publications).
+"""
+
+from django.db.models import OuterRef, Subquery, FloatField, Value
+from django.db.models.functions import Coalesce
+
+from bibliodata.models import PublicationMetric
+
+# Columnas de métricas del dashboard: clave mostrada -> (source, metric_type)
+LATEST_METRICS = {
+    'Dimensions Citations': ('dimensions', 'citations'),
+    'WoS Citations': ('wos', 'citations'),
+    'Scopus Citations': ('scopus', 'citations'),
+    'FCR': ('dimensions', 'fcr'),
+    'RCR': ('dimensions', 'rcr'),
+}
+
+
+def latest_metric_value(key, missing=-1.0):
+    """
+    Subquery expression with the value of the latest metric of a publication.
+
+    Args:
+        key (str): One of the LATEST_METRICS keys.
+        missing (float): Value used when the publication has no such metric,
+            so that it sorts after (desc) or before (asc) every real value.
+
+    Returns:
+        Expression: Expression usable in annotate() and order_by().
+    """
+    source, metric_type = LATEST_METRICS[key]
+    latest = PublicationMetric.objects.filter(
+        publication=OuterRef('pk'),
+        source=source,
+        metric_type=metric_type,
+    ).order_by('-year').values('impact_factor')[:1]
+    return Coalesce(Subquery(latest, output_field=FloatField()), Value(missing), output_field=FloatField())
+
+
+def latest_metrics(publication_ids, keys=None):
+    """
+    Fetches the latest metrics of many publications in a single query.
+
+    Args:
+        publication_ids (iterable[int]): Publications to fetch.
+        keys (iterable[str] | None): LATEST_METRICS keys to include (all by default).
+
+    Returns:
+        dict: ``{publication_id: {key: {'value': ..., 'year': ...}}}``. Publications
+        without any metric are missing from the dict.
+    """
+    keys = list(keys or LATEST_METRICS)
+    by_pair = {LATEST_METRICS[k]: k for k in keys}
+    rows = PublicationMetric.objects.filter(
+        publication_id__in=list(publication_ids),
+        source__in={s for s, _ in by_pair},
+        metric_type__in={m for _, m in by_pair},
+    ).order_by('publication_id', 'source', 'metric_type', '-year').values_list(
+        'publication_id', 'source', 'metric_type', 'year', 'impact_factor'
+    )
+
+    result = {}
+    for pub_id, source, metric_type, year, value in rows:
+        key = by_pair.get((source, metric_type))
+        if key is None:
+            continue
+        metrics = result.setdefault(pub_id, {})
+        # Las filas llegan ordenadas por año descendente: la primera es la más reciente
+        if key not in metrics:
+            metrics[key] = {'value': value, 'year': year}
+    return {pub_id: {k: metrics[k] for k in keys if k in metrics} for pub_id, metrics in result.items()}
@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-18 11:34
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.UUIDField(default=uuid.uuid4, editable=False, unique=True, verbose_name='Public token')),
+                ('key', models.CharField(db_index=True, max_length=64, verbose_name='Deduplication key')),
+                ('params', models.JSONField(verbose_name='Report parameters')),
+                ('language', models.CharField(max_length=10, verbose_name='Language')),
+                ('site_url', models.CharField(max_length=255, verbose_name='Site URL')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10, verbose_name='Status')),
+                ('progress', models.PositiveSmallIntegerField(default=0, verbose_name='Progress (%)')),
+                ('message', models.CharField(blank=True, max_length=255, verbose_name='Progress message')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='report_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Report job',
+                'verbose_name_plural': 'Report jobs',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='core_report_status_f898a4_idx')],
+            },
+        ),
+    ]
@@ -1,3 +1,56 @@
+import uuid
+
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+
+class ReportJob(models.Model):
+    """
+    PDF report requested from the dashboard and rendered by run_report_worker.
+
+    Fields:
+        - token: Public identifier used by the status and download endpoints.
+        - key: Deduplication key (parameters, language, links and data version);
+          identical requests are served by the same job and PDF.
+        - params: Report parameters (filters and digests of the uploaded chart images, see core.reports).
+        - language: Language the report is rendered in.
+        - site_url: Absolute URL of the site, for the links of the report.
+        - status / progress / message: State of the rendering, polled by the dashboard.
+        - error: Error message if the rendering failed.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    token = models.UUIDField("Public token", default=uuid.uuid4, unique=True, editable=False)
+    key = models.CharField("Deduplication key", max_length=64, db_index=True)
+    params = models.JSONField("Report parameters")
+    language = models.CharField("Language", max_length=10)
+    site_url = models.CharField("Site URL", max_length=255)
+
+    status = models.CharField("Status", max_length=10, choices=STATUSES, default=PENDING)
+    progress = models.PositiveSmallIntegerField("Progress (%)", default=0)
+    message = models.CharField("Progress message", max_length=255, blank=True)
+    error = models.TextField("Error", blank=True)
+
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="report_jobs")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Report job"
+        verbose_name_plural = "Report jobs"
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.token} | {self.status} ({self.progress}%)"
@@ -0,0 +1,93 @@
+"""
+Keyset (cursor) pagination helpers for the dashboard listings.
+
+A cursor is an opaque, URL-safe token that stores the sort key of the last row
+of a page, the page number and a fingerprint of the filters it was issued for.
+The next page is then read with a WHERE on the sort key instead of an OFFSET,
+so deep pages cost the same as the first one.
+"""
+
+import base64
+import hashlib
+import json
+
+from django.db.models import Q
+
+
+def filters_fingerprint(params, exclude=('page', 'cursor')):
+    """
+    Stable fingerprint of a set of query parameters.
+
+    Args:
+        params (QueryDict): Request parameters.
+        exclude (tuple[str]): Parameters that do not change the result set.
+
+    Returns:
+        str: Short hex digest, identical for the same filters in any order.
+    """
+    normalized = sorted(
+        (key, sorted(v for v in params.getlist(key) if v))
+        for key in params.keys() if key not in exclude
+    )
+    normalized = [(key, values) for key, values in normalized if values]
+    return hashlib.sha1(json.dumps(normalized, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+
+def encode_cursor(values, last_id, page, fingerprint):
+    """
+    Builds the opaque cursor that points right after the given row.
+
+    Args:
+        values (list): Sort key values of the last row (JSON serializable).
+        last_id (int): Primary key of the last row (final tie-breaker).
+        page (int): Page number of the page that ends in this row.
+        fingerprint (str): filters_fingerprint() of the request.
+
+    Returns:
+        str: URL-safe token.
+    """
+    payload = json.dumps({'v': values, 'id': last_id, 'page': page, 'f': fingerprint}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, fingerprint):
+    """
+    Decodes a cursor built by encode_cursor().
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for other filters.
+
+    Returns:
+        dict: ``{'v': [...], 'id': int, 'page': int}``.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        values, last_id, page = data['v'], int(data['id']), int(data['page'])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError('Malformed cursor')
+    if data.get('f') != fingerprint:
+        raise ValueError('Cursor issued for different filters')
+    return {'v': values, 'id': last_id, 'page': page}
+
+
+def keyset_filter(fields, values, last_id):
+    """
+    WHERE condition that selects the rows after the cursor position.
+
+    Args:
+        fields (list[tuple[str, bool]]): Sort fields as ``(name, descending)``,
+            in order. The primary key (ascending) is always the last tie-breaker.
+        values (list): Values of ``fields`` in the last row of the previous page.
+        last_id (int): Primary key of that row.
+
+    Returns:
+        Q: ``(f1 after v1) OR (f1 = v1 AND f2 after v2) OR ... OR (all equal AND id > last_id)``.
+    """
+    condition = Q()
+    equal = {}
+    for (name, descending), value in zip(fields, values):
+        lookup = f'{name}__lt' if descending else f'{name}__gt'
+        condition |= Q(**equal, **{lookup: value})
+        equal[name] = value
+    return condition | Q(**equal, id__gt=last_id)
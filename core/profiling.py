@@ -0,0 +1,278 @@
+"""
+Per-request SQL and timing instrumentation.
+
+With REQUEST_PROFILING enabled, ``RequestProfilingMiddleware`` records for every
+request the SQL statements run on any database alias (through an execute
+wrapper), the time spent in the view and the time spent encoding JSON (reported
+by core.responses through ``timed``). It then:
+
+- adds a ``Server-Timing`` header (``db``, ``view``, ``serialize``, ``slowest``)
+  that the browser developer tools show next to the request. Streaming responses
+  generate their body after the headers are sent, so the header only covers the
+  work done in the view;
+- once the body has been sent, appends a summary to a rolling in-memory log
+  (REQUEST_PROFILE_LOG_SIZE entries per process) with the slowest statements and
+  the statements repeated REQUEST_PROFILE_REPEATED times or more (N+1 patterns).
+  Superusers read it at the ``request_profiles`` debug endpoint;
+- if REQUEST_PROFILE_EXPLAIN_MS is set, captures the plan of the SELECT
+  statements slower than that threshold (EXPLAIN QUERY PLAN on SQLite, EXPLAIN
+  on PostgreSQL).
+
+The middleware must be the last one of MIDDLEWARE, so that ``view`` is measured
+right around the view function.
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from itertools import count
+
+from django.conf import settings
+from django.db import DatabaseError, NotSupportedError, connections
+
+SQL_PREVIEW_LENGTH = 2000
+
+_current = ContextVar('request_profile', default=None)
+_log = deque(maxlen=getattr(settings, 'REQUEST_PROFILE_LOG_SIZE', 200))
+_log_lock = threading.Lock()
+_ids = count(1)
+_whitespace_re = re.compile(r'\s+')
+# Solo se explican las consultas de lectura
+_select_re = re.compile(r'\s*(SELECT|WITH)\b', re.IGNORECASE)
+
+
+def profiling_exempt(view_func):
+    """
+    Marks a view whose requests are not recorded (like the debug endpoint itself).
+    """
+    view_func.profiling_exempt = True
+    return view_func
+
+
+def add_timing(name, seconds):
+    """
+    Adds ``seconds`` to the named timing of the request being profiled, if any.
+    """
+    profile = _current.get()
+    if profile is not None:
+        profile.timings[name] = profile.timings.get(name, 0.0) + seconds
+
+
+@contextmanager
+def timed(name):
+    """Mide el bloque y lo suma a la métrica ``name`` de la petición en curso."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_timing(name, time.perf_counter() - start)
+
+
+def recent_profiles(limit=None):
+    """
+    Summaries of the last profiled requests of this process, newest first.
+    """
+    with _log_lock:
+        entries = list(_log)
+    entries.reverse()
+    return entries[:limit] if limit else entries
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+def _preview(sql):
+    sql = _whitespace_re.sub(' ', sql).strip()
+    return sql if len(sql) <= SQL_PREVIEW_LENGTH else sql[:SQL_PREVIEW_LENGTH] + '…'
+
+
+class _QueryRecorder:
+    """Execute wrapper que anota cada sentencia de un alias en el perfil de la petición."""
+
+    def __init__(self, profile, alias):
+        self.profile = profile
+        self.alias = alias
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.profile.add_query(self.alias, sql, None if many else params, time.perf_counter() - start)
+
+
+class RequestProfile:
+    """
+    SQL statements and timings of one request.
+    """
+
+    def __init__(self, request):
+        self.method = request.method
+        self.path = request.get_full_path()
+        self.view_name = None
+        self.status = None
+        self.exempt = False
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_time = 0.0
+        self.stream_time = 0.0
+        self.timings = {}
+        # alias -> número de sentencias y tiempo; sentencia -> (veces, tiempo)
+        self.aliases = {}
+        self.statements = {}
+        self.queries = []
+        self.explain_threshold = getattr(settings, 'REQUEST_PROFILE_EXPLAIN_MS', 0) / 1000
+
+    @contextmanager
+    def capture(self):
+        """Registra las consultas de todos los alias (y los tiempos de add_timing) dentro del bloque."""
+        token = _current.set(self)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(_QueryRecorder(self, alias)))
+                yield
+        finally:
+            _current.reset(token)
+
+    def add_query(self, alias, sql, params, duration):
+        queries, total = self.aliases.get(alias, (0, 0.0))
+        self.aliases[alias] = (queries + 1, total + duration)
+        times, total = self.statements.get(sql, (0, 0.0))
+        self.statements[sql] = (times + 1, total + duration)
+        # Solo se conservan los parámetros de las sentencias que se van a explicar
+        keep_params = self.explain_threshold and duration >= self.explain_threshold
+        self.queries.append((duration, alias, sql, params if keep_params else None))
+
+    def start_view(self, view_func):
+        self.view_started = time.perf_counter()
+        self.view_name = f'{view_func.__module__}.{getattr(view_func, "__name__", type(view_func).__name__)}'
+        self.exempt = getattr(view_func, 'profiling_exempt', False)
+
+    def end_view(self):
+        self.view_time = time.perf_counter() - (self.view_started or self.started)
+
+    @property
+    def db_time(self):
+        return sum(total for _, total in self.aliases.values())
+
+    @property
+    def query_count(self):
+        return sum(queries for queries, _ in self.aliases.values())
+
+    def server_timing(self):
+        """Valor de la cabecera Server-Timing con lo medido hasta el final de la vista."""
+        metrics = [
+            f'db;dur={_ms(self.db_time)};desc="{self.query_count} queries"',
+            f'view;dur={_ms(self.view_time)}',
+        ]
+        if 'serialize' in self.timings:
+            metrics.append(f'serialize;dur={_ms(self.timings["serialize"])}')
+        if self.queries:
+            metrics.append(f'slowest;dur={_ms(max(query[0] for query in self.queries))};desc="slowest query"')
+        return ', '.join(metrics)
+
+    def stream(self, chunks):
+        """Re-emite el cuerpo de una respuesta en streaming midiendo lo que se hace al generarlo."""
+        chunks = iter(chunks)
+        try:
+            while True:
+                start = time.perf_counter()
+                with self.capture():
+                    try:
+                        chunk = next(chunks)
+                    except StopIteration:
+                        return
+                    finally:
+                        self.stream_time += time.perf_counter() - start
+                yield chunk
+        finally:
+            self.finish()
+
+    def _explain(self, alias, sql, params):
+        connection = connections[alias]
+        try:
+            prefix = connection.ops.explain_query_prefix()
+            with connection.cursor() as cursor:
+                cursor.execute(f'{prefix} {sql}', params)
+                rows = cursor.fetchall()
+        except (DatabaseError, NotSupportedError, ValueError) as e:
+            return [f'EXPLAIN no disponible: {e}']
+        # SQLite: (id, parent, notused, detail); PostgreSQL: una línea del plan por fila
+        return [str(row[-1]) for row in rows]
+
+    def finish(self):
+        """Añade el resumen de la petición al registro en memoria."""
+        slowest = sorted(self.queries, key=lambda query: query[0], reverse=True)
+        slowest = slowest[:getattr(settings, 'REQUEST_PROFILE_SLOWEST', 5)]
+        repeated_min = getattr(settings, 'REQUEST_PROFILE_REPEATED', 5)
+        repeated = sorted(
+            ((sql, times, total) for sql, (times, total) in self.statements.items() if times >= repeated_min),
+            key=lambda item: item[1], reverse=True,
+        )
+
+        slowest_data = []
+        for duration, alias, sql, params in slowest:
+            query = {'alias': alias, 'time_ms': _ms(duration), 'sql': _preview(sql)}
+            if params is not None and _select_re.match(sql):
+                query['explain'] = self._explain(alias, sql, params)
+            slowest_data.append(query)
+
+        entry = {
+            'id': next(_ids),
+            'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'method': self.method,
+            'path': self.path,
+            'status': self.status,
+            'view': self.view_name,
+            'duration_ms': _ms(time.perf_counter() - self.started),
+            'view_ms': _ms(self.view_time),
+            'stream_ms': _ms(self.stream_time),
+            'timings_ms': {name: _ms(seconds) for name, seconds in self.timings.items()},
+            'db': {
+                'queries': self.query_count,
+                'time_ms': _ms(self.db_time),
+                'aliases': {alias: {'queries': queries, 'time_ms': _ms(total)} for alias, (queries, total) in self.aliases.items()},
+            },
+            'slowest': slowest_data,
+            'repeated': [{'sql': _preview(sql), 'count': times, 'time_ms': _ms(total)} for sql, times, total in repeated],
+        }
+        with _log_lock:
+            _log.append(entry)
+
+
+class RequestProfilingMiddleware:
+    """
+    Records the SQL statements and timings of every request (see the module docstring).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = RequestProfile(request)
+        with profile.capture():
+            response = self.get_response(request)
+        profile.end_view()
+        if profile.exempt:
+            return response
+
+        response['Server-Timing'] = profile.server_timing()
+        profile.status = response.status_code
+        if response.streaming:
+            # El resumen se guarda cuando termina de enviarse el cuerpo
+            response.streaming_content = profile.stream(response.streaming_content)
+        else:
+            profile.finish()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = _current.get()
+        if profile is not None:
+            profile.start_view(view_func)
+        return None
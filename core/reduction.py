@@ -0,0 +1,266 @@
+"""
+Level-of-detail reductions of the collaboration network snapshots.
+
+The full co-authorship network is too large to draw in the browser, so the
+collaboration-network endpoint can reduce a snapshot before sending it:
+
+- ``community`` (+ ``communityField``): drill-down, keep only one community;
+- ``minWeight``: drop edges with fewer joint publications;
+- ``kCore``: keep the k-core of the remaining graph;
+- ``topN`` (+ ``topBy`` = degree | weight): keep the N best connected nodes;
+- ``aggregate`` (lovaina | leiden): collapse every community into a supernode,
+  joined by edges that sum the weights between communities.
+
+The steps are applied in that order on the columnar arrays of the snapshot (see
+bibliodata.graphs), and the result keeps the same columnar format, so the
+dashboard decodes reduced and full networks the same way.
+"""
+
+import networkx as nx
+import numpy as np
+
+LOD_PARAMS = ('community', 'communityField', 'minWeight', 'kCore', 'topN', 'topBy', 'aggregate')
+
+# Parámetro communityField / aggregate -> columna de nodos del snapshot
+COMMUNITY_FIELDS = {
+    'lovaina': 'lovaina_community',
+    'leiden': 'leiden_community',
+    'department': 'department',
+}
+AGGREGATE_FIELDS = ('lovaina', 'leiden')
+TOP_BY = ('degree', 'weight')
+
+
+class LevelOfDetail:
+    """
+    Reduction options parsed from the request parameters.
+    """
+
+    def __init__(self, community=None, community_field='lovaina', min_weight=None, k_core=None,
+                 top_n=None, top_by='degree', aggregate=None):
+        self.community = community
+        self.community_field = community_field
+        self.min_weight = min_weight
+        self.k_core = k_core
+        self.top_n = top_n
+        self.top_by = top_by
+        self.aggregate = aggregate
+
+    @classmethod
+    def from_params(cls, params):
+        """
+        Parses the reduction parameters of a request.
+
+        Raises:
+            ValueError: With a message for the client if a parameter is invalid.
+        """
+        def positive_int(name):
+            value = params.get(name)
+            if value in (None, ''):
+                return None
+            try:
+                value = int(value)
+            except ValueError:
+                raise ValueError(f'{name} debe ser un entero')
+            if value < 0:
+                raise ValueError(f'{name} debe ser positivo')
+            return value or None
+
+        aggregate = params.get('aggregate') or None
+        if aggregate is not None and aggregate not in AGGREGATE_FIELDS:
+            raise ValueError(f"aggregate debe ser uno de: {', '.join(AGGREGATE_FIELDS)}")
+        community_field = params.get('communityField') or aggregate or 'lovaina'
+        if community_field not in COMMUNITY_FIELDS:
+            raise ValueError(f"communityField debe ser uno de: {', '.join(COMMUNITY_FIELDS)}")
+        top_by = params.get('topBy') or 'degree'
+        if top_by not in TOP_BY:
+            raise ValueError(f"topBy debe ser uno de: {', '.join(TOP_BY)}")
+
+        return cls(
+            community=params.get('community') or None,
+            community_field=community_field,
+            min_weight=positive_int('minWeight'),
+            k_core=positive_int('kCore'),
+            top_n=positive_int('topN'),
+            top_by=top_by,
+            aggregate=aggregate,
+        )
+
+    @property
+    def is_active(self):
+        return any((self.community, self.min_weight, self.k_core, self.top_n, self.aggregate))
+
+    def as_dict(self):
+        return {
+            'community': self.community,
+            'communityField': self.community_field if self.community else None,
+            'minWeight': self.min_weight,
+            'kCore': self.k_core,
+            'topN': self.top_n,
+            'topBy': self.top_by if self.top_n else None,
+            'aggregate': None if self.community else self.aggregate,
+        }
+
+
+def _community_labels(data, field):
+    """Etiqueta (texto) de la comunidad de cada nodo; None si no tiene."""
+    values = data['nodes'][COMMUNITY_FIELDS[field]]
+    if field == 'department':
+        departments = data['departments']
+        return [departments[code] if code >= 0 else None for code in values]
+    return [None if value is None else str(value) for value in values]
+
+
+def _label_order(label):
+    """Orden de las comunidades: numéricas por valor, el resto alfabéticamente."""
+    try:
+        return (0, int(label), '')
+    except ValueError:
+        return (1, 0, label)
+
+
+def _select(data, keep, edge_keep):
+    """Subconjunto del snapshot con los nodos y aristas indicados (reindexando)."""
+    nodes, edges = data['nodes'], data['edges']
+    kept = np.flatnonzero(keep)
+    new_index = np.full(len(keep), -1, dtype=np.int64)
+    new_index[kept] = np.arange(len(kept))
+
+    source = np.asarray(edges['source'], dtype=np.int64)[edge_keep]
+    target = np.asarray(edges['target'], dtype=np.int64)[edge_keep]
+    weight = np.asarray(edges['weight'])[edge_keep]
+
+    picked = kept.tolist()
+    document = dict(data)
+    document['nodes'] = {column: [values[i] for i in picked] for column, values in nodes.items()}
+    document['edges'] = {
+        'source': new_index[source].tolist(),
+        'target': new_index[target].tolist(),
+        'weight': weight.tolist(),
+    }
+    document['layouts'] = {
+        mode: {axis: [positions[axis][i] for i in picked] for axis in ('x', 'y')}
+        for mode, positions in data.get('layouts', {}).items()
+    }
+    return document
+
+
+def _aggregate(data, field):
+    """Colapsa cada comunidad en un supernodo con las aristas entre comunidades sumadas."""
+    labels = _community_labels(data, field)
+    attribute = COMMUNITY_FIELDS[field]
+    order = sorted({label for label in labels if label is not None}, key=_label_order)
+    if None in labels:
+        order.append(None)
+    position = {label: i for i, label in enumerate(order)}
+    groups = np.array([position[label] for label in labels], dtype=np.int64)
+    sizes = np.bincount(groups, minlength=len(order))
+
+    # Aristas entre comunidades: pares (menor, mayor) con los pesos sumados
+    edges = data['edges']
+    a = groups[np.asarray(edges['source'], dtype=np.int64)]
+    b = groups[np.asarray(edges['target'], dtype=np.int64)]
+    weight = np.asarray(edges['weight'], dtype=np.int64)
+    between = a != b
+    low, high, weight = np.minimum(a, b)[between], np.maximum(a, b)[between], weight[between]
+    pairs = low * len(order) + high
+    unique, inverse = np.unique(pairs, return_inverse=True)
+    sums = np.bincount(inverse, weights=weight).astype(np.int64)
+
+    # Valor original (no texto) de la comunidad de cada supernodo
+    originals = {}
+    for value in data['nodes'][attribute]:
+        if value is not None:
+            originals.setdefault(str(value), value)
+    nodes = {
+        'id': [f'{field}:{label}' if label is not None else f'{field}:none' for label in order],
+        'label': [f'Comunidad {label}' if label is not None else 'Sin comunidad' for label in order],
+        'department': [-1] * len(order),
+        'lovaina_community': [None] * len(order),
+        'leiden_community': [None] * len(order),
+        'member_count': sizes.tolist(),
+    }
+    nodes[attribute] = [originals.get(label) for label in order]
+
+    # Posición del supernodo: centroide de sus miembros en cada layout
+    layouts = {}
+    for mode, positions in data.get('layouts', {}).items():
+        centroid = {}
+        for axis in ('x', 'y'):
+            totals = np.bincount(groups, weights=np.asarray(positions[axis], dtype=float), minlength=len(order))
+            centroid[axis] = np.round(totals / np.maximum(sizes, 1), 1).tolist()
+        layouts[mode] = centroid
+
+    document = dict(data)
+    document['nodes'] = nodes
+    document['edges'] = {
+        'source': (unique // len(order)).tolist(),
+        'target': (unique % len(order)).tolist(),
+        'weight': sums.tolist(),
+    }
+    document['layouts'] = layouts
+    document['aggregated'] = field
+    return document
+
+
+def reduce_network(data, lod):
+    """
+    Applies the level-of-detail options to a snapshot document.
+
+    Args:
+        data (dict): Columnar snapshot document (GraphSnapshot.data).
+        lod (LevelOfDetail): Reduction options.
+
+    Returns:
+        dict: Reduced columnar document, with a ``lod`` entry describing the
+        applied options and the size of the original network.
+    """
+    node_count = len(data['nodes']['id'])
+    source = np.asarray(data['edges']['source'], dtype=np.int64)
+    target = np.asarray(data['edges']['target'], dtype=np.int64)
+    weight = np.asarray(data['edges']['weight'])
+    keep = np.ones(node_count, dtype=bool)
+
+    # === Drill-down: solo los nodos de una comunidad ===
+    if lod.community is not None:
+        labels = _community_labels(data, lod.community_field)
+        keep &= np.array([label == lod.community for label in labels], dtype=bool)
+
+    # === Peso mínimo de arista ===
+    edge_keep = keep[source] & keep[target]
+    if lod.min_weight:
+        edge_keep &= weight >= lod.min_weight
+
+    # === k-core ===
+    if lod.k_core:
+        G = nx.Graph()
+        G.add_nodes_from(np.flatnonzero(keep).tolist())
+        G.add_edges_from(zip(source[edge_keep].tolist(), target[edge_keep].tolist()))
+        G.remove_edges_from(nx.selfloop_edges(G))
+        core = nx.core_number(G)
+        in_core = np.zeros(node_count, dtype=bool)
+        in_core[[node for node, k in core.items() if k >= lod.k_core]] = True
+        keep &= in_core
+        edge_keep &= keep[source] & keep[target]
+
+    # === Top-N nodos por grado (o grado ponderado) ===
+    if lod.top_n:
+        scores = weight[edge_keep] if lod.top_by == 'weight' else np.ones(int(edge_keep.sum()))
+        score = (np.bincount(source[edge_keep], weights=scores, minlength=node_count)
+                 + np.bincount(target[edge_keep], weights=scores, minlength=node_count))
+        score[~keep] = -1
+        top = np.argsort(-score, kind='stable')[:min(lod.top_n, int(keep.sum()))]
+        keep = np.zeros(node_count, dtype=bool)
+        keep[top] = True
+        edge_keep &= keep[source] & keep[target]
+
+    document = _select(data, keep, edge_keep)
+    if lod.aggregate and lod.community is None:
+        document = _aggregate(document, lod.aggregate)
+
+    document['lod'] = {
+        **{key: value for key, value in lod.as_dict().items() if value is not None},
+        'total_nodes': node_count,
+        'total_edges': len(source),
+    }
+    return document
@@ -0,0 +1,529 @@
+"""
+PDF report of the dashboard, rendered in the background by the report worker.
+
+``export_report`` only records a ReportJob with the request parameters (filters
+and chart options); ``run_report_worker`` picks the pending jobs and renders them
+here with ReportLab, reporting the progress back to the job. The charts are drawn
+on the server (see core.charts) unless the client uploads its own captures.
+Identical requests (same parameters, language, links and data version) share the
+job and therefore the PDF already rendered for them.
+
+Uploaded captures are stored as files next to the PDFs (named by their SHA-256)
+and the job parameters only keep the digest. ``purge_reports`` deletes the old
+jobs with their PDFs and captures (``run_report_worker --purge-older-than``).
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import unicodedata
+from datetime import datetime, timedelta
+from io import BytesIO
+from xml.sax.saxutils import escape as xml_escape
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone, translation
+from django.utils.translation import gettext as _
+from reportlab.lib import colors
+from reportlab.lib.colors import blue
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.platypus import Image, PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from bibliodata.models import Author, DataVersion
+from .aggregates import filter_publications
+from .charts import chart_series, timeline_drawing, pie_drawing, bar_drawing
+from .models import ReportJob
+from .serializers import serialize_publications
+
+logger = logging.getLogger("django")
+
+REPORT_FILENAME = 'Bibliometria_IPBLN_Informe.pdf'
+# Permisos de los PDF generados (legibles por el usuario del servidor web)
+REPORT_FILE_MODE = 0o644
+
+LIST_PARAMS = ('areas', 'institutions', 'types')
+TEXT_PARAMS = ('year_from', 'year_to', 'author', 'view_type', 'areas_view', 'include_predicted_areas',
+               'network_html')
+# Capturas de los gráficos (base64) que el cliente puede enviar en lugar de dibujarlos en el servidor
+IMAGE_PARAMS = ('timeline_img', 'pie_img', 'bar_img')
+IMAGES_DIR = 'images'
+_digest_re = re.compile(r'^[0-9a-f]{64}$')
+
+
+def _write_file(path, content):
+    """Escribe un fichero de REPORT_CACHE_DIR de forma atómica, legible por el servidor web."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(content)
+    # mkstemp crea el fichero con permisos 0600: el servidor web puede ejecutarse con otro usuario
+    os.chmod(tmp_path, REPORT_FILE_MODE)
+    os.replace(tmp_path, path)
+
+
+def report_image_path(digest):
+    return os.path.join(settings.REPORT_CACHE_DIR, IMAGES_DIR, f'{digest}.png')
+
+
+def store_report_image(value):
+    """
+    Stores an uploaded chart capture (base64, optionally as a data URL).
+
+    Returns:
+        str: SHA-256 digest of the image, which names its file.
+
+    Raises:
+        ValueError: If the value is not valid base64.
+    """
+    # Quitar el prefijo data:image/png;base64,
+    if value.startswith('data:image'):
+        value = value.split(',', 1)[-1]
+    try:
+        content = base64.b64decode(value, validate=True)
+    except binascii.Error:
+        raise ValueError('Imagen del gráfico no válida')
+    digest = hashlib.sha256(content).hexdigest()
+    path = report_image_path(digest)
+    if not os.path.exists(path):
+        _write_file(path, content)
+    return digest
+
+
+def _load_image(digest):
+    """Bytes de una captura guardada (None si no hay o ya se ha purgado)."""
+    if not digest or not _digest_re.match(digest):
+        return None
+    try:
+        with open(report_image_path(digest), 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def report_params(data):
+    """
+    Report parameters of a request (filters and digests of the uploaded chart
+    images), as a JSON-able dict.
+
+    Raises:
+        ValueError: If an uploaded image is not valid base64.
+    """
+    params = {name: data.get(name) or None for name in TEXT_PARAMS}
+    for name in LIST_PARAMS:
+        params[name] = sorted(data.getlist(name)) if hasattr(data, 'getlist') else []
+    for name in IMAGE_PARAMS:
+        value = data.get(name)
+        params[name] = store_report_image(value) if value else None
+    return params
+
+
+def report_key(params, language, site_url, version=None):
+    """
+    Deduplication key of a report: same parameters, language, links and data version.
+    """
+    if version is None:
+        version = DataVersion.current()
+    payload = json.dumps([params, language, site_url, version], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def report_path(key):
+    return os.path.join(settings.REPORT_CACHE_DIR, f'{key}.pdf')
+
+
+def _filter_publications(params):
+    pubs_query = filter_publications(params['year_from'], params['year_to'], params['areas'],
+                                     params['institutions'], params['types'], params['author'])
+    return pubs_query.distinct().order_by('-year', '-publication_date')
+
+
+def build_report_pdf(params, site_url, progress=None):
+    """
+    Renders the PDF report.
+
+    Args:
+        params (dict): Report parameters (see report_params).
+        site_url (str): Absolute URL of the site root, used for the links of the report.
+        progress (callable | None): Called with ``(percent, message)`` while rendering.
+
+    Returns:
+        bytes: PDF document.
+    """
+    def report(percent, message):
+        if progress:
+            progress(percent, message)
+
+    year_from = params['year_from']
+    year_to = params['year_to']
+    areas = params['areas']
+    institutions = params['institutions']
+    types = params['types']
+    author = params['author']
+
+    # Valores por defecto personalizados
+    default_year_from = '1965'
+    default_year_to = '2025'
+    default_areas = _('Todas las áreas')
+    default_institutions = _('Todas las instituciones')
+    default_types = _('Todos los tipos')
+
+    report(5, 'Preparando el informe')
+    buffer = BytesIO()
+    doc_title = 'Bibliometría IPBLN: Informe'
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm, topMargin=2*cm, bottomMargin=2*cm)
+    doc.title = doc_title
+    elements = []
+    styles = getSampleStyleSheet()
+
+    # Título dinámico
+    if author:
+        title = f"{_('Informe bibliométrico de')} {author}"
+    else:
+        title = _('Bibliometría IPBLN: Informe generado con filtros personalizados')
+
+    # Fecha de generación
+    fecha = datetime.now().strftime('%d/%m/%Y %H:%M')
+    subtitle = f"{_('Fecha de generación')}: {fecha}"
+
+    # Añadir título y subtítulo
+    title_style = styles['Title']
+    title_style.alignment = TA_CENTER
+    subtitle_style = styles['Heading3']
+    subtitle_style.alignment = TA_CENTER
+    elements.append(Paragraph(title, title_style))
+    elements.append(Spacer(1, 0.3*cm))
+    elements.append(Paragraph(subtitle, subtitle_style))
+    elements.append(Spacer(1, 0.7*cm))
+
+    # Sección de filtros
+    normal = styles['Normal']
+    def safe_value(val, default):
+        if isinstance(val, list):
+            return Paragraph(', '.join(val) if val else default, normal)
+        return Paragraph(str(val) if val else default, normal)
+    def label(text):
+        return Paragraph(f"<b>{text}</b>", normal)
+    filters_data = [
+        [label(_('Año desde')), safe_value(year_from, default_year_from)],
+        [label(_('Año hasta')), safe_value(year_to, default_year_to)],
+        [label(_('Áreas temáticas')), safe_value(areas, default_areas)],
+        [label(_('Instituciones')), safe_value(institutions, default_institutions)],
+        [label(_('Tipos de publicación')), safe_value(types, default_types)],
+    ]
+    if author:
+        filters_data.append([label(_('Autor seleccionado')), safe_value(author, '-')])
+    table = Table(filters_data, colWidths=[5*cm, 10*cm])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('LINEBELOW', (0, 0), (-1, -1), 0.25, colors.grey),
+    ]))
+    elements.append(table)
+    elements.append(Spacer(1, 1*cm))
+
+    base_url = site_url.rstrip('/') + settings.MEDIA_URL + 'networks_html/'
+    link_style = ParagraphStyle(
+        'LinkStyle',
+        parent=styles['Normal'],
+        textColor=blue,
+        underline=True,
+        fontSize=12,
+    )
+
+    # Añadir gráficos: los dibujados en el servidor, o las capturas enviadas por el cliente
+    report(10, 'Añadiendo gráficos')
+    # Las capturas que ya no están en disco se sustituyen por los gráficos del servidor
+    timeline_img = _load_image(params.get('timeline_img'))
+    pie_img = _load_image(params.get('pie_img'))
+    bar_img = _load_image(params.get('bar_img'))
+    view_type = params.get('view_type') or 'yearly'
+    areas_view = 'bar' if bar_img or (params.get('areas_view') == 'bar' and not pie_img) else 'pie'
+
+    def add_image_section(title, img_bytes):
+        if img_bytes:
+            elements.append(Paragraph(f'<b>{title}</b>', styles['Heading4']))
+            elements.append(Spacer(1, 0.2*cm))
+            img_io = BytesIO(img_bytes)
+            img = Image(img_io, width=18*cm, height=9*cm)
+            elements.append(img)
+            elements.append(Spacer(1, 0.7*cm))
+
+    def add_chart_section(title, drawing):
+        elements.append(Paragraph(f'<b>{title}</b>', styles['Heading4']))
+        elements.append(Spacer(1, 0.2*cm))
+        if drawing is None:
+            elements.append(Paragraph('No hay publicaciones que coincidan con los filtros seleccionados.', styles['Normal']))
+        else:
+            elements.append(drawing)
+        elements.append(Spacer(1, 0.7*cm))
+
+    series = None
+    if not timeline_img or not (bar_img or pie_img):
+        series = chart_series(params, view_type, params.get('include_predicted_areas') == 'true')
+
+    elements.append(PageBreak())
+    timeline_title = _('Línea temporal de publicaciones')
+    if timeline_img:
+        add_image_section(timeline_title, timeline_img)
+    else:
+        add_chart_section(timeline_title, timeline_drawing(series['timeline'], view_type))
+
+    if areas_view == 'bar':
+        bar_title = _('Distribución de áreas (gráfico de barras)')
+        if bar_img:
+            add_image_section(bar_title, bar_img)
+        else:
+            add_chart_section(bar_title, bar_drawing(series['areas']))
+    else:
+        pie_title = _('Distribución de áreas (gráfico circular)')
+        if pie_img:
+            add_image_section(pie_title, pie_img)
+        else:
+            add_chart_section(pie_title, pie_drawing(series['areas']))
+
+    # --- Añadir enlaces a redes interactivas ---
+    elements.append(Spacer(1, 0.7*cm))
+    elements.append(Paragraph('<b>Visualizar redes de colaboración entre IPs:</b>', styles['Heading4']))
+    # Enlaces fijos
+    elements.append(Paragraph(f'<a href="{base_url}departments_comunidades.html">Departamentos</a>', link_style))
+    elements.append(Paragraph(f'<a href="{base_url}lovaina_comunidades.html">Lovaina (7 comunidades)</a>', link_style))
+    elements.append(Paragraph(f'<a href="{base_url}leiden_comunidades.html"> Leiden (6 comunidades)</a>', link_style))
+    # Palabras clave (si existe)
+    network_html = params['network_html']
+    if network_html:
+        elements.append(Paragraph(f'<a href="{base_url}{network_html}">Red de Coautorías por Palabras Clave</a>', link_style))
+
+    # --- Apartado de autor seleccionado (ahora lo primero) ---
+    if author:
+        elements.append(Spacer(1, 0.5*cm))
+        elements.append(Paragraph(f'<b>Métricas del autor seleccionado</b>', styles['Heading3']))
+        try:
+            author_obj = Author.objects.get(name=author)
+            metrics = [
+                (_('ORCID'), author_obj.orcid_link or '-'),
+                (_('Total publicaciones'), author_obj.total_publications or '-'),
+                (_('Total citas'), author_obj.total_citations or '-'),
+                (_('Citas WoS'), author_obj.citations_wos or '-'),
+                (_('Citas Scopus'), author_obj.citations_scopus or '-'),
+                (_('Índice h (WoS/Scopus)'), author_obj.h_index or '-'),
+                (_('Índice h GESBIB'), author_obj.h_index_gb or '-'),
+                (_('Índice h5 GESBIB'), author_obj.h_index_h5gb or '-'),
+                (_('Índice internacionalización'), author_obj.international_index or '-')
+            ]
+            table = Table(metrics, colWidths=[7*cm, 8*cm])
+            table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+                ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 0), (-1, -1), 11),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+                ('TOPPADDING', (0, 0), (-1, -1), 8),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('LINEBELOW', (0, 0), (-1, -1), 0.25, colors.grey),
+            ]))
+            elements.append(table)
+        except Author.DoesNotExist:
+            elements.append(Paragraph('<b>No se han encontrado métricas para el autor seleccionado.</b>', styles['Normal']))
+        elements.append(Spacer(1, 0.7*cm))
+
+        # Enlace a la red de colaboración del autor
+        def slugify(value):
+            value = unicodedata.normalize('NFKD', value).encode('ascii', 'ignore').decode('ascii')
+            value = value.replace(' ', '_').replace('/', '_').replace(',', '').replace('.', '')
+            return value
+        author_slug = slugify(author)
+        author_html = f'collab_{author_slug}.html'
+        elements.append(Paragraph(f'<a href="{base_url}{author_html}">Red de colaboración de {author}</a>', link_style))
+        elements.append(Spacer(1, 1*cm))
+
+    # --- Sección de publicaciones filtradas ---
+    report(20, 'Consultando publicaciones')
+    elements.append(PageBreak())
+    elements.append(Paragraph('<b>Listado de publicaciones filtradas</b>', styles['Heading2']))
+    pubs = serialize_publications(_filter_publications(params), fields=('title', 'year'))
+    num_pubs = len(pubs)
+    # Mostrar el número de publicaciones
+    elements.append(Paragraph(f'Se muestran {num_pubs} publicaciones que cumplen los filtros seleccionados.', styles['Normal']))
+    elements.append(Spacer(1, 0.2*cm))
+    # Construir la tabla
+    report(30, 'Construyendo el listado de publicaciones')
+    data = [[Paragraph('<b>Título</b>', styles['Normal']), Paragraph('<b>Año</b>', styles['Normal'])]]
+    for pub in pubs:
+        pub_url = f"{site_url.rstrip('/')}/publication/{pub['id']}"
+        title_link = f'<a href="{pub_url}">{xml_escape(pub["title"] or "")}</a>'
+        data.append([Paragraph(title_link, link_style), str(pub['year']) if pub['year'] else '-'])
+    if len(data) == 1:
+        elements.append(Paragraph('No hay publicaciones que coincidan con los filtros seleccionados.', styles['Normal']))
+    else:
+        table = Table(data, colWidths=[13*cm, 2.5*cm])
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LINEBELOW', (0, 0), (-1, -1), 0.25, colors.grey),
+        ]))
+        elements.append(table)
+
+    # Pie de página en todas las páginas
+    def add_footer(canvas, doc):
+        footer_text = _('Este informe ha sido generado automáticamente por la plataforma de Bibliometría IPBLN.')
+        canvas.saveState()
+        canvas.setFont('Helvetica', 9)
+        canvas.setFillColor(colors.grey)
+        width, height = A4
+        canvas.drawCentredString(width / 2, 1.2 * cm, footer_text)
+        canvas.restoreState()
+
+    def set_metadata(canvas, doc):
+        canvas.setTitle(doc_title)
+        add_footer(canvas, doc)
+
+    # Progreso de la maquetación (35-95 %) según los elementos ya colocados
+    layout = {'total': 1, 'done': 0}
+    def on_progress(kind, value):
+        if kind == 'SIZE_EST':
+            layout['total'] = max(value, 1)
+        elif kind == 'PROGRESS':
+            layout['done'] = value
+        elif kind == 'PAGE':
+            report(35 + 60 * min(layout['done'], layout['total']) // layout['total'], f'Maquetando la página {value}')
+    doc.setProgressCallBack(on_progress)
+
+    doc.build(elements, onFirstPage=set_metadata, onLaterPages=add_footer)
+    pdf = buffer.getvalue()
+    buffer.close()
+    report(100, 'Informe generado')
+    return pdf
+
+
+# === Cola de informes ===
+
+def enqueue_report(params, language, site_url, user=None):
+    """
+    Returns the job of a report, creating it unless an identical one exists.
+
+    Pending, running and finished jobs with the same key are reused (a finished
+    one only while its PDF is still on disk); failed jobs are retried.
+
+    Returns:
+        tuple: ``(job, created)``.
+    """
+    key = report_key(params, language, site_url)
+    job = ReportJob.objects.filter(key=key).exclude(status=ReportJob.FAILED).order_by('-created_at').first()
+    if job and (job.status != ReportJob.DONE or os.path.exists(report_path(key))):
+        return job, False
+    job = ReportJob.objects.create(
+        key=key, params=params, language=language, site_url=site_url,
+        requested_by=user if user and user.is_authenticated else None,
+    )
+    return job, True
+
+
+def _claimable():
+    # Pendientes, o en curso desde hace más de REPORT_JOB_TIMEOUT (worker caído)
+    stale = timezone.now() - timedelta(seconds=settings.REPORT_JOB_TIMEOUT)
+    return Q(status=ReportJob.PENDING) | Q(status=ReportJob.RUNNING, started_at__lt=stale)
+
+
+def claim_next_job():
+    """
+    Marks the oldest claimable job as running and returns it (None if there is none).
+
+    The claim is a conditional UPDATE, so several workers never render the same job.
+    """
+    for job_id in ReportJob.objects.filter(_claimable()).order_by('created_at').values_list('id', flat=True)[:10]:
+        claimed = ReportJob.objects.filter(_claimable(), id=job_id).update(
+            status=ReportJob.RUNNING, started_at=timezone.now(), progress=0, message='', error='',
+        )
+        if claimed:
+            return ReportJob.objects.get(id=job_id)
+    return None
+
+
+def run_job(job):
+    """
+    Renders the PDF of a claimed job and stores it in REPORT_CACHE_DIR.
+
+    Returns:
+        bool: Whether the report was generated.
+    """
+    last = {'percent': None}
+
+    def progress(percent, message):
+        # Solo se escribe en la base de datos cuando cambia el porcentaje
+        if percent != last['percent']:
+            last['percent'] = percent
+            ReportJob.objects.filter(pk=job.pk).update(progress=percent, message=message)
+
+    try:
+        with translation.override(job.language):
+            pdf = build_report_pdf(job.params, job.site_url, progress)
+        _write_file(report_path(job.key), pdf)
+    except Exception as e:
+        logger.exception('Error generando el informe %s', job.token)
+        ReportJob.objects.filter(pk=job.pk).update(status=ReportJob.FAILED, error=str(e), finished_at=timezone.now())
+        return False
+
+    ReportJob.objects.filter(pk=job.pk).update(
+        status=ReportJob.DONE, progress=100, message='Informe generado', finished_at=timezone.now(),
+    )
+    return True
+
+
+def purge_reports(older_than):
+    """
+    Deletes the jobs created before ``older_than`` (except the running ones) and
+    the PDFs and chart captures that no remaining job uses.
+
+    Args:
+        older_than (timedelta): Age of the jobs to delete.
+
+    Returns:
+        tuple: ``(deleted jobs, deleted files)``.
+    """
+    cutoff = timezone.now() - older_than
+    deleted, _ = ReportJob.objects.filter(created_at__lt=cutoff).exclude(status=ReportJob.RUNNING).delete()
+
+    keep = set()
+    for key, params in ReportJob.objects.values_list('key', 'params'):
+        keep.add(f'{key}.pdf')
+        keep.update(f'{params.get(name)}.png' for name in IMAGE_PARAMS if params.get(name))
+
+    # Solo se borran ficheros tan antiguos como los trabajos purgados (no los que se están escribiendo)
+    removed = 0
+    for directory in (settings.REPORT_CACHE_DIR, os.path.join(settings.REPORT_CACHE_DIR, IMAGES_DIR)):
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            if not entry.is_file() or entry.name in keep:
+                continue
+            if not entry.name.endswith(('.pdf', '.png', '.tmp')):
+                continue
+            if entry.stat().st_mtime >= cutoff.timestamp():
+                continue
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return deleted, removed
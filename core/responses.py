@@ -0,0 +1,73 @@
+"""
+JSON responses for the large dashboard payloads (networks and publication lists).
+
+- ``json_dumps`` encodes with orjson when it is installed (it is optional) and
+  falls back to the standard library with DjangoJSONEncoder otherwise.
+- ``JsonBytesResponse`` is a JsonResponse encoded with ``json_dumps``. The views
+  build their payloads completely in memory before answering, so the body is
+  encoded once and sent (and cached by cached_json_response) as it is.
+- ``snapshot_response`` serves a precomputed network snapshot with its gzip
+  body (compressed once per snapshot) when the client accepts gzip.
+
+The rest of the responses are compressed by GZipMiddleware.
+"""
+
+import re
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from .profiling import timed
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa el módulo json estándar
+    orjson = None
+
+_encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+_accepts_gzip_re = re.compile(r'\bgzip\b')
+
+
+def json_dumps(data):
+    """
+    Encodes a value as compact UTF-8 JSON.
+
+    Returns:
+        bytes: JSON text.
+    """
+    with timed('serialize'):
+        if orjson is not None:
+            return orjson.dumps(data, default=_encoder.default, option=orjson.OPT_NON_STR_KEYS)
+        return _encoder.encode(data).encode('utf-8')
+
+
+class JsonBytesResponse(HttpResponse):
+    """
+    Response with the JSON text of ``data``, encoded with json_dumps.
+    """
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(json_dumps(data), **kwargs)
+
+
+def accepts_gzip(request):
+    return bool(_accepts_gzip_re.search(request.META.get('HTTP_ACCEPT_ENCODING', '')))
+
+
+def snapshot_response(request, snapshot):
+    """
+    Response with the raw JSON of a GraphSnapshot and its ETag.
+
+    The gzip body of the snapshot is reused for every client that accepts it, so
+    the snapshot is compressed once instead of on every request.
+    """
+    if accepts_gzip(request):
+        response = HttpResponse(snapshot.gzip_content, content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(snapshot.content, content_type='application/json')
+    patch_vary_headers(response, ('Accept-Encoding',))
+    response['ETag'] = snapshot.etag
+    return response
@@ -0,0 +1,86 @@
+"""
+Read-only database alias for the dashboard in SQLite production mode.
+
+With SQLITE_PRODUCTION=true the settings define a ``readonly`` alias on the same
+SQLite file (WAL journal, ``PRAGMA query_only``). Readers in WAL mode never wait
+for a writer, so a ``load_*`` command running a long transaction no longer blocks
+or breaks the dashboard.
+
+``ReadOnlyViewsMiddleware`` flags the requests handled by ``core.views`` (also
+while their streaming responses are being sent) and ``ReadOnlyRouter`` sends the
+reads made under that flag to the alias. Writes always go to ``default``.
+"""
+
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+READONLY_ALIAS = 'readonly'
+READONLY_VIEWS_MODULE = 'core.views'
+
+_readonly_reads = ContextVar('readonly_reads', default=False)
+
+
+class ReadOnlyRouter:
+    """
+    Sends the reads of the flagged requests to the read-only alias.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _readonly_reads.get() and READONLY_ALIAS in settings.DATABASES:
+            return READONLY_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Siempre 'default', aunque la instancia se haya leído del alias de solo lectura
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Ambos alias apuntan a la misma base de datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == READONLY_ALIAS:
+            return False
+        return None
+
+
+class ReadOnlyViewsMiddleware:
+    """
+    Flags the requests resolved to ``core.views`` so that their reads use the read-only alias.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        previous = _readonly_reads.get()
+        try:
+            response = self.get_response(request)
+            if response.streaming and _readonly_reads.get():
+                # Las respuestas en streaming consultan la base de datos al enviarse
+                response.streaming_content = _readonly_stream(response.streaming_content)
+            return response
+        finally:
+            _readonly_reads.set(previous)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if view_func.__module__ == READONLY_VIEWS_MODULE:
+            _readonly_reads.set(True)
+        return None
+
+
+def _readonly_stream(chunks):
+    """Re-emite una respuesta en streaming con las lecturas dirigidas al alias de solo lectura."""
+    chunks = iter(chunks)
+    while True:
+        # El flag se activa mientras se genera cada fragmento (no durante el yield)
+        previous = _readonly_reads.set(True)
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            return
+        finally:
+            _readonly_reads.reset(previous)
+        yield chunk
@@ -0,0 +1,94 @@
+"""
+Batch serialization of publications for the dashboard endpoints.
+
+Serializing N publications costs a constant number of queries: one ``values()``
+projection of the publication columns, one grouped query per many-to-many
+relation (names only) and, if requested, one query for the latest metrics.
+Large id lists are processed in chunks so that the ``IN (...)`` clauses stay
+below the database parameter limits.
+"""
+
+from django.db.models.query import QuerySet
+
+from bibliodata.models import Publication, Author
+from .metrics import latest_metrics
+
+# Relaciones serializables: clave en la salida -> (tabla intermedia, campo con el nombre, orden)
+# El orden reproduce el de publication.<relación>.all() en las vistas anteriores
+RELATIONS = {
+    'authors': (Author.publications.through, 'author__name', 'id'),
+    'institutions': (Publication.institutions.through, 'institution__name', 'institution_id'),
+    'areas': (Publication.thematic_areas.through, 'thematicarea__name', 'thematicarea_id'),
+    'types': (Publication.publication_types.through, 'publicationtype__name', 'publicationtype_id'),
+}
+
+CHUNK_SIZE = 900
+
+
+def _chunks(ids):
+    for start in range(0, len(ids), CHUNK_SIZE):
+        yield ids[start:start + CHUNK_SIZE]
+
+
+def related_names(publication_ids, relations):
+    """
+    Names of the related objects of many publications, one query per relation.
+
+    Args:
+        publication_ids (iterable[int]): Publications to fetch.
+        relations (iterable[str]): RELATIONS keys.
+
+    Returns:
+        dict: ``{relation: {publication_id: [names]}}``, in the order of RELATIONS.
+    """
+    ids = list(publication_ids)
+    result = {}
+    for relation in relations:
+        through, name_field, order = RELATIONS[relation]
+        names = {}
+        for chunk in _chunks(ids):
+            rows = through.objects.filter(publication_id__in=chunk).order_by(order).values_list('publication_id', name_field)
+            for pub_id, name in rows:
+                names.setdefault(pub_id, []).append(name)
+        result[relation] = names
+    return result
+
+
+def serialize_publications(publications, fields=('id', 'title', 'year', 'publication_type'), relations=(), metrics=False):
+    """
+    Serializes many publications to dicts with a constant number of queries.
+
+    Args:
+        publications (QuerySet | iterable[int]): Publications to serialize. A queryset
+            (possibly ordered and sliced) is projected with values() keeping its order;
+            a list of ids keeps the order of the list and skips missing ids.
+        fields (iterable[str]): Publication columns (or annotations of the queryset).
+        relations (iterable[str]): RELATIONS keys, added as lists of names.
+        metrics (bool): Whether to add the latest metrics under ``'metrics'``.
+
+    Returns:
+        list[dict]: One dict per publication.
+    """
+    fields = list(dict.fromkeys(['id', *fields]))
+    if isinstance(publications, QuerySet):
+        rows = list(publications.values(*fields))
+    else:
+        ids = list(dict.fromkeys(publications))
+        by_id = {}
+        for chunk in _chunks(ids):
+            by_id.update((row['id'], row) for row in Publication.objects.filter(id__in=chunk).values(*fields))
+        rows = [by_id[pub_id] for pub_id in ids if pub_id in by_id]
+
+    ids = [row['id'] for row in rows]
+    names = related_names(ids, relations)
+    for relation, by_pub in names.items():
+        for row in rows:
+            row[relation] = by_pub.get(row['id'], [])
+
+    if metrics:
+        metrics_by_pub = {}
+        for chunk in _chunks(ids):
+            metrics_by_pub.update(latest_metrics(chunk))
+        for row in rows:
+            row['metrics'] = metrics_by_pub.get(row['id'], {})
+    return rows
@@ -0,0 +1,163 @@
+"""
+Keyword similarity between authors for the "keywords" community view.
+
+Every author is a row of a sparse binary author x keyword incidence matrix ``A``
+(built from Author.keywords). The number of keywords shared by every pair of
+authors of a graph is then the sparse product ``A_sub @ A_sub.T``, so the edges are
+computed in one pass instead of comparing every pair in Python.
+
+The matrix is tagged with the current DataVersion and rebuilt lazily the first
+time it is requested after a load command bumps the version; the edge lists
+computed from it are kept with it, so a graph is only computed once per version.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from scipy import sparse
+
+from bibliodata.models import Author, DataVersion
+
+# Aristas por nodo que se conservan si la petición no indica topK (0 = sin límite)
+DEFAULT_TOP_K = 10
+# Listas de aristas calculadas que se guardan por versión de datos (red de IPs, red completa, parámetros...)
+EDGE_CACHE_SIZE = 16
+
+
+def _keyword_set(keywords):
+    if isinstance(keywords, dict):
+        return set(keywords.keys())
+    if isinstance(keywords, list):
+        return {k for k in keywords if isinstance(k, str)}
+    return set()
+
+
+class KeywordSimilarity:
+    """
+    Sparse author x keyword incidence matrix.
+    """
+
+    def __init__(self, version, positions, vocabulary, matrix):
+        self.version = version
+        self.positions = positions
+        self.vocabulary = vocabulary
+        self.matrix = matrix
+        self._edges = OrderedDict()
+        self._edges_lock = threading.Lock()
+
+    @classmethod
+    def build(cls, version):
+        positions = {}
+        vocabulary = {}
+        rows, cols = [], []
+        for gesbib_id, keywords in Author.objects.order_by('gesbib_id').values_list('gesbib_id', 'keywords'):
+            row = positions.setdefault(str(gesbib_id), len(positions))
+            for keyword in _keyword_set(keywords):
+                rows.append(row)
+                cols.append(vocabulary.setdefault(keyword, len(vocabulary)))
+        matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(positions), len(vocabulary)),
+        )
+        # Índices de columna ordenados dentro de cada fila para intersecarlos sin copiar la matriz
+        matrix.sort_indices()
+        return cls(version, positions, list(vocabulary), matrix)
+
+    def _row(self, position):
+        """Columnas (keywords) de una fila, leídas directamente de la estructura CSR."""
+        return self.matrix.indices[self.matrix.indptr[position]:self.matrix.indptr[position + 1]]
+
+    def shared_keywords(self, author_a, author_b):
+        """
+        Sorted list of the keywords shared by two authors.
+        """
+        return self._shared(self.positions[author_a], self.positions[author_b])
+
+    def _shared(self, position_a, position_b):
+        common = np.intersect1d(self._row(position_a), self._row(position_b), assume_unique=True)
+        return sorted(self.vocabulary[k] for k in common.tolist())
+
+    def edges(self, node_ids, min_shared=1, top_k=DEFAULT_TOP_K):
+        """
+        Keyword edges between the given authors.
+
+        Args:
+            node_ids (list[str]): Author ids (gesbib_id) of the graph, in display order.
+            min_shared (int): Minimum number of shared keywords for an edge.
+            top_k (int | None): If set, only the ``top_k`` strongest edges of each
+                node are kept (an edge survives if it is in the top of either end).
+
+        Returns:
+            list[dict]: ``{'source', 'target', 'weight', 'title'}`` dicts, ordered
+            by the position of the nodes in ``node_ids``. The list is shared by the
+            requests with the same arguments and must not be modified.
+        """
+        key = (tuple(node_ids), min_shared, top_k)
+        with self._edges_lock:
+            if key in self._edges:
+                self._edges.move_to_end(key)
+                return self._edges[key]
+        edges = self._compute_edges(node_ids, min_shared, top_k)
+        with self._edges_lock:
+            self._edges[key] = edges
+            while len(self._edges) > EDGE_CACHE_SIZE:
+                self._edges.popitem(last=False)
+        return edges
+
+    def _compute_edges(self, node_ids, min_shared, top_k):
+        present = [(self.positions[node], node) for node in node_ids if node in self.positions]
+        if len(present) < 2:
+            return []
+        sub = self.matrix[[position for position, _ in present]]
+        shared = (sub @ sub.T).tocoo()
+
+        # Pares distintos con suficientes keywords en común (en ambos sentidos)
+        mask = (shared.row != shared.col) & (shared.data >= max(min_shared, 1))
+        rows, cols, weights = shared.row[mask], shared.col[mask], shared.data[mask]
+
+        if top_k:
+            # Ordenar los vecinos de cada nodo por peso descendente y quedarse con los k primeros
+            order = np.lexsort((cols, -weights, rows))
+            rows, cols, weights = rows[order], cols[order], weights[order]
+            starts = np.searchsorted(rows, rows, side='left')
+            keep = (np.arange(len(rows)) - starts) < top_k
+            rows, cols, weights = rows[keep], cols[keep], weights[keep]
+
+        pairs = {}
+        for r, c, w in zip(rows.tolist(), cols.tolist(), weights.tolist()):
+            pairs[(min(r, c), max(r, c))] = w
+
+        edges = []
+        for (r, c) in sorted(pairs):
+            (position_a, source), (position_b, target) = present[r], present[c]
+            keywords = self._shared(position_a, position_b)
+            edges.append({
+                'source': source,
+                'target': target,
+                'weight': pairs[(r, c)],
+                'title': f"Keywords compartidas: {', '.join(keywords)}"
+            })
+        return edges
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_keyword_similarity():
+    """
+    Returns the keyword matrix for the current data version, rebuilding it if stale.
+
+    Returns:
+        KeywordSimilarity: Matrix shared by all the requests of this process.
+    """
+    global _index
+    version = DataVersion.current()
+    index = _index
+    if index is None or index.version != version:
+        with _lock:
+            if _index is None or _index.version != version:
+                _index = KeywordSimilarity.build(version)
+            index = _index
+    return index
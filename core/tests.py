@@ -1,3 +1,213 @@
+"""
+Query plan and query count regression tests for the dashboard queries.
+
+Every query is run through SQLite's ``EXPLAIN QUERY PLAN``; a ``SCAN`` of a table
+means it is read completely, which on the real corpus turns a lookup into a full
+pass over publications, authors, metrics or a relation table. The tests fail
+when one of the indexes behind these access paths is missing (see the indexes of
+bibliodata.models and migration 0029_index_audit).
+
+The endpoints are also requested with two corpus sizes: the number of queries
+must not grow with the number of publications (no N+1 lookups).
+"""
+
+import re
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import F
 from django.test import TestCase
 
-# Create your tests here.
+from bibliodata.models import (
+    Author, Collaboration, Institution, Publication, PublicationMetric, PublicationType, ThematicArea,
+)
+from bibliodata.search import index_publications
+from core.aggregates import _area_count, combined_area_counts, filter_publications
+from core.cache import dashboard_cache
+from core.metrics import LATEST_METRICS, latest_metric_value, latest_metrics
+
+# "SCAN <tabla>" (con o sin índice) recorre la tabla o el índice entero
+FULL_SCAN_RE = re.compile(r'\bSCAN (?!CONSTANT ROW|\()(\S+)')
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is specific to SQLite')
+class DashboardQueryPlanTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.area = ThematicArea.objects.create(name='Biología Molecular')
+        cls.institution = Institution.objects.create(gesbib_id=1, name='Universidad de Granada')
+        cls.pub_type = PublicationType.objects.create(name='Artículo')
+        cls.author = Author.objects.create(gesbib_id='A1', name='García López, Ana')
+        cls.coauthor = Author.objects.create(gesbib_id='A2', name='Pérez Ruiz, Juan')
+        Collaboration.objects.create(author=cls.author, collaborator=cls.coauthor, publication_count=1)
+
+        for year in (2019, 2020, 2021):
+            pub = Publication.objects.create(gb_id=f'P{year}', title=f'Publicación {year}', year=year, month=6)
+            pub.thematic_areas.add(cls.area)
+            pub.predicted_thematic_areas.add(cls.area)
+            pub.institutions.add(cls.institution)
+            pub.publication_types.add(cls.pub_type)
+            pub.authors.add(cls.author)
+            for metric_year in (year, year + 1):
+                PublicationMetric.objects.create(
+                    publication=pub, source='wos', metric_type='citations', year=metric_year, impact_factor=1.0,
+                )
+
+    def assertNoFullScan(self, query, allowed=()):
+        """Fails if the plan of the queryset reads a whole table other than the allowed ones."""
+        plan = query.explain()
+        scanned = [table for table in FULL_SCAN_RE.findall(plan) if table not in allowed]
+        self.assertFalse(scanned, f'Recorrido completo de {scanned}:\n{query.query}\n{plan}')
+
+    def test_year_range(self):
+        query = filter_publications(year_from=2019, year_to=2020)
+        self.assertNoFullScan(query.values('year'))
+        self.assertNoFullScan(query.order_by('-year', '-publication_date', 'id')[:20])
+
+    def test_area_filter(self):
+        self.assertNoFullScan(filter_publications(areas=[self.area.name]).values('id'))
+
+    def test_institution_filter(self):
+        self.assertNoFullScan(filter_publications(institutions=[self.institution.name]).values('id'))
+
+    def test_type_filter(self):
+        self.assertNoFullScan(filter_publications(types=[self.pub_type.name]).values('id'))
+
+    def test_author_filter(self):
+        self.assertNoFullScan(filter_publications(author=self.author.name).values('id'))
+
+    def test_author_lookup(self):
+        self.assertNoFullScan(Author.objects.filter(name=self.author.name))
+        self.assertNoFullScan(Author.objects.filter(name__iexact=self.author.name.upper()))
+
+    def test_collaborations_of_author(self):
+        query = Collaboration.objects.filter(author=self.author) | Collaboration.objects.filter(collaborator=self.author)
+        self.assertNoFullScan(query)
+
+    def test_latest_metric_sort(self):
+        query = filter_publications(year_from=2019).annotate(sort_value=latest_metric_value('WoS Citations'))
+        self.assertNoFullScan(query.order_by('-sort_value', 'id')[:20])
+
+    def test_latest_metrics_of_page(self):
+        ids = list(Publication.objects.values_list('id', flat=True))
+        with self.assertNumQueries(1):
+            metrics = latest_metrics(ids)
+        self.assertEqual({m['WoS Citations']['year'] for m in metrics.values()}, {2020, 2021, 2022})
+        pairs = set(LATEST_METRICS.values())
+        query = PublicationMetric.objects.filter(
+            publication_id__in=ids,
+            source__in={s for s, _ in pairs},
+            metric_type__in={m for _, m in pairs},
+        ).order_by('publication_id', 'source', 'metric_type', '-year')
+        self.assertNoFullScan(query)
+
+    def test_combined_area_counts(self):
+        # La consulta recorre las áreas (una fila por área); las tablas intermedias se consultan por índice
+        query = filter_publications(year_from=2020)
+        with self.assertNumQueries(1):
+            counts = combined_area_counts(query)
+        self.assertEqual(counts, [(self.area.name, 4)])
+
+        publication_ids = query.order_by().values('id')
+        areas = ThematicArea.objects.annotate(
+            normal=_area_count(Publication.thematic_areas.through, publication_ids),
+            predicted=_area_count(Publication.predicted_thematic_areas.through, publication_ids),
+        ).annotate(total=F('normal') + F('predicted'))
+        self.assertNoFullScan(areas, allowed=('bibliodata_thematicarea',))
+
+
+def create_publications(count, area, institution, pub_type, authors):
+    """Adds count publications with their relations and two years of metrics each, and reindexes them."""
+    start = Publication.objects.count()
+    for i in range(start, start + count):
+        pub = Publication.objects.create(
+            gb_id=f'Q{i}', title=f'Tuberculosis publicación {i}', year=2000 + i % 20, month=i % 12 + 1,
+            abstract='Resistencia a fármacos en tuberculosis.',
+        )
+        pub.thematic_areas.add(area)
+        pub.institutions.add(institution)
+        pub.publication_types.add(pub_type)
+        pub.authors.add(*authors)
+        for metric_year in (2022, 2023):
+            PublicationMetric.objects.create(
+                publication=pub, source='wos', metric_type='citations', year=metric_year, impact_factor=float(i),
+            )
+    index_publications()
+
+
+class EndpointQueryCountTests(TestCase):
+    # Publicaciones del corpus pequeño; el grande tiene el doble (más de una página de 20)
+    SIZE = 30
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('analista@ugr.es', password='analista', is_active=True)
+        cls.area = ThematicArea.objects.create(name='Microbiología')
+        cls.institution = Institution.objects.create(gesbib_id=1, name='Universidad de Granada')
+        cls.pub_type = PublicationType.objects.create(name='Artículo de revista')
+        cls.authors = [
+            Author.objects.create(gesbib_id='A1', name='García López, Ana'),
+            Author.objects.create(gesbib_id='A2', name='Pérez Ruiz, Juan'),
+        ]
+        create_publications(1, cls.area, cls.institution, cls.pub_type, cls.authors)
+        cls.publication = Publication.objects.get()
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def assertQueriesPerCorpusSize(self, num, request):
+        """
+        Calls request() with SIZE and 2 * SIZE publications and checks that both
+        calls run num queries. The cache is cleared after a first unmeasured call,
+        so the measured one computes everything again.
+
+        Returns:
+            HttpResponse: The response with the large corpus.
+        """
+        for total in (self.SIZE, 2 * self.SIZE):
+            create_publications(
+                total - Publication.objects.count(), self.area, self.institution, self.pub_type, self.authors,
+            )
+            request()
+            dashboard_cache().clear()
+            with self.subTest(publications=total), self.assertNumQueries(num):
+                response = request()
+                if response.streaming:
+                    # Las exportaciones consultan la base de datos mientras se envían
+                    b''.join(response.streaming_content)
+            self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_sorted_publications_page(self):
+        # Sesión, usuario, versión de los datos (clave de la respuesta y del total), total,
+        # página y métricas de la página
+        url = '/en/api/dashboard/publications/'
+        self.assertQueriesPerCorpusSize(7, lambda: self.client.get(url, {
+            'sort_by': 'WoS Citations', 'sort_order': 'desc', 'areas': self.area.name,
+        }))
+        # Otra ordenación de los mismos filtros reutiliza el total cacheado (sin COUNT)
+        with self.assertNumQueries(6):
+            response = self.client.get(url, {'sort_by': 'RCR', 'sort_order': 'asc', 'areas': self.area.name})
+        self.assertEqual(response.json()['publications']['pagination']['total_items'], 2 * self.SIZE)
+
+    def test_publications_page(self):
+        self.assertQueriesPerCorpusSize(7, lambda: self.client.get('/en/api/dashboard/publications/'))
+
+    def test_search(self):
+        # Sesión, usuario, búsqueda en el índice, publicaciones, autores, instituciones y áreas
+        response = self.assertQueriesPerCorpusSize(7, lambda: self.client.get('/en/api/search/', {'q': 'tuberculosis'}))
+        results = response.json()['results']
+        self.assertEqual(len(results), 50)
+        self.assertIn('<mark>', results[0]['snippet'])
+
+    def test_publication_detail(self):
+        # Sesión, usuario, publicación, autores, instituciones, áreas y métricas
+        self.assertQueriesPerCorpusSize(7, lambda: self.client.get(f'/en/publication/{self.publication.id}/'))
+
+    def test_export(self):
+        # Sesión, usuario, ids del lote y, por lote, publicaciones, autores, instituciones, áreas y métricas
+        self.assertQueriesPerCorpusSize(8, lambda: self.client.get('/en/api/export/report/', {
+            'format': 'csv', 'areas': self.area.name,
+        }))
@@ -14,4 +14,7 @@ urlpatterns = [
     path('api/author/metrics/', views.get_author_metrics, name='get_author_metrics'),
     path('publication/<int:publication_id>/', views.publication_detail, name='publication_detail'),
     path('api/export/report/', views.export_report, name='export_report'),
+    path('api/export/report/<uuid:token>/', views.report_job_status, name='report_job_status'),
+    path('api/export/report/<uuid:token>/download/', views.report_job_download, name='report_job_download'),
+    path('api/debug/requests/', views.get_request_profiles, name='request_profiles'),
 ] 
\ No newline at end of file
@@ -552,6 +552,7 @@ export function initFiltersAndSearch() {
                         <h6 class="card-subtitle mb-2 text-muted">
                             ${result.year} - ${result.publication_type}
                         </h6>
+                        ${result.snippet ? `<p class="card-text small fst-italic">${result.snippet}</p>` : ''}
                         <p class="card-text">
                             <strong>Autores:</strong> ${result.authors.join(', ')}<br>
                             <strong>Instituciones:</strong> ${result.institutions.join(', ')}<br>
@@ -749,22 +750,9 @@ export function initFiltersAndSearch() {
             types: Array.from(selectedTypesList)
         };
 
-        // Determinar si se puede usar la vista mensual
-        const canUseMonthly = filters.year_from && filters.year_to && filters.year_from === filters.year_to;
-        const monthlyBtn = document.querySelector('[data-view="monthly"]');
-        const yearlyBtn = document.querySelector('[data-view="yearly"]');
-        
-        // Actualizar estado de los botones
-        monthlyBtn.disabled = !canUseMonthly;
-        if (!canUseMonthly) {
-            // Si no se puede usar mensual, forzar vista anual
-            monthlyBtn.classList.remove('active');
-            yearlyBtn.classList.add('active');
-            filters.view_type = 'yearly';
-        } else {
-            // Si se puede usar mensual, usar el botón activo
-            filters.view_type = monthlyBtn.classList.contains('active') ? 'monthly' : 'yearly';
-        }
+        // Vista de la línea temporal: anual, mensual o trimestral (cualquier rango de años)
+        const activeViewBtn = document.querySelector('[data-view].active');
+        filters.view_type = activeViewBtn ? activeViewBtn.dataset.view : 'yearly';
 
         // Construir la URL con los parámetros de filtrado
         const params = new URLSearchParams();
@@ -792,6 +780,7 @@ export function initFiltersAndSearch() {
 
                 fetch(`/api/dashboard/collaboration-network/?${networkParams.toString()}`)
                 .then(response => response.json())
+                .then(decodeNetworkData)
                 .then(data => {
                     updateCollaborationNetwork(data);
                 })
@@ -830,7 +819,7 @@ export function initFiltersAndSearch() {
         direction: 'desc'
     };
 
-    function updatePublicationsTable(page = 1) {
+    function updatePublicationsTable(page = 1, cursor = null) {
         const tableBody = document.getElementById('metricsTable');
         const pagination = document.getElementById('publicationsPagination');
         const table = tableBody.closest('table');
@@ -886,6 +875,10 @@ export function initFiltersAndSearch() {
         filters.institutions.forEach(institution => params.append('institutions', institution));
         filters.types.forEach(type => params.append('types', type));
         params.append('page', filters.page);
+        // Cursor de la página siguiente (paginación por keyset)
+        if (cursor) {
+            params.append('cursor', cursor);
+        }
         
         // Añadir el autor seleccionado si existe
         if (selectedAuthorName) {
@@ -1026,7 +1019,7 @@ export function initFiltersAndSearch() {
 
                     paginationHTML += `
                         <li class="page-item ${paginationData.current_page === paginationData.total_pages ? 'disabled' : ''}">
-                            <a class="page-link" href="#" data-page="${paginationData.current_page + 1}">&gt;</a>
+                            <a class="page-link" href="#" data-page="${paginationData.current_page + 1}" data-cursor="${paginationData.next_cursor || ''}">&gt;</a>
                         </li>
                         <li class="page-item ${paginationData.current_page === paginationData.total_pages ? 'disabled' : ''}">
                             <a class="page-link" href="#" data-page="${paginationData.total_pages}">&raquo;</a>
@@ -1044,7 +1037,7 @@ export function initFiltersAndSearch() {
                         e.preventDefault();
                         const page = parseInt(this.dataset.page);
                         if (!isNaN(page)) {
-                            updatePublicationsTable(page);
+                            updatePublicationsTable(page, this.dataset.cursor || null);
                         }
                     });
                 });
@@ -1098,12 +1091,28 @@ export function initFiltersAndSearch() {
             .append('g')
             .attr('transform', `translate(${margin.left},${margin.top})`);
 
+        // Periodos por año y posición de cada punto en el eje X
+        const periodsPerYear = viewType === 'monthly' ? 12 : viewType === 'quarterly' ? 4 : 1;
+        const firstYear = d3.min(data, d => d.year);
+        const singleYear = firstYear === d3.max(data, d => d.year);
+        const shortMonths = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun', 'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic'];
+        const longMonths = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
+                            'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre'];
+        const periodOf = d => viewType === 'monthly' ? d.month : d.quarter;
+        const xValue = d => periodsPerYear === 1 ? d.year : (d.year - firstYear) * periodsPerYear + periodOf(d);
+        const periodLabel = (d, long) => {
+            const period = viewType === 'monthly'
+                ? (long ? longMonths : shortMonths)[d.month - 1]
+                : `T${d.quarter}`;
+            return singleYear ? period : `${period} ${d.year}`;
+        };
+
         // Escalas
         let x;
-        if (viewType === 'monthly') {
-            // Escala para meses
+        if (periodsPerYear > 1) {
+            // Escala para meses o trimestres
             x = d3.scaleLinear()
-                .domain([1, 12])
+                .domain(d3.extent(data, xValue))
                 .range([0, width]);
         } else {
             // Escala para años
@@ -1119,13 +1128,12 @@ export function initFiltersAndSearch() {
 
         // Ejes
         let xAxis;
-        if (viewType === 'monthly') {
+        if (periodsPerYear > 1) {
+            // Como mucho unas 12 marcas, siempre sobre periodos enteros
+            const step = Math.max(1, Math.ceil(data.length / 12));
             xAxis = d3.axisBottom(x)
-                .ticks(12)
-                .tickFormat(d => {
-                    const months = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun', 'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic'];
-                    return months[d - 1];
-                });
+                .tickValues(data.filter((d, i) => i % step === 0).map(xValue))
+                .tickFormat((value, i) => periodLabel(data[i * step]));
         } else {
             xAxis = d3.axisBottom(x)
                 .ticks(width / 80)
@@ -1147,13 +1155,13 @@ export function initFiltersAndSearch() {
 
         // Línea
         const line = d3.line()
-            .x(d => viewType === 'monthly' ? x(d.month) : x(d.year))
+            .x(d => x(xValue(d)))
             .y(d => y(d.count))
             .curve(d3.curveMonotoneX);
 
         // Área
         const area = d3.area()
-            .x(d => viewType === 'monthly' ? x(d.month) : x(d.year))
+            .x(d => x(xValue(d)))
             .y0(height)
             .y1(d => y(d.count))
             .curve(d3.curveMonotoneX);
@@ -1208,7 +1216,7 @@ export function initFiltersAndSearch() {
             .enter()
             .append('circle')
             .attr('class', 'point')
-            .attr('cx', d => viewType === 'monthly' ? x(d.month) : x(d.year))
+            .attr('cx', d => x(xValue(d)))
             .attr('cy', d => y(d.count))
             .attr('r', 5)
             .attr('fill', '#2196f3')
@@ -1222,10 +1230,8 @@ export function initFiltersAndSearch() {
                 tooltip.style.opacity = 1;
                 
                 let tooltipContent;
-                if (viewType === 'monthly') {
-                    const months = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio', 
-                                  'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre'];
-                    tooltipContent = `<b>${months[d.month - 1]}</b><br><b>Publicaciones:</b> ${d.count}`;
+                if (periodsPerYear > 1) {
+                    tooltipContent = `<b>${periodLabel(d, true)}</b><br><b>Publicaciones:</b> ${d.count}`;
                 } else {
                     tooltipContent = `<b>Año:</b> ${d.year}<br><b>Publicaciones:</b> ${d.count}`;
                 }
@@ -1273,11 +1279,9 @@ export function initFiltersAndSearch() {
                 
                 // Mostrar el nuevo info box
                 let infoBoxContent;
-                if (viewType === 'monthly') {
-                    const months = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio', 
-                                  'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre'];
+                if (periodsPerYear > 1) {
                     infoBoxContent = `
-                        <div style="font-weight: bold; margin-bottom: 5px;">${months[d.month - 1]}</div>
+                        <div style="font-weight: bold; margin-bottom: 5px;">${periodLabel(d, true)}</div>
                         <div>Publicaciones: ${d.count}</div>
                     `;
                 } else {
@@ -1330,10 +1334,10 @@ export function initFiltersAndSearch() {
             .attr('dy', '1em')
             .style('text-anchor', 'middle')
             .style('font-size', '12px')
-            .text(viewType === 'monthly' ? 'Mes' : 'Año');
+            .text(viewType === 'monthly' ? 'Mes' : viewType === 'quarterly' ? 'Trimestre' : 'Año');
 
         // Añadir mensaje informativo sobre publicaciones sin mes
-        if (viewType === 'monthly' && timelineInfo && timelineInfo.no_month_count > 0) {
+        if (periodsPerYear > 1 && timelineInfo && timelineInfo.no_month_count > 0) {
             const infoMessage = d3.select('#timelineChart')
                 .append('div')
                 .attr('class', 'alert alert-info')
@@ -1359,7 +1363,7 @@ export function initFiltersAndSearch() {
                 <div style="flex-grow: 1;">
                     <i class="fas fa-info-circle"></i>
                     ${timelineInfo.no_month_count} publicación(es) sin mes asignado 
-                    se han contabilizado en enero
+                    se han contabilizado en ${viewType === 'monthly' ? 'enero' : 'el primer trimestre'}
                 </div>
                 <button type="button" class="btn-close" style="font-size: 0.7rem;" aria-label="Close"></button>
             `);
@@ -1751,6 +1755,92 @@ export function initFiltersAndSearch() {
     window.currentClusteringModel = null;
     window.currentNClusters = null;
     let isFullNetwork = false;
+    // Nivel de detalle de la red completa (reducciones LOD calculadas en el servidor)
+    let networkDetail = 'all';
+    // Comunidad de un supernodo en la que se ha hecho drill-down ({community, communityField})
+    let networkDrillDown = null;
+
+    function networkDetailParams() {
+        if (networkDrillDown) return networkDrillDown;
+        if (networkDetail === 'strong') return { minWeight: 2 };
+        if (networkDetail === 'top') return { topN: 300, topBy: 'weight' };
+        if (networkDetail === 'communities') {
+            return { aggregate: window.currentCommunityView === 'modularity-5' ? 'leiden' : 'lovaina' };
+        }
+        return {};
+    }
+
+    // Solo la red completa admite reducciones; la vista de palabras clave se calcula aparte
+    function appendNetworkDetail(params) {
+        if (!isFullNetwork || window.currentCommunityView === 'keywords') return;
+        Object.entries(networkDetailParams()).forEach(([name, value]) => params.append(name, value));
+    }
+
+    function updateNetworkDetailVisibility() {
+        const wrapper = document.getElementById('networkDetailDropdownWrapper');
+        if (!wrapper) return;
+        wrapper.style.display = isFullNetwork && window.currentCommunityView !== 'keywords' ? 'block' : 'none';
+    }
+
+    // Recargar la red completa con el nivel de detalle actual
+    function reloadFullNetwork() {
+        const container = document.getElementById('collaborationNetwork');
+        const loadingOverlay = document.createElement('div');
+        loadingOverlay.style.cssText = `
+            position: absolute;
+            top: 0;
+            left: 0;
+            width: 100%;
+            height: 100%;
+            background: rgba(255, 255, 255, 0.8);
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            z-index: 1000;
+            border-radius: inherit;
+        `;
+        loadingOverlay.innerHTML = `
+            <div class="spinner-border text-primary" role="status">
+                <span class="visually-hidden">${window.location.pathname.split('/')[1] === 'es' ? 'Cargando...' : 'Loading...'}</span>
+            </div>
+        `;
+        container.appendChild(loadingOverlay);
+
+        const params = new URLSearchParams({
+            communityView: window.currentCommunityView,
+            fullNetwork: isFullNetwork
+        });
+        appendNetworkDetail(params);
+
+        fetch(`/api/dashboard/collaboration-network/?${params.toString()}`)
+            .then(response => response.json())
+            .then(decodeNetworkData)
+            .then(data => {
+                if (data.error) {
+                    console.error('Error desde backend:', data.error);
+                    return;
+                }
+                window.currentNetworkData = data;
+                updateCollaborationNetwork(data);
+            })
+            .catch(error => {
+                console.error('Error en la petición fetch:', error);
+            })
+            .finally(() => {
+                loadingOverlay.remove();
+            });
+    }
+
+    document.querySelectorAll('.dropdown-item.network-detail').forEach(item => {
+        item.addEventListener('click', function(e) {
+            e.preventDefault();
+            networkDetail = this.dataset.networkDetail;
+            networkDrillDown = null;
+            document.querySelectorAll('.dropdown-item.network-detail').forEach(link => link.classList.remove('active'));
+            this.classList.add('active');
+            reloadFullNetwork();
+        });
+    });
 
 
     // Event listeners para las opciones del menú desplegable de vista de comunidad
@@ -1786,6 +1876,42 @@ export function initFiltersAndSearch() {
         });
     });
 
+    // Layout precalculado en el servidor para cada vista de comunidades
+    function layoutForCommunityView(view) {
+        if (view === 'department') return 'department';
+        if (view === 'modularity-5') return 'leiden';
+        return 'lovaina';
+    }
+
+    // Las redes generales llegan en formato columnar (arrays paralelos de nodos y aristas):
+    // se convierten a la lista de objetos que espera vis-network
+    function decodeNetworkData(data) {
+        if (!data || data.format !== 'columnar') {
+            return data;
+        }
+        const n = data.nodes;
+        const layout = data.layouts ? data.layouts[layoutForCommunityView(window.currentCommunityView)] : null;
+        const nodes = n.id.map((id, i) => ({
+            id: id,
+            label: n.label[i],
+            x: layout ? layout.x[i] : null,
+            y: layout ? layout.y[i] : null,
+            is_selected: false,
+            community: n.lovaina_community[i],
+            department: n.department[i] >= 0 ? data.departments[n.department[i]] : null,
+            leiden_community: n.leiden_community[i],
+            lovaina_community: n.lovaina_community[i],
+            member_count: n.member_count ? n.member_count[i] : null
+        }));
+        const e = data.edges;
+        const edges = e.source.map((s, i) => ({
+            source: n.id[s],
+            target: n.id[e.target[i]],
+            weight: e.weight[i]
+        }));
+        return { nodes: nodes, edges: edges, is_author_view: false, has_layout: !!layout };
+    }
+
     function updateCollaborationNetwork(data) {
         const container = document.getElementById('collaborationNetwork');
         if (!container) return;
@@ -1933,7 +2059,8 @@ export function initFiltersAndSearch() {
                 node.x = centerX + radius * Math.cos(angle);
                 node.y = centerY + radius * Math.sin(angle);
             });
-        } else {
+        } else if (!data.has_layout) {
+            // Sin posiciones del servidor (vista por palabras clave): agrupar por comunidad en círculos
             let groupByProp;
             if (window.currentCommunityView === 'department') {
                 groupByProp = 'department';
@@ -1993,10 +2120,12 @@ export function initFiltersAndSearch() {
                 label: node.label,
                 x: node.x,
                 y: node.y,
-                size: node.is_selected ? 18 : 12,
+                // Los supernodos (red agregada por comunidades) crecen con su número de autores
+                size: node.member_count ? Math.min(40, 10 + 3 * Math.sqrt(node.member_count)) : (node.is_selected ? 18 : 12),
                 color: nodeColor,
                 highlighted: node.is_selected,
-                forceLabel: showAllLabels
+                forceLabel: showAllLabels,
+                memberCount: node.member_count || 0
             });
         });
     
@@ -2215,6 +2344,16 @@ export function initFiltersAndSearch() {
                     graph.setEdgeAttribute(e, 'hidden', !visible);
                 });
             });
+
+            // Clic en un supernodo: drill-down en los autores de esa comunidad
+            renderer.on('clickNode', ({ node }) => {
+                if (!graph.getNodeAttribute(node, 'memberCount')) return;
+                const separator = node.indexOf(':');
+                const label = node.slice(separator + 1);
+                if (separator < 0 || label === 'none') return;
+                networkDrillDown = { community: label, communityField: node.slice(0, separator) };
+                reloadFullNetwork();
+            });
     
             renderer.on('leaveNode', () => {
                 tooltip.style.display = 'none';
@@ -2260,6 +2399,7 @@ export function initFiltersAndSearch() {
         // === HACER LA PETICIÓN AL BACKEND ===
         fetch(`/api/dashboard/collaboration-network/?${params.toString()}`)
             .then(response => response.json())
+            .then(decodeNetworkData)
             .then(data => {
                 if (data.error) {
                     console.error('Error desde backend:', data.error);
@@ -2442,6 +2582,7 @@ export function initFiltersAndSearch() {
         
         // Cambiar el estado de la red
         isFullNetwork = !isFullNetwork;
+        networkDrillDown = null;
         
         // Actualizar el texto del botón
         button.textContent = currentLang === 'es' 
@@ -2466,6 +2607,7 @@ export function initFiltersAndSearch() {
             params.append('autoMode', 'true');
             params.append('globalMode', 'true');
         }
+        appendNetworkDetail(params);
 
         // Actualizar las opciones del menú desplegable
         const dropdownItems = document.querySelectorAll('.network-community-view');
@@ -2478,6 +2620,7 @@ export function initFiltersAndSearch() {
 
         fetch(`/api/dashboard/collaboration-network/?${params.toString()}`)
             .then(response => response.json())
+            .then(decodeNetworkData)
             .then(data => {
                 if (data.error) {
                     console.error('Error desde backend:', data.error);
@@ -2516,6 +2659,7 @@ export function initFiltersAndSearch() {
                 loadingOverlay.remove();
                 // Habilitar el botón
                 button.disabled = false;
+                updateNetworkDetailVisibility();
             });
     });
 
@@ -2539,6 +2683,8 @@ export function initFiltersAndSearch() {
                 const currentLang = window.location.pathname.split('/')[1];
                 toggleFullNetworkBtn.textContent = currentLang === 'es' ? 'Mostrar Red Completa' : 'Show Full Network';
             }
+            networkDrillDown = null;
+            updateNetworkDetailVisibility();
 
             // Ocultar el botón de red completa para ciertas vistas en modo IPs
             const toggleFullNetworkBtn = document.getElementById('toggleFullNetworkBtn');
@@ -2583,9 +2729,11 @@ export function initFiltersAndSearch() {
                 params.append('autoMode', 'true');
                 params.append('globalMode', 'true');
             }
+            appendNetworkDetail(params);
 
             fetch(`/api/dashboard/collaboration-network/?${params.toString()}`)
                 .then(response => response.json())
+                .then(decodeNetworkData)
                 .then(data => {
                     if (data.error) {
                         console.error('Error desde backend:', data.error);
@@ -2660,6 +2808,7 @@ export function initFiltersAndSearch() {
             btn.addEventListener('click', function() {
                 showAreasLoading();
                 includePredictedAreas = !includePredictedAreas;
+                window.includePredictedAreas = includePredictedAreas; // Para el informe exportado
                 updatePredictedAreasBtnText();
                 updateVisualizations();
             });
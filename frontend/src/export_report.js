@@ -12,9 +12,15 @@ export function setupExportReportButton() {
             cancel: 'Cancelar',
             prompt: 'Pulse para continuar.',
             loading: 'Generando informe...',
+            pending: 'El informe sigue en cola: el generador de informes no lo ha empezado todavía...',
+            timeout: 'El informe está tardando demasiado. Inténtelo de nuevo más tarde.',
             pdf: 'PDF',
             html: 'HTML (próximamente...)',
-            csv: 'CSV (próximamente...)',
+            csv: 'CSV',
+            xlsx: 'Excel',
+            parquet: 'Parquet',
+            bibtex: 'BibTeX',
+            ris: 'RIS',
             soon: 'Próximamente...'
         },
         en: {
@@ -24,9 +30,15 @@ export function setupExportReportButton() {
             cancel: 'Cancel',
             prompt: 'Click to continue.',
             loading: 'Generating report...',
+            pending: 'The report is still queued: the report generator has not started it yet...',
+            timeout: 'The report is taking too long. Please try again later.',
             pdf: 'PDF',
             html: 'HTML (coming soon...)',
-            csv: 'CSV (coming soon...)',
+            csv: 'CSV',
+            xlsx: 'Excel',
+            parquet: 'Parquet',
+            bibtex: 'BibTeX',
+            ris: 'RIS',
             soon: 'Coming soon...'
         }
     };
@@ -48,13 +60,21 @@ export function setupExportReportButton() {
                     </div>
                     <div class="modal-body">
                         <p>${t.message}</p>
-                        <div class="btn-group w-100 mb-3" role="group" aria-label="Export format">
+                        <div class="btn-group flex-wrap w-100 mb-3" role="group" aria-label="Export format">
                             <input type="radio" class="btn-check" name="exportFormat" id="exportFormatPDF" value="pdf" autocomplete="off" checked>
                             <label class="btn btn-outline-primary" for="exportFormatPDF">${t.pdf}</label>
+                            <input type="radio" class="btn-check" name="exportFormat" id="exportFormatCSV" value="csv" autocomplete="off">
+                            <label class="btn btn-outline-primary" for="exportFormatCSV">${t.csv}</label>
+                            <input type="radio" class="btn-check" name="exportFormat" id="exportFormatXLSX" value="xlsx" autocomplete="off">
+                            <label class="btn btn-outline-primary" for="exportFormatXLSX">${t.xlsx}</label>
+                            <input type="radio" class="btn-check" name="exportFormat" id="exportFormatParquet" value="parquet" autocomplete="off">
+                            <label class="btn btn-outline-primary" for="exportFormatParquet">${t.parquet}</label>
+                            <input type="radio" class="btn-check" name="exportFormat" id="exportFormatBibTeX" value="bibtex" autocomplete="off">
+                            <label class="btn btn-outline-primary" for="exportFormatBibTeX">${t.bibtex}</label>
+                            <input type="radio" class="btn-check" name="exportFormat" id="exportFormatRIS" value="ris" autocomplete="off">
+                            <label class="btn btn-outline-primary" for="exportFormatRIS">${t.ris}</label>
                             <input type="radio" class="btn-check" name="exportFormat" id="exportFormatHTML" value="html" autocomplete="off" disabled>
                             <label class="btn btn-outline-secondary disabled" for="exportFormatHTML">${t.html}</label>
-                            <input type="radio" class="btn-check" name="exportFormat" id="exportFormatCSV" value="csv" autocomplete="off" disabled>
-                            <label class="btn btn-outline-secondary disabled" for="exportFormatCSV">${t.csv}</label>
                         </div>
                         <p>${t.prompt}</p>
                     </div>
@@ -71,13 +91,21 @@ export function setupExportReportButton() {
         modal.querySelector('.modal-title').textContent = t.title;
         modal.querySelector('.modal-body').innerHTML = `
             <p>${t.message}</p>
-            <div class="btn-group w-100 mb-3" role="group" aria-label="Export format">
+            <div class="btn-group flex-wrap w-100 mb-3" role="group" aria-label="Export format">
                 <input type="radio" class="btn-check" name="exportFormat" id="exportFormatPDF" value="pdf" autocomplete="off" checked>
                 <label class="btn btn-outline-primary" for="exportFormatPDF">${t.pdf}</label>
+                <input type="radio" class="btn-check" name="exportFormat" id="exportFormatCSV" value="csv" autocomplete="off">
+                <label class="btn btn-outline-primary" for="exportFormatCSV">${t.csv}</label>
+                <input type="radio" class="btn-check" name="exportFormat" id="exportFormatXLSX" value="xlsx" autocomplete="off">
+                <label class="btn btn-outline-primary" for="exportFormatXLSX">${t.xlsx}</label>
+                <input type="radio" class="btn-check" name="exportFormat" id="exportFormatParquet" value="parquet" autocomplete="off">
+                <label class="btn btn-outline-primary" for="exportFormatParquet">${t.parquet}</label>
+                <input type="radio" class="btn-check" name="exportFormat" id="exportFormatBibTeX" value="bibtex" autocomplete="off">
+                <label class="btn btn-outline-primary" for="exportFormatBibTeX">${t.bibtex}</label>
+                <input type="radio" class="btn-check" name="exportFormat" id="exportFormatRIS" value="ris" autocomplete="off">
+                <label class="btn btn-outline-primary" for="exportFormatRIS">${t.ris}</label>
                 <input type="radio" class="btn-check" name="exportFormat" id="exportFormatHTML" value="html" autocomplete="off" disabled>
                 <label class="btn btn-outline-secondary disabled" for="exportFormatHTML">${t.html}</label>
-                <input type="radio" class="btn-check" name="exportFormat" id="exportFormatCSV" value="csv" autocomplete="off" disabled>
-                <label class="btn btn-outline-secondary disabled" for="exportFormatCSV">${t.csv}</label>
             </div>
             <p>${t.prompt}</p>
         `;
@@ -105,41 +133,51 @@ export function setupExportReportButton() {
         loadingOverlay.style.justifyContent = 'center';
         loadingOverlay.style.alignItems = 'center';
         loadingOverlay.style.zIndex = 2000;
-        loadingOverlay.innerHTML = `<div class="spinner-border text-primary" role="status"><span class="visually-hidden">${t.loading}</span></div><div style="margin-left: 1rem; font-size: 1.2rem;">${t.loading}</div>`;
+        loadingOverlay.innerHTML = `<div class="spinner-border text-primary" role="status"><span class="visually-hidden">${t.loading}</span></div><div id="exportReportProgress" style="margin-left: 1rem; font-size: 1.2rem;">${t.loading}</div>`;
         document.body.appendChild(loadingOverlay);
     }
 
-    // Función para convertir SVG a PNG base64 con escala
-    function svgToPngBase64(svgElement, width, height, callback, scale = 3) {
-        const svgData = new XMLSerializer().serializeToString(svgElement);
-        const svgBlob = new Blob([svgData], {type: 'image/svg+xml;charset=utf-8'});
-        const url = URL.createObjectURL(svgBlob);
-        const img = new window.Image();
-        img.onload = function() {
-            const canvas = document.createElement('canvas');
-            canvas.width = (width || img.width) * scale;
-            canvas.height = (height || img.height) * scale;
-            const ctx = canvas.getContext('2d');
-            ctx.setTransform(scale, 0, 0, scale, 0, 0);
-            ctx.drawImage(img, 0, 0);
-            const pngBase64 = canvas.toDataURL('image/png');
-            callback(pngBase64);
-            URL.revokeObjectURL(url);
-        };
-        img.src = url;
+    const progressText = loadingOverlay.querySelector('#exportReportProgress');
+
+    // El informe se genera en segundo plano: consultar su estado hasta que esté listo,
+    // avisando si sigue en cola (sin worker) y con un tiempo máximo de espera
+    const POLL_INTERVAL_MS = 1000;
+    const PENDING_NOTICE_MS = 15 * 1000;
+    const MAX_WAIT_MS = 5 * 60 * 1000;
+
+    function waitForReport(job, startedAt = Date.now()) {
+        const elapsed = Date.now() - startedAt;
+        if (job.status === 'pending' && elapsed >= PENDING_NOTICE_MS) {
+            progressText.textContent = t.pending;
+        } else {
+            progressText.textContent = `${t.loading} ${job.progress || 0}%`;
+        }
+        if (job.status === 'done') return Promise.resolve(job);
+        if (job.status === 'failed') return Promise.reject(new Error(job.error || 'Error al generar el informe'));
+        if (elapsed >= MAX_WAIT_MS) {
+            const error = new Error('Tiempo de espera agotado');
+            error.userMessage = t.timeout;
+            return Promise.reject(error);
+        }
+        return new Promise(resolve => setTimeout(resolve, POLL_INTERVAL_MS))
+            .then(() => fetch(job.status_url))
+            .then(response => {
+                if (!response.ok) throw new Error('Error al consultar el informe');
+                return response.json();
+            })
+            .then(next => waitForReport(next, startedAt));
     }
 
     // Evento para el botón de continuar
     modal.addEventListener('click', function(e) {
         if (e.target && e.target.id === 'confirmExportReport') {
             const format = document.querySelector('input[name="exportFormat"]:checked').value;
-            if (format !== 'pdf') {
-                // No hacer nada para HTML/CSV
+            if (format === 'html') {
+                // No hacer nada para HTML
                 return;
             }
             const modalInstance = bootstrap.Modal.getInstance(modal);
             modalInstance.hide();
-            loadingOverlay.style.display = 'flex';
 
             // Recoger filtros actuales del dashboard
             const yearFrom = document.getElementById('yearFrom')?.value;
@@ -176,34 +214,23 @@ export function setupExportReportButton() {
                 author = window.selectedAuthorName;
             }
 
-            // Recoger los SVG de los gráficos
-            const timelineSVG = document.querySelector('#timelineChart svg');
-            const pieSVG = document.querySelector('#areasChart svg');
-            // Para el bar chart, si está activo, es el mismo div que pie pero con otro SVG
-            let barSVG = null;
-            if (pieSVG && pieSVG.parentElement) {
-                // Si hay más de un SVG en #areasChart, el segundo es el bar
-                const svgs = document.querySelectorAll('#areasChart svg');
-                if (svgs.length > 1) {
-                    barSVG = svgs[1];
-                } else if (document.querySelector('[data-areas-view="bar"]')?.classList.contains('active')) {
-                    barSVG = pieSVG;
-                }
-            }
+            // Detectar el idioma de la URL para la API
+            const apiExportUrl = `/${lang}/api/export/report/`;
 
-            // Si solo hay un SVG, lo usamos para ambos (pie/bar) según el botón activo
-            if (!barSVG) {
-                if (document.querySelector('[data-areas-view="bar"]')?.classList.contains('active')) {
-                    barSVG = pieSVG;
-                }
+            // CSV, Excel, Parquet, BibTeX y RIS: el servidor envía el fichero en streaming
+            if (format !== 'pdf') {
+                const params = new URLSearchParams();
+                if (yearFrom) params.append('year_from', yearFrom);
+                if (yearTo) params.append('year_to', yearTo);
+                areas.forEach(area => params.append('areas', area));
+                institutions.forEach(inst => params.append('institutions', inst));
+                types.forEach(type => params.append('types', type));
+                if (author) params.append('author', author);
+                params.append('format', format);
+                window.location.href = `${apiExportUrl}?${params.toString()}`;
+                return;
             }
-
-            // LOG para depuración
-            console.log('SVGs encontrados:', {
-                timelineSVG: !!timelineSVG,
-                pieSVG: !!pieSVG,
-                barSVG: !!barSVG
-            });
+            loadingOverlay.style.display = 'flex';
 
             // Detectar la vista activa de áreas
             let areas_view = 'pie';
@@ -211,107 +238,72 @@ export function setupExportReportButton() {
                 areas_view = 'bar';
             }
 
-            // Detectar el idioma de la URL para la API
-            const apiExportUrl = `/${lang}/api/export/report/`;
+            // Vista de la línea temporal: anual, mensual o trimestral
+            const activeViewBtn = document.querySelector('[data-view].active');
+            const viewType = activeViewBtn ? activeViewBtn.dataset.view : 'yearly';
 
-            // Convertir SVGs a PNG base64 (async)
-            let imagesReady = 0;
-            const images = { timeline: null, pie: null, bar: null };
-            const checkAndSend = () => {
-                if (imagesReady === 3) {
-                    // LOG para depuración
-                    console.log('Imágenes base64 generadas:', images);
-                    // Enviar al backend
-                    const formData = new FormData();
-                    if (yearFrom) formData.append('year_from', yearFrom);
-                    if (yearTo) formData.append('year_to', yearTo);
-                    areas.forEach(area => formData.append('areas', area));
-                    institutions.forEach(inst => formData.append('institutions', inst));
-                    types.forEach(type => formData.append('types', type));
-                    if (author) formData.append('author', author);
-                    formData.append('format', 'pdf');
-                    formData.append('areas_view', areas_view);
-                    if (images.timeline) formData.append('timeline_img', images.timeline);
-                    if (images.pie) formData.append('pie_img', images.pie);
-                    if (images.bar) formData.append('bar_img', images.bar);
+            // Enviar al backend
+            const formData = new FormData();
+            if (yearFrom) formData.append('year_from', yearFrom);
+            if (yearTo) formData.append('year_to', yearTo);
+            areas.forEach(area => formData.append('areas', area));
+            institutions.forEach(inst => formData.append('institutions', inst));
+            types.forEach(type => formData.append('types', type));
+            if (author) formData.append('author', author);
+            formData.append('format', 'pdf');
+            formData.append('areas_view', areas_view);
+            // Los gráficos se dibujan en el servidor con los mismos datos del dashboard
+            formData.append('view_type', viewType);
+            if (window.includePredictedAreas) formData.append('include_predicted_areas', 'true');
 
-                    // Añadir el nombre del HTML de la red de palabras clave si corresponde
-                    if (
-                        (window.currentCommunityView === 'keywords' || (typeof currentCommunityView !== 'undefined' && currentCommunityView === 'keywords')) &&
-                        (window.currentClusteringModel || typeof currentClusteringModel !== 'undefined') &&
-                        (window.currentNClusters || typeof currentNClusters !== 'undefined')
-                    ) {
-                        const model = window.currentClusteringModel || currentClusteringModel;
-                        const nClusters = window.currentNClusters || currentNClusters;
-                        if (model && nClusters) {
-                            const modelSlug = model.toLowerCase().replace(/[^a-z0-9]/g, '');
-                            const htmlName = `${modelSlug}_k${nClusters}.html`;
-                            console.log('Enviando network_html:', htmlName);
-                            formData.append('network_html', htmlName);
-                        }
-                    }
-
-                    fetch(apiExportUrl, {
-                        method: 'POST',
-                        body: formData
-                    })
-                    .then(response => {
-                        if (!response.ok) throw new Error('Error al generar el informe');
-                        return response.blob();
-                    })
-                    .then(blob => {
-                        // Descargar el PDF
-                        const url = window.URL.createObjectURL(blob);
-                        const a = document.createElement('a');
-                        a.href = url;
-                        a.download = `Bibliometria_IPBLN_Informe.pdf`;
-                        document.body.appendChild(a);
-                        a.click();
-                        a.remove();
-                        window.URL.revokeObjectURL(url);
-                    })
-                    .catch(err => {
-                        alert(lang === 'es' ? 'Error al generar el informe' : 'Error generating report');
-                    })
-                    .finally(() => {
-                        loadingOverlay.style.display = 'none';
-                    });
+            // Añadir el nombre del HTML de la red de palabras clave si corresponde
+            if (
+                (window.currentCommunityView === 'keywords' || (typeof currentCommunityView !== 'undefined' && currentCommunityView === 'keywords')) &&
+                (window.currentClusteringModel || typeof currentClusteringModel !== 'undefined') &&
+                (window.currentNClusters || typeof currentNClusters !== 'undefined')
+            ) {
+                const model = window.currentClusteringModel || currentClusteringModel;
+                const nClusters = window.currentNClusters || currentNClusters;
+                if (model && nClusters) {
+                    const modelSlug = model.toLowerCase().replace(/[^a-z0-9]/g, '');
+                    const htmlName = `${modelSlug}_k${nClusters}.html`;
+                    console.log('Enviando network_html:', htmlName);
+                    formData.append('network_html', htmlName);
                 }
-            };
-
-            // Timeline
-            if (timelineSVG) {
-                svgToPngBase64(timelineSVG, timelineSVG.clientWidth, timelineSVG.clientHeight, (b64) => {
-                    images.timeline = b64;
-                    imagesReady++;
-                    checkAndSend();
-                }, 3);
-            } else {
-                imagesReady++;
-                checkAndSend();
-            }
-            // Pie
-            if (pieSVG) {
-                svgToPngBase64(pieSVG, pieSVG.clientWidth, pieSVG.clientHeight, (b64) => {
-                    images.pie = b64;
-                    imagesReady++;
-                    checkAndSend();
-                }, 3);
-            } else {
-                imagesReady++;
-                checkAndSend();
-            }
-            // Bar
-            if (barSVG) {
-                svgToPngBase64(barSVG, barSVG.clientWidth, barSVG.clientHeight, (b64) => {
-                    images.bar = b64;
-                    imagesReady++;
-                    checkAndSend();
-                }, 3);
-            } else {
-                imagesReady++;
-                checkAndSend();
             }
+
+            fetch(apiExportUrl, {
+                method: 'POST',
+                body: formData
+            })
+            .then(response => {
+                if (!response.ok) throw new Error('Error al generar el informe');
+                return response.json();
+            })
+            .then(waitForReport)
+            .then(job => fetch(job.download_url))
+            .then(response => {
+                if (!response.ok) throw new Error('Error al descargar el informe');
+                return response.blob();
+            })
+            .then(blob => {
+                // Descargar el PDF
+                const url = window.URL.createObjectURL(blob);
+                const a = document.createElement('a');
+                a.href = url;
+                a.download = `Bibliometria_IPBLN_Informe.pdf`;
+                document.body.appendChild(a);
+                a.click();
+                a.remove();
+                window.URL.revokeObjectURL(url);
+            })
+            .catch(err => {
+                alert(err.userMessage || (lang === 'es' ? 'Error al generar el informe' : 'Error generating report'));
+            })
+            .finally(() => {
+                loadingOverlay.style.display = 'none';
+                progressText.textContent = t.loading;
+            });
         }
     });
 } 
\ No newline at end of file
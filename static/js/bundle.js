@@ -495,65 +495,712 @@ void main() {
 
   v_color.a *= bias;
 }
-`);return r}var Na=.25,up={arrowHead:null,curvatureAttribute:"curvature",defaultCurvature:Na},Ma=WebGLRenderingContext,uo=Ma.UNSIGNED_BYTE,st=Ma.FLOAT;function Xi(e){var t=$n($n({},up),e||{}),n=t,i=n.arrowHead,r=n.curvatureAttribute,o=n.drawLabel,a=(i==null?void 0:i.extremity)==="target"||(i==null?void 0:i.extremity)==="both",s=(i==null?void 0:i.extremity)==="source"||(i==null?void 0:i.extremity)==="both",u=["u_matrix","u_sizeRatio","u_dimensions","u_pixelRatio","u_feather","u_minEdgeThickness"].concat(ci(i?["u_lengthToThicknessRatio","u_widenessToThicknessRatio"]:[]));return function(l){Qf(c,l);function c(){var d;Yf(this,c);for(var h=arguments.length,f=new Array(h),g=0;g<h;g++)f[g]=arguments[g];return d=Jf(this,c,[].concat(f)),Sa(La(d),"drawLabel",o||op(t)),d}return Kf(c,[{key:"getDefinition",value:function(){return{VERTICES:6,VERTEX_SHADER_SOURCE:sp(t),FRAGMENT_SHADER_SOURCE:ap(t),METHOD:WebGLRenderingContext.TRIANGLES,UNIFORMS:u,ATTRIBUTES:[{name:"a_source",size:2,type:st},{name:"a_target",size:2,type:st}].concat(ci(a?[{name:"a_targetSize",size:1,type:st}]:[]),ci(s?[{name:"a_sourceSize",size:1,type:st}]:[]),[{name:"a_thickness",size:1,type:st},{name:"a_curvature",size:1,type:st},{name:"a_color",size:4,type:uo,normalized:!0},{name:"a_id",size:4,type:uo,normalized:!0}]),CONSTANT_ATTRIBUTES:[{name:"a_current",size:1,type:st},{name:"a_direction",size:1,type:st}],CONSTANT_DATA:[[0,1],[0,-1],[1,1],[0,-1],[1,1],[1,-1]]}}},{key:"processVisibleItem",value:function(h,f,g,y,b){var k,x=b.size||1,_=g.x,m=g.y,v=y.x,w=y.y,C=Nt(b.color),z=(k=b[r])!==null&&k!==void 0?k:Na,O=this.array;O[f++]=_,O[f++]=m,O[f++]=v,O[f++]=w,a&&(O[f++]=y.size),s&&(O[f++]=g.size),O[f++]=x,O[f++]=z,O[f++]=C,O[f++]=h}},{key:"setUniforms",value:function(h,f){var g=f.gl,y=f.uniformLocations,b=y.u_matrix,k=y.u_pixelRatio,x=y.u_feather,_=y.u_sizeRatio,m=y.u_dimensions,v=y.u_minEdgeThickness;if(g.uniformMatrix3fv(b,!1,h.matrix),g.uniform1f(k,h.pixelRatio),g.uniform1f(_,h.sizeRatio),g.uniform1f(x,h.antiAliasingFeather),g.uniform2f(m,h.width*h.pixelRatio,h.height*h.pixelRatio),g.uniform1f(v,h.minEdgeThickness),i){var w=y.u_lengthToThicknessRatio,C=y.u_widenessToThicknessRatio;g.uniform1f(w,i.lengthToThicknessRatio),g.uniform1f(C,i.widenessToThicknessRatio)}}}]),c}(Bn)}var lp=Xi();Xi({arrowHead:Un});Xi({arrowHead:$n($n({},Un),{},{extremity:"both"})});function cp(){const e=document.getElementById("exportMetrics");if(!e)return;const t=window.location.pathname.split("/")[1]==="es"?"es":"en",i={es:{title:"Exportar informe",message:"Seleccione el formato de exportación:",continue:"Continuar",cancel:"Cancelar",prompt:"Pulse para continuar.",loading:"Generando informe...",pdf:"PDF",html:"HTML (próximamente...)",csv:"CSV (próximamente...)",soon:"Próximamente..."},en:{title:"Export report",message:"Select export format:",continue:"Continue",cancel:"Cancel",prompt:"Click to continue.",loading:"Generating report...",pdf:"PDF",html:"HTML (coming soon...)",csv:"CSV (coming soon...)",soon:"Coming soon..."}}[t];let r=document.getElementById("exportReportModal");r?(r.querySelector(".modal-title").textContent=i.title,r.querySelector(".modal-body").innerHTML=`
-            <p>${i.message}</p>
-            <div class="btn-group w-100 mb-3" role="group" aria-label="Export format">
-                <input type="radio" class="btn-check" name="exportFormat" id="exportFormatPDF" value="pdf" autocomplete="off" checked>
-                <label class="btn btn-outline-primary" for="exportFormatPDF">${i.pdf}</label>
-                <input type="radio" class="btn-check" name="exportFormat" id="exportFormatHTML" value="html" autocomplete="off" disabled>
-                <label class="btn btn-outline-secondary disabled" for="exportFormatHTML">${i.html}</label>
-                <input type="radio" class="btn-check" name="exportFormat" id="exportFormatCSV" value="csv" autocomplete="off" disabled>
-                <label class="btn btn-outline-secondary disabled" for="exportFormatCSV">${i.csv}</label>
-            </div>
-            <p>${i.prompt}</p>
-        `,r.querySelector("#confirmExportReport").textContent=i.continue,r.querySelector(".btn-secondary").textContent=i.cancel):(r=document.createElement("div"),r.id="exportReportModal",r.className="modal fade",r.setAttribute("tabindex","-1"),r.innerHTML=`
+`);return r}var Na=.25,up={arrowHead:null,curvatureAttribute:"curvature",defaultCurvature:Na},Ma=WebGLRenderingContext,uo=Ma.UNSIGNED_BYTE,st=Ma.FLOAT;function Xi(e){var t=$n($n({},up),e||{}),n=t,i=n.arrowHead,r=n.curvatureAttribute,o=n.drawLabel,a=(i==null?void 0:i.extremity)==="target"||(i==null?void 0:i.extremity)==="both",s=(i==null?void 0:i.extremity)==="source"||(i==null?void 0:i.extremity)==="both",u=["u_matrix","u_sizeRatio","u_dimensions","u_pixelRatio","u_feather","u_minEdgeThickness"].concat(ci(i?["u_lengthToThicknessRatio","u_widenessToThicknessRatio"]:[]));return function(l){Qf(c,l);function c(){var d;Yf(this,c);for(var h=arguments.length,f=new Array(h),g=0;g<h;g++)f[g]=arguments[g];return d=Jf(this,c,[].concat(f)),Sa(La(d),"drawLabel",o||op(t)),d}return Kf(c,[{key:"getDefinition",value:function(){return{VERTICES:6,VERTEX_SHADER_SOURCE:sp(t),FRAGMENT_SHADER_SOURCE:ap(t),METHOD:WebGLRenderingContext.TRIANGLES,UNIFORMS:u,ATTRIBUTES:[{name:"a_source",size:2,type:st},{name:"a_target",size:2,type:st}].concat(ci(a?[{name:"a_targetSize",size:1,type:st}]:[]),ci(s?[{name:"a_sourceSize",size:1,type:st}]:[]),[{name:"a_thickness",size:1,type:st},{name:"a_curvature",size:1,type:st},{name:"a_color",size:4,type:uo,normalized:!0},{name:"a_id",size:4,type:uo,normalized:!0}]),CONSTANT_ATTRIBUTES:[{name:"a_current",size:1,type:st},{name:"a_direction",size:1,type:st}],CONSTANT_DATA:[[0,1],[0,-1],[1,1],[0,-1],[1,1],[1,-1]]}}},{key:"processVisibleItem",value:function(h,f,g,y,b){var k,x=b.size||1,_=g.x,m=g.y,v=y.x,w=y.y,C=Nt(b.color),z=(k=b[r])!==null&&k!==void 0?k:Na,O=this.array;O[f++]=_,O[f++]=m,O[f++]=v,O[f++]=w,a&&(O[f++]=y.size),s&&(O[f++]=g.size),O[f++]=x,O[f++]=z,O[f++]=C,O[f++]=h}},{key:"setUniforms",value:function(h,f){var g=f.gl,y=f.uniformLocations,b=y.u_matrix,k=y.u_pixelRatio,x=y.u_feather,_=y.u_sizeRatio,m=y.u_dimensions,v=y.u_minEdgeThickness;if(g.uniformMatrix3fv(b,!1,h.matrix),g.uniform1f(k,h.pixelRatio),g.uniform1f(_,h.sizeRatio),g.uniform1f(x,h.antiAliasingFeather),g.uniform2f(m,h.width*h.pixelRatio,h.height*h.pixelRatio),g.uniform1f(v,h.minEdgeThickness),i){var w=y.u_lengthToThicknessRatio,C=y.u_widenessToThicknessRatio;g.uniform1f(w,i.lengthToThicknessRatio),g.uniform1f(C,i.widenessToThicknessRatio)}}}]),c}(Bn)}var lp=Xi();Xi({arrowHead:Un});Xi({arrowHead:$n($n({},Un),{},{extremity:"both"})});(()=>{const __export_report=(()=>{
+function setupExportReportButton() {
+    const exportBtn = document.getElementById('exportMetrics');
+    if (!exportBtn) return;
+
+    // Detectar idioma por la URL
+    const lang = window.location.pathname.split('/')[1] === 'es' ? 'es' : 'en';
+    const texts = {
+        es: {
+            title: 'Exportar informe',
+            message: 'Seleccione el formato de exportación:',
+            continue: 'Continuar',
+            cancel: 'Cancelar',
+            prompt: 'Pulse para continuar.',
+            loading: 'Generando informe...',
+            pending: 'El informe sigue en cola: el generador de informes no lo ha empezado todavía...',
+            timeout: 'El informe está tardando demasiado. Inténtelo de nuevo más tarde.',
+            pdf: 'PDF',
+            html: 'HTML (próximamente...)',
+            csv: 'CSV',
+            xlsx: 'Excel',
+            parquet: 'Parquet',
+            bibtex: 'BibTeX',
+            ris: 'RIS',
+            soon: 'Próximamente...'
+        },
+        en: {
+            title: 'Export report',
+            message: 'Select export format:',
+            continue: 'Continue',
+            cancel: 'Cancel',
+            prompt: 'Click to continue.',
+            loading: 'Generating report...',
+            pending: 'The report is still queued: the report generator has not started it yet...',
+            timeout: 'The report is taking too long. Please try again later.',
+            pdf: 'PDF',
+            html: 'HTML (coming soon...)',
+            csv: 'CSV',
+            xlsx: 'Excel',
+            parquet: 'Parquet',
+            bibtex: 'BibTeX',
+            ris: 'RIS',
+            soon: 'Coming soon...'
+        }
+    };
+    const t = texts[lang];
+
+    // Crear el modal si no existe
+    let modal = document.getElementById('exportReportModal');
+    if (!modal) {
+        modal = document.createElement('div');
+        modal.id = 'exportReportModal';
+        modal.className = 'modal fade';
+        modal.setAttribute('tabindex', '-1');
+        modal.innerHTML = `
             <div class="modal-dialog">
                 <div class="modal-content">
                     <div class="modal-header">
-                        <h5 class="modal-title">${i.title}</h5>
+                        <h5 class="modal-title">${t.title}</h5>
                         <button type="button" class="btn-close" data-bs-dismiss="modal" aria-label="Close"></button>
                     </div>
                     <div class="modal-body">
-                        <p>${i.message}</p>
-                        <div class="btn-group w-100 mb-3" role="group" aria-label="Export format">
+                        <p>${t.message}</p>
+                        <div class="btn-group flex-wrap w-100 mb-3" role="group" aria-label="Export format">
                             <input type="radio" class="btn-check" name="exportFormat" id="exportFormatPDF" value="pdf" autocomplete="off" checked>
-                            <label class="btn btn-outline-primary" for="exportFormatPDF">${i.pdf}</label>
+                            <label class="btn btn-outline-primary" for="exportFormatPDF">${t.pdf}</label>
+                            <input type="radio" class="btn-check" name="exportFormat" id="exportFormatCSV" value="csv" autocomplete="off">
+                            <label class="btn btn-outline-primary" for="exportFormatCSV">${t.csv}</label>
+                            <input type="radio" class="btn-check" name="exportFormat" id="exportFormatXLSX" value="xlsx" autocomplete="off">
+                            <label class="btn btn-outline-primary" for="exportFormatXLSX">${t.xlsx}</label>
+                            <input type="radio" class="btn-check" name="exportFormat" id="exportFormatParquet" value="parquet" autocomplete="off">
+                            <label class="btn btn-outline-primary" for="exportFormatParquet">${t.parquet}</label>
+                            <input type="radio" class="btn-check" name="exportFormat" id="exportFormatBibTeX" value="bibtex" autocomplete="off">
+                            <label class="btn btn-outline-primary" for="exportFormatBibTeX">${t.bibtex}</label>
+                            <input type="radio" class="btn-check" name="exportFormat" id="exportFormatRIS" value="ris" autocomplete="off">
+                            <label class="btn btn-outline-primary" for="exportFormatRIS">${t.ris}</label>
                             <input type="radio" class="btn-check" name="exportFormat" id="exportFormatHTML" value="html" autocomplete="off" disabled>
-                            <label class="btn btn-outline-secondary disabled" for="exportFormatHTML">${i.html}</label>
-                            <input type="radio" class="btn-check" name="exportFormat" id="exportFormatCSV" value="csv" autocomplete="off" disabled>
-                            <label class="btn btn-outline-secondary disabled" for="exportFormatCSV">${i.csv}</label>
+                            <label class="btn btn-outline-secondary disabled" for="exportFormatHTML">${t.html}</label>
                         </div>
-                        <p>${i.prompt}</p>
+                        <p>${t.prompt}</p>
                     </div>
                     <div class="modal-footer">
-                        <button type="button" class="btn btn-primary" id="confirmExportReport">${i.continue}</button>
-                        <button type="button" class="btn btn-secondary" data-bs-dismiss="modal">${i.cancel}</button>
+                        <button type="button" class="btn btn-primary" id="confirmExportReport">${t.continue}</button>
+                        <button type="button" class="btn btn-secondary" data-bs-dismiss="modal">${t.cancel}</button>
                     </div>
                 </div>
             </div>
-        `,document.body.appendChild(r)),e.addEventListener("click",function(){new bootstrap.Modal(r).show()});let o=document.getElementById("exportReportLoading");o||(o=document.createElement("div"),o.id="exportReportLoading",o.style.position="fixed",o.style.top=0,o.style.left=0,o.style.width="100vw",o.style.height="100vh",o.style.background="rgba(255,255,255,0.7)",o.style.display="none",o.style.justifyContent="center",o.style.alignItems="center",o.style.zIndex=2e3,o.innerHTML=`<div class="spinner-border text-primary" role="status"><span class="visually-hidden">${i.loading}</span></div><div style="margin-left: 1rem; font-size: 1.2rem;">${i.loading}</div>`,document.body.appendChild(o));function a(s,u,l,c,d=3){const h=new XMLSerializer().serializeToString(s),f=new Blob([h],{type:"image/svg+xml;charset=utf-8"}),g=URL.createObjectURL(f),y=new window.Image;y.onload=function(){const b=document.createElement("canvas");b.width=(u||y.width)*d,b.height=(l||y.height)*d;const k=b.getContext("2d");k.setTransform(d,0,0,d,0,0),k.drawImage(y,0,0);const x=b.toDataURL("image/png");c(x),URL.revokeObjectURL(g)},y.src=g}r.addEventListener("click",function(s){var u,l,c,d,h;if(s.target&&s.target.id==="confirmExportReport"){if(document.querySelector('input[name="exportFormat"]:checked').value!=="pdf")return;bootstrap.Modal.getInstance(r).hide(),o.style.display="flex";const y=(u=document.getElementById("yearFrom"))==null?void 0:u.value,b=(l=document.getElementById("yearTo"))==null?void 0:l.value;let k=[];if(window.selectedAreasList&&window.selectedAreasList.size>0)k=Array.from(window.selectedAreasList);else{const S=document.getElementById("areaFilter");S&&(k=Array.from(S.selectedOptions).map(I=>I.value).filter(I=>I))}let x=[];if(window.selectedInstitutionsList&&window.selectedInstitutionsList.size>0)x=Array.from(window.selectedInstitutionsList);else{const S=document.getElementById("institutionFilter");S&&(x=Array.from(S.selectedOptions).map(I=>I.value).filter(I=>I))}let _=[];if(window.selectedTypesList&&window.selectedTypesList.size>0)_=Array.from(window.selectedTypesList);else{const S=document.getElementById("typeFilter");S&&(_=Array.from(S.selectedOptions).map(I=>I.value).filter(I=>I))}let m=null;window.selectedAuthorName&&(m=window.selectedAuthorName);const v=document.querySelector("#timelineChart svg"),w=document.querySelector("#areasChart svg");let C=null;if(w&&w.parentElement){const S=document.querySelectorAll("#areasChart svg");S.length>1?C=S[1]:(c=document.querySelector('[data-areas-view="bar"]'))!=null&&c.classList.contains("active")&&(C=w)}C||(d=document.querySelector('[data-areas-view="bar"]'))!=null&&d.classList.contains("active")&&(C=w),console.log("SVGs encontrados:",{timelineSVG:!!v,pieSVG:!!w,barSVG:!!C});let z="pie";(h=document.querySelector('[data-areas-view="bar"]'))!=null&&h.classList.contains("active")&&(z="bar");const O=`/${t}/api/export/report/`;let F=0;const M={timeline:null,pie:null,bar:null},V=()=>{if(F===3){console.log("Imágenes base64 generadas:",M);const S=new FormData;if(y&&S.append("year_from",y),b&&S.append("year_to",b),k.forEach(I=>S.append("areas",I)),x.forEach(I=>S.append("institutions",I)),_.forEach(I=>S.append("types",I)),m&&S.append("author",m),S.append("format","pdf"),S.append("areas_view",z),M.timeline&&S.append("timeline_img",M.timeline),M.pie&&S.append("pie_img",M.pie),M.bar&&S.append("bar_img",M.bar),(window.currentCommunityView==="keywords"||typeof currentCommunityView<"u"&&currentCommunityView==="keywords")&&(window.currentClusteringModel||typeof currentClusteringModel<"u")&&(window.currentNClusters||typeof currentNClusters<"u")){const I=window.currentClusteringModel||currentClusteringModel,Q=window.currentNClusters||currentNClusters;if(I&&Q){const he=`${I.toLowerCase().replace(/[^a-z0-9]/g,"")}_k${Q}.html`;console.log("Enviando network_html:",he),S.append("network_html",he)}}fetch(O,{method:"POST",body:S}).then(I=>{if(!I.ok)throw new Error("Error al generar el informe");return I.blob()}).then(I=>{const Q=window.URL.createObjectURL(I),ie=document.createElement("a");ie.href=Q,ie.download="Bibliometria_IPBLN_Informe.pdf",document.body.appendChild(ie),ie.click(),ie.remove(),window.URL.revokeObjectURL(Q)}).catch(I=>{alert(t==="es"?"Error al generar el informe":"Error generating report")}).finally(()=>{o.style.display="none"})}};v?a(v,v.clientWidth,v.clientHeight,S=>{M.timeline=S,F++,V()},3):(F++,V()),w?a(w,w.clientWidth,w.clientHeight,S=>{M.pie=S,F++,V()},3):(F++,V()),C?a(C,C.clientWidth,C.clientHeight,S=>{M.bar=S,F++,V()},3):(F++,V())}})}function dp(){const e=document.getElementById("yearFrom"),t=document.getElementById("yearTo"),n=document.getElementById("areaFilter"),i=document.getElementById("institutionFilter"),r=document.getElementById("typeFilter"),o=document.getElementById("clearFilters"),a=document.getElementById("selectedAreas"),s=document.getElementById("selectedInstitutions"),u=document.getElementById("selectedTypes"),l=document.getElementById("standardSearch"),c=document.getElementById("standardSearchBtn"),d=document.getElementById("searchSuggestions"),h=document.getElementById("selectedAuthor"),f=document.getElementById("authorLimitMessage"),g=document.getElementById("clusteringModel"),y=document.getElementById("nClusters"),b=document.getElementById("nClustersValue"),k=document.getElementById("nClustersContainer"),x=document.getElementById("modelDescription");document.getElementById("applyClustering");const _=document.getElementById("rangeContainer"),m=document.getElementById("dbscanOptions"),v=document.getElementById("hdbscanOptions"),w=document.getElementById("dbscanClusters"),C=document.getElementById("hdbscanClusters"),z=document.getElementById("manualMode"),O=document.getElementById("globalBestMode"),F=document.getElementById("modelManualMode"),M=document.getElementById("modelAutoMode"),V=document.getElementById("manualConfigContainer"),S=document.getElementById("lovainaOptions"),I={kmeans:'Agrupa los datos en un número fijo de categorías (clusters) tratando de minimizar la distancia entre los puntos de cada grupo y su centroide, es decir, su "centro". Este método busca particiones compactas y bien separadas, y es especialmente útil cuando los grupos tienen forma redonda o esférica. Es rápido y eficiente, aunque sensible a la elección inicial del número de grupos (k) y a los valores extremos.',agglomerative:"Construye agrupaciones de forma jerárquica: comienza considerando cada autor como un grupo separado y va fusionando los más similares en pasos sucesivos. El resultado es una estructura en forma de árbol (dendrograma), que permite explorar diferentes niveles de agrupación según la profundidad del corte. Es útil cuando no se conoce el número exacto de grupos y se desea analizar la relación progresiva entre autores.",spectral:"Transforma la relación entre autores en una red (o grafo) de similitudes y la descompone matemáticamente para encontrar estructuras ocultas. Posteriormente, agrupa los autores en ese nuevo espacio. Es muy útil cuando las agrupaciones no tienen una forma clara o son no convexas, como anillos o cadenas, y aprovecha la conectividad global de los datos.",gmm:"Parte de la idea de que los datos provienen de una combinación de distribuciones estadísticas llamadas Gaussianas (curvas en forma de campana). En lugar de asignar cada punto a un único cluster, estima la probabilidad de que pertenezca a cada uno. Esto le permite detectar clusters superpuestos o de formas más complejas que los que detecta KMeans, siendo ideal cuando se sospecha que los datos tienen estructuras suaves o ambiguas.",dbscan:"Identifica grupos basándose en la densidad de los puntos: busca regiones donde los puntos están muy juntos y los separa de las regiones más dispersas. Es especialmente útil cuando los clusters tienen formas arbitrarias y no se conoce el número de grupos a priori. Puede identificar puntos de ruido (outliers) y no requiere especificar el número de clusters.",hdbscan:"Es una versión jerárquica de DBSCAN que puede encontrar clusters de diferentes densidades. En lugar de usar un único umbral de densidad, construye una jerarquía de clusters y luego selecciona los más significativos. Es robusto a los parámetros y puede encontrar clusters de formas arbitrarias.",lovaina:"Algoritmo de detección de comunidades que optimiza la modularidad de la red. Funciona de manera iterativa, moviendo nodos entre comunidades para maximizar la modularidad. Es especialmente efectivo para detectar comunidades en redes grandes y puede encontrar comunidades de diferentes tamaños."},Q={kmeans:'It groups the data into a fixed number of categories (clusters) trying to minimize the distance between the points of each group and its centroid, that is, its "center". This method looks for compact and well-separated partitions, and is especially useful when the clusters are round or spherical in shape. It is fast and efficient, although sensitive to the initial choice of the number of groups (k) and to extreme values.',agglomerative:"It builds groupings in a hierarchical way: it starts by considering each author as a separate group and merges the most similar ones in successive steps. The result is a tree-like structure (dendrogram), which allows exploring different levels of grouping according to the depth of the cut. It is useful when the exact number of groups is not known and it is desired to analyze the progressive relationship between authors.",spectral:"It transforms the relationship between authors into a network (or graph) of similarities and decomposes it mathematically to find hidden structures. It then clusters the authors in this new space. It is very useful when the groupings do not have a clear shape or are non-convex, such as rings or chains, and takes advantage of the global connectivity of the data.",gmm:"It starts from the idea that the data come from a combination of statistical distributions called Gaussian (bell-shaped curves). Instead of assigning each point to a single cluster, it estimates the probability that it belongs to each cluster. This allows it to detect overlapping or more complex-shaped clusters than KMeans detects, making it ideal when data are suspected of having soft or ambiguous structures.",dbscan:"Identifies groups based on the density of points: it looks for regions where points are very close together and separates them from more scattered regions. It is especially useful when clusters have arbitrary shapes and the number of groups is not known a priori. It can identify noise points (outliers) and does not require specifying the number of clusters.",hdbscan:"It is a hierarchical version of DBSCAN that can find clusters of different densities. Instead of using a single density threshold, it builds a hierarchy of clusters and then selects the most significant ones. It is robust to parameters and can find clusters of arbitrary shapes.",lovaina:"A community detection algorithm that optimizes network modularity. It works iteratively, moving nodes between communities to maximize modularity. It is especially effective for detecting communities in large networks and can find communities of different sizes."},ie={clusters:"clusters",bestConfig:"Mejor Configuración",globalBestConfig:"Mejor Configuración Global",manualConfig:"Configuración Manual",numberOfClusters:"Número de Clusters",clusteringModel:"Modelo de Clustering",apply:"Aplicar",cancel:"Cancelar",globalBestDescription:"Usa la mejor configuración de clustering encontrada entre todos los modelos y parámetros."},he={clusters:"clusters",bestConfig:"Best Configuration",globalBestConfig:"Global Best Configuration",manualConfig:"Manual Configuration",numberOfClusters:"Number of Clusters",clusteringModel:"Clustering Model",apply:"Apply",cancel:"Cancel",globalBestDescription:"Uses the best clustering configuration found across all models and parameters."};function fe(){const p=Dt==="es"?ie:he,R=Dt==="es"?I:Q,L={clusteringModelLabel:document.querySelector('label[for="clusteringModel"]'),nClustersLabel:document.querySelector('label[for="nClusters"]'),manualModeLabel:document.querySelector('label[for="manualMode"]'),globalBestModeLabel:document.querySelector('label[for="globalBestMode"]'),modelManualModeLabel:document.querySelector('label[for="modelManualMode"]'),modelAutoModeLabel:document.querySelector('label[for="modelAutoMode"]'),globalBestDescription:document.querySelector("#globalBestMode + .form-text"),applyButton:document.getElementById("applyClustering"),cancelButton:document.querySelector(".btn-secondary")};L.clusteringModelLabel&&(L.clusteringModelLabel.textContent=p.clusteringModel),L.nClustersLabel&&(L.nClustersLabel.textContent=p.numberOfClusters),L.manualModeLabel&&(L.manualModeLabel.textContent=p.manualConfig),L.globalBestModeLabel&&(L.globalBestModeLabel.textContent=p.globalBestConfig),L.modelManualModeLabel&&(L.modelManualModeLabel.textContent=p.manualConfig),L.modelAutoModeLabel&&(L.modelAutoModeLabel.textContent=p.bestConfig),L.globalBestDescription&&(L.globalBestDescription.textContent=p.globalBestDescription),L.applyButton&&(L.applyButton.textContent=p.apply),L.cancelButton&&(L.cancelButton.textContent=p.cancel),w&&Array.from(w.options).forEach(E=>{E.text=`${E.value} ${p.clusters}`}),C&&Array.from(C.options).forEach(E=>{E.text=`${E.value} ${p.clusters}`}),g&&x&&(x.textContent=R[g.value]||"")}g&&x&&g.addEventListener("change",function(){const p=this.value,R=Dt==="es"?I:Q;x.textContent=R[p]||"",p==="dbscan"?(_.classList.add("d-none"),m.classList.remove("d-none"),v.classList.add("d-none"),S.classList.add("d-none")):p==="hdbscan"?(_.classList.add("d-none"),m.classList.add("d-none"),v.classList.remove("d-none"),S.classList.add("d-none")):p==="lovaina"?(_.classList.add("d-none"),m.classList.add("d-none"),v.classList.add("d-none"),S.classList.remove("d-none")):(_.classList.remove("d-none"),m.classList.add("d-none"),v.classList.add("d-none"),S.classList.add("d-none"))}),z&&O&&V&&(z.addEventListener("change",function(){this.checked&&V.classList.remove("d-none")}),O.addEventListener("change",function(){this.checked&&V.classList.add("d-none")})),F&&M&&k&&(F.addEventListener("change",function(){this.checked&&k.classList.remove("d-none")}),M.addEventListener("change",function(){this.checked&&k.classList.add("d-none")})),y&&b&&y.addEventListener("input",function(){b.textContent=this.value});const ae=document.getElementById("clusteringModal");ae&&ae.addEventListener("show.bs.modal",function(){fe()}),document.querySelectorAll(".dropdown-item.network-community-view").forEach(p=>{p.addEventListener("click",function(R){R.preventDefault();const L=this.dataset.communityView;if(L==="keywords"){new bootstrap.Modal(document.getElementById("clusteringModal")).show();return}if(window.currentCommunityView===L){document.querySelectorAll(".dropdown-item.network-community-view").forEach(E=>{E.classList.remove("active")}),this.classList.add("active");return}window.currentCommunityView=L,document.querySelectorAll(".dropdown-item.network-community-view").forEach(E=>{E.classList.remove("active")}),this.classList.add("active"),nn(),Ye()})});let oe=new Set,re=new Set,se=new Set,ee=null;window.selectedAreasList=oe,window.selectedInstitutionsList=re,window.selectedTypesList=se,window.selectedAuthorName=ee;let Me=null;function pe(){ee?(c.classList.remove("btn-primary","btn-success"),c.classList.add("btn-secondary"),c.disabled=!0):(c.innerHTML='<i class="fas fa-search"></i>',c.classList.remove("btn-success","btn-secondary"),c.classList.add("btn-primary"),c.disabled=!1)}function Oe(p){if(!p||ee){d.style.display="none";return}fetch(`/api/search/authors/?q=${encodeURIComponent(p)}`).then(R=>R.json()).then(R=>{const L=d.querySelector(".list-group");if(L.innerHTML="",R.suggestions.length===0){d.style.display="none";return}R.suggestions.forEach(E=>{const H=document.createElement("a");H.href="#",H.className="list-group-item list-group-item-action",H.innerHTML=`
-                        ${E.name}
-                        <span class="badge bg-secondary float-end">${E.count} pub.</span>
-                    `,H.addEventListener("click",T=>{T.preventDefault(),ut(E.name)}),L.appendChild(H)}),d.style.display="block"}).catch(R=>{console.error("Error fetching author suggestions:",R),d.style.display="none"})}function ut(p){ee=p,window.selectedAuthorName=p,l.value="",l.disabled=!0,d.style.display="none",f.style.display="block",pe(),h.innerHTML=`
+        `;
+        document.body.appendChild(modal);
+    } else {
+        // Si ya existe, actualiza los textos por si cambia el idioma
+        modal.querySelector('.modal-title').textContent = t.title;
+        modal.querySelector('.modal-body').innerHTML = `
+            <p>${t.message}</p>
+            <div class="btn-group flex-wrap w-100 mb-3" role="group" aria-label="Export format">
+                <input type="radio" class="btn-check" name="exportFormat" id="exportFormatPDF" value="pdf" autocomplete="off" checked>
+                <label class="btn btn-outline-primary" for="exportFormatPDF">${t.pdf}</label>
+                <input type="radio" class="btn-check" name="exportFormat" id="exportFormatCSV" value="csv" autocomplete="off">
+                <label class="btn btn-outline-primary" for="exportFormatCSV">${t.csv}</label>
+                <input type="radio" class="btn-check" name="exportFormat" id="exportFormatXLSX" value="xlsx" autocomplete="off">
+                <label class="btn btn-outline-primary" for="exportFormatXLSX">${t.xlsx}</label>
+                <input type="radio" class="btn-check" name="exportFormat" id="exportFormatParquet" value="parquet" autocomplete="off">
+                <label class="btn btn-outline-primary" for="exportFormatParquet">${t.parquet}</label>
+                <input type="radio" class="btn-check" name="exportFormat" id="exportFormatBibTeX" value="bibtex" autocomplete="off">
+                <label class="btn btn-outline-primary" for="exportFormatBibTeX">${t.bibtex}</label>
+                <input type="radio" class="btn-check" name="exportFormat" id="exportFormatRIS" value="ris" autocomplete="off">
+                <label class="btn btn-outline-primary" for="exportFormatRIS">${t.ris}</label>
+                <input type="radio" class="btn-check" name="exportFormat" id="exportFormatHTML" value="html" autocomplete="off" disabled>
+                <label class="btn btn-outline-secondary disabled" for="exportFormatHTML">${t.html}</label>
+            </div>
+            <p>${t.prompt}</p>
+        `;
+        modal.querySelector('#confirmExportReport').textContent = t.continue;
+        modal.querySelector('.btn-secondary').textContent = t.cancel;
+    }
+
+    exportBtn.addEventListener('click', function() {
+        const modalInstance = new bootstrap.Modal(modal);
+        modalInstance.show();
+    });
+
+    // Overlay de carga
+    let loadingOverlay = document.getElementById('exportReportLoading');
+    if (!loadingOverlay) {
+        loadingOverlay = document.createElement('div');
+        loadingOverlay.id = 'exportReportLoading';
+        loadingOverlay.style.position = 'fixed';
+        loadingOverlay.style.top = 0;
+        loadingOverlay.style.left = 0;
+        loadingOverlay.style.width = '100vw';
+        loadingOverlay.style.height = '100vh';
+        loadingOverlay.style.background = 'rgba(255,255,255,0.7)';
+        loadingOverlay.style.display = 'none';
+        loadingOverlay.style.justifyContent = 'center';
+        loadingOverlay.style.alignItems = 'center';
+        loadingOverlay.style.zIndex = 2000;
+        loadingOverlay.innerHTML = `<div class="spinner-border text-primary" role="status"><span class="visually-hidden">${t.loading}</span></div><div id="exportReportProgress" style="margin-left: 1rem; font-size: 1.2rem;">${t.loading}</div>`;
+        document.body.appendChild(loadingOverlay);
+    }
+
+    const progressText = loadingOverlay.querySelector('#exportReportProgress');
+
+    // El informe se genera en segundo plano: consultar su estado hasta que esté listo,
+    // avisando si sigue en cola (sin worker) y con un tiempo máximo de espera
+    const POLL_INTERVAL_MS = 1000;
+    const PENDING_NOTICE_MS = 15 * 1000;
+    const MAX_WAIT_MS = 5 * 60 * 1000;
+
+    function waitForReport(job, startedAt = Date.now()) {
+        const elapsed = Date.now() - startedAt;
+        if (job.status === 'pending' && elapsed >= PENDING_NOTICE_MS) {
+            progressText.textContent = t.pending;
+        } else {
+            progressText.textContent = `${t.loading} ${job.progress || 0}%`;
+        }
+        if (job.status === 'done') return Promise.resolve(job);
+        if (job.status === 'failed') return Promise.reject(new Error(job.error || 'Error al generar el informe'));
+        if (elapsed >= MAX_WAIT_MS) {
+            const error = new Error('Tiempo de espera agotado');
+            error.userMessage = t.timeout;
+            return Promise.reject(error);
+        }
+        return new Promise(resolve => setTimeout(resolve, POLL_INTERVAL_MS))
+            .then(() => fetch(job.status_url))
+            .then(response => {
+                if (!response.ok) throw new Error('Error al consultar el informe');
+                return response.json();
+            })
+            .then(next => waitForReport(next, startedAt));
+    }
+
+    // Evento para el botón de continuar
+    modal.addEventListener('click', function(e) {
+        if (e.target && e.target.id === 'confirmExportReport') {
+            const format = document.querySelector('input[name="exportFormat"]:checked').value;
+            if (format === 'html') {
+                // No hacer nada para HTML
+                return;
+            }
+            const modalInstance = bootstrap.Modal.getInstance(modal);
+            modalInstance.hide();
+
+            // Recoger filtros actuales del dashboard
+            const yearFrom = document.getElementById('yearFrom')?.value;
+            const yearTo = document.getElementById('yearTo')?.value;
+            let areas = [];
+            if (window.selectedAreasList && window.selectedAreasList.size > 0) {
+                areas = Array.from(window.selectedAreasList);
+            } else {
+                const areaFilter = document.getElementById('areaFilter');
+                if (areaFilter) {
+                    areas = Array.from(areaFilter.selectedOptions).map(opt => opt.value).filter(v => v);
+                }
+            }
+            let institutions = [];
+            if (window.selectedInstitutionsList && window.selectedInstitutionsList.size > 0) {
+                institutions = Array.from(window.selectedInstitutionsList);
+            } else {
+                const institutionFilter = document.getElementById('institutionFilter');
+                if (institutionFilter) {
+                    institutions = Array.from(institutionFilter.selectedOptions).map(opt => opt.value).filter(v => v);
+                }
+            }
+            let types = [];
+            if (window.selectedTypesList && window.selectedTypesList.size > 0) {
+                types = Array.from(window.selectedTypesList);
+            } else {
+                const typeFilter = document.getElementById('typeFilter');
+                if (typeFilter) {
+                    types = Array.from(typeFilter.selectedOptions).map(opt => opt.value).filter(v => v);
+                }
+            }
+            let author = null;
+            if (window.selectedAuthorName) {
+                author = window.selectedAuthorName;
+            }
+
+            // Detectar el idioma de la URL para la API
+            const apiExportUrl = `/${lang}/api/export/report/`;
+
+            // CSV, Excel, Parquet, BibTeX y RIS: el servidor envía el fichero en streaming
+            if (format !== 'pdf') {
+                const params = new URLSearchParams();
+                if (yearFrom) params.append('year_from', yearFrom);
+                if (yearTo) params.append('year_to', yearTo);
+                areas.forEach(area => params.append('areas', area));
+                institutions.forEach(inst => params.append('institutions', inst));
+                types.forEach(type => params.append('types', type));
+                if (author) params.append('author', author);
+                params.append('format', format);
+                window.location.href = `${apiExportUrl}?${params.toString()}`;
+                return;
+            }
+            loadingOverlay.style.display = 'flex';
+
+            // Detectar la vista activa de áreas
+            let areas_view = 'pie';
+            if (document.querySelector('[data-areas-view="bar"]')?.classList.contains('active')) {
+                areas_view = 'bar';
+            }
+
+            // Vista de la línea temporal: anual, mensual o trimestral
+            const activeViewBtn = document.querySelector('[data-view].active');
+            const viewType = activeViewBtn ? activeViewBtn.dataset.view : 'yearly';
+
+            // Enviar al backend
+            const formData = new FormData();
+            if (yearFrom) formData.append('year_from', yearFrom);
+            if (yearTo) formData.append('year_to', yearTo);
+            areas.forEach(area => formData.append('areas', area));
+            institutions.forEach(inst => formData.append('institutions', inst));
+            types.forEach(type => formData.append('types', type));
+            if (author) formData.append('author', author);
+            formData.append('format', 'pdf');
+            formData.append('areas_view', areas_view);
+            // Los gráficos se dibujan en el servidor con los mismos datos del dashboard
+            formData.append('view_type', viewType);
+            if (window.includePredictedAreas) formData.append('include_predicted_areas', 'true');
+
+            // Añadir el nombre del HTML de la red de palabras clave si corresponde
+            if (
+                (window.currentCommunityView === 'keywords' || (typeof currentCommunityView !== 'undefined' && currentCommunityView === 'keywords')) &&
+                (window.currentClusteringModel || typeof currentClusteringModel !== 'undefined') &&
+                (window.currentNClusters || typeof currentNClusters !== 'undefined')
+            ) {
+                const model = window.currentClusteringModel || currentClusteringModel;
+                const nClusters = window.currentNClusters || currentNClusters;
+                if (model && nClusters) {
+                    const modelSlug = model.toLowerCase().replace(/[^a-z0-9]/g, '');
+                    const htmlName = `${modelSlug}_k${nClusters}.html`;
+                    console.log('Enviando network_html:', htmlName);
+                    formData.append('network_html', htmlName);
+                }
+            }
+
+            fetch(apiExportUrl, {
+                method: 'POST',
+                body: formData
+            })
+            .then(response => {
+                if (!response.ok) throw new Error('Error al generar el informe');
+                return response.json();
+            })
+            .then(waitForReport)
+            .then(job => fetch(job.download_url))
+            .then(response => {
+                if (!response.ok) throw new Error('Error al descargar el informe');
+                return response.blob();
+            })
+            .then(blob => {
+                // Descargar el PDF
+                const url = window.URL.createObjectURL(blob);
+                const a = document.createElement('a');
+                a.href = url;
+                a.download = `Bibliometria_IPBLN_Informe.pdf`;
+                document.body.appendChild(a);
+                a.click();
+                a.remove();
+                window.URL.revokeObjectURL(url);
+            })
+            .catch(err => {
+                alert(err.userMessage || (lang === 'es' ? 'Error al generar el informe' : 'Error generating report'));
+            })
+            .finally(() => {
+                loadingOverlay.style.display = 'none';
+                progressText.textContent = t.loading;
+            });
+        }
+    });
+} 
+return{setupExportReportButton};})();
+const __dashboard=(()=>{const d3={arc:sd,area:ud,axisBottom:Yn,axisLeft:ar,curveMonotoneX:Ir,extent:Wa,format:zi,line:Wo,max:rr,min:function(e,t){let n;if(t===void 0)for(const i of e)i!=null&&(n>i||n===void 0&&i>=i)&&(n=i);else{let i=-1;for(let r of e)(r=t(r,++i,e))!=null&&(n>r||n===void 0&&r>=r)&&(n=r)}return n},pie:dd,scaleBand:Oo,scaleLinear:Vt,scaleOrdinal:Wt,schemeCategory10:Lr,select:$e,selectAll:He,sum:qn};const Graph=ue;const Sigma=Wf;const EdgeCurveProgram=lp;const {setupExportReportButton}=__export_report;
+// filters_search.js
+
+
+
+
+
+
+
+function initFiltersAndSearch() {
+
+    // Referencias a los elementos del DOM
+    const yearFrom = document.getElementById('yearFrom');
+    const yearTo = document.getElementById('yearTo');
+    const areaFilter = document.getElementById('areaFilter');
+    const institutionFilter = document.getElementById('institutionFilter');
+    const typeFilter = document.getElementById('typeFilter');
+    const clearFiltersBtn = document.getElementById('clearFilters');
+    const selectedAreas = document.getElementById('selectedAreas');
+    const selectedInstitutions = document.getElementById('selectedInstitutions');
+    const selectedTypes = document.getElementById('selectedTypes');
+    const standardSearch = document.getElementById('standardSearch');
+    const standardSearchBtn = document.getElementById('standardSearchBtn');
+    const searchSuggestions = document.getElementById('searchSuggestions');
+    const selectedAuthor = document.getElementById('selectedAuthor');
+    const authorLimitMessage = document.getElementById('authorLimitMessage');
+
+    // Referencias a elementos del modal de clustering
+    const clusteringModel = document.getElementById('clusteringModel');
+    const nClusters = document.getElementById('nClusters');
+    const nClustersValue = document.getElementById('nClustersValue');
+    const nClustersContainer = document.getElementById('nClustersContainer');
+    const modelDescription = document.getElementById('modelDescription');
+    const applyClusteringBtn = document.getElementById('applyClustering');
+    const rangeContainer = document.getElementById('rangeContainer');
+    const dbscanOptions = document.getElementById('dbscanOptions');
+    const hdbscanOptions = document.getElementById('hdbscanOptions');
+    const dbscanClusters = document.getElementById('dbscanClusters');
+    const hdbscanClusters = document.getElementById('hdbscanClusters');
+    const manualMode = document.getElementById('manualMode');
+    const globalBestMode = document.getElementById('globalBestMode');
+    const modelManualMode = document.getElementById('modelManualMode');
+    const modelAutoMode = document.getElementById('modelAutoMode');
+    const manualConfigContainer = document.getElementById('manualConfigContainer');
+    const lovainaOptions = document.getElementById('lovainaOptions');
+
+    // Descripciones de los modelos en español
+    const spanishModelDescriptions = {
+        'kmeans': 'Agrupa los datos en un número fijo de categorías (clusters) tratando de minimizar la distancia entre los puntos de cada grupo y su centroide, es decir, su "centro". Este método busca particiones compactas y bien separadas, y es especialmente útil cuando los grupos tienen forma redonda o esférica. Es rápido y eficiente, aunque sensible a la elección inicial del número de grupos (k) y a los valores extremos.',
+        'agglomerative': 'Construye agrupaciones de forma jerárquica: comienza considerando cada autor como un grupo separado y va fusionando los más similares en pasos sucesivos. El resultado es una estructura en forma de árbol (dendrograma), que permite explorar diferentes niveles de agrupación según la profundidad del corte. Es útil cuando no se conoce el número exacto de grupos y se desea analizar la relación progresiva entre autores.',
+        'spectral': 'Transforma la relación entre autores en una red (o grafo) de similitudes y la descompone matemáticamente para encontrar estructuras ocultas. Posteriormente, agrupa los autores en ese nuevo espacio. Es muy útil cuando las agrupaciones no tienen una forma clara o son no convexas, como anillos o cadenas, y aprovecha la conectividad global de los datos.',
+        'gmm': 'Parte de la idea de que los datos provienen de una combinación de distribuciones estadísticas llamadas Gaussianas (curvas en forma de campana). En lugar de asignar cada punto a un único cluster, estima la probabilidad de que pertenezca a cada uno. Esto le permite detectar clusters superpuestos o de formas más complejas que los que detecta KMeans, siendo ideal cuando se sospecha que los datos tienen estructuras suaves o ambiguas.',
+        'dbscan': 'Identifica grupos basándose en la densidad de los puntos: busca regiones donde los puntos están muy juntos y los separa de las regiones más dispersas. Es especialmente útil cuando los clusters tienen formas arbitrarias y no se conoce el número de grupos a priori. Puede identificar puntos de ruido (outliers) y no requiere especificar el número de clusters.',
+        'hdbscan': 'Es una versión jerárquica de DBSCAN que puede encontrar clusters de diferentes densidades. En lugar de usar un único umbral de densidad, construye una jerarquía de clusters y luego selecciona los más significativos. Es robusto a los parámetros y puede encontrar clusters de formas arbitrarias.',
+        'lovaina': 'Algoritmo de detección de comunidades que optimiza la modularidad de la red. Funciona de manera iterativa, moviendo nodos entre comunidades para maximizar la modularidad. Es especialmente efectivo para detectar comunidades en redes grandes y puede encontrar comunidades de diferentes tamaños.'
+    };
+
+    // Descripciones de los modelos en inglés
+    const englishModelDescriptions = {
+        'kmeans': 'It groups the data into a fixed number of categories (clusters) trying to minimize the distance between the points of each group and its centroid, that is, its "center". This method looks for compact and well-separated partitions, and is especially useful when the clusters are round or spherical in shape. It is fast and efficient, although sensitive to the initial choice of the number of groups (k) and to extreme values.',
+        'agglomerative': 'It builds groupings in a hierarchical way: it starts by considering each author as a separate group and merges the most similar ones in successive steps. The result is a tree-like structure (dendrogram), which allows exploring different levels of grouping according to the depth of the cut. It is useful when the exact number of groups is not known and it is desired to analyze the progressive relationship between authors.',
+        'spectral': 'It transforms the relationship between authors into a network (or graph) of similarities and decomposes it mathematically to find hidden structures. It then clusters the authors in this new space. It is very useful when the groupings do not have a clear shape or are non-convex, such as rings or chains, and takes advantage of the global connectivity of the data.',
+        'gmm': 'It starts from the idea that the data come from a combination of statistical distributions called Gaussian (bell-shaped curves). Instead of assigning each point to a single cluster, it estimates the probability that it belongs to each cluster. This allows it to detect overlapping or more complex-shaped clusters than KMeans detects, making it ideal when data are suspected of having soft or ambiguous structures.',
+        'dbscan': 'Identifies groups based on the density of points: it looks for regions where points are very close together and separates them from more scattered regions. It is especially useful when clusters have arbitrary shapes and the number of groups is not known a priori. It can identify noise points (outliers) and does not require specifying the number of clusters.',
+        'hdbscan': 'It is a hierarchical version of DBSCAN that can find clusters of different densities. Instead of using a single density threshold, it builds a hierarchy of clusters and then selects the most significant ones. It is robust to parameters and can find clusters of arbitrary shapes.',
+        'lovaina': 'A community detection algorithm that optimizes network modularity. It works iteratively, moving nodes between communities to maximize modularity. It is especially effective for detecting communities in large networks and can find communities of different sizes.'
+    };
+
+    // Textos en español
+    const spanishTexts = {
+        'clusters': 'clusters',
+        'bestConfig': 'Mejor Configuración',
+        'globalBestConfig': 'Mejor Configuración Global',
+        'manualConfig': 'Configuración Manual',
+        'numberOfClusters': 'Número de Clusters',
+        'clusteringModel': 'Modelo de Clustering',
+        'configurationMode': 'Modo de Configuración',
+        'apply': 'Aplicar',
+        'cancel': 'Cancelar',
+        'globalBestDescription': 'Usa la mejor configuración de clustering encontrada entre todos los modelos y parámetros.'
+    };
+
+    // Textos en inglés
+    const englishTexts = {
+        'clusters': 'clusters',
+        'bestConfig': 'Best Configuration',
+        'globalBestConfig': 'Global Best Configuration',
+        'manualConfig': 'Manual Configuration',
+        'numberOfClusters': 'Number of Clusters',
+        'clusteringModel': 'Clustering Model',
+        'configurationMode': 'Configuration Mode',
+        'apply': 'Apply',
+        'cancel': 'Cancel',
+        'globalBestDescription': 'Uses the best clustering configuration found across all models and parameters.'
+    };
+
+    // Función para actualizar textos según el idioma
+    function updateModalTexts() {
+        const texts = currentLang === 'es' ? spanishTexts : englishTexts;
+        const modelDescriptions = currentLang === 'es' ? spanishModelDescriptions : englishModelDescriptions;
+        
+        // Actualizar etiquetas
+        const elements = {
+            clusteringModelLabel: document.querySelector('label[for="clusteringModel"]'),
+            nClustersLabel: document.querySelector('label[for="nClusters"]'),
+            manualModeLabel: document.querySelector('label[for="manualMode"]'),
+            globalBestModeLabel: document.querySelector('label[for="globalBestMode"]'),
+            modelManualModeLabel: document.querySelector('label[for="modelManualMode"]'),
+            modelAutoModeLabel: document.querySelector('label[for="modelAutoMode"]'),
+            globalBestDescription: document.querySelector('#globalBestMode + .form-text'),
+            applyButton: document.getElementById('applyClustering'),
+            cancelButton: document.querySelector('.btn-secondary')
+        };
+
+        // Actualizar etiquetas solo si existen
+        if (elements.clusteringModelLabel) elements.clusteringModelLabel.textContent = texts.clusteringModel;
+        if (elements.nClustersLabel) elements.nClustersLabel.textContent = texts.numberOfClusters;
+        if (elements.manualModeLabel) elements.manualModeLabel.textContent = texts.manualConfig;
+        if (elements.globalBestModeLabel) elements.globalBestModeLabel.textContent = texts.globalBestConfig;
+        if (elements.modelManualModeLabel) elements.modelManualModeLabel.textContent = texts.manualConfig;
+        if (elements.modelAutoModeLabel) elements.modelAutoModeLabel.textContent = texts.bestConfig;
+        if (elements.globalBestDescription) elements.globalBestDescription.textContent = texts.globalBestDescription;
+        
+        // Actualizar botones
+        if (elements.applyButton) elements.applyButton.textContent = texts.apply;
+        if (elements.cancelButton) elements.cancelButton.textContent = texts.cancel;
+
+        // Actualizar opciones de clusters
+        if (dbscanClusters) {
+            Array.from(dbscanClusters.options).forEach(option => {
+                option.text = `${option.value} ${texts.clusters}`;
+            });
+        }
+        if (hdbscanClusters) {
+            Array.from(hdbscanClusters.options).forEach(option => {
+                option.text = `${option.value} ${texts.clusters}`;
+            });
+        }
+
+        // Actualizar descripción del modelo actual
+        if (clusteringModel && modelDescription) {
+            modelDescription.textContent = modelDescriptions[clusteringModel.value] || '';
+        }
+    }
+
+    // Event listeners para el modal de clustering
+    if (clusteringModel && modelDescription) {
+        clusteringModel.addEventListener('change', function() {
+            const selectedModel = this.value;
+            const modelDescriptions = currentLang === 'es' ? spanishModelDescriptions : englishModelDescriptions;
+            modelDescription.textContent = modelDescriptions[selectedModel] || '';
+            
+            // Mostrar/ocultar opciones específicas según el modelo
+            if (selectedModel === 'dbscan') {
+                rangeContainer.classList.add('d-none');
+                dbscanOptions.classList.remove('d-none');
+                hdbscanOptions.classList.add('d-none');
+                lovainaOptions.classList.add('d-none');
+            } else if (selectedModel === 'hdbscan') {
+                rangeContainer.classList.add('d-none');
+                dbscanOptions.classList.add('d-none');
+                hdbscanOptions.classList.remove('d-none');
+                lovainaOptions.classList.add('d-none');
+            } else if (selectedModel === 'lovaina') {
+                rangeContainer.classList.add('d-none');
+                dbscanOptions.classList.add('d-none');
+                hdbscanOptions.classList.add('d-none');
+                lovainaOptions.classList.remove('d-none');
+            } else {
+                rangeContainer.classList.remove('d-none');
+                dbscanOptions.classList.add('d-none');
+                hdbscanOptions.classList.add('d-none');
+                lovainaOptions.classList.add('d-none');
+            }
+        });
+    }
+
+    // Event listener para el modo de configuración global
+    if (manualMode && globalBestMode && manualConfigContainer) {
+        manualMode.addEventListener('change', function() {
+            if (this.checked) {
+                manualConfigContainer.classList.remove('d-none');
+            }
+        });
+
+        globalBestMode.addEventListener('change', function() {
+            if (this.checked) {
+                manualConfigContainer.classList.add('d-none');
+            }
+        });
+    }
+
+    // Event listener para el modo de configuración del modelo
+    if (modelManualMode && modelAutoMode && nClustersContainer) {
+        modelManualMode.addEventListener('change', function() {
+            if (this.checked) {
+                nClustersContainer.classList.remove('d-none');
+            }
+        });
+
+        modelAutoMode.addEventListener('change', function() {
+            if (this.checked) {
+                nClustersContainer.classList.add('d-none');
+            }
+        });
+    }
+
+    if (nClusters && nClustersValue) {
+        nClusters.addEventListener('input', function() {
+            nClustersValue.textContent = this.value;
+        });
+    }
+
+    // Actualizar textos cuando se abre el modal
+    const clusteringModal = document.getElementById('clusteringModal');
+    if (clusteringModal) {
+        clusteringModal.addEventListener('show.bs.modal', function() {
+            updateModalTexts();
+        });
+    }
+
+    // Modificar el event listener existente para el dropdown de vista de comunidad
+    document.querySelectorAll('.dropdown-item.network-community-view').forEach(item => {
+        item.addEventListener('click', function(e) {
+            e.preventDefault();
+
+            const selectedView = this.dataset.communityView;
+
+            if (selectedView === 'keywords') {
+                // Mostrar el modal de clustering
+                const modal = new bootstrap.Modal(document.getElementById('clusteringModal'));
+                modal.show();
+                return;
+            }
+
+            // Si ya es la vista actual, no hacer nada
+            if (window.currentCommunityView === selectedView) {
+                document.querySelectorAll('.dropdown-item.network-community-view').forEach(link => {
+                    link.classList.remove('active');
+                });
+                this.classList.add('active');
+                return;
+            }
+
+            window.currentCommunityView = selectedView;
+
+            document.querySelectorAll('.dropdown-item.network-community-view').forEach(link => {
+                link.classList.remove('active');
+            });
+            this.classList.add('active');
+            
+            updateCommunityDropdownText();
+            updateVisualizations();
+        });
+    });
+
+    // Almacenar las selecciones
+    let selectedAreasList = new Set();
+    let selectedInstitutionsList = new Set();
+    let selectedTypesList = new Set();
+    let selectedAuthorName = null;
+
+    // Exponer en window para export_report.js
+    window.selectedAreasList = selectedAreasList;
+    window.selectedInstitutionsList = selectedInstitutionsList;
+    window.selectedTypesList = selectedTypesList;
+    window.selectedAuthorName = selectedAuthorName;
+
+    // Variables para el autocompletado
+    let searchTimeout = null;
+
+    // Función para actualizar el estado del botón de búsqueda
+    function updateSearchButton() {
+        if (selectedAuthorName) {
+            standardSearchBtn.classList.remove('btn-primary', 'btn-success');
+            standardSearchBtn.classList.add('btn-secondary');
+            standardSearchBtn.disabled = true;
+        } else {
+            standardSearchBtn.innerHTML = '<i class="fas fa-search"></i>';
+            standardSearchBtn.classList.remove('btn-success', 'btn-secondary');
+            standardSearchBtn.classList.add('btn-primary');
+            standardSearchBtn.disabled = false;
+        }
+    }
+
+    // Función para mostrar sugerencias de autores
+    function showAuthorSuggestions(query) {
+        if (!query || selectedAuthorName) {
+            searchSuggestions.style.display = 'none';
+            return;
+        }
+
+        fetch(`/api/search/authors/?q=${encodeURIComponent(query)}`)
+            .then(response => response.json())
+            .then(data => {
+                const suggestionsList = searchSuggestions.querySelector('.list-group');
+                suggestionsList.innerHTML = '';
+
+                if (data.suggestions.length === 0) {
+                    searchSuggestions.style.display = 'none';
+                    return;
+                }
+
+                data.suggestions.forEach(author => {
+                    const item = document.createElement('a');
+                    item.href = '#';
+                    item.className = 'list-group-item list-group-item-action';
+                    item.innerHTML = `
+                        ${author.name}
+                        <span class="badge bg-secondary float-end">${author.count} pub.</span>
+                    `;
+                    item.addEventListener('click', (e) => {
+                        e.preventDefault();
+                        selectAuthor(author.name);
+                    });
+                    suggestionsList.appendChild(item);
+                });
+
+                searchSuggestions.style.display = 'block';
+            })
+            .catch(error => {
+                console.error('Error fetching author suggestions:', error);
+                searchSuggestions.style.display = 'none';
+            });
+    }
+
+    // Event listener para el autor seleccionado
+    function selectAuthor(authorName) {
+        selectedAuthorName = authorName;
+        window.selectedAuthorName = authorName;
+        standardSearch.value = '';
+        standardSearch.disabled = true;
+        searchSuggestions.style.display = 'none';
+        authorLimitMessage.style.display = 'block';
+        updateSearchButton();
+
+        // Crear el badge del autor seleccionado
+        selectedAuthor.innerHTML = `
             <span class="badge bg-primary me-2 mb-2">
-                ${p}
+                ${authorName}
                 <button type="button" class="btn-close btn-close-white ms-1" 
                         style="font-size: 0.5rem; vertical-align: middle;"
                         aria-label="Remove"></button>
             </span>
-        `,h.querySelector(".btn-close").addEventListener("click",()=>{ee=null,window.selectedAuthorName=null,h.innerHTML="",l.disabled=!1,f.style.display="none",pe();const te=document.getElementById("authorMetricsCard");te&&te.remove();const X=document.getElementById("networkCol");X&&(X.className="col-12"),rt()});const R=document.getElementById("collaborationRow"),L=document.createElement("div");L.id="authorMetricsCard",L.className="col-md-6 mt-3 mt-md-0 mb-10 h-100";const E=window.location.pathname.split("/")[1],H=E==="es"?"Resumen de Métricas del Autor":"Author Metrics Summary",T=E==="es"?"Métrica":"Metrics",$=E==="es"?"Valor":"Value";L.innerHTML=`
+        `;
+
+        // Añadir evento para eliminar el autor
+        selectedAuthor.querySelector('.btn-close').addEventListener('click', () => {
+            selectedAuthorName = null;
+            window.selectedAuthorName = null;
+            selectedAuthor.innerHTML = '';
+            standardSearch.disabled = false;
+            authorLimitMessage.style.display = 'none';
+            updateSearchButton();
+            
+            // Eliminar la card de métricas del autor del DOM
+            const authorMetricsCard = document.getElementById('authorMetricsCard');
+            if (authorMetricsCard) {
+                authorMetricsCard.remove();
+            }
+            
+            // Ajustar la columna de la red de colaboración
+            const networkCol = document.getElementById('networkCol');
+            if (networkCol) {
+                networkCol.className = 'col-12';
+            }
+            
+            updateFilters(); // Actualizar filtros al eliminar el autor
+        });
+
+        // Crear y añadir la card de métricas del autor al DOM
+        const collaborationRow = document.getElementById('collaborationRow');
+        const authorMetricsCard = document.createElement('div');
+        authorMetricsCard.id = 'authorMetricsCard';
+        authorMetricsCard.className = 'col-md-6 mt-3 mt-md-0 mb-10 h-100';
+        
+        // Extraer el idioma de la URL
+        const currentLang = window.location.pathname.split('/')[1];
+        const cardTitle = currentLang === 'es' ? 'Resumen de Métricas del Autor' : 'Author Metrics Summary';
+        const metricsTitle = currentLang === 'es' ? 'Métrica' : 'Metrics';
+        const valuesTitle = currentLang === 'es' ? 'Valor' : 'Value';
+        
+        authorMetricsCard.innerHTML = `
             <div class="card dashboard-card h-100">
                 <div class="card-body d-flex flex-column">
                     <div class="d-flex justify-content-between align-items-center mb-3">
-                        <h5 class="card-title mb-0">${H}</h5>
+                        <h5 class="card-title mb-0">${cardTitle}</h5>
                     </div>
                     <div id="authorMetricsContent" class="flex-grow-1">
                         <div class="table-responsive">
                             <table class="table table-hover">
                                 <thead>
                                     <tr>
-                                        <th>${T}</th>
-                                        <th>${$}</th>
+                                        <th>${metricsTitle}</th>
+                                        <th>${valuesTitle}</th>
                                     </tr>
                                 </thead>
                                 <tbody id="authorMetricsTable">
@@ -564,17 +1211,133 @@ void main() {
                     </div>
                 </div>
             </div>
-        `,R.appendChild(L);const B=document.getElementById("networkCol");B&&(B.className="col-12 col-md-6 mb-10");const J=document.getElementById("pubsCol");J&&(J.className="col-12 mt-4"),fetch(`/api/author/metrics/?author_id=${encodeURIComponent(p)}`).then(te=>te.json()).then(te=>{if(te.error){console.error("Error fetching author metrics:",te.error);return}const X=document.getElementById("authorMetricsTable");if(!X)return;const ye={orcid:"ORCID",total_publications:"Total Publications",total_citations:"Total Citations",citations_wos:"WoS Citations",citations_scopus:"Scopus Citations",h_index:"H-index (WoS/Scopus)",h_index_gb:"H-index (Gesbib)",h_index_h5gb:"H5-index (Gesbib)",international_index:"International Collaboration Index"};X.innerHTML="",Object.entries(te.metrics).forEach(([A,P])=>{const q=document.createElement("tr");if(A==="orcid"&&typeof P=="string"&&P.trim()!==""){const D=P.replace(/^http:/,"https:");q.innerHTML=`
-                            <td>${ye[A]}</td>
-                            <td><a href="${D}" target="_blank" rel="noopener noreferrer">${D}</a></td>
-                        `}else q.innerHTML=`
-                            <td>${ye[A]||A}</td>
-                            <td>${P}</td>
-                        `;X.appendChild(q)})}).catch(te=>{console.error("Error fetching author metrics:",te)}),rt()}function Ue(){if(!ee&&!l.value.trim())return;c.innerHTML='<i class="fas fa-spinner fa-spin"></i>';const p=new URLSearchParams;ee?p.append("author",ee):p.append("q",l.value.trim()),fetch(`/api/search/?${p.toString()}`).then(R=>R.json()).then(R=>{c.innerHTML='<i class="fas fa-search"></i>',Te(R.results)}).catch(R=>{console.error("Error performing search:",R),c.innerHTML='<i class="fas fa-search"></i>',alert("Error al realizar la búsqueda. Por favor, inténtelo de nuevo.")})}function Te(p){const L=window.location.pathname.split("/")[1]==="es"?"Resultados de la búsqueda":"Search Results";let E=document.getElementById("searchResultsModal");E||(E=document.createElement("div"),E.id="searchResultsModal",E.className="modal fade",E.setAttribute("tabindex","-1"),E.innerHTML=`
+        `;
+        collaborationRow.appendChild(authorMetricsCard);
+
+        // Ajustar la columna de la red de colaboración
+        const networkCol = document.getElementById('networkCol');
+        if (networkCol) {
+            networkCol.className = 'col-12 col-md-6 mb-10';
+        }
+        const pubsCol = document.getElementById('pubsCol');
+        if (pubsCol) {
+            pubsCol.className = 'col-12 mt-4';
+        }
+
+        // Obtener las métricas del autor
+        fetch(`/api/author/metrics/?author_id=${encodeURIComponent(authorName)}`)
+            .then(response => response.json())
+            .then(data => {
+                if (data.error) {
+                    console.error('Error fetching author metrics:', data.error);
+                    return;
+                }
+                
+                const metricsTable = document.getElementById('authorMetricsTable');
+                if (!metricsTable) return;
+
+                // Mapeo de nombres de métricas a nombres más amigables
+                const metricNames = {
+                    'orcid': 'ORCID',
+                    'total_publications': 'Total Publications',
+                    'total_citations': 'Total Citations',
+                    'citations_wos': 'WoS Citations',
+                    'citations_scopus': 'Scopus Citations',
+                    'h_index': 'H-index (WoS/Scopus)',
+                    'h_index_gb': 'H-index (Gesbib)',
+                    'h_index_h5gb': 'H5-index (Gesbib)',
+                    'international_index': 'International Collaboration Index'
+                };
+
+                // Limpiar la tabla
+                metricsTable.innerHTML = '';
+
+                // Añadir cada métrica a la tabla
+                Object.entries(data.metrics).forEach(([key, value]) => {
+                    const row = document.createElement('tr');
+                
+                    if (key === 'orcid' && typeof value === 'string' && value.trim() !== '') {
+                        // Forzar https y generar enlace clicable
+                        const url = value.replace(/^http:/, 'https:');
+                        row.innerHTML = `
+                            <td>${metricNames[key]}</td>
+                            <td><a href="${url}" target="_blank" rel="noopener noreferrer">${url}</a></td>
+                        `;
+                    } else {
+                        row.innerHTML = `
+                            <td>${metricNames[key] || key}</td>
+                            <td>${value}</td>
+                        `;
+                    }
+                
+                    metricsTable.appendChild(row);
+                });
+            })
+            .catch(error => {
+                console.error('Error fetching author metrics:', error);
+            });
+
+        // Actualizar los filtros y visualizaciones con el autor seleccionado
+        updateFilters();
+    }
+
+    // Función para actualizar el autor seleccionado
+    function updateSelectedAuthor() {
+        if (selectedAuthorName) {
+            // Actualizar los filtros para reflejar las publicaciones del autor
+            updateFilters();
+        }
+    }
+
+    // Función para realizar la búsqueda
+    function performSearch() {
+        if (!selectedAuthorName && !standardSearch.value.trim()) return;
+
+        // Mostrar indicador de carga
+        standardSearchBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i>';
+
+        // Construir la URL de búsqueda
+        const params = new URLSearchParams();
+        if (selectedAuthorName) {
+            params.append('author', selectedAuthorName);
+        } else {
+            params.append('q', standardSearch.value.trim());
+        }
+
+        // Realizar la búsqueda
+        fetch(`/api/search/?${params.toString()}`)
+            .then(response => response.json())
+            .then(data => {
+                // Restaurar el botón
+                standardSearchBtn.innerHTML = '<i class="fas fa-search"></i>';
+
+                // Crear y mostrar el modal de resultados
+                showSearchResults(data.results);
+            })
+            .catch(error => {
+                console.error('Error performing search:', error);
+                standardSearchBtn.innerHTML = '<i class="fas fa-search"></i>';
+                alert('Error al realizar la búsqueda. Por favor, inténtelo de nuevo.');
+            });
+    }
+
+    // Función para mostrar los resultados de búsqueda
+    function showSearchResults(results) {
+        const currentLang = window.location.pathname.split('/')[1];
+        const searchResults = currentLang === 'es' ? 'Resultados de la búsqueda' : 'Search Results';
+
+        // Crear el modal si no existe
+        let modal = document.getElementById('searchResultsModal');
+        if (!modal) {
+            modal = document.createElement('div');
+            modal.id = 'searchResultsModal';
+            modal.className = 'modal fade';
+            modal.setAttribute('tabindex', '-1');
+            modal.innerHTML = `
                 <div class="modal-dialog modal-lg">
                     <div class="modal-content">
                         <div class="modal-header">
-                            <h5 class="modal-title">${L}</h5>
+                            <h5 class="modal-title">${searchResults}</h5>
                             <button type="button" class="btn-close" data-bs-dismiss="modal" aria-label="Close"></button>
                         </div>
                         <div class="modal-body">
@@ -582,27 +1345,302 @@ void main() {
                         </div>
                     </div>
                 </div>
-            `,document.body.appendChild(E));const H=document.getElementById("searchResultsList");p.length===0?H.innerHTML='<p class="text-center">No se encontraron resultados.</p>':H.innerHTML=p.map($=>`
+            `;
+            document.body.appendChild(modal);
+        }
+
+        // Actualizar el contenido del modal
+        const resultsList = document.getElementById('searchResultsList');
+        if (results.length === 0) {
+            resultsList.innerHTML = '<p class="text-center">No se encontraron resultados.</p>';
+        } else {
+            resultsList.innerHTML = results.map(result => `
                 <div class="card mb-3">
-                    <div class="card-body" data-publication-id="${$.id}" style="cursor: pointer;">
-                        <h5 class="card-title">${$.title}</h5>
+                    <div class="card-body" data-publication-id="${result.id}" style="cursor: pointer;">
+                        <h5 class="card-title">${result.title}</h5>
                         <h6 class="card-subtitle mb-2 text-muted">
-                            ${$.year} - ${$.publication_type}
+                            ${result.year} - ${result.publication_type}
                         </h6>
+                        ${result.snippet ? `<p class="card-text small fst-italic">${result.snippet}</p>` : ''}
                         <p class="card-text">
-                            <strong>Autores:</strong> ${$.authors.join(", ")}<br>
-                            <strong>Instituciones:</strong> ${$.institutions.join(", ")}<br>
-                            <strong>Áreas:</strong> ${$.areas.join(", ")}
+                            <strong>Autores:</strong> ${result.authors.join(', ')}<br>
+                            <strong>Instituciones:</strong> ${result.institutions.join(', ')}<br>
+                            <strong>Áreas:</strong> ${result.areas.join(', ')}
                         </p>
-                        ${$.url?`<a href="${$.url}" class="card-link" target="_blank">Ver publicación</a>`:""}
+                        ${result.url ? `<a href="${result.url}" class="card-link" target="_blank">Ver publicación</a>` : ''}
                     </div>
                 </div>
-            `).join(""),H.querySelectorAll(".card-body").forEach($=>{$.addEventListener("click",function(){const B=this.dataset.publicationId;B&&(window.location.href=`/publication/${B}/`)})}),new bootstrap.Modal(E).show()}l.addEventListener("input",function(){ee||(clearTimeout(Me),Me=setTimeout(()=>{Oe(this.value.trim())},300))}),l.addEventListener("focus",function(){this.value.trim()&&!ee&&Oe(this.value.trim())}),document.addEventListener("click",function(p){!p.target.closest("#standardSearch")&&!p.target.closest("#searchSuggestions")&&(d.style.display="none")}),c.addEventListener("click",Ue),l.addEventListener("keypress",function(p){p.key==="Enter"&&Ue()}),pe(),tt(),Hn();function tt(){fetch("/api/dashboard/filters/").then(p=>p.json()).then(p=>{const R=p.years.map(L=>L.year);e.min=Math.min(...R),e.max=Math.max(...R),t.min=Math.min(...R),t.max=Math.max(...R),p.areas.forEach(L=>{const E=document.createElement("option");E.value=L.name,E.textContent=`${L.name} (${L.count})`,n.appendChild(E)}),p.institutions.forEach(L=>{const E=document.createElement("option");E.value=L.name,E.textContent=`${L.name} (${L.count})`,i.appendChild(E)}),p.publication_types.forEach(L=>{const E=document.createElement("option");E.value=L.publication_type,E.textContent=`${L.publication_type} (${L.count})`,r.appendChild(E)}),Ye()}).catch(p=>console.error("Error loading filter data:",p))}function nt(p,R,L){const E=document.createElement("span");E.className="badge bg-primary me-2 mb-2";const H=p.length>40?p.substring(0,40)+"...":p;E.innerHTML=`
-            ${H}
+            `).join('');
+        }
+
+        // Añadir evento de clic a cada tarjeta de resultado
+        resultsList.querySelectorAll('.card-body').forEach(cardBody => {
+            cardBody.addEventListener('click', function() {
+                const publicationId = this.dataset.publicationId;
+                if (publicationId) {
+                    // Redirigir a la página de detalle de publicación
+                    window.location.href = `/publication/${publicationId}/`;
+                }
+            });
+        });
+
+        // Mostrar el modal
+        const modalInstance = new bootstrap.Modal(modal);
+        modalInstance.show();
+    }
+
+    // Event listeners para el autocompletado
+    standardSearch.addEventListener('input', function() {
+        if (selectedAuthorName) return;
+
+        clearTimeout(searchTimeout);
+        searchTimeout = setTimeout(() => {
+            showAuthorSuggestions(this.value.trim());
+        }, 300);
+    });
+
+    standardSearch.addEventListener('focus', function() {
+        if (this.value.trim() && !selectedAuthorName) {
+            showAuthorSuggestions(this.value.trim());
+        }
+    });
+
+    // Cerrar sugerencias al hacer clic fuera
+    document.addEventListener('click', function(e) {
+        if (!e.target.closest('#standardSearch') && !e.target.closest('#searchSuggestions')) {
+            searchSuggestions.style.display = 'none';
+        }
+    });
+
+    // Event listeners para la búsqueda
+    standardSearchBtn.addEventListener('click', performSearch);
+    standardSearch.addEventListener('keypress', function(e) {
+        if (e.key === 'Enter') {
+            performSearch();
+        }
+    });
+
+    // Inicializar estado del botón al cargar la página
+    updateSearchButton();
+
+    // Cargar los datos de los filtros
+    loadFilterData();
+
+    // Configurar botones de vista de áreas (circular/barra)
+    setupAreasButtons();
+
+    // Función para cargar los datos de los filtros
+    function loadFilterData() {
+        fetch('/api/dashboard/filters/')
+            .then(response => response.json())
+            .then(data => {
+                // Establecer el rango de años disponible
+                const years = data.years.map(y => y.year);
+                yearFrom.min = Math.min(...years);
+                yearFrom.max = Math.max(...years);
+                yearTo.min = Math.min(...years);
+                yearTo.max = Math.max(...years);
+
+                // Llenar el filtro de áreas temáticas
+                data.areas.forEach(area => {
+                    const option = document.createElement('option');
+                    option.value = area.name;
+                    option.textContent = `${area.name} (${area.count})`;
+                    areaFilter.appendChild(option);
+                });
+
+                // Llenar el filtro de instituciones
+                data.institutions.forEach(institution => {
+                    const option = document.createElement('option');
+                    option.value = institution.name;
+                    option.textContent = `${institution.name} (${institution.count})`;
+                    institutionFilter.appendChild(option);
+                });
+
+                // Llenar el filtro de tipos de publicación
+                data.publication_types.forEach(type => {
+                    const option = document.createElement('option');
+                    option.value = type.publication_type;
+                    option.textContent = `${type.publication_type} (${type.count})`;
+                    typeFilter.appendChild(option);
+                });
+
+                // Cargar datos iniciales
+                updateVisualizations();
+            })
+            .catch(error => console.error('Error loading filter data:', error));
+    }
+
+    // Función para crear un badge con botón de eliminar
+    function createBadge(value, container, set) {
+        const badge = document.createElement('span');
+        badge.className = 'badge bg-primary me-2 mb-2';
+        // Limitar el texto a 40 caracteres
+        const displayText = value.length > 40 ? value.substring(0, 40) + '...' : value;
+        badge.innerHTML = `
+            ${displayText}
             <button type="button" class="btn-close btn-close-white ms-1" 
                     style="font-size: 0.5rem; vertical-align: middle;"
                     aria-label="Remove"></button>
-        `,E.querySelector(".btn-close").addEventListener("click",()=>{L.delete(p),E.remove(),L===oe&&(window.selectedAreasList=oe),L===re&&(window.selectedInstitutionsList=re),L===se&&(window.selectedTypesList=se),Ye()}),R.appendChild(E),L===oe&&(window.selectedAreasList=oe),L===re&&(window.selectedInstitutionsList=re),L===se&&(window.selectedTypesList=se)}let je="pie",it=null;function Mt(p){je==="pie"?$a(p):Ia(p),Ji()}function Hn(){const p=document.querySelector('[data-areas-view="pie"]'),R=document.querySelector('[data-areas-view="bar"]');!p||!R||(p.addEventListener("click",function(){p.classList.contains("active")||(p.classList.add("active"),R.classList.remove("active"),je="pie",it&&Mt(it))}),R.addEventListener("click",function(){R.classList.contains("active")||(R.classList.add("active"),p.classList.remove("active"),je="bar",it&&Mt(it))}))}function Ye(){const p={year_from:e.value,year_to:t.value,areas:Array.from(oe),institutions:Array.from(re),types:Array.from(se)},R=p.year_from&&p.year_to&&p.year_from===p.year_to,L=document.querySelector('[data-view="monthly"]'),E=document.querySelector('[data-view="yearly"]');L.disabled=!R,R?p.view_type=L.classList.contains("active")?"monthly":"yearly":(L.classList.remove("active"),E.classList.add("active"),p.view_type="yearly");const H=new URLSearchParams;p.year_from&&H.append("year_from",p.year_from),p.year_to&&H.append("year_to",p.year_to),p.areas.forEach(T=>H.append("areas",T)),p.institutions.forEach(T=>H.append("institutions",T)),p.types.forEach(T=>H.append("types",T)),H.append("view_type",p.view_type),rn&&H.append("include_predicted_areas","true"),ee&&H.append("author",ee),fetch(`/api/dashboard/data/?${H.toString()}`).then(T=>T.json()).then(T=>{const $=new URLSearchParams(H);$.append("view_type",window.currentCommunityView),fetch(`/api/dashboard/collaboration-network/?${$.toString()}`).then(te=>te.json()).then(te=>{tn(te)}).catch(te=>{console.error("Error fetching collaboration network data:",te)}),Da(T.timeline,p.view_type,T.timeline_info),it=T.areas;const B=document.querySelector('[data-areas-view="pie"]'),J=document.querySelector('[data-areas-view="bar"]');B&&J&&!B.classList.contains("active")&&!J.classList.contains("active")?(B.classList.add("active"),J.classList.remove("active"),je="pie"):J&&J.classList.contains("active")?je="bar":B&&B.classList.contains("active")&&(je="pie"),Mt(T.areas),Vn(1).then(()=>{})}).catch(T=>console.error("Error updating visualizations:",T))}let De={metric:null,direction:"desc"};function Vn(p=1){const R=document.getElementById("metricsTable"),L=document.getElementById("publicationsPagination"),E=R.closest("table");if(E){let $=E.querySelector(".loading-overlay");$||($=document.createElement("div"),$.className="loading-overlay",$.style.cssText=`
+        `;
+        badge.querySelector('.btn-close').addEventListener('click', () => {
+            set.delete(value);
+            badge.remove();
+            // Actualizar window para exportación
+            if (set === selectedAreasList) window.selectedAreasList = selectedAreasList;
+            if (set === selectedInstitutionsList) window.selectedInstitutionsList = selectedInstitutionsList;
+            if (set === selectedTypesList) window.selectedTypesList = selectedTypesList;
+            updateVisualizations();
+        });
+        container.appendChild(badge);
+        // Actualizar window para exportación
+        if (set === selectedAreasList) window.selectedAreasList = selectedAreasList;
+        if (set === selectedInstitutionsList) window.selectedInstitutionsList = selectedInstitutionsList;
+        if (set === selectedTypesList) window.selectedTypesList = selectedTypesList;
+    }
+
+    // Función para limpiar todos los filtros
+    function clearFilters() {
+        yearFrom.value = '';
+        yearTo.value = '';
+        selectedAreasList.clear();
+        selectedInstitutionsList.clear();
+        selectedTypesList.clear();
+        selectedAreas.innerHTML = '';
+        selectedInstitutions.innerHTML = '';
+        selectedTypes.innerHTML = '';
+        updateFilters();
+    }
+
+    // --- ÁREAS TEMÁTICAS: LÓGICA DE BOTONES Y RENDER ---
+    let currentAreasView = 'pie';
+    let lastAreasData = null;
+
+    function renderAreasChart(data) {
+        if (currentAreasView === 'pie') {
+            updateAreasChart(data);
+        } else {
+            updateAreasBarChart(data);
+        }
+        hideAreasLoading();
+    }
+
+    // Lógica de botones de áreas temáticas igual que yearly/monthly
+    function setupAreasButtons() {
+        const pieBtn = document.querySelector('[data-areas-view="pie"]');
+        const barBtn = document.querySelector('[data-areas-view="bar"]');
+        if (!pieBtn || !barBtn) return;
+
+        pieBtn.addEventListener('click', function() {
+            if (!pieBtn.classList.contains('active')) {
+                pieBtn.classList.add('active');
+                barBtn.classList.remove('active');
+                currentAreasView = 'pie';
+                if (lastAreasData) renderAreasChart(lastAreasData);
+            }
+        });
+        barBtn.addEventListener('click', function() {
+            if (!barBtn.classList.contains('active')) {
+                barBtn.classList.add('active');
+                pieBtn.classList.remove('active');
+                currentAreasView = 'bar';
+                if (lastAreasData) renderAreasChart(lastAreasData);
+            }
+        });
+    }
+
+    // Modifica updateVisualizations para guardar los datos de áreas y renderizar según la vista activa
+    function updateVisualizations() {
+        const filters = {
+            year_from: yearFrom.value,
+            year_to: yearTo.value,
+            areas: Array.from(selectedAreasList),
+            institutions: Array.from(selectedInstitutionsList),
+            types: Array.from(selectedTypesList)
+        };
+
+        // Vista de la línea temporal: anual, mensual o trimestral (cualquier rango de años)
+        const activeViewBtn = document.querySelector('[data-view].active');
+        filters.view_type = activeViewBtn ? activeViewBtn.dataset.view : 'yearly';
+
+        // Construir la URL con los parámetros de filtrado
+        const params = new URLSearchParams();
+        if (filters.year_from) params.append('year_from', filters.year_from);
+        if (filters.year_to) params.append('year_to', filters.year_to);
+        filters.areas.forEach(area => params.append('areas', area));
+        filters.institutions.forEach(institution => params.append('institutions', institution));
+        filters.types.forEach(type => params.append('types', type));
+        params.append('view_type', filters.view_type);
+        if (includePredictedAreas) params.append('include_predicted_areas', 'true');
+        
+        // Añadir el autor seleccionado si existe
+        if (selectedAuthorName) {
+            params.append('author', selectedAuthorName);
+        }
+
+        // Obtener los datos filtrados
+        fetch(`/api/dashboard/data/?${params.toString()}`)
+            .then(response => response.json())
+            .then(data => {
+
+                // Obtener datos de la red de colaboración
+                const networkParams = new URLSearchParams(params); // Clonar los parámetros existentes
+                networkParams.append('view_type', window.currentCommunityView); // Añadir el tipo de vista de comunidad
+
+                fetch(`/api/dashboard/collaboration-network/?${networkParams.toString()}`)
+                .then(response => response.json())
+                .then(decodeNetworkData)
+                .then(data => {
+                    updateCollaborationNetwork(data);
+                })
+                .catch(error => {
+                    console.error('Error fetching collaboration network data:', error);
+                });
+
+                // Actualizar la línea de tiempo
+                updateTimeline(data.timeline, filters.view_type, data.timeline_info);
+                // Guardar y renderizar áreas según el botón activo
+                lastAreasData = data.areas;
+                // Si ninguno está activo, activa Circular por defecto
+                const pieBtn = document.querySelector('[data-areas-view="pie"]');
+                const barBtn = document.querySelector('[data-areas-view="bar"]');
+                if (pieBtn && barBtn && !pieBtn.classList.contains('active') && !barBtn.classList.contains('active')) {
+                    pieBtn.classList.add('active');
+                    barBtn.classList.remove('active');
+                    currentAreasView = 'pie';
+                } else if (barBtn && barBtn.classList.contains('active')) {
+                    currentAreasView = 'bar';
+                } else if (pieBtn && pieBtn.classList.contains('active')) {
+                    currentAreasView = 'pie';
+                }
+                renderAreasChart(data.areas);
+                
+                // Actualizar la tabla de publicaciones
+                updatePublicationsTable(1).then(() => {
+                });
+            })
+            .catch(error => console.error('Error updating visualizations:', error));
+    }
+
+    // Estado de ordenación actual (mover fuera de la función para mantenerlo entre llamadas)
+    let currentSort = {
+        metric: null,
+        direction: 'desc'
+    };
+
+    function updatePublicationsTable(page = 1, cursor = null) {
+        const tableBody = document.getElementById('metricsTable');
+        const pagination = document.getElementById('publicationsPagination');
+        const table = tableBody.closest('table');
+
+        // Mostrar indicador de carga y deshabilitar la tabla
+        if (table) {
+            // Crear overlay de carga si no existe
+            let loadingOverlay = table.querySelector('.loading-overlay');
+            if (!loadingOverlay) {
+                loadingOverlay = document.createElement('div');
+                loadingOverlay.className = 'loading-overlay';
+                loadingOverlay.style.cssText = `
                     position: absolute;
                     top: 0;
                     left: 0;
@@ -613,66 +1651,1135 @@ void main() {
                     justify-content: center;
                     align-items: center;
                     z-index: 1000;
-                `,$.innerHTML=`
+                `;
+                loadingOverlay.innerHTML = `
                     <div class="spinner-border text-primary" role="status">
                         <span class="visually-hidden">Cargando...</span>
                     </div>
-                `,E.style.position="relative",E.appendChild($)),$.style.display="flex",E.style.pointerEvents="none",E.style.opacity="0.7"}const H={year_from:e.value,year_to:t.value,areas:Array.from(oe),institutions:Array.from(re),types:Array.from(se),page:p},T=new URLSearchParams;return H.year_from&&T.append("year_from",H.year_from),H.year_to&&T.append("year_to",H.year_to),H.areas.forEach($=>T.append("areas",$)),H.institutions.forEach($=>T.append("institutions",$)),H.types.forEach($=>T.append("types",$)),T.append("page",H.page),ee&&T.append("author",ee),De.metric&&(T.append("sort_by",De.metric),T.append("sort_order",De.direction)),fetch(`/api/dashboard/publications/?${T.toString()}`).then($=>{if(!$.ok)throw new Error("Network response was not ok");return $.json()}).then($=>{if(!R||!L)return Promise.reject("Required elements not found");const{data:B,pagination:J}=$.publications,te=[{key:"Dimensions Citations",label:"Dimensions Citations"},{key:"WoS Citations",label:"WoS Citations"},{key:"Scopus Citations",label:"Scopus Citations"},{key:"FCR",label:"FCR"},{key:"RCR",label:"RCR"},{key:"International Collaboration",label:"International Collaboration"}],X=document.createElement("thead");if(X.innerHTML=`
+                `;
+                table.style.position = 'relative';
+                table.appendChild(loadingOverlay);
+            }
+            loadingOverlay.style.display = 'flex';
+            
+            // Deshabilitar la tabla
+            table.style.pointerEvents = 'none';
+            table.style.opacity = '0.7';
+        }
+
+        const filters = {
+            year_from: yearFrom.value,
+            year_to: yearTo.value,
+            areas: Array.from(selectedAreasList),
+            institutions: Array.from(selectedInstitutionsList),
+            types: Array.from(selectedTypesList),
+            page: page
+        };
+
+        // Construir la URL con los parámetros de filtrado
+        const params = new URLSearchParams();
+        if (filters.year_from) params.append('year_from', filters.year_from);
+        if (filters.year_to) params.append('year_to', filters.year_to);
+        filters.areas.forEach(area => params.append('areas', area));
+        filters.institutions.forEach(institution => params.append('institutions', institution));
+        filters.types.forEach(type => params.append('types', type));
+        params.append('page', filters.page);
+        // Cursor de la página siguiente (paginación por keyset)
+        if (cursor) {
+            params.append('cursor', cursor);
+        }
+        
+        // Añadir el autor seleccionado si existe
+        if (selectedAuthorName) {
+            params.append('author', selectedAuthorName);
+        }
+
+        // Añadir parámetros de ordenación si existen
+        if (currentSort.metric) {
+            params.append('sort_by', currentSort.metric);
+            params.append('sort_order', currentSort.direction);
+        }
+
+        // Retornar la promesa de fetch
+        return fetch(`/api/dashboard/publications/?${params.toString()}`)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error('Network response was not ok');
+                }
+                return response.json();
+            })
+            .then(data => {
+                if (!tableBody || !pagination) {
+                    return Promise.reject('Required elements not found');
+                }
+
+                const { data: publications, pagination: paginationData } = data.publications;
+
+                // Ordenar las métricas en un orden específico
+                const orderedMetrics = [
+                    { key: 'Dimensions Citations', label: 'Dimensions Citations' },
+                    { key: 'WoS Citations', label: 'WoS Citations' },
+                    { key: 'Scopus Citations', label: 'Scopus Citations' },
+                    { key: 'FCR', label: 'FCR' },
+                    { key: 'RCR', label: 'RCR' },
+                    { key: 'International Collaboration', label: 'International Collaboration' }
+                ];
+
+                // Crear el encabezado de la tabla con iconos de ordenación
+                const tableHeader = document.createElement('thead');
+                tableHeader.innerHTML = `
                     <tr>
                         <th style="max-width: 300px;">Título</th>
-                        ${te.map(({key:A,label:P})=>`
-                            <th class="sortable" data-metric="${A}">
-                                ${P}
-                                <i class="fas fa-sort${De.metric===A?`-${De.direction==="desc"?"down":"up"}`:""} ms-1"></i>
+                        ${orderedMetrics.map(({ key, label }) => `
+                            <th class="sortable" data-metric="${key}">
+                                ${label}
+                                <i class="fas fa-sort${currentSort.metric === key ? `-${currentSort.direction === 'desc' ? 'down' : 'up'}` : ''} ms-1"></i>
                             </th>
-                        `).join("")}
+                        `).join('')}
                     </tr>
-                `,E){const A=E.querySelector("thead");A&&A.remove(),E.insertBefore(X,R)}X.querySelectorAll(".sortable").forEach(A=>{A.addEventListener("click",function(){const P=this.dataset.metric,q=this.querySelector("i");X.querySelectorAll(".sortable i").forEach(D=>{D.className="fas fa-sort ms-1"}),De.metric===P?De.direction=De.direction==="desc"?"asc":"desc":(De.metric=P,De.direction="desc"),q.className=`fas fa-sort-${De.direction==="desc"?"down":"up"} ms-1`,Vn(1)})});function ye(A){R.innerHTML=A.map(P=>`
-                        <tr class="publication-row" data-publication-id="${P.id}" style="cursor: pointer;">
-                            <td style="max-width: 300px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;">${P.title}</td>
-                            ${te.map(({key:q})=>{const D=P.metrics[q];return`<td>${D&&D.value!==null?D.value:""}</td>`}).join("")}
-                            <td>${P.international_collab!==null?P.international_collab:"-"}</td>
+                `;
+
+                // Añadir el encabezado a la tabla
+                if (table) {
+                    const existingHeader = table.querySelector('thead');
+                    if (existingHeader) {
+                        existingHeader.remove();
+                    }
+                    table.insertBefore(tableHeader, tableBody);
+                }
+
+                // Añadir eventos de clic a los encabezados ordenables
+                tableHeader.querySelectorAll('.sortable').forEach(header => {
+                    header.addEventListener('click', function() {
+                        const metric = this.dataset.metric;
+                        const icon = this.querySelector('i');
+
+                        // Resetear todos los iconos
+                        tableHeader.querySelectorAll('.sortable i').forEach(i => {
+                            i.className = 'fas fa-sort ms-1';
+                        });
+
+                        // Actualizar el estado de ordenación
+                        if (currentSort.metric === metric) {
+                            currentSort.direction = currentSort.direction === 'desc' ? 'asc' : 'desc';
+                        } else {
+                            currentSort.metric = metric;
+                            currentSort.direction = 'desc';
+                        }
+
+                        // Actualizar el icono
+                        icon.className = `fas fa-sort-${currentSort.direction === 'desc' ? 'down' : 'up'} ms-1`;
+
+                        // Actualizar la tabla con la nueva ordenación
+                        updatePublicationsTable(1); // Volver a la primera página
+                    });
+                });
+
+                // Función para actualizar el contenido de la tabla
+                function updateTableContent(pubs) {
+                    tableBody.innerHTML = pubs.map(pub => `
+                        <tr class="publication-row" data-publication-id="${pub.id}" style="cursor: pointer;">
+                            <td style="max-width: 300px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;">${pub.title}</td>
+                            ${orderedMetrics.map(({ key }) => {
+                                const metric = pub.metrics[key];
+                                const displayValue = (metric && metric.value !== null) ? metric.value : '';
+                                return `<td>${displayValue}</td>`;
+                            }).join('')}
+                            <td>${pub.international_collab !== null ? pub.international_collab : '-'}</td>
                         </tr>
-                    `).join(""),R.querySelectorAll(".publication-row").forEach(P=>{P.addEventListener("click",function(){const q=this.dataset.publicationId;q&&(window.location.href=`/publication/${q}/`)})})}if(ye(B),J.total_pages>1){let A=`
-                        <li class="page-item ${J.current_page===1?"disabled":""}">
+                    `).join('');
+
+                    // Añadir eventos para las filas de publicaciones
+                    tableBody.querySelectorAll('.publication-row').forEach(row => {
+                        row.addEventListener('click', function() {
+                            const publicationId = this.dataset.publicationId;
+                            if (publicationId) {
+                                window.location.href = `/publication/${publicationId}/`;
+                            }
+                        });
+                    });
+                }
+
+                // Actualizar el contenido inicial de la tabla
+                updateTableContent(publications);
+
+                // Actualizar la paginación
+                if (paginationData.total_pages > 1) {
+                    let paginationHTML = `
+                        <li class="page-item ${paginationData.current_page === 1 ? 'disabled' : ''}">
                             <a class="page-link" href="#" data-page="1">&laquo;</a>
                         </li>
-                        <li class="page-item ${J.current_page===1?"disabled":""}">
-                            <a class="page-link" href="#" data-page="${J.current_page-1}">&lt;</a>
+                        <li class="page-item ${paginationData.current_page === 1 ? 'disabled' : ''}">
+                            <a class="page-link" href="#" data-page="${paginationData.current_page - 1}">&lt;</a>
                         </li>
-                    `;const P=Math.max(1,J.current_page-2),q=Math.min(J.total_pages,J.current_page+2);for(let D=P;D<=q;D++)A+=`
-                            <li class="page-item ${D===J.current_page?"active":""}">
-                                <a class="page-link" href="#" data-page="${D}">${D}</a>
+                    `;
+
+                    // Mostrar páginas alrededor de la actual
+                    const startPage = Math.max(1, paginationData.current_page - 2);
+                    const endPage = Math.min(paginationData.total_pages, paginationData.current_page + 2);
+
+                    for (let i = startPage; i <= endPage; i++) {
+                        paginationHTML += `
+                            <li class="page-item ${i === paginationData.current_page ? 'active' : ''}">
+                                <a class="page-link" href="#" data-page="${i}">${i}</a>
                             </li>
-                        `;A+=`
-                        <li class="page-item ${J.current_page===J.total_pages?"disabled":""}">
-                            <a class="page-link" href="#" data-page="${J.current_page+1}">&gt;</a>
+                        `;
+                    }
+
+                    paginationHTML += `
+                        <li class="page-item ${paginationData.current_page === paginationData.total_pages ? 'disabled' : ''}">
+                            <a class="page-link" href="#" data-page="${paginationData.current_page + 1}" data-cursor="${paginationData.next_cursor || ''}">&gt;</a>
                         </li>
-                        <li class="page-item ${J.current_page===J.total_pages?"disabled":""}">
-                            <a class="page-link" href="#" data-page="${J.total_pages}">&raquo;</a>
+                        <li class="page-item ${paginationData.current_page === paginationData.total_pages ? 'disabled' : ''}">
+                            <a class="page-link" href="#" data-page="${paginationData.total_pages}">&raquo;</a>
                         </li>
-                    `,L.innerHTML=A}else L.innerHTML="";if(L.querySelectorAll(".page-link").forEach(A=>{A.addEventListener("click",function(P){P.preventDefault();const q=parseInt(this.dataset.page);isNaN(q)||Vn(q)})}),E){const A=E.querySelector(".loading-overlay");A&&(A.style.display="none"),E.style.pointerEvents="auto",E.style.opacity="1"}return Promise.resolve()}).catch($=>{if(console.error("Error updating publications table:",$),E){const B=E.querySelector(".loading-overlay");B&&(B.style.display="none"),E.style.pointerEvents="auto",E.style.opacity="1"}return Promise.reject($)})}function Da(p,R,L){$e("#timelineChart").html("");const E={top:20,right:20,bottom:70,left:60},H=document.getElementById("timelineChart").clientWidth-E.left-E.right,T=300-E.top-E.bottom,$=$e("#timelineChart").append("svg").attr("width",H+E.left+E.right).attr("height",T+E.top+E.bottom).style("display","block").style("margin","0 auto").append("g").attr("transform",`translate(${E.left},${E.top})`);let B;R==="monthly"?B=Vt().domain([1,12]).range([0,H]):B=Vt().domain(Wa(p,D=>D.year)).range([0,H]);const J=Vt().domain([0,rr(p,D=>D.count)]).nice().range([T,0]);let te;R==="monthly"?te=Yn(B).ticks(12).tickFormat(D=>["Ene","Feb","Mar","Abr","May","Jun","Jul","Ago","Sep","Oct","Nov","Dic"][D-1]):te=Yn(B).ticks(H/80).tickFormat(zi("d"));const X=ar(J).ticks(T/40);$.append("g").attr("transform",`translate(0,${T})`).call(te).selectAll("text").style("text-anchor","middle"),$.append("g").call(X);const ye=Wo().x(D=>B(R==="monthly"?D.month:D.year)).y(D=>J(D.count)).curve(Ir),A=ud().x(D=>B(R==="monthly"?D.month:D.year)).y0(T).y1(D=>J(D.count)).curve(Ir);$.append("path").datum(p).attr("fill","#e3f2fd").attr("d",A),$.append("path").datum(p).attr("fill","none").attr("stroke","#2196f3").attr("stroke-width",2).attr("d",ye);const P=document.createElement("div");P.className="tooltip",P.style.opacity=0,P.style.position="absolute",P.style.backgroundColor="rgba(255,255,255,0.95)",P.style.border="1px solid #2196f3",P.style.borderRadius="4px",P.style.padding="6px 10px",P.style.fontSize="13px",P.style.pointerEvents="none",P.style.zIndex="1000",P.style.boxShadow="0 2px 4px rgba(0,0,0,0.1)",document.body.appendChild(P);const q=document.createElement("div");if(q.className="info-box",q.style.display="none",q.style.position="absolute",q.style.backgroundColor="white",q.style.border="2px solid #2196f3",q.style.borderRadius="6px",q.style.padding="10px 15px",q.style.fontSize="14px",q.style.zIndex="1000",q.style.boxShadow="0 4px 8px rgba(0,0,0,0.1)",q.style.pointerEvents="none",document.body.appendChild(q),$.selectAll(".point").data(p).enter().append("circle").attr("class","point").attr("cx",D=>B(R==="monthly"?D.month:D.year)).attr("cy",D=>J(D.count)).attr("r",5).attr("fill","#2196f3").attr("stroke","#fff").attr("stroke-width",2).style("cursor","pointer").on("mouseover",function(D,j){$e(this).attr("r",7).attr("fill","#1976d2"),P.style.opacity=1;let K;R==="monthly"?K=`<b>${["Enero","Febrero","Marzo","Abril","Mayo","Junio","Julio","Agosto","Septiembre","Octubre","Noviembre","Diciembre"][j.month-1]}</b><br><b>Publicaciones:</b> ${j.count}`:K=`<b>Año:</b> ${j.year}<br><b>Publicaciones:</b> ${j.count}`,P.innerHTML=K,P.style.left=`${D.pageX+10}px`,P.style.top=`${D.pageY+10}px`}).on("mouseout",function(){$e(this).attr("r",5).attr("fill","#2196f3"),P.style.opacity=0}).on("click",function(D,j){D.stopPropagation(),He(".info-box").style("display","none");const K=document.getElementById("timelineChart").getBoundingClientRect(),Z=D.clientX-K.left,le=D.clientY-K.top,de=120,ge=60;let be=Z,ot=le-ge-10;be+de/2>K.width?be=K.width-de/2:be-de/2<0&&(be=de/2),ot<0&&(ot=le+10);let lt;R==="monthly"?lt=`
-                        <div style="font-weight: bold; margin-bottom: 5px;">${["Enero","Febrero","Marzo","Abril","Mayo","Junio","Julio","Agosto","Septiembre","Octubre","Noviembre","Diciembre"][j.month-1]}</div>
-                        <div>Publicaciones: ${j.count}</div>
-                    `:lt=`
-                        <div style="font-weight: bold; margin-bottom: 5px;">Año ${j.year}</div>
-                        <div>Publicaciones: ${j.count}</div>
-                    `,q.innerHTML=lt,q.style.display="block",q.style.left=`${be-de/2}px`,q.style.top=`${ot}px`}),$.on("click",function(D){D.target.classList.contains("point")||He(".info-box").style("display","none")}),document.addEventListener("click",function(D){D.target.closest("#timelineChart")||He(".info-box").style("display","none")}),document.getElementById("timelineChart").addEventListener("click",function(D){D.target.closest(".point")||He(".info-box").style("display","none")}),$.append("text").attr("transform","rotate(-90)").attr("y",0-E.left+20).attr("x",0-T/2).attr("dy","1em").style("text-anchor","middle").style("font-size","12px").text("Número de publicaciones"),$.append("text").attr("transform",`translate(${H/2}, ${T+E.bottom-30})`).attr("dy","1em").style("text-anchor","middle").style("font-size","12px").text(R==="monthly"?"Mes":"Año"),R==="monthly"&&L&&L.no_month_count>0){const D=$e("#timelineChart").append("div").attr("class","alert alert-info").style("position","absolute").style("top","50px").style("right","10px").style("padding","8px 12px").style("font-size","12px").style("border-radius","4px").style("background-color","#e3f2fd").style("border","1px solid #2196f3").style("color","#0d47a1").style("z-index","1000").style("display","flex").style("align-items","center").style("gap","8px").style("max-width","300px");(L.no_month_count/L.total_count*100).toFixed(1),D.html(`
+                    `;
+
+                    pagination.innerHTML = paginationHTML;
+                } else {
+                    pagination.innerHTML = '';
+                }
+
+                // Añadir eventos para la paginación
+                pagination.querySelectorAll('.page-link').forEach(link => {
+                    link.addEventListener('click', function(e) {
+                        e.preventDefault();
+                        const page = parseInt(this.dataset.page);
+                        if (!isNaN(page)) {
+                            updatePublicationsTable(page, this.dataset.cursor || null);
+                        }
+                    });
+                });
+
+                // Ocultar indicador de carga y habilitar la tabla
+                if (table) {
+                    const loadingOverlay = table.querySelector('.loading-overlay');
+                    if (loadingOverlay) {
+                        loadingOverlay.style.display = 'none';
+                    }
+                    table.style.pointerEvents = 'auto';
+                    table.style.opacity = '1';
+                }
+
+                return Promise.resolve();
+            })
+            .catch(error => {
+                console.error('Error updating publications table:', error);
+                
+                // Ocultar indicador de carga y habilitar la tabla en caso de error
+                if (table) {
+                    const loadingOverlay = table.querySelector('.loading-overlay');
+                    if (loadingOverlay) {
+                        loadingOverlay.style.display = 'none';
+                    }
+                    table.style.pointerEvents = 'auto';
+                    table.style.opacity = '1';
+                }
+                
+                return Promise.reject(error);
+            });
+    }
+
+    // Funciones para actualizar cada visualización
+    function updateTimeline(data, viewType, timelineInfo) {
+        // Limpiar el contenedor
+        d3.select('#timelineChart').html('');
+
+        // Configuración del gráfico
+        const margin = {top: 20, right: 20, bottom: 70, left: 60};
+        const width = document.getElementById('timelineChart').clientWidth - margin.left - margin.right;
+        const height = 300 - margin.top - margin.bottom;
+
+        // Crear el SVG
+        const svg = d3.select('#timelineChart')
+            .append('svg')
+            .attr('width', width + margin.left + margin.right)
+            .attr('height', height + margin.top + margin.bottom)
+            .style('display', 'block')
+            .style('margin', '0 auto')
+            .append('g')
+            .attr('transform', `translate(${margin.left},${margin.top})`);
+
+        // Periodos por año y posición de cada punto en el eje X
+        const periodsPerYear = viewType === 'monthly' ? 12 : viewType === 'quarterly' ? 4 : 1;
+        const firstYear = d3.min(data, d => d.year);
+        const singleYear = firstYear === d3.max(data, d => d.year);
+        const shortMonths = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun', 'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic'];
+        const longMonths = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
+                            'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre'];
+        const periodOf = d => viewType === 'monthly' ? d.month : d.quarter;
+        const xValue = d => periodsPerYear === 1 ? d.year : (d.year - firstYear) * periodsPerYear + periodOf(d);
+        const periodLabel = (d, long) => {
+            const period = viewType === 'monthly'
+                ? (long ? longMonths : shortMonths)[d.month - 1]
+                : `T${d.quarter}`;
+            return singleYear ? period : `${period} ${d.year}`;
+        };
+
+        // Escalas
+        let x;
+        if (periodsPerYear > 1) {
+            // Escala para meses o trimestres
+            x = d3.scaleLinear()
+                .domain(d3.extent(data, xValue))
+                .range([0, width]);
+        } else {
+            // Escala para años
+            x = d3.scaleLinear()
+                .domain(d3.extent(data, d => d.year))
+                .range([0, width]);
+        }
+
+        const y = d3.scaleLinear()
+            .domain([0, d3.max(data, d => d.count)])
+            .nice()
+            .range([height, 0]);
+
+        // Ejes
+        let xAxis;
+        if (periodsPerYear > 1) {
+            // Como mucho unas 12 marcas, siempre sobre periodos enteros
+            const step = Math.max(1, Math.ceil(data.length / 12));
+            xAxis = d3.axisBottom(x)
+                .tickValues(data.filter((d, i) => i % step === 0).map(xValue))
+                .tickFormat((value, i) => periodLabel(data[i * step]));
+        } else {
+            xAxis = d3.axisBottom(x)
+                .ticks(width / 80)
+                .tickFormat(d3.format('d'));
+        }
+
+        const yAxis = d3.axisLeft(y)
+            .ticks(height / 40);
+
+        // Añadir ejes
+        svg.append('g')
+            .attr('transform', `translate(0,${height})`)
+            .call(xAxis)
+            .selectAll('text')
+            .style('text-anchor', 'middle');
+
+        svg.append('g')
+            .call(yAxis);
+
+        // Línea
+        const line = d3.line()
+            .x(d => x(xValue(d)))
+            .y(d => y(d.count))
+            .curve(d3.curveMonotoneX);
+
+        // Área
+        const area = d3.area()
+            .x(d => x(xValue(d)))
+            .y0(height)
+            .y1(d => y(d.count))
+            .curve(d3.curveMonotoneX);
+
+        // Añadir área
+        svg.append('path')
+            .datum(data)
+            .attr('fill', '#e3f2fd')
+            .attr('d', area);
+
+        // Añadir línea
+        svg.append('path')
+            .datum(data)
+            .attr('fill', 'none')
+            .attr('stroke', '#2196f3')
+            .attr('stroke-width', 2)
+            .attr('d', line);
+
+        // Tooltip
+        const tooltip = document.createElement('div');
+        tooltip.className = 'tooltip';
+        tooltip.style.opacity = 0;
+        tooltip.style.position = 'absolute';
+        tooltip.style.backgroundColor = 'rgba(255,255,255,0.95)';
+        tooltip.style.border = '1px solid #2196f3';
+        tooltip.style.borderRadius = '4px';
+        tooltip.style.padding = '6px 10px';
+        tooltip.style.fontSize = '13px';
+        tooltip.style.pointerEvents = 'none';
+        tooltip.style.zIndex = '1000';
+        tooltip.style.boxShadow = '0 2px 4px rgba(0,0,0,0.1)';
+        document.body.appendChild(tooltip);
+
+        // Info box para el clic
+        const infoBox = document.createElement('div');
+        infoBox.className = 'info-box';
+        infoBox.style.display = 'none';
+        infoBox.style.position = 'absolute';
+        infoBox.style.backgroundColor = 'white';
+        infoBox.style.border = '2px solid #2196f3';
+        infoBox.style.borderRadius = '6px';
+        infoBox.style.padding = '10px 15px';
+        infoBox.style.fontSize = '14px';
+        infoBox.style.zIndex = '1000';
+        infoBox.style.boxShadow = '0 4px 8px rgba(0,0,0,0.1)';
+        infoBox.style.pointerEvents = 'none';
+        document.body.appendChild(infoBox);
+
+        // Añadir puntos y eventos de tooltip y click
+        svg.selectAll('.point')
+            .data(data)
+            .enter()
+            .append('circle')
+            .attr('class', 'point')
+            .attr('cx', d => x(xValue(d)))
+            .attr('cy', d => y(d.count))
+            .attr('r', 5)
+            .attr('fill', '#2196f3')
+            .attr('stroke', '#fff')
+            .attr('stroke-width', 2)
+            .style('cursor', 'pointer')
+            .on('mouseover', function(event, d) {
+                d3.select(this)
+                    .attr('r', 7)
+                    .attr('fill', '#1976d2');
+                tooltip.style.opacity = 1;
+                
+                let tooltipContent;
+                if (periodsPerYear > 1) {
+                    tooltipContent = `<b>${periodLabel(d, true)}</b><br><b>Publicaciones:</b> ${d.count}`;
+                } else {
+                    tooltipContent = `<b>Año:</b> ${d.year}<br><b>Publicaciones:</b> ${d.count}`;
+                }
+                
+                tooltip.innerHTML = tooltipContent;
+                tooltip.style.left = `${event.pageX + 10}px`;
+                tooltip.style.top = `${event.pageY + 10}px`;
+            })
+            .on('mouseout', function() {
+                d3.select(this)
+                    .attr('r', 5)
+                    .attr('fill', '#2196f3');
+                tooltip.style.opacity = 0;
+            })
+            .on('click', function(event, d) {
+                event.stopPropagation();
+                
+                // Ocultar cualquier info box existente
+                d3.selectAll('.info-box').style('display', 'none');
+                
+                // Calcular la posición relativa al contenedor del gráfico
+                const containerRect = document.getElementById('timelineChart').getBoundingClientRect();
+                const xPos = event.clientX - containerRect.left;
+                const yPos = event.clientY - containerRect.top;
+                
+                // Obtener las dimensiones del info box
+                const infoBoxWidth = 120;
+                const infoBoxHeight = 60;
+                
+                // Calcular la posición final del info box
+                let finalX = xPos;
+                let finalY = yPos - infoBoxHeight - 10;
+                
+                // Ajustar la posición horizontal para que no se salga del gráfico
+                if (finalX + infoBoxWidth/2 > containerRect.width) {
+                    finalX = containerRect.width - infoBoxWidth/2;
+                } else if (finalX - infoBoxWidth/2 < 0) {
+                    finalX = infoBoxWidth/2;
+                }
+                
+                // Ajustar la posición vertical si se sale por arriba
+                if (finalY < 0) {
+                    finalY = yPos + 10;
+                }
+                
+                // Mostrar el nuevo info box
+                let infoBoxContent;
+                if (periodsPerYear > 1) {
+                    infoBoxContent = `
+                        <div style="font-weight: bold; margin-bottom: 5px;">${periodLabel(d, true)}</div>
+                        <div>Publicaciones: ${d.count}</div>
+                    `;
+                } else {
+                    infoBoxContent = `
+                        <div style="font-weight: bold; margin-bottom: 5px;">Año ${d.year}</div>
+                        <div>Publicaciones: ${d.count}</div>
+                    `;
+                }
+                
+                infoBox.innerHTML = infoBoxContent;
+                infoBox.style.display = 'block';
+                infoBox.style.left = `${finalX - infoBoxWidth/2}px`;
+                infoBox.style.top = `${finalY}px`;
+            });
+
+        // Añadir evento de clic en el SVG para cerrar el info box
+        svg.on('click', function(event) {
+            if (!event.target.classList.contains('point')) {
+                d3.selectAll('.info-box').style('display', 'none');
+            }
+        });
+
+        // Añadir evento de clic en el documento para cerrar el info box
+        document.addEventListener('click', function(event) {
+            if (!event.target.closest('#timelineChart')) {
+                d3.selectAll('.info-box').style('display', 'none');
+            }
+        });
+
+        // Añadir evento de clic en el contenedor del gráfico
+        document.getElementById('timelineChart').addEventListener('click', function(event) {
+            if (!event.target.closest('.point')) {
+                d3.selectAll('.info-box').style('display', 'none');
+            }
+        });
+
+        // Añadir título del eje Y
+        svg.append('text')
+            .attr('transform', 'rotate(-90)')
+            .attr('y', 0 - margin.left + 20)
+            .attr('x', 0 - (height / 2))
+            .attr('dy', '1em')
+            .style('text-anchor', 'middle')
+            .style('font-size', '12px')
+            .text('Número de publicaciones');
+
+        // Añadir título del eje X
+        svg.append('text')
+            .attr('transform', `translate(${width / 2}, ${height + margin.bottom - 30})`)
+            .attr('dy', '1em')
+            .style('text-anchor', 'middle')
+            .style('font-size', '12px')
+            .text(viewType === 'monthly' ? 'Mes' : viewType === 'quarterly' ? 'Trimestre' : 'Año');
+
+        // Añadir mensaje informativo sobre publicaciones sin mes
+        if (periodsPerYear > 1 && timelineInfo && timelineInfo.no_month_count > 0) {
+            const infoMessage = d3.select('#timelineChart')
+                .append('div')
+                .attr('class', 'alert alert-info')
+                .style('position', 'absolute')
+                .style('top', '50px')  // Cambiado de 10px a 50px para que aparezca más abajo
+                .style('right', '10px')
+                .style('padding', '8px 12px')
+                .style('font-size', '12px')
+                .style('border-radius', '4px')
+                .style('background-color', '#e3f2fd')
+                .style('border', '1px solid #2196f3')
+                .style('color', '#0d47a1')
+                .style('z-index', '1000')
+                .style('display', 'flex')
+                .style('align-items', 'center')
+                .style('gap', '8px')
+                .style('max-width', '300px');
+
+            const percentage = ((timelineInfo.no_month_count / timelineInfo.total_count) * 100).toFixed(1);
+            
+            // Crear el contenido del mensaje
+            infoMessage.html(`
                 <div style="flex-grow: 1;">
                     <i class="fas fa-info-circle"></i>
-                    ${L.no_month_count} publicación(es) sin mes asignado 
-                    se han contabilizado en enero
+                    ${timelineInfo.no_month_count} publicación(es) sin mes asignado 
+                    se han contabilizado en ${viewType === 'monthly' ? 'enero' : 'el primer trimestre'}
                 </div>
                 <button type="button" class="btn-close" style="font-size: 0.7rem;" aria-label="Close"></button>
-            `),D.select(".btn-close").on("click",function(){D.remove()})}}function $a(p){p=p.filter(A=>A.thematic_areas__name!==null),$e("#areasChart").html("");const R={top:20,right:150,bottom:20,left:20},L=document.getElementById("areasChart").clientWidth-R.left-R.right,E=320-R.top-R.bottom,H=Math.min(L,E)/2,T=$e("#areasChart").append("svg").attr("width",L+R.left+R.right).attr("height",E+R.top+R.bottom).style("display","block").style("margin","0 auto").style("min-width","550px").append("g").attr("transform",`translate(${H+R.left},${E/2+R.top})`),$=Wt().domain(p.map(A=>A.thematic_areas__name)).range(Lr),B=dd().value(A=>A.count).sort(null),J=sd().innerRadius(0).outerRadius(H),te=$e("#areasChart").append("div").attr("class","info-box").style("display","none").style("position","absolute").style("background-color","white").style("border","2px solid #2196f3").style("border-radius","6px").style("padding","10px 15px").style("font-size","14px").style("z-index","1000").style("box-shadow","0 4px 8px rgba(0,0,0,0.1)").style("pointer-events","none");T.selectAll("path").data(B(p)).enter().append("path").attr("d",J).attr("fill",A=>$(A.data.thematic_areas__name)).attr("stroke","white").style("stroke-width","2px").style("cursor","pointer").on("click",function(A,P){A.stopPropagation(),He(".info-box").style("display","none");const q=document.getElementById("areasChart").getBoundingClientRect(),D=A.clientX-q.left,j=A.clientY-q.top,K=180,Z=70;let le=D,de=j-Z-10;le+K/2>q.width?le=q.width-K/2:le-K/2<0&&(le=K/2),de<0&&(de=j+10);const ge=(P.data.count/qn(p,lt=>lt.count)*100).toFixed(1),be=`
-                    <div style="font-weight: bold; margin-bottom: 5px;">${P.data.thematic_areas__name}</div>
-                    <div>Publicaciones: ${P.data.count}</div>
-                    <div>Porcentaje: ${ge}%</div>
-                `,ot=$(P.data.thematic_areas__name);te.html(be).style("display","block").style("left",le-K/2+"px").style("top",de+"px").style("border",`2px solid ${ot}`)});const ye=T.append("g").attr("transform",`translate(${H+20}, ${-280/2})`).selectAll(".legend-item").data(p).enter().append("g").attr("class","legend-item").attr("transform",(A,P)=>`translate(0, ${P*20})`);ye.append("rect").attr("width",15).attr("height",15).attr("fill",A=>$(A.thematic_areas__name)),ye.append("text").attr("x",20).attr("y",12).style("font-size","10px").text(A=>{const P=A.thematic_areas__name,q=(A.count/qn(p,D=>D.count)*100).toFixed(1);return`${P} (${A.count} pubs, ${q}%)`}),document.getElementById("areasChart").addEventListener("click",function(A){A.target.closest("path")||He(".info-box").style("display","none")}),document.addEventListener("click",function(A){A.target.closest("#areasChart")||He(".info-box").style("display","none")}),Ji()}function Ia(p){p=p.filter(X=>X.thematic_areas__name!==null);const R=25;if(p.length>R){const X=p.slice().sort((q,D)=>D.count-q.count),ye=X.slice(0,R),P=X.slice(R).reduce((q,D)=>q+D.count,0);p=[...ye,{thematic_areas__name:"Otras",count:P}]}$e("#areasChart").html("");const L={top:20,right:20,bottom:30,left:60},E=document.getElementById("areasChart").clientWidth-L.left-L.right,H=300-L.top-L.bottom,T=$e("#areasChart").append("svg").attr("width",E+L.left+L.right).attr("height",H+L.top+L.bottom).style("display","block").style("margin","0 auto").append("g").attr("transform",`translate(${L.left},${L.top})`),$=Oo().domain(p.map(X=>X.thematic_areas__name)).range([0,E]).padding(.2),B=Vt().domain([0,rr(p,X=>X.count)]).nice().range([H,0]);T.append("g").attr("transform",`translate(0,${H})`).call(Yn($).tickFormat("")),T.append("g").call(ar(B).ticks(H/40));const J=Wt().domain(p.map(X=>X.thematic_areas__name)).range(Lr),te=$e("#areasChart").append("div").attr("class","info-box").style("display","none").style("position","absolute").style("background-color","white").style("border","2px solid #2196f3").style("border-radius","6px").style("padding","10px 15px").style("font-size","14px").style("z-index","1000").style("box-shadow","0 4px 8px rgba(0,0,0,0.1)").style("pointer-events","none");T.selectAll(".bar").data(p).enter().append("rect").attr("class","bar").attr("x",X=>$(X.thematic_areas__name)).attr("y",X=>B(X.count)).attr("width",$.bandwidth()).attr("height",X=>H-B(X.count)).attr("fill",X=>J(X.thematic_areas__name)).style("cursor","pointer").on("click",function(X,ye){X.stopPropagation(),He(".info-box").style("display","none");const A=document.getElementById("areasChart").getBoundingClientRect(),P=X.clientX-A.left,q=X.clientY-A.top,D=180,j=70;let K=P,Z=q-j-10;K+D/2>A.width?K=A.width-D/2:K-D/2<0&&(K=D/2),Z<0&&(Z=q+10);const le=(ye.count/qn(p,be=>be.count)*100).toFixed(1),de=`
-                    <div style="font-weight: bold; margin-bottom: 5px;">${ye.thematic_areas__name}</div>
-                    <div>Publicaciones: ${ye.count}</div>
-                    <div>Porcentaje: ${le}%</div>
-                `,ge=J(ye.thematic_areas__name);te.html(de).style("display","block").style("left",K-D/2+"px").style("top",Z+"px").style("border",`2px solid ${ge}`)}),document.getElementById("areasChart").addEventListener("click",function(X){X.target.closest("rect")||He(".info-box").style("display","none")}),document.addEventListener("click",function(X){X.target.closest("#areasChart")||He(".info-box").style("display","none")}),T.append("text").attr("transform","rotate(-90)").attr("y",-40).attr("x",-250/2).attr("dy","1em").style("text-anchor","middle").style("font-size","12px").text("Número de publicaciones"),T.append("text").attr("transform",`translate(${E/2}, ${H+L.bottom-20})`).attr("dy","1em").style("text-anchor","middle").style("font-size","12px").text("Áreas temáticas")}document.querySelectorAll("[data-view]").forEach(p=>{p.addEventListener("click",function(){this.disabled||(document.querySelectorAll("[data-view]").forEach(R=>R.classList.remove("active")),this.classList.add("active"),Ye())})}),e.addEventListener("change",rt),t.addEventListener("change",rt),n.addEventListener("change",()=>{const p=n.value;p&&!oe.has(p)&&(oe.add(p),window.selectedAreasList=oe,nt(p,a,oe),rt()),n.value=""}),i.addEventListener("change",()=>{const p=i.value;p&&!re.has(p)&&(re.add(p),window.selectedInstitutionsList=re,nt(p,s,re),rt()),i.value=""}),r.addEventListener("change",()=>{const p=r.value;p&&!se.has(p)&&(se.add(p),window.selectedTypesList=se,nt(p,u,se),rt()),r.value=""}),o.addEventListener("click",()=>{e.value="",t.value="",oe.clear(),re.clear(),se.clear(),a.innerHTML="",s.innerHTML="",u.innerHTML="",rt()});let Se=null,yt=!1;const en=document.getElementById("toggleLabelsBtn"),Dt=window.location.pathname.split("/")[1],Pa=Dt==="es"?"Ocultar etiquetas extra":"Hide Extra Labels",Fa=Dt==="es"?"Mostrar etiquetas":"Show All Labels";en&&en.addEventListener("click",()=>{Se&&(yt=!yt,yt?(Se.setSettings({labelDensity:1/0,labelGridCellSize:1,labelRenderedSizeThreshold:0}),en.textContent=`${Pa}`):(Se.setSettings({labelDensity:1,labelGridCellSize:200,labelRenderedSizeThreshold:0}),en.textContent=`${Fa}`),Se.refresh())}),window.currentCommunityView="modularity-7",window.currentClusteringModel=null,window.currentNClusters=null;let ce=!1;document.querySelectorAll(".dropdown-item.network-community-view").forEach(p=>{p.addEventListener("click",function(R){R.preventDefault();const L=this.dataset.communityView;if(window.currentCommunityView===L){document.querySelectorAll(".dropdown-item.network-community-view").forEach(E=>{E.classList.remove("active")}),this.classList.add("active");return}window.currentCommunityView=L,document.querySelectorAll(".dropdown-item.network-community-view").forEach(E=>{E.classList.remove("active")}),this.classList.add("active"),nn(),Ye()})});function tn(p){const R=document.getElementById("collaborationNetwork");if(!R)return;const L=document.querySelector("#collaborationNetwork").closest(".card").querySelector(".card-title"),E=window.location.pathname.split("/")[1],H=document.getElementById("toggleFullNetworkBtn");if(p.is_author_view){const A=p.nodes.find(P=>P.is_selected);A&&(L.textContent=E==="es"?`Colaboraciones de ${A.label}`:`Collaborations of ${A.label}`),document.querySelector("#communityViewDropdown").closest(".dropdown").style.display="none",H.style.display="none"}else{if(document.querySelector("#communityViewDropdown").closest(".dropdown").style.display="block",nn(p.model||null,p.n_clusters||null),window.currentCommunityView==="keywords"?H.style.display="none":H.style.display="block",ce){const A=document.getElementById("networkInfoMessage");A&&A.remove();let P="";if(window.currentCommunityView==="department"?P=E==="es"?"Los investigadores han sido clasificados en departamentos utilizando un Node2VecTransformer y un MLPClassifier. Esta clasificación no es 100% precisa. No aparecen investigadores sin colaboraciones.":"Researchers have been classified into departments using a Node2VecTransformer and MLPClassifier. This classification is not 100% accurate. There are no researchers without collaborations.":window.currentCommunityView==="modularity-7"?P=E==="es"?"Se ha utilizado el algoritmo de detección de comunidades Lovaina sobre la red de coautorías completa para agrupar a los investigadores en distintas comunidades. No aparecen investigadores sin colaboraciones.":"The Louvain community detection algorithm has been used on the complete co-authorship network to group researchers into different communities. There are no researchers without collaborations.":window.currentCommunityView==="modularity-5"&&(P=E==="es"?"Se ha utilizado el algoritmo de detección de comunidades Leiden sobre la red de coautorías completa para agrupar a los investigadores en distintas comunidades. No aparecen investigadores sin colaboraciones.":"The Leiden community detection algorithm has been used on the complete co-authorship network to group researchers into different communities. There are no researchers without collaborations."),P){const q=R.closest(".card-body"),D=document.createElement("div");D.id="networkInfoMessage",D.style.cssText=`
+            `);
+
+            // Añadir evento para cerrar el mensaje
+            infoMessage.select('.btn-close').on('click', function() {
+                infoMessage.remove();
+            });
+        }
+    }
+
+    function updateAreasChart(data) {
+        // Filtrar valores nulos
+        data = data.filter(d => d.thematic_areas__name !== null);
+
+        // Limpiar el contenedor
+        d3.select('#areasChart').html('');
+
+        // Configuración del gráfico
+        const margin = {top: 20, right: 150, bottom: 20, left: 20}; // Aumentado el margen derecho para la leyenda
+        const width = document.getElementById('areasChart').clientWidth - margin.left - margin.right;
+        const height = 320 - margin.top - margin.bottom;
+        const radius = Math.min(width, height) / 2;
+
+        // Crear el SVG
+        const svg = d3.select('#areasChart')
+            .append('svg')
+            .attr('width', width + margin.left + margin.right)
+            .attr('height', height + margin.top + margin.bottom)
+            .style('display', 'block')
+            .style('margin', '0 auto')
+            .style('min-width', '550px')
+            .append('g')
+            .attr('transform', `translate(${radius + margin.left},${height/2 + margin.top})`);
+
+        // Escala de colores
+        const color = d3.scaleOrdinal()
+            .domain(data.map(d => d.thematic_areas__name))
+            .range(d3.schemeCategory10);
+
+        // Crear el pie chart
+        const pie = d3.pie()
+            .value(d => d.count)
+            .sort(null);
+
+        const arc = d3.arc()
+            .innerRadius(0)
+            .outerRadius(radius);
+
+        // Info box para el clic
+        const infoBox = d3.select('#areasChart')
+            .append('div')
+            .attr('class', 'info-box')
+            .style('display', 'none')
+            .style('position', 'absolute')
+            .style('background-color', 'white')
+            .style('border', '2px solid #2196f3')
+            .style('border-radius', '6px')
+            .style('padding', '10px 15px')
+            .style('font-size', '14px')
+            .style('z-index', '1000')
+            .style('box-shadow', '0 4px 8px rgba(0,0,0,0.1)')
+            .style('pointer-events', 'none');
+
+        // Añadir los segmentos del pie
+        svg.selectAll('path')
+            .data(pie(data))
+            .enter()
+            .append('path')
+            .attr('d', arc)
+            .attr('fill', d => color(d.data.thematic_areas__name))
+            .attr('stroke', 'white')
+            .style('stroke-width', '2px')
+            .style('cursor', 'pointer')
+            .on('click', function(event, d) {
+                event.stopPropagation();
+                d3.selectAll('.info-box').style('display', 'none');
+                // Calcular la posición relativa al contenedor del gráfico
+                const containerRect = document.getElementById('areasChart').getBoundingClientRect();
+                const xPos = event.clientX - containerRect.left;
+                const yPos = event.clientY - containerRect.top;
+                // Dimensiones del info box
+                const infoBoxWidth = 180;
+                const infoBoxHeight = 70;
+                let finalX = xPos;
+                let finalY = yPos - infoBoxHeight - 10;
+                if (finalX + infoBoxWidth/2 > containerRect.width) {
+                    finalX = containerRect.width - infoBoxWidth/2;
+                } else if (finalX - infoBoxWidth/2 < 0) {
+                    finalX = infoBoxWidth/2;
+                }
+                if (finalY < 0) {
+                    finalY = yPos + 10;
+                }
+                const percentage = (d.data.count / d3.sum(data, d => d.count) * 100).toFixed(1);
+                const infoBoxContent = `
+                    <div style="font-weight: bold; margin-bottom: 5px;">${d.data.thematic_areas__name}</div>
+                    <div>Publicaciones: ${d.data.count}</div>
+                    <div>Porcentaje: ${percentage}%</div>
+                `;
+                // Cambiar el borde del info box al color del segmento
+                const borderColor = color(d.data.thematic_areas__name);
+                infoBox.html(infoBoxContent)
+                    .style('display', 'block')
+                    .style('left', (finalX - infoBoxWidth/2) + 'px')
+                    .style('top', finalY + 'px')
+                    .style('border', `2px solid ${borderColor}`);
+            });
+
+        // Añadir la leyenda
+        const legend = svg.append('g')
+            .attr('transform', `translate(${radius + 20}, ${-height/2})`);
+
+        const legendItem = legend.selectAll('.legend-item')
+            .data(data)
+            .enter()
+            .append('g')
+            .attr('class', 'legend-item')
+            .attr('transform', (d, i) => `translate(0, ${i * 20})`);
+
+        legendItem.append('rect')
+            .attr('width', 15)
+            .attr('height', 15)
+            .attr('fill', d => color(d.thematic_areas__name));
+
+        legendItem.append('text')
+            .attr('x', 20)
+            .attr('y', 12)
+            .style('font-size', '10px')
+            .text(d => {
+                const name = d.thematic_areas__name;
+                const percentage = (d.count / d3.sum(data, d => d.count) * 100).toFixed(1);
+                return `${name} (${d.count} pubs, ${percentage}%)`;
+            });
+
+        // Cerrar info box al pinchar fuera
+        document.getElementById('areasChart').addEventListener('click', function(event) {
+            if (!event.target.closest('path')) {
+                d3.selectAll('.info-box').style('display', 'none');
+            }
+        });
+        document.addEventListener('click', function(event) {
+            if (!event.target.closest('#areasChart')) {
+                d3.selectAll('.info-box').style('display', 'none');
+            }
+        });
+        hideAreasLoading();
+    }
+
+    function updateAreasBarChart(data) {
+        // Filtrar valores nulos
+        data = data.filter(d => d.thematic_areas__name !== null);
+    
+        // Agrupar las áreas menos representativas en 'Otras'
+        const N = 25;
+        if (data.length > N) {
+            const sorted = data.slice().sort((a, b) => b.count - a.count);
+            const topN = sorted.slice(0, N);
+            const rest = sorted.slice(N);
+            const otrasCount = rest.reduce((sum, d) => sum + d.count, 0);
+            data = [...topN, {thematic_areas__name: 'Otras', count: otrasCount}];
+        }
+    
+        // Limpiar el contenedor
+        d3.select('#areasChart').html('');
+    
+        // Dimensiones y márgenes
+        const margin = { top: 20, right: 20, bottom: 30, left: 60 };
+        const width = document.getElementById('areasChart').clientWidth - margin.left - margin.right;
+        const height = 300 - margin.top - margin.bottom;
+    
+        const svg = d3.select('#areasChart')
+            .append('svg')
+            .attr('width', width + margin.left + margin.right)
+            .attr('height', height + margin.top + margin.bottom)
+            .style('display', 'block')
+            .style('margin', '0 auto')
+            .append('g')
+            .attr('transform', `translate(${margin.left},${margin.top})`);
+    
+        const x = d3.scaleBand()
+            .domain(data.map(d => d.thematic_areas__name))
+            .range([0, width])
+            .padding(0.2);
+    
+        const y = d3.scaleLinear()
+            .domain([0, d3.max(data, d => d.count)])
+            .nice()
+            .range([height, 0]);
+    
+        svg.append('g')
+            .attr('transform', `translate(0,${height})`)
+            // Quitamos las etiquetas del eje X
+            .call(d3.axisBottom(x).tickFormat(''));
+    
+        svg.append('g')
+            .call(d3.axisLeft(y).ticks(height / 40));
+    
+        const color = d3.scaleOrdinal()
+            .domain(data.map(d => d.thematic_areas__name))
+            .range(d3.schemeCategory10);
+    
+        // Info box para el clic
+        const infoBox = d3.select('#areasChart')
+            .append('div')
+            .attr('class', 'info-box')
+            .style('display', 'none')
+            .style('position', 'absolute')
+            .style('background-color', 'white')
+            .style('border', '2px solid #2196f3')
+            .style('border-radius', '6px')
+            .style('padding', '10px 15px')
+            .style('font-size', '14px')
+            .style('z-index', '1000')
+            .style('box-shadow', '0 4px 8px rgba(0,0,0,0.1)')
+            .style('pointer-events', 'none');
+    
+        svg.selectAll('.bar')
+            .data(data)
+            .enter()
+            .append('rect')
+            .attr('class', 'bar')
+            .attr('x', d => x(d.thematic_areas__name))
+            .attr('y', d => y(d.count))
+            .attr('width', x.bandwidth())
+            .attr('height', d => height - y(d.count))
+            .attr('fill', d => color(d.thematic_areas__name))
+            .style('cursor', 'pointer')
+            .on('click', function(event, d) {
+                event.stopPropagation();
+                d3.selectAll('.info-box').style('display', 'none');
+                const containerRect = document.getElementById('areasChart').getBoundingClientRect();
+                const xPos = event.clientX - containerRect.left;
+                const yPos = event.clientY - containerRect.top;
+                const infoBoxWidth = 180;
+                const infoBoxHeight = 70;
+                let finalX = xPos;
+                let finalY = yPos - infoBoxHeight - 10;
+                if (finalX + infoBoxWidth/2 > containerRect.width) {
+                    finalX = containerRect.width - infoBoxWidth/2;
+                } else if (finalX - infoBoxWidth/2 < 0) {
+                    finalX = infoBoxWidth/2;
+                }
+                if (finalY < 0) {
+                    finalY = yPos + 10;
+                }
+                const percentage = (d.count / d3.sum(data, d => d.count) * 100).toFixed(1);
+                const infoBoxContent = `
+                    <div style="font-weight: bold; margin-bottom: 5px;">${d.thematic_areas__name}</div>
+                    <div>Publicaciones: ${d.count}</div>
+                    <div>Porcentaje: ${percentage}%</div>
+                `;
+                const borderColor = color(d.thematic_areas__name);
+                infoBox.html(infoBoxContent)
+                    .style('display', 'block')
+                    .style('left', (finalX - infoBoxWidth/2) + 'px')
+                    .style('top', finalY + 'px')
+                    .style('border', `2px solid ${borderColor}`);
+            });
+    
+        // Cerrar info box al pinchar fuera
+        document.getElementById('areasChart').addEventListener('click', function(event) {
+            if (!event.target.closest('rect')) {
+                d3.selectAll('.info-box').style('display', 'none');
+            }
+        });
+        document.addEventListener('click', function(event) {
+            if (!event.target.closest('#areasChart')) {
+                d3.selectAll('.info-box').style('display', 'none');
+            }
+        });
+    
+        // Títulos
+        svg.append('text')
+            .attr('transform', 'rotate(-90)')
+            .attr('y', -margin.left + 20)
+            .attr('x', -height / 2)
+            .attr('dy', '1em')
+            .style('text-anchor', 'middle')
+            .style('font-size', '12px')
+            .text('Número de publicaciones');
+    
+        // Añadir título del eje X
+        svg.append('text')
+            .attr('transform', `translate(${width / 2}, ${height + margin.bottom - 20})`)
+            .attr('dy', '1em')
+            .style('text-anchor', 'middle')
+            .style('font-size', '12px')
+            .text('Áreas temáticas');
+    }  
+
+    // --- LÍNEA TEMPORAL: LÓGICA DE BOTONES ---
+    document.querySelectorAll('[data-view]').forEach(button => {
+        button.addEventListener('click', function() {
+            if (!this.disabled) {
+                document.querySelectorAll('[data-view]').forEach(btn => btn.classList.remove('active'));
+                this.classList.add('active');
+                updateVisualizations();
+            }
+        });
+    });
+
+    // Event listeners para los filtros
+    yearFrom.addEventListener('change', updateFilters);
+    yearTo.addEventListener('change', updateFilters);
+    areaFilter.addEventListener('change', () => {
+        const selectedArea = areaFilter.value;
+        if (selectedArea && !selectedAreasList.has(selectedArea)) {
+            selectedAreasList.add(selectedArea);
+            window.selectedAreasList = selectedAreasList;
+            createBadge(selectedArea, selectedAreas, selectedAreasList);
+            updateFilters();
+        }
+        areaFilter.value = '';
+    });
+    institutionFilter.addEventListener('change', () => {
+        const selectedInstitution = institutionFilter.value;
+        if (selectedInstitution && !selectedInstitutionsList.has(selectedInstitution)) {
+            selectedInstitutionsList.add(selectedInstitution);
+            window.selectedInstitutionsList = selectedInstitutionsList;
+            createBadge(selectedInstitution, selectedInstitutions, selectedInstitutionsList);
+            updateFilters();
+        }
+        institutionFilter.value = '';
+    });
+    typeFilter.addEventListener('change', () => {
+        const selectedType = typeFilter.value;
+        if (selectedType && !selectedTypesList.has(selectedType)) {
+            selectedTypesList.add(selectedType);
+            window.selectedTypesList = selectedTypesList;
+            createBadge(selectedType, selectedTypes, selectedTypesList);
+            updateFilters();
+        }
+        typeFilter.value = '';
+    });
+
+    // Event listener para limpiar filtros
+    clearFiltersBtn.addEventListener('click', () => {
+        yearFrom.value = '';
+        yearTo.value = '';
+        selectedAreasList.clear();
+        selectedInstitutionsList.clear();
+        selectedTypesList.clear();
+        selectedAreas.innerHTML = '';
+        selectedInstitutions.innerHTML = '';
+        selectedTypes.innerHTML = '';
+        updateFilters();
+    });
+
+    let renderer = null;
+    let showAllLabels = false; // Estado para controlar la visualización de todas las etiquetas
+
+    // Event listener para el botón de mostrar/ocultar etiquetas
+    const toggleLabelsBtn = document.getElementById('toggleLabelsBtn');
+    const currentLang = window.location.pathname.split('/')[1];
+    const extraLabels = currentLang === 'es' ? 'Ocultar etiquetas extra' : 'Hide Extra Labels';
+    const allLabels = currentLang === 'es' ? 'Mostrar etiquetas' : 'Show All Labels';
+    if (toggleLabelsBtn) {
+        toggleLabelsBtn.addEventListener('click', () => {
+            if (!renderer) return; // Asegurarse de que el renderer existe
+
+            showAllLabels = !showAllLabels; // Alternar el estado
+
+            if (showAllLabels) {
+                // Mostrar todas las etiquetas: ajustar settings para forzar renderizado
+                renderer.setSettings({
+                    labelDensity: Infinity,
+                    labelGridCellSize: 1,
+                    labelRenderedSizeThreshold: 0
+                });
+                // Actualizar texto del botón
+                toggleLabelsBtn.textContent = `${extraLabels}`;
+            } else {
+                // Volver al comportamiento por defecto (ocultar algunas etiquetas)
+                // Restaurar settings por defecto o los que generan el comportamiento deseado
+                 renderer.setSettings({
+                    labelDensity: 1,
+                    labelGridCellSize: 200,
+                    labelRenderedSizeThreshold: 0
+                });
+                 // Actualizar texto del botón
+                toggleLabelsBtn.textContent = `${allLabels}`;
+            }
+            renderer.refresh();
+        });
+    }
+
+    window.currentCommunityView = 'modularity-7'; // Estado para la vista de comunidad activa
+    window.currentClusteringModel = null;
+    window.currentNClusters = null;
+    let isFullNetwork = false;
+    // Nivel de detalle de la red completa (reducciones LOD calculadas en el servidor)
+    let networkDetail = 'all';
+    // Comunidad de un supernodo en la que se ha hecho drill-down ({community, communityField})
+    let networkDrillDown = null;
+
+    function networkDetailParams() {
+        if (networkDrillDown) return networkDrillDown;
+        if (networkDetail === 'strong') return { minWeight: 2 };
+        if (networkDetail === 'top') return { topN: 300, topBy: 'weight' };
+        if (networkDetail === 'communities') {
+            return { aggregate: window.currentCommunityView === 'modularity-5' ? 'leiden' : 'lovaina' };
+        }
+        return {};
+    }
+
+    // Solo la red completa admite reducciones; la vista de palabras clave se calcula aparte
+    function appendNetworkDetail(params) {
+        if (!isFullNetwork || window.currentCommunityView === 'keywords') return;
+        Object.entries(networkDetailParams()).forEach(([name, value]) => params.append(name, value));
+    }
+
+    function updateNetworkDetailVisibility() {
+        const wrapper = document.getElementById('networkDetailDropdownWrapper');
+        if (!wrapper) return;
+        wrapper.style.display = isFullNetwork && window.currentCommunityView !== 'keywords' ? 'block' : 'none';
+    }
+
+    // Recargar la red completa con el nivel de detalle actual
+    function reloadFullNetwork() {
+        const container = document.getElementById('collaborationNetwork');
+        const loadingOverlay = document.createElement('div');
+        loadingOverlay.style.cssText = `
+            position: absolute;
+            top: 0;
+            left: 0;
+            width: 100%;
+            height: 100%;
+            background: rgba(255, 255, 255, 0.8);
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            z-index: 1000;
+            border-radius: inherit;
+        `;
+        loadingOverlay.innerHTML = `
+            <div class="spinner-border text-primary" role="status">
+                <span class="visually-hidden">${window.location.pathname.split('/')[1] === 'es' ? 'Cargando...' : 'Loading...'}</span>
+            </div>
+        `;
+        container.appendChild(loadingOverlay);
+
+        const params = new URLSearchParams({
+            communityView: window.currentCommunityView,
+            fullNetwork: isFullNetwork
+        });
+        appendNetworkDetail(params);
+
+        fetch(`/api/dashboard/collaboration-network/?${params.toString()}`)
+            .then(response => response.json())
+            .then(decodeNetworkData)
+            .then(data => {
+                if (data.error) {
+                    console.error('Error desde backend:', data.error);
+                    return;
+                }
+                window.currentNetworkData = data;
+                updateCollaborationNetwork(data);
+            })
+            .catch(error => {
+                console.error('Error en la petición fetch:', error);
+            })
+            .finally(() => {
+                loadingOverlay.remove();
+            });
+    }
+
+    document.querySelectorAll('.dropdown-item.network-detail').forEach(item => {
+        item.addEventListener('click', function(e) {
+            e.preventDefault();
+            networkDetail = this.dataset.networkDetail;
+            networkDrillDown = null;
+            document.querySelectorAll('.dropdown-item.network-detail').forEach(link => link.classList.remove('active'));
+            this.classList.add('active');
+            reloadFullNetwork();
+        });
+    });
+
+
+    // Event listeners para las opciones del menú desplegable de vista de comunidad
+    document.querySelectorAll('.dropdown-item.network-community-view').forEach(item => {
+        item.addEventListener('click', function(e) {
+            e.preventDefault(); // Prevenir el comportamiento por defecto del enlace
+
+            const selectedView = this.dataset.communityView; // Obtener el tipo de vista del data-attribute
+
+            // Si ya es la vista actual, no hacer nada
+            if (window.currentCommunityView === selectedView) {
+                 // Actualizar visualmente el menú para marcar la opción activa (en caso de que no lo estuviera)
+                document.querySelectorAll('.dropdown-item.network-community-view').forEach(link => {
+                    link.classList.remove('active');
+                });
+                this.classList.add('active');
+                return; // Salir de la función si la vista no cambia
+            }
+
+            window.currentCommunityView = selectedView; // Actualizar el estado
+
+            // Actualizar visualmente el menú para marcar la opción activa
+            document.querySelectorAll('.dropdown-item.network-community-view').forEach(link => {
+                link.classList.remove('active');
+            });
+            this.classList.add('active');
+
+            // Actualizar la red con la nueva vista
+            // La función updateVisualizations ya llama a get_collaboration_network
+            // y le pasa los parámetros, solo necesitamos que incluya el view_type
+            updateCommunityDropdownText();
+            updateVisualizations(); // Esto recarga los datos con el nuevo view_type y llama a updateCollaborationNetwork
+        });
+    });
+
+    // Layout precalculado en el servidor para cada vista de comunidades
+    function layoutForCommunityView(view) {
+        if (view === 'department') return 'department';
+        if (view === 'modularity-5') return 'leiden';
+        return 'lovaina';
+    }
+
+    // Las redes generales llegan en formato columnar (arrays paralelos de nodos y aristas):
+    // se convierten a la lista de objetos que espera vis-network
+    function decodeNetworkData(data) {
+        if (!data || data.format !== 'columnar') {
+            return data;
+        }
+        const n = data.nodes;
+        const layout = data.layouts ? data.layouts[layoutForCommunityView(window.currentCommunityView)] : null;
+        const nodes = n.id.map((id, i) => ({
+            id: id,
+            label: n.label[i],
+            x: layout ? layout.x[i] : null,
+            y: layout ? layout.y[i] : null,
+            is_selected: false,
+            community: n.lovaina_community[i],
+            department: n.department[i] >= 0 ? data.departments[n.department[i]] : null,
+            leiden_community: n.leiden_community[i],
+            lovaina_community: n.lovaina_community[i],
+            member_count: n.member_count ? n.member_count[i] : null
+        }));
+        const e = data.edges;
+        const edges = e.source.map((s, i) => ({
+            source: n.id[s],
+            target: n.id[e.target[i]],
+            weight: e.weight[i]
+        }));
+        return { nodes: nodes, edges: edges, is_author_view: false, has_layout: !!layout };
+    }
+
+    function updateCollaborationNetwork(data) {
+        const container = document.getElementById('collaborationNetwork');
+        if (!container) return;
+    
+        const cardTitle = document.querySelector('#collaborationNetwork').closest('.card').querySelector('.card-title');
+        const currentLang = window.location.pathname.split('/')[1];
+        const toggleButton = document.getElementById('toggleFullNetworkBtn');
+    
+        if (data.is_author_view) {
+            const selectedAuthor = data.nodes.find(node => node.is_selected);
+            if (selectedAuthor) {
+                cardTitle.textContent = currentLang === 'es'
+                    ? `Colaboraciones de ${selectedAuthor.label}`
+                    : `Collaborations of ${selectedAuthor.label}`;
+            }
+            document.querySelector('#communityViewDropdown').closest('.dropdown').style.display = 'none';
+            toggleButton.style.display = 'none';
+        } else {
+            document.querySelector('#communityViewDropdown').closest('.dropdown').style.display = 'block';
+            updateCommunityDropdownText(
+                data.model || null,
+                data.n_clusters || null
+            );
+
+            // Ocultar el botón de toggle en todas las vistas de la red completa
+            if (window.currentCommunityView === 'keywords') {
+                toggleButton.style.display = 'none';
+            } else {
+                toggleButton.style.display = 'block';
+            }
+
+            // Añadir mensaje informativo para red completa
+            if (isFullNetwork) {
+                // Eliminar mensaje anterior si existe
+                const existingMessage = document.getElementById('networkInfoMessage');
+                if (existingMessage) {
+                    existingMessage.remove();
+                }
+
+                let messageText = '';
+                if (window.currentCommunityView === 'department') {
+                    messageText = currentLang === 'es'
+                        ? 'Los investigadores han sido clasificados en departamentos utilizando un Node2VecTransformer y un MLPClassifier. Esta clasificación no es 100% precisa. No aparecen investigadores sin colaboraciones.'
+                        : 'Researchers have been classified into departments using a Node2VecTransformer and MLPClassifier. This classification is not 100% accurate. There are no researchers without collaborations.';
+                } else if (window.currentCommunityView === 'modularity-7') {
+                    messageText = currentLang === 'es'
+                        ? 'Se ha utilizado el algoritmo de detección de comunidades Lovaina sobre la red de coautorías completa para agrupar a los investigadores en distintas comunidades. No aparecen investigadores sin colaboraciones.'
+                        : 'The Louvain community detection algorithm has been used on the complete co-authorship network to group researchers into different communities. There are no researchers without collaborations.';
+                }  else if (window.currentCommunityView === 'modularity-5') {
+                    messageText = currentLang === 'es'
+                        ? 'Se ha utilizado el algoritmo de detección de comunidades Leiden sobre la red de coautorías completa para agrupar a los investigadores en distintas comunidades. No aparecen investigadores sin colaboraciones.'
+                        : 'The Leiden community detection algorithm has been used on the complete co-authorship network to group researchers into different communities. There are no researchers without collaborations.';
+                }
+
+                if (messageText) {
+                    const cardBody = container.closest('.card-body');
+                    const messageDiv = document.createElement('div');
+                    messageDiv.id = 'networkInfoMessage';
+                    messageDiv.style.cssText = `
                         background-color: #f8f9fa;
                         border-left: 4px solid #0d6efd;
                         padding: 10px 15px;
@@ -681,18 +2788,588 @@ void main() {
                         font-size: 0.9rem;
                         color: #666;
                         position: relative;
-                    `;const j=document.createElement("button");j.className="btn-close",j.style.cssText=`
+                    `;
+
+                    const closeButton = document.createElement('button');
+                    closeButton.className = 'btn-close';
+                    closeButton.style.cssText = `
                         position: absolute;
                         right: 10px;
                         top: 10px;
                         padding: 0.25rem;
-                    `,j.onclick=function(){D.remove()};const K=document.createElement("div");K.textContent=P,D.appendChild(j),D.appendChild(K),q.insertBefore(D,R)}}else{const A=document.getElementById("networkInfoMessage");A&&A.remove()}window.currentCommunityView==="keywords"?L.textContent=E==="es"?"Red de coincidencia de palabras clave (entre IPs)":"Keyword Coincidence Network (between IPs)":L.textContent=E==="es"?ce?"Red de Coautorías Interactiva Completa":"Red de Coautorías Interactiva entre IPs":ce?"Complete Interactive Co-authorship Network":"Interactive Co-authorship Network between IPs"}Se&&(Se.kill(),Se=null),R.innerHTML="";const T=new ue,$=["#e6194b","#3cb44b","#ffe119","#4363d8","#f58231","#911eb4","#42d4f4","#f032e6","#bfef45","#fabed4","#469990","#dcbeff","#9a6324","#fffac8","#800000","#aaffc3","#808000","#ffd8b1","#000075","#a9a9a9","#000000","#6a3d9a","#b15928","#1f78b4"],B=A=>A===-1||isNaN(A)?"#A9A9A9":$[A%$.length],J=Wt().domain(["Departamento 1","Departamento 2","Departamento 3","Unknown"]).range(["#1f78b4","#ff7f0e","#2ca02c","#999999"]);if(p.is_author_view){const A=R.clientWidth/2,P=R.clientHeight/2,q=250,D=p.nodes.find(Z=>Z.is_selected);if(!D)return;D.x=A,D.y=P;const j=p.nodes.filter(Z=>!Z.is_selected),K=2*Math.PI/Math.max(j.length,1);j.forEach((Z,le)=>{const de=le*K;Z.x=A+q*Math.cos(de),Z.y=P+q*Math.sin(de)})}else{let A;window.currentCommunityView==="department"?A="department":window.currentCommunityView==="modularity-5"?A="leiden_community":(window.currentCommunityView,A="community");const P=[...new Set(p.nodes.map(ge=>ge[A]))].filter(ge=>ge!==void 0),q=P.indexOf(-1);q>-1&&(P.splice(q,1),P.push(-1));const D={};P.forEach(ge=>{D[ge]=p.nodes.filter(be=>be[A]===ge)});const j=R.clientWidth/2,K=R.clientHeight/2,Z=P.length,le=Math.min(j,K)*.8,de=le/Math.sqrt(Z)*.5;P.forEach((ge,be)=>{const ot=D[ge],lt=2*Math.PI/Math.max(ot.length,5),Qi=j+le*Math.cos(2*Math.PI*be/Z),za=K+le*Math.sin(2*Math.PI*be/Z);ot.forEach((er,Ba)=>{const tr=Ba*lt;er.x=Qi+de*Math.cos(tr),er.y=za+de*Math.sin(tr)})})}if(p.nodes.forEach(A=>{const P=parseInt(A.community),q=parseInt(A.leiden_community),D=A.department,j=p.is_author_view?A.is_selected?"#e6194b":"#bbbbbb":window.currentCommunityView==="department"?J(D):window.currentCommunityView==="modularity-5"?B(q):B(P);T.addNode(A.id,{label:A.label,x:A.x,y:A.y,size:A.is_selected?18:12,color:j,highlighted:A.is_selected,forceLabel:yt})}),p.edges.forEach(A=>{if(T.hasNode(A.source)&&T.hasNode(A.target)){const P=A.weight||1,q=Math.pow(P,.7),D=Math.min(4,Math.max(1.5,q)),K=`rgba(3, 138, 255, ${Math.min(.9,.5+.05*P).toFixed(2)})`;T.addEdge(A.source,A.target,{size:D,color:K,type:"curve"})}}),Se=new Wf(T,R,{minCameraRatio:.1,maxCameraRatio:10,defaultEdgeType:"curve",edgeProgramClasses:{curve:lp},renderLabels:!0,labelDensity:1,labelGridCellSize:300,labelRenderedSizeThreshold:0,defaultLabelSize:8,zIndex:!0,enableEdgeHovering:!1,enableNodeHovering:!1,enableCamera:!1}),!p.is_author_view&&!(ce&&window.currentCommunityView==="modularity-7")&&!(ce&&window.currentCommunityView==="modularity-5")){const A=document.createElement("div");A.id="networkLegend",Object.assign(A.style,{position:"absolute",bottom:"10px",left:"10px",backgroundColor:"rgba(255,255,255,0.95)",border:"1px solid #ccc",borderRadius:"8px",padding:"12px",fontSize:"13px",zIndex:1e3,boxShadow:"0px 0px 6px rgba(0,0,0,0.1)"});const P=document.createElement("div");if(P.style.fontWeight="bold",P.style.marginBottom="6px",window.currentCommunityView==="department")P.textContent=E==="es"?"Departamentos":"Departments";else if(window.currentCommunityView==="keywords")P.textContent=E==="es"?"Comunidades de Palabras Clave":"Keyword Communities";else if(window.currentCommunityView==="modularity-5"||window.currentCommunityView==="modularity-7"){const D=window.currentCommunityView==="modularity-7"?7:5;P.textContent=E==="es"?`Comunidades (${D})`:`Communities (${D})`}A.appendChild(P);const q=document.createElement("div");if(q.style.marginBottom="8px",q.textContent=`${p.nodes.length} nodos / ${p.edges.length} enlaces`,A.appendChild(q),window.currentCommunityView==="department")[...new Set(p.nodes.map(j=>j.department))].forEach(j=>{const K=document.createElement("div");K.style.display="flex",K.style.alignItems="center",K.style.marginBottom="4px";const Z=document.createElement("div");Object.assign(Z.style,{width:"14px",height:"14px",backgroundColor:J(j),marginRight:"6px",borderRadius:"3px"});const le=document.createElement("span");le.textContent=j,K.appendChild(Z),K.appendChild(le),A.appendChild(K)});else{let D=[];window.currentCommunityView==="keywords"?D=[...new Set(p.nodes.map(j=>parseInt(j.community)))]:window.currentCommunityView==="modularity-5"?D=[...new Set(p.nodes.map(j=>parseInt(j.leiden_community)))]:window.currentCommunityView==="modularity-7"&&(D=[...new Set(p.nodes.map(j=>parseInt(j.community)))]),D.sort((j,K)=>j-K),D.forEach((j,K)=>{const Z=document.createElement("div");Z.style.display="flex",Z.style.alignItems="center",Z.style.marginBottom="4px";const le=document.createElement("div");Object.assign(le.style,{width:"14px",height:"14px",backgroundColor:B(j),marginRight:"6px",borderRadius:"3px"});const de=document.createElement("span");if(j===-1||isNaN(j))de.textContent="Outlier";else{const ge=window.currentCommunityView==="modularity-7"?K+1:j+1,be=E==="es"?"Comunidad":"Community";de.textContent=`${be} ${ge}`}Z.appendChild(le),Z.appendChild(de),A.appendChild(Z)})}R.appendChild(A)}const te=document.createElement("div");te.innerText=E==="es"?"Haz click para activar la red":"Click to activate the network",Object.assign(te.style,{position:"absolute",top:0,left:0,width:"100%",height:"100%",backgroundColor:"rgba(255,255,255,0.85)",display:"flex",alignItems:"center",justifyContent:"center",fontSize:"24px",fontWeight:"bold",color:"#333",cursor:"pointer",zIndex:1e3,borderRadius:getComputedStyle(R).borderRadius}),R.appendChild(te),te.addEventListener("click",()=>{te.remove(),ye()});const X=document.createElement("div");Object.assign(X.style,{position:"absolute",backgroundColor:"#fff",border:"1px solid #aaa",padding:"4px 8px",fontSize:"12px",borderRadius:"4px",pointerEvents:"none",display:"none",zIndex:1e3}),document.body.appendChild(X);const ye=()=>{Se.setSettings({enableEdgeHovering:!0,enableNodeHovering:!0,enableCamera:!0}),Se.on("enterNode",({node:A,event:P})=>{const q=T.getNodeAttribute(A,"label"),D=T.neighbors(A),j=[];D.forEach(Z=>{const le=T.edge(A,Z)||T.edge(Z,A),de=T.getEdgeAttribute(le,"size")||1,ge=T.getNodeAttribute(Z,"label");j.push(`• ${ge} (${de})`)}),X.innerText=`${q}
-${E==="es"?"Colabora con:":"Collaborates with:"}
-${j.join(`
-`)}`,X.style.left=`${P.clientX+10}px`,X.style.top=`${P.clientY+10}px`,X.style.display="block";const K=new Set(D);K.add(A),T.forEachNode(Z=>{T.setNodeAttribute(Z,"hidden",!K.has(Z)),T.setNodeAttribute(Z,"forceLabel",yt||K.has(Z))}),T.forEachEdge(Z=>{const le=T.source(Z),de=T.target(Z),ge=K.has(le)&&K.has(de);T.setEdgeAttribute(Z,"hidden",!ge)})}),Se.on("leaveNode",()=>{X.style.display="none",T.forEachNode(A=>{T.removeNodeAttribute(A,"hidden"),T.setNodeAttribute(A,"forceLabel",yt)}),T.forEachEdge(A=>T.removeEdgeAttribute(A,"hidden"))})};Se.getCamera().animatedReset({duration:500})}document.getElementById("applyClustering").addEventListener("click",()=>{const p=document.querySelector('input[name="configMode"]:checked').value,R=document.getElementById("clusteringModel").value,L=document.querySelector('input[name="modelConfigMode"]:checked').value;let E=document.getElementById("nClusters").value;R==="dbscan"?E=document.getElementById("dbscanClusters").value:R==="hdbscan"?E=document.getElementById("hdbscanClusters").value:R==="lovaina"&&(E=document.getElementById("lovainaClusters").value),window.currentCommunityView="keywords",window.currentClusteringModel=R,window.currentNClusters=E;const H=new URLSearchParams({communityView:"keywords",clusteringModel:R,nClusters:E,autoMode:L==="auto",globalMode:p==="global"});fetch(`/api/dashboard/collaboration-network/?${H.toString()}`).then(T=>T.json()).then(T=>{if(T.error){console.error("Error desde backend:",T.error),alert(`Ocurrió un error al generar la red: ${T.error}`);return}if(!T.nodes||!T.edges){console.error("Respuesta incompleta del backend:",T),alert("La respuesta del servidor no contiene datos de red válidos.");return}window.currentNetworkData=T,nn(R,E),tn(T),document.activeElement.blur(),bootstrap.Modal.getInstance(document.getElementById("clusteringModal")).hide()}).catch(T=>{console.error("Error en la petición fetch:",T)})});function nn(p=null,R=null){const L=document.getElementById("communityViewDropdown"),E=window.location.pathname.split("/")[1];let H="";if(window.currentCommunityView==="department")H=E==="es"?"Por Departamento":"By Department";else if(window.currentCommunityView==="modularity-7")H=E==="es"?ce?"Louvain":"Louvain (7 comunidades)":ce?"Louvain":"Louvain (7 communities)";else if(window.currentCommunityView==="modularity-5")H=E==="es"?ce?"Leiden":"Leiden (5 comunidades)":ce?"Leiden":"Leiden (5 communities)";else if(window.currentCommunityView==="keywords"){const T=p||window.currentClusteringModel,$=R||window.currentNClusters;T&&$?H=E==="es"?`Por palabras clave (${T}, ${$} clústeres)`:`By keywords (${T}, ${$} clusters)`:H=E==="es"?"Por palabras clave":"By keywords"}L.textContent=H}function rt(){const p=new URLSearchParams;e.value&&p.append("year_from",e.value),t.value&&p.append("year_to",t.value),oe.forEach(T=>p.append("areas",T)),re.forEach(T=>p.append("institutions",T)),se.forEach(T=>p.append("types",T)),ee&&p.append("author",ee);const R=window.location.pathname.split("/")[1],L=R==="es"?"Todas las Áreas":"All areas",E=R==="es"?"Todas las Instituciones":"All Institutions",H=R==="es"?"Todos los tipos":"All types";fetch(`/api/dashboard/filters/?${p.toString()}`).then(T=>{if(!T.ok)throw new Error(`HTTP error! status: ${T.status}`);return T.json()}).then(T=>{n.innerHTML=`<option value="">${L}</option>`,T.areas.forEach($=>{const B=document.createElement("option");B.value=$.name,B.textContent=`${$.name} (${$.count})`,n.appendChild(B)}),i.innerHTML=`<option value="">${E}</option>`,T.institutions.forEach($=>{const B=document.createElement("option");B.value=$.name,B.textContent=`${$.name} (${$.count})`,i.appendChild(B)}),r.innerHTML=`<option value="">${H}</option>`,T.publication_types.forEach($=>{const B=document.createElement("option");B.value=$.publication_type,B.textContent=`${$.publication_type} (${$.count})`,r.appendChild(B)})}).catch(T=>{console.error("Error updating filters:",T);const $=document.createElement("div");$.className="alert alert-danger",$.style.position="fixed",$.style.top="20px",$.style.right="20px",$.style.zIndex="9999",$.innerHTML=`
+                    `;
+                    closeButton.onclick = function() {
+                        messageDiv.remove();
+                    };
+
+                    const messageContent = document.createElement('div');
+                    messageContent.textContent = messageText;
+
+                    messageDiv.appendChild(closeButton);
+                    messageDiv.appendChild(messageContent);
+
+                    // Insertar el mensaje después del título
+                    cardBody.insertBefore(messageDiv, container);
+                }
+            } else {
+                // Eliminar mensaje si no estamos en red completa
+                const existingMessage = document.getElementById('networkInfoMessage');
+                if (existingMessage) {
+                    existingMessage.remove();
+                }
+            }
+
+            if (window.currentCommunityView === 'keywords') {
+                cardTitle.textContent = currentLang === 'es'
+                    ? 'Red de coincidencia de palabras clave (entre IPs)'
+                    : 'Keyword Coincidence Network (between IPs)';
+            } else {
+                cardTitle.textContent = currentLang === 'es'
+                    ? (isFullNetwork ? 'Red de Coautorías Interactiva Completa' : 'Red de Coautorías Interactiva entre IPs')
+                    : (isFullNetwork ? 'Complete Interactive Co-authorship Network' : 'Interactive Co-authorship Network between IPs');
+            }
+        }
+    
+        if (renderer) {
+            renderer.kill();
+            renderer = null;
+        }
+        container.innerHTML = '';
+        const graph = new Graph();
+    
+        const colorPalette = [
+            "#e6194b", "#3cb44b", "#ffe119", "#4363d8", "#f58231", "#911eb4", "#42d4f4", "#f032e6",
+            "#bfef45", "#fabed4", "#469990", "#dcbeff", "#9a6324", "#fffac8", "#800000", "#aaffc3",
+            "#808000", "#ffd8b1", "#000075", "#a9a9a9", "#000000", "#6a3d9a", "#b15928", "#1f78b4"
+        ];
+    
+        const colorByCommunity = c => {
+            if (c === -1 || isNaN(c)) return '#A9A9A9'; // gris para outliers
+            return colorPalette[c % colorPalette.length];
+        };
+    
+        const departmentColorScale = d3.scaleOrdinal()
+            .domain(['Departamento 1', 'Departamento 2', 'Departamento 3', 'Unknown'])
+            .range(['#1f78b4', '#ff7f0e', '#2ca02c', '#999999']);
+    
+        // Posicionamiento
+        if (data.is_author_view) {
+            const centerX = container.clientWidth / 2;
+            const centerY = container.clientHeight / 2;
+            const radius = 250;
+            const authorNode = data.nodes.find(n => n.is_selected);
+            if (!authorNode) return;
+            authorNode.x = centerX;
+            authorNode.y = centerY;
+            const coauthors = data.nodes.filter(n => !n.is_selected);
+            const angleStep = (2 * Math.PI) / Math.max(coauthors.length, 1);
+            coauthors.forEach((node, i) => {
+                const angle = i * angleStep;
+                node.x = centerX + radius * Math.cos(angle);
+                node.y = centerY + radius * Math.sin(angle);
+            });
+        } else if (!data.has_layout) {
+            // Sin posiciones del servidor (vista por palabras clave): agrupar por comunidad en círculos
+            let groupByProp;
+            if (window.currentCommunityView === 'department') {
+                groupByProp = 'department';
+            } else if (window.currentCommunityView === 'modularity-5') {
+                groupByProp = 'leiden_community';
+            } else if (window.currentCommunityView === 'modularity-7') {
+                groupByProp = 'community';  // aquí es lovaina_community en back
+            } else {
+                groupByProp = 'community';
+            }
+    
+            const groups = [...new Set(data.nodes.map(n => n[groupByProp]))].filter(g => g !== undefined);
+            const unknownIndex = groups.indexOf(-1);
+            if (unknownIndex > -1) {
+                groups.splice(unknownIndex, 1);
+                groups.push(-1);
+            }
+    
+            const nodesByGroup = {};
+            groups.forEach(group => {
+                nodesByGroup[group] = data.nodes.filter(n => n[groupByProp] === group);
+            });
+    
+            const canvasCenterX = container.clientWidth / 2;
+            const canvasCenterY = container.clientHeight / 2;
+            const totalGroups = groups.length;
+            const overallRadius = Math.min(canvasCenterX, canvasCenterY) * 0.8;
+            const groupRadius = overallRadius / Math.sqrt(totalGroups) * 0.5;
+    
+            groups.forEach((group, i) => {
+                const nodes = nodesByGroup[group];
+                const angleStep = (2 * Math.PI) / Math.max(nodes.length, 5);
+                const cx = canvasCenterX + overallRadius * Math.cos((2 * Math.PI * i) / totalGroups);
+                const cy = canvasCenterY + overallRadius * Math.sin((2 * Math.PI * i) / totalGroups);
+                nodes.forEach((node, j) => {
+                    const angle = j * angleStep;
+                    node.x = cx + groupRadius * Math.cos(angle);
+                    node.y = cy + groupRadius * Math.sin(angle);
+                });
+            });
+        }
+    
+        data.nodes.forEach(node => {
+            const comm = parseInt(node.community);
+            const leiden = parseInt(node.leiden_community);
+            const dept = node.department;
+    
+            const nodeColor = data.is_author_view
+                ? (node.is_selected ? '#e6194b' : '#bbbbbb')
+                : (window.currentCommunityView === 'department'
+                    ? departmentColorScale(dept)
+                    : (window.currentCommunityView === 'modularity-5'
+                        ? colorByCommunity(leiden)
+                        : colorByCommunity(comm)));
+    
+            graph.addNode(node.id, {
+                label: node.label,
+                x: node.x,
+                y: node.y,
+                // Los supernodos (red agregada por comunidades) crecen con su número de autores
+                size: node.member_count ? Math.min(40, 10 + 3 * Math.sqrt(node.member_count)) : (node.is_selected ? 18 : 12),
+                color: nodeColor,
+                highlighted: node.is_selected,
+                forceLabel: showAllLabels,
+                memberCount: node.member_count || 0
+            });
+        });
+    
+        data.edges.forEach(edge => {
+            if (graph.hasNode(edge.source) && graph.hasNode(edge.target)) {
+                const weight = edge.weight || 1;
+                const rawSize = Math.pow(weight, 0.7);
+                const edgeSize = Math.min(4.0, Math.max(1.5, rawSize));
+                const alpha = Math.min(0.9, 0.5 + 0.05 * weight);
+                const edgeColor = `rgba(3, 138, 255, ${alpha.toFixed(2)})`;
+                graph.addEdge(edge.source, edge.target, {
+                    size: edgeSize,
+                    color: edgeColor,
+                    type: 'curve'
+                });
+            }
+        });
+    
+        renderer = new Sigma(graph, container, {
+            minCameraRatio: 0.1,
+            maxCameraRatio: 10,
+            defaultEdgeType: "curve",
+            edgeProgramClasses: { curve: EdgeCurveProgram },
+            renderLabels: true,
+            labelDensity: 1,
+            labelGridCellSize: 300,
+            labelRenderedSizeThreshold: 0,
+            defaultLabelSize: 8,
+            zIndex: true,
+            enableEdgeHovering: false,
+            enableNodeHovering: false,
+            enableCamera: false
+        });
+    
+        // Leyenda
+        if (!data.is_author_view && !(isFullNetwork && window.currentCommunityView === 'modularity-7') && !(isFullNetwork && window.currentCommunityView === 'modularity-5')) {
+            const legend = document.createElement('div');
+            legend.id = 'networkLegend';
+            Object.assign(legend.style, {
+                position: 'absolute',
+                bottom: '10px',
+                left: '10px',
+                backgroundColor: 'rgba(255,255,255,0.95)',
+                border: '1px solid #ccc',
+                borderRadius: '8px',
+                padding: '12px',
+                fontSize: '13px',
+                zIndex: 1000,
+                boxShadow: '0px 0px 6px rgba(0,0,0,0.1)'
+            });
+        
+            const title = document.createElement('div');
+            title.style.fontWeight = 'bold';
+            title.style.marginBottom = '6px';
+        
+            if (window.currentCommunityView === 'department') {
+                title.textContent = currentLang === 'es' ? 'Departamentos' : 'Departments';
+            } else if (window.currentCommunityView === 'keywords') {
+                title.textContent = currentLang === 'es' ? 'Comunidades de Palabras Clave' : 'Keyword Communities';
+            } else if (window.currentCommunityView === 'modularity-5' || window.currentCommunityView === 'modularity-7') {
+                const k = window.currentCommunityView === 'modularity-7' ? 7 : 5;
+                title.textContent = currentLang === 'es'
+                    ? `Comunidades (${k})`
+                    : `Communities (${k})`;
+            }
+        
+            legend.appendChild(title);
+
+            const counts = document.createElement('div');
+            counts.style.marginBottom = '8px';
+            counts.textContent = `${data.nodes.length} nodos / ${data.edges.length} enlaces`;
+            legend.appendChild(counts);
+        
+            if (window.currentCommunityView === 'department') {
+                const departments = [...new Set(data.nodes.map(n => n.department))];
+                departments.forEach(dept => {
+                    const item = document.createElement('div');
+                    item.style.display = 'flex';
+                    item.style.alignItems = 'center';
+                    item.style.marginBottom = '4px';
+        
+                    const colorBox = document.createElement('div');
+                    Object.assign(colorBox.style, {
+                        width: '14px',
+                        height: '14px',
+                        backgroundColor: departmentColorScale(dept),
+                        marginRight: '6px',
+                        borderRadius: '3px'
+                    });
+        
+                    const label = document.createElement('span');
+                    label.textContent = dept;
+        
+                    item.appendChild(colorBox);
+                    item.appendChild(label);
+                    legend.appendChild(item);
+                });
+            } else {
+                // === Obtener comunidades ===
+                let communities = [];
+                if (window.currentCommunityView === 'keywords') {
+                    communities = [...new Set(data.nodes.map(n => parseInt(n.community)))];
+                } else if (window.currentCommunityView === 'modularity-5') {
+                    communities = [...new Set(data.nodes.map(n => parseInt(n.leiden_community)))];
+                } else if (window.currentCommunityView === 'modularity-7') {
+                    communities = [...new Set(data.nodes.map(n => parseInt(n.community)))];
+                }
+        
+                communities.sort((a, b) => a - b);
+        
+                communities.forEach((comm, i) => {
+                    const item = document.createElement('div');
+                    item.style.display = 'flex';
+                    item.style.alignItems = 'center';
+                    item.style.marginBottom = '4px';
+        
+                    const colorBox = document.createElement('div');
+                    Object.assign(colorBox.style, {
+                        width: '14px',
+                        height: '14px',
+                        backgroundColor: colorByCommunity(comm),
+                        marginRight: '6px',
+                        borderRadius: '3px'
+                    });
+        
+                    const label = document.createElement('span');
+                    if (comm === -1 || isNaN(comm)) {
+                        label.textContent = currentLang === 'es' ? 'Outlier' : 'Outlier';
+                    } else {
+                        const num = (window.currentCommunityView === 'modularity-7') ? (i + 1) : (comm + 1);
+                        const word = currentLang === 'es' ? 'Comunidad' : 'Community';
+                        label.textContent = `${word} ${num}`;
+                    }
+        
+                    item.appendChild(colorBox);
+                    item.appendChild(label);
+                    legend.appendChild(item);
+                });
+            }
+        
+            container.appendChild(legend);
+        }
+    
+        // Interactividad
+        const overlay = document.createElement('div');
+        overlay.innerText = currentLang === 'es' ? 'Haz click para activar la red' : 'Click to activate the network';
+        Object.assign(overlay.style, {
+            position: 'absolute',
+            top: 0,
+            left: 0,
+            width: '100%',
+            height: '100%',
+            backgroundColor: 'rgba(255,255,255,0.85)',
+            display: 'flex',
+            alignItems: 'center',
+            justifyContent: 'center',
+            fontSize: '24px',
+            fontWeight: 'bold',
+            color: '#333',
+            cursor: 'pointer',
+            zIndex: 1000,
+            borderRadius: getComputedStyle(container).borderRadius
+        });
+        container.appendChild(overlay);
+        overlay.addEventListener('click', () => {
+            overlay.remove();
+            activateInteractivity();
+        });
+    
+        const tooltip = document.createElement('div');
+        Object.assign(tooltip.style, {
+            position: 'absolute',
+            backgroundColor: '#fff',
+            border: '1px solid #aaa',
+            padding: '4px 8px',
+            fontSize: '12px',
+            borderRadius: '4px',
+            pointerEvents: 'none',
+            display: 'none',
+            zIndex: 1000
+        });
+        document.body.appendChild(tooltip);
+    
+        const activateInteractivity = () => {
+            renderer.setSettings({
+                enableEdgeHovering: true,
+                enableNodeHovering: true,
+                enableCamera: true
+            });
+    
+            renderer.on('enterNode', ({ node, event }) => {
+                const label = graph.getNodeAttribute(node, 'label');
+                const neighbors = graph.neighbors(node);
+                const lines = [];
+                neighbors.forEach(neighbor => {
+                    const edge = graph.edge(node, neighbor) || graph.edge(neighbor, node);
+                    const weight = graph.getEdgeAttribute(edge, 'size') || 1;
+                    const neighborLabel = graph.getNodeAttribute(neighbor, 'label');
+                    lines.push(`• ${neighborLabel} (${weight})`);
+                });
+                tooltip.innerText = `${label}\n${currentLang === 'es' ? 'Colabora con:' : 'Collaborates with:'}\n${lines.join('\n')}`;
+                tooltip.style.left = `${event.clientX + 10}px`;
+                tooltip.style.top = `${event.clientY + 10}px`;
+                tooltip.style.display = 'block';
+    
+                const visibleNodes = new Set(neighbors);
+                visibleNodes.add(node);
+                graph.forEachNode(n => {
+                    graph.setNodeAttribute(n, 'hidden', !visibleNodes.has(n));
+                    graph.setNodeAttribute(n, 'forceLabel', showAllLabels || visibleNodes.has(n));
+                });
+                graph.forEachEdge(e => {
+                    const src = graph.source(e);
+                    const tgt = graph.target(e);
+                    const visible = visibleNodes.has(src) && visibleNodes.has(tgt);
+                    graph.setEdgeAttribute(e, 'hidden', !visible);
+                });
+            });
+
+            // Clic en un supernodo: drill-down en los autores de esa comunidad
+            renderer.on('clickNode', ({ node }) => {
+                if (!graph.getNodeAttribute(node, 'memberCount')) return;
+                const separator = node.indexOf(':');
+                const label = node.slice(separator + 1);
+                if (separator < 0 || label === 'none') return;
+                networkDrillDown = { community: label, communityField: node.slice(0, separator) };
+                reloadFullNetwork();
+            });
+    
+            renderer.on('leaveNode', () => {
+                tooltip.style.display = 'none';
+                graph.forEachNode(n => {
+                    graph.removeNodeAttribute(n, 'hidden');
+                    graph.setNodeAttribute(n, 'forceLabel', showAllLabels);
+                });
+                graph.forEachEdge(e => graph.removeEdgeAttribute(e, 'hidden'));
+            });
+        };
+    
+        renderer.getCamera().animatedReset({ duration: 500 });
+    }        
+    
+               
+    document.getElementById('applyClustering').addEventListener('click', () => {
+        const configMode = document.querySelector('input[name="configMode"]:checked').value; // 'global' o 'manual'
+        const model = document.getElementById('clusteringModel').value;
+        const modelConfigMode = document.querySelector('input[name="modelConfigMode"]:checked').value; // 'auto' o 'manual'
+    
+        let nClusters = document.getElementById('nClusters').value;
+        if (model === 'dbscan') {
+            nClusters = document.getElementById('dbscanClusters').value;
+        } else if (model === 'hdbscan') {
+            nClusters = document.getElementById('hdbscanClusters').value;
+        } else if (model === 'lovaina') {
+            nClusters = document.getElementById('lovainaClusters').value;
+        }
+    
+        // === ESTABLECER LA VISTA EN KEYWORDS ===
+        window.currentCommunityView = 'keywords';
+        window.currentClusteringModel = model;
+        window.currentNClusters = nClusters;
+    
+        const params = new URLSearchParams({
+            communityView: 'keywords',
+            clusteringModel: model,
+            nClusters: nClusters,
+            autoMode: modelConfigMode === 'auto',
+            globalMode: configMode === 'global'
+        });
+    
+        // === HACER LA PETICIÓN AL BACKEND ===
+        fetch(`/api/dashboard/collaboration-network/?${params.toString()}`)
+            .then(response => response.json())
+            .then(decodeNetworkData)
+            .then(data => {
+                if (data.error) {
+                    console.error('Error desde backend:', data.error);
+                    alert(`Ocurrió un error al generar la red: ${data.error}`);
+                    return;
+                }
+            
+                if (!data.nodes || !data.edges) {
+                    console.error('Respuesta incompleta del backend:', data);
+                    alert('La respuesta del servidor no contiene datos de red válidos.');
+                    return;
+                }
+            
+                // Guardar los datos actuales de la red
+                window.currentNetworkData = data;
+                
+                updateCommunityDropdownText(model, nClusters);
+                updateCollaborationNetwork(data);
+                document.activeElement.blur();
+                const modal = bootstrap.Modal.getInstance(document.getElementById('clusteringModal'));
+                modal.hide();
+            })
+            .catch(error => {
+                console.error('Error en la petición fetch:', error);
+            });
+    });
+    
+    function updateCommunityDropdownText(model = null, nClusters = null) {
+        const dropdownButton = document.getElementById('communityViewDropdown');
+        const currentLang = window.location.pathname.split('/')[1];
+        let text = '';
+
+        if (window.currentCommunityView === 'department') {
+            text = currentLang === 'es' ? 'Por Departamento' : 'By Department';
+        } else if (window.currentCommunityView === 'modularity-7') {
+            text = currentLang === 'es' 
+                ? (isFullNetwork ? 'Louvain' : 'Louvain (7 comunidades)')
+                : (isFullNetwork ? 'Louvain' : 'Louvain (7 communities)');
+        } else if (window.currentCommunityView === 'modularity-5') {
+            text = currentLang === 'es' 
+                ? (isFullNetwork ? 'Leiden' : 'Leiden (5 comunidades)')
+                : (isFullNetwork ? 'Leiden' : 'Leiden (5 communities)');
+        } else if (window.currentCommunityView === 'keywords') {
+            const modelName = model || window.currentClusteringModel;
+            const nClustersValue = nClusters || window.currentNClusters;
+            if (modelName && nClustersValue) {
+                text = currentLang === 'es'
+                    ? `Por palabras clave (${modelName}, ${nClustersValue} clústeres)`
+                    : `By keywords (${modelName}, ${nClustersValue} clusters)`;
+            } else {
+                text = currentLang === 'es' ? 'Por palabras clave' : 'By keywords';
+            }
+        }
+
+        dropdownButton.textContent = text;
+    }
+    
+    
+    
+    function updateFilters() {
+        const params = new URLSearchParams();
+        
+        // Añadir filtros de año
+        if (yearFrom.value) params.append('year_from', yearFrom.value);
+        if (yearTo.value) params.append('year_to', yearTo.value);
+        
+        // Añadir filtros de área
+        selectedAreasList.forEach(area => params.append('areas', area));
+        
+        // Añadir filtros de institución
+        selectedInstitutionsList.forEach(institution => params.append('institutions', institution));
+        
+        // Añadir filtros de tipo
+        selectedTypesList.forEach(type => params.append('types', type));
+
+        // Añadir autor seleccionado si existe
+        if (selectedAuthorName) {
+            params.append('author', selectedAuthorName);
+        }
+
+        // Extraer el idioma de la URL
+        const currentLang = window.location.pathname.split('/')[1];
+        const allAreas = currentLang === 'es' ? 'Todas las Áreas' : 'All areas';
+        const allInstitutions = currentLang === 'es' ? 'Todas las Instituciones' : 'All Institutions';
+        const allTypes = currentLang === 'es' ? 'Todos los tipos' : 'All types';
+
+        // Obtener datos actualizados de los filtros
+        fetch(`/api/dashboard/filters/?${params.toString()}`)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                return response.json();
+            })
+            .then(data => {
+                // Actualizar áreas temáticas
+                areaFilter.innerHTML = `<option value="">${allAreas}</option>`;
+                data.areas.forEach(area => {
+                    const option = document.createElement('option');
+                    option.value = area.name;
+                    option.textContent = `${area.name} (${area.count})`;
+                    areaFilter.appendChild(option);
+                });
+
+                // Actualizar instituciones
+                institutionFilter.innerHTML = `<option value="">${allInstitutions}</option>`;
+                data.institutions.forEach(institution => {
+                    const option = document.createElement('option');
+                    option.value = institution.name;
+                    option.textContent = `${institution.name} (${institution.count})`;
+                    institutionFilter.appendChild(option);
+                });
+
+                // Actualizar tipos de publicación
+                typeFilter.innerHTML = `<option value="">${allTypes}</option>`;
+                data.publication_types.forEach(type => {
+                    const option = document.createElement('option');
+                    option.value = type.publication_type;
+                    option.textContent = `${type.publication_type} (${type.count})`;
+                    typeFilter.appendChild(option);
+                });
+            })
+            .catch(error => {
+                console.error('Error updating filters:', error);
+                // Mostrar un mensaje de error al usuario
+                const errorMessage = document.createElement('div');
+                errorMessage.className = 'alert alert-danger';
+                errorMessage.style.position = 'fixed';
+                errorMessage.style.top = '20px';
+                errorMessage.style.right = '20px';
+                errorMessage.style.zIndex = '9999';
+                errorMessage.innerHTML = `
                     <strong>Error:</strong> No se pudieron actualizar los filtros.
                     <button type="button" class="btn-close" data-bs-dismiss="alert" aria-label="Close"></button>
-                `,document.body.appendChild($),setTimeout(()=>{$.remove()},5e3)}),Ye()}document.getElementById("toggleFullNetworkBtn").addEventListener("click",function(){const p=this,R=document.getElementById("collaborationNetwork"),L=window.location.pathname.split("/")[1];p.disabled=!0,p.innerHTML='<span class="spinner-border spinner-border-sm" role="status" aria-hidden="true"></span> '+(L==="es"?"Cargando...":"Loading...");const E=document.createElement("div");E.style.cssText=`
+                `;
+                document.body.appendChild(errorMessage);
+                
+                // Auto-cerrar el mensaje después de 5 segundos
+                setTimeout(() => {
+                    errorMessage.remove();
+                }, 5000);
+            });
+
+        // Actualizar visualizaciones
+        updateVisualizations();
+    }
+
+    // Añadir el manejador del botón de red completa
+    document.getElementById('toggleFullNetworkBtn').addEventListener('click', function() {
+        const button = this;
+        const container = document.getElementById('collaborationNetwork');
+        const currentLang = window.location.pathname.split('/')[1];
+        
+        // Deshabilitar el botón y mostrar spinner
+        button.disabled = true;
+        button.innerHTML = '<span class="spinner-border spinner-border-sm" role="status" aria-hidden="true"></span> ' + 
+            (currentLang === 'es' ? 'Cargando...' : 'Loading...');
+        
+        // Mostrar overlay de carga
+        const loadingOverlay = document.createElement('div');
+        loadingOverlay.style.cssText = `
             position: absolute;
             top: 0;
             left: 0;
@@ -704,11 +3381,132 @@ ${j.join(`
             align-items: center;
             z-index: 1000;
             border-radius: inherit;
-        `,E.innerHTML=`
+        `;
+        loadingOverlay.innerHTML = `
             <div class="spinner-border text-primary" role="status">
-                <span class="visually-hidden">${L==="es"?"Cargando...":"Loading..."}</span>
+                <span class="visually-hidden">${currentLang === 'es' ? 'Cargando...' : 'Loading...'}</span>
             </div>
-        `,R.appendChild(E),ce=!ce,p.textContent=L==="es"?ce?"Mostrar Red de IPs":"Mostrar Red Completa":ce?"Show IPs Network":"Show Full Network";const H=document.querySelector("#collaborationNetwork").closest(".card").querySelector(".card-title");H.textContent=L==="es"?ce?"Red de Coautorías Interactiva Completa":"Red de Coautorías Interactiva entre IPs":ce?"Complete Interactive Co-authorship Network":"Interactive Co-authorship Network between IPs";const T=new URLSearchParams({communityView:window.currentCommunityView,fullNetwork:ce});window.currentClusteringModel&&(T.append("clusteringModel",window.currentClusteringModel),T.append("nClusters",window.currentNClusters),T.append("autoMode","true"),T.append("globalMode","true")),document.querySelectorAll(".network-community-view").forEach(B=>{B.classList.remove("disabled"),B.style.pointerEvents="auto",B.style.opacity="1"}),fetch(`/api/dashboard/collaboration-network/?${T.toString()}`).then(B=>B.json()).then(B=>{if(B.error){console.error("Error desde backend:",B.error),alert(`Ocurrió un error al generar la red: ${B.error}`),ce=!ce;return}if(!B.nodes||!B.edges){console.error("Respuesta incompleta del backend:",B),alert("La respuesta del servidor no contiene datos de red válidos."),ce=!ce;return}window.currentNetworkData=B,tn(B),!ce&&(window.currentCommunityView==="modularity-5"||window.currentCommunityView==="keywords")?p.style.display="none":p.style.display="block"}).catch(B=>{console.error("Error en la petición fetch:",B)}).finally(()=>{E.remove(),p.disabled=!1})}),document.querySelectorAll(".network-community-view").forEach(p=>{p.addEventListener("click",function(R){if(R.preventDefault(),this.classList.contains("disabled"))return;const L=this.getAttribute("data-community-view");if(window.currentCommunityView=L,document.querySelectorAll(".network-community-view").forEach(B=>B.classList.remove("active")),this.classList.add("active"),(L==="department"||L==="modularity-7"||L==="modularity-5")&&ce){ce=!1;const B=document.getElementById("toggleFullNetworkBtn"),J=window.location.pathname.split("/")[1];B.textContent=J==="es"?"Mostrar Red Completa":"Show Full Network"}const E=document.getElementById("toggleFullNetworkBtn");!ce&&L==="keywords"?E.style.display="none":E.style.display="block";const H=document.getElementById("collaborationNetwork"),T=document.createElement("div");T.style.cssText=`
+        `;
+        container.appendChild(loadingOverlay);
+        
+        // Cambiar el estado de la red
+        isFullNetwork = !isFullNetwork;
+        networkDrillDown = null;
+        
+        // Actualizar el texto del botón
+        button.textContent = currentLang === 'es' 
+            ? (isFullNetwork ? 'Mostrar Red de IPs' : 'Mostrar Red Completa')
+            : (isFullNetwork ? 'Show IPs Network' : 'Show Full Network');
+
+        // Actualizar el título del card
+        const cardTitle = document.querySelector('#collaborationNetwork').closest('.card').querySelector('.card-title');
+        cardTitle.textContent = currentLang === 'es'
+            ? (isFullNetwork ? 'Red de Coautorías Interactiva Completa' : 'Red de Coautorías Interactiva entre IPs')
+            : (isFullNetwork ? 'Complete Interactive Co-authorship Network' : 'Interactive Co-authorship Network between IPs');
+        
+        // Actualizar la red con el nuevo modo
+        const params = new URLSearchParams({
+            communityView: window.currentCommunityView,
+            fullNetwork: isFullNetwork
+        });
+        
+        if (window.currentClusteringModel) {
+            params.append('clusteringModel', window.currentClusteringModel);
+            params.append('nClusters', window.currentNClusters);
+            params.append('autoMode', 'true');
+            params.append('globalMode', 'true');
+        }
+        appendNetworkDetail(params);
+
+        // Actualizar las opciones del menú desplegable
+        const dropdownItems = document.querySelectorAll('.network-community-view');
+        dropdownItems.forEach(item => {
+            // Habilitar todas las opciones
+            item.classList.remove('disabled');
+            item.style.pointerEvents = 'auto';
+            item.style.opacity = '1';
+        });
+
+        fetch(`/api/dashboard/collaboration-network/?${params.toString()}`)
+            .then(response => response.json())
+            .then(decodeNetworkData)
+            .then(data => {
+                if (data.error) {
+                    console.error('Error desde backend:', data.error);
+                    alert(`Ocurrió un error al generar la red: ${data.error}`);
+                    // Revertir el estado si hay error
+                    isFullNetwork = !isFullNetwork;
+                    return;
+                }
+                
+                if (!data.nodes || !data.edges) {
+                    console.error('Respuesta incompleta del backend:', data);
+                    alert('La respuesta del servidor no contiene datos de red válidos.');
+                    // Revertir el estado si hay error
+                    isFullNetwork = !isFullNetwork;
+                    return;
+                }
+                
+                // Guardar los datos actuales de la red
+                window.currentNetworkData = data;
+                
+                // Solo actualizar la red cuando tengamos los nuevos datos
+                updateCollaborationNetwork(data);
+
+                // Actualizar visibilidad del botón
+                if (!isFullNetwork && (window.currentCommunityView === 'modularity-5' || window.currentCommunityView === 'keywords')) {
+                    button.style.display = 'none';
+                } else {
+                    button.style.display = 'block';
+                }
+            })
+            .catch(error => {
+                console.error('Error en la petición fetch:', error);
+            })
+            .finally(() => {
+                // Eliminar el overlay de carga
+                loadingOverlay.remove();
+                // Habilitar el botón
+                button.disabled = false;
+                updateNetworkDetailVisibility();
+            });
+    });
+
+    // También necesitamos actualizar el manejador de cambio de vista
+    document.querySelectorAll('.network-community-view').forEach(item => {
+        item.addEventListener('click', function(e) {
+            e.preventDefault();
+            if (this.classList.contains('disabled')) return;
+            
+            const view = this.getAttribute('data-community-view');
+            window.currentCommunityView = view;
+            
+            // Actualizar clases activas
+            document.querySelectorAll('.network-community-view').forEach(i => i.classList.remove('active'));
+            this.classList.add('active');
+
+            // Si estamos cambiando entre department, modularity-7 o modularity-5, forzar red de IPs
+            if ((view === 'department' || view === 'modularity-7' || view === 'modularity-5') && isFullNetwork) {
+                isFullNetwork = false;
+                const toggleFullNetworkBtn = document.getElementById('toggleFullNetworkBtn');
+                const currentLang = window.location.pathname.split('/')[1];
+                toggleFullNetworkBtn.textContent = currentLang === 'es' ? 'Mostrar Red Completa' : 'Show Full Network';
+            }
+            networkDrillDown = null;
+            updateNetworkDetailVisibility();
+
+            // Ocultar el botón de red completa para ciertas vistas en modo IPs
+            const toggleFullNetworkBtn = document.getElementById('toggleFullNetworkBtn');
+            if (!isFullNetwork && (view === 'keywords')) {
+                toggleFullNetworkBtn.style.display = 'none';
+            } else {
+                toggleFullNetworkBtn.style.display = 'block';
+            }
+            
+            // Mostrar overlay de carga
+            const container = document.getElementById('collaborationNetwork');
+            const loadingOverlay = document.createElement('div');
+            loadingOverlay.style.cssText = `
                 position: absolute;
                 top: 0;
                 left: 0;
@@ -720,8 +3518,119 @@ ${j.join(`
                 align-items: center;
                 z-index: 1000;
                 border-radius: inherit;
-            `,T.innerHTML=`
+            `;
+            loadingOverlay.innerHTML = `
                 <div class="spinner-border text-primary" role="status">
-                    <span class="visually-hidden">${window.location.pathname.split("/")[1]==="es"?"Cargando...":"Loading..."}</span>
+                    <span class="visually-hidden">${window.location.pathname.split('/')[1] === 'es' ? 'Cargando...' : 'Loading...'}</span>
                 </div>
-            `,H.appendChild(T);const $=new URLSearchParams({communityView:L,fullNetwork:ce});window.currentClusteringModel&&($.append("clusteringModel",window.currentClusteringModel),$.append("nClusters",window.currentNClusters),$.append("autoMode","true"),$.append("globalMode","true")),fetch(`/api/dashboard/collaboration-network/?${$.toString()}`).then(B=>B.json()).then(B=>{if(B.error){console.error("Error desde backend:",B.error);return}tn(B)}).catch(B=>{console.error("Error en la petición fetch:",B)}).finally(()=>{T.remove()})})});let rn=!1;const Ki={es:{include:"Incluir áreas temáticas predichas por IA",exclude:"Excluir áreas temáticas predichas por IA"},en:{include:"Include AI-predicted areas",exclude:"Exclude AI-predicted areas"}};function Zi(){const p=window.location.pathname.split("/")[1]==="es"?"es":"en",R=document.getElementById("togglePredictedAreasBtn");R&&(R.textContent=rn?Ki[p].exclude:Ki[p].include)}function Ga(){let p=document.getElementById("areasChartLoading");if(p)p.style.display="flex";else{p=document.createElement("div"),p.id="areasChartLoading",p.style.position="absolute",p.style.top=0,p.style.left=0,p.style.width="100%",p.style.height="100%",p.style.background="rgba(255,255,255,0.7)",p.style.display="flex",p.style.justifyContent="center",p.style.alignItems="center",p.style.zIndex=10,p.innerHTML='<div class="spinner-border text-primary" role="status"><span class="visually-hidden">Cargando...</span></div>';const R=document.getElementById("areasChart").parentElement;R.style.position="relative",R.appendChild(p)}}function Ji(){const p=document.getElementById("areasChartLoading");p&&(p.style.display="none")}window.addEventListener("DOMContentLoaded",function(){const p=document.getElementById("togglePredictedAreasBtn");p&&(p.addEventListener("click",function(){Ga(),rn=!rn,Zi(),Ye()}),Zi()),cp()})}document.addEventListener("DOMContentLoaded",()=>{dp()});
+            `;
+            container.appendChild(loadingOverlay);
+            
+            // Actualizar la red
+            const params = new URLSearchParams({
+                communityView: view,
+                fullNetwork: isFullNetwork
+            });
+            
+            if (window.currentClusteringModel) {
+                params.append('clusteringModel', window.currentClusteringModel);
+                params.append('nClusters', window.currentNClusters);
+                params.append('autoMode', 'true');
+                params.append('globalMode', 'true');
+            }
+            appendNetworkDetail(params);
+
+            fetch(`/api/dashboard/collaboration-network/?${params.toString()}`)
+                .then(response => response.json())
+                .then(decodeNetworkData)
+                .then(data => {
+                    if (data.error) {
+                        console.error('Error desde backend:', data.error);
+                        return;
+                    }
+                    // Solo actualizar la red cuando tengamos los nuevos datos
+                    updateCollaborationNetwork(data);
+                })
+                .catch(error => {
+                    console.error('Error en la petición fetch:', error);
+                })
+                .finally(() => {
+                    // Eliminar el overlay de carga
+                    loadingOverlay.remove();
+                });
+        });
+    });
+
+    let includePredictedAreas = false;
+
+    // Textos para el botón (es/en)
+    const predictedAreasBtnTexts = {
+        es: {
+            include: 'Incluir áreas temáticas predichas por IA',
+            exclude: 'Excluir áreas temáticas predichas por IA'
+        },
+        en: {
+            include: 'Include AI-predicted areas',
+            exclude: 'Exclude AI-predicted areas'
+        }
+    };
+
+    function updatePredictedAreasBtnText() {
+        const lang = window.location.pathname.split('/')[1] === 'es' ? 'es' : 'en';
+        const btn = document.getElementById('togglePredictedAreasBtn');
+        if (!btn) return;
+        btn.textContent = includePredictedAreas ? predictedAreasBtnTexts[lang].exclude : predictedAreasBtnTexts[lang].include;
+    }
+
+    function showAreasLoading() {
+        let overlay = document.getElementById('areasChartLoading');
+        if (!overlay) {
+            overlay = document.createElement('div');
+            overlay.id = 'areasChartLoading';
+            overlay.style.position = 'absolute';
+            overlay.style.top = 0;
+            overlay.style.left = 0;
+            overlay.style.width = '100%';
+            overlay.style.height = '100%';
+            overlay.style.background = 'rgba(255,255,255,0.7)';
+            overlay.style.display = 'flex';
+            overlay.style.justifyContent = 'center';
+            overlay.style.alignItems = 'center';
+            overlay.style.zIndex = 10;
+            overlay.innerHTML = '<div class="spinner-border text-primary" role="status"><span class="visually-hidden">Cargando...</span></div>';
+            const parent = document.getElementById('areasChart').parentElement;
+            parent.style.position = 'relative';
+            parent.appendChild(overlay);
+        } else {
+            overlay.style.display = 'flex';
+        }
+    }
+
+    function hideAreasLoading() {
+        const overlay = document.getElementById('areasChartLoading');
+        if (overlay) overlay.style.display = 'none';
+    }
+
+    window.addEventListener('DOMContentLoaded', function() {
+        const btn = document.getElementById('togglePredictedAreasBtn');
+        if (btn) {
+            btn.addEventListener('click', function() {
+                showAreasLoading();
+                includePredictedAreas = !includePredictedAreas;
+                window.includePredictedAreas = includePredictedAreas; // Para el informe exportado
+                updatePredictedAreasBtnText();
+                updateVisualizations();
+            });
+            updatePredictedAreasBtnText();
+        }
+        setupExportReportButton();
+    });
+}
+return{initFiltersAndSearch};})();
+const __main=(()=>{const {initFiltersAndSearch}=__dashboard;
+
+
+document.addEventListener('DOMContentLoaded', () => {
+  initFiltersAndSearch();
+});
+})();})();